@@ -10,8 +10,11 @@
 import os
 import os.path as osp
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from subprocess import call
 
+from datalad import cfg
+
 from datalad.runner import (
     GitRunner,
     Runner,
@@ -67,3 +70,32 @@ class witlessrunner(SuprocBenchmarks):
 
     def time_echo_gitrunner_fullcapture(self):
         self.git_runner.run(["echo"], protocol=StdOutErrCapture)
+
+
+class runners(SuprocBenchmarks):
+    """Compare the thread-based and the event loop based runner
+    """
+
+    params = ['threaded', 'asyncio']
+    param_names = ['runner']
+
+    def setup(self, runner):
+        cfg.set('datalad.runtime.runner', runner, scope='override')
+        self.runner = Runner()
+
+    def teardown(self, runner):
+        cfg.unset('datalad.runtime.runner', scope='override')
+
+    def time_echo(self, runner):
+        self.runner.run(["echo"], protocol=StdOutErrCapture)
+
+    def time_heavyout(self, runner):
+        self.runner.run([sys.executable] + heavyout_cmd.split(),
+                        protocol=StdOutErrCapture)
+
+    def time_echo_parallel16(self, runner):
+        with ThreadPoolExecutor(16) as executor:
+            list(executor.map(
+                lambda i: self.runner.run(["echo", str(i)],
+                                          protocol=StdOutErrCapture),
+                range(64)))
@@ -7,6 +7,14 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Benchmarks of the basic repos (Git/Annex) functionality"""
 
+from collections.abc import Mapping
+
+from datalad.support.contentinfo import (
+    ContentInfo,
+    parse_ls_files,
+)
+from datalad.utils import Path
+
 from .common import (
     SampleSuperDatasetBenchmarks,
     SuprocBenchmarks,
@@ -20,4 +28,48 @@ class gitrepo(SampleSuperDatasetBenchmarks):
 
     def time_get_content_info(self):
         info = self.repo.get_content_info()
-        assert isinstance(info, dict)   # just so we do not end up with a generator
+        assert isinstance(info, Mapping)   # just so we do not end up with a generator
+
+
+class contentinfo(SuprocBenchmarks):
+    """Parsing of `git ls-files` outputs for get_content_info()"""
+
+    params = [1000, 100000]
+    param_names = ['nfiles']
+
+    def setup(self, nfiles):
+        sha = b'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'
+        self.out = b''.join(
+            b'100644 %s 0\tdir%d/file%d.dat\0' % (sha, i % 100, i)
+            for i in range(nfiles))
+
+    def time_parse_ls_files(self, nfiles):
+        parse_ls_files(self.out)
+
+    def time_contentinfo_items(self, nfiles):
+        for _ in ContentInfo(Path('/repo'), parse_ls_files(self.out)).items():
+            pass
+
+
+class config(SuprocBenchmarks):
+    """Reading and modifying the configuration of a repository"""
+
+    def setup(self):
+        from datalad.support.gitrepo import GitRepo
+        from datalad.utils import make_tempfile
+        with make_tempfile(mkdir=True) as path:
+            self.path = path
+        self.repo = GitRepo(self.path, create=True)
+
+    def teardown(self):
+        from datalad.utils import rmtree
+        rmtree(self.path)
+
+    def time_configmanager(self):
+        from datalad.config import ConfigManager
+        ConfigManager(self.repo)
+
+    def time_set20(self):
+        cfg = self.repo.config
+        for i in range(20):
+            cfg.set(f'bench.sec.key{i}', str(i), scope='local')
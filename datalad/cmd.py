@@ -18,14 +18,21 @@ import logging
 import os
 import queue
 import sys
+import threading
+import time
 import warnings
+from collections import (
+    OrderedDict,
+    deque,
+)
 from datetime import datetime
-from operator import attrgetter
 from queue import Queue
 from subprocess import TimeoutExpired
 from typing import (
     Any,
     Callable,
+    Iterable,
+    Iterator,
     List,
     Optional,
     Tuple,
@@ -63,7 +70,7 @@ from datalad.runner.protocol import (
     WitlessProtocol,
 )
 from datalad.runner.runner import WitlessRunner
-from datalad.runner.utils import LineSplitter
+from datalad.runner.utils import ByteLineSplitter
 from datalad.support.exceptions import CommandError
 from datalad.utils import (
     auto_repr,
@@ -157,21 +164,23 @@ class BatchedCommandProtocol(GeneratorMixIn, StdOutErrCapture):
         StdOutErrCapture.__init__(self, done_future, encoding)
         self.batched_command = batched_command
         self.output_proc = output_proc
-        self.line_splitter = LineSplitter()
+        self.line_splitter = ByteLineSplitter()
 
     def pipe_data_received(self, fd: int, data: bytes):
         if fd == STDERR_FILENO:
             self.send_result((fd, data))
         elif fd == STDOUT_FILENO:
-            for line in self.line_splitter.process(data.decode(self.encoding)):
-                self.send_result((fd, line))
+            encoding = self.encoding
+            for line in self.line_splitter.process(data):
+                self.send_result((fd, line.decode(encoding)))
         else:
             raise ValueError(f"unknown file descriptor: {fd}")
 
     def pipe_connection_lost(self, fd: int, exc: Optional[BaseException]):
         if fd == STDOUT_FILENO:
-            remaining_line = self.line_splitter.finish_processing()
-            if remaining_line is not None:
+            remaining_data = self.line_splitter.finish_processing()
+            if remaining_data is not None:
+                remaining_line = remaining_data.decode(self.encoding)
                 lgr.debug("unterminated line: %s", remaining_line)
                 self.send_result((fd, remaining_line))
 
@@ -219,6 +228,152 @@ class SafeDelCloseMixin(object):
             raise
 
 
+class BatchedProcessPool:
+    """Process-wide registry of the running processes of batched commands
+
+    All `BatchedCommand` instances (including the batched git-annex and
+    `git cat-file` processes of all repositories) report to a single pool.
+    Before a new process is started, the pool closes
+
+    - processes that have been idle for longer than
+      `datalad.runtime.max-inactive-age` seconds, and
+    - the least recently used idle processes, until the number of running
+      processes is below `datalad.runtime.max-batched` and the number of
+      pipes to them is below `datalad.runtime.max-batched-fds`.
+
+    A closed `BatchedCommand` transparently restarts its process on the next
+    request, hence these limits put a cap on the resources used by batched
+    commands, even when a very large number of repositories is processed.
+
+    Processes that are in the middle of a request are never closed.
+    """
+    # pipes held open per process (stdin, stdout, stderr)
+    fds_per_process = 3
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        # running processes, least recently used first. Commands are
+        # referenced weakly, such that they are still closed when they are
+        # no longer used by their owner
+        self._running: OrderedDict[int, ReferenceType[BatchedCommand]] = \
+            OrderedDict()
+        self._last_used: dict[int, float] = {}
+        self.counters = dict(
+            # requests served by a running process
+            hits=0,
+            # requests that had to (re)start a process
+            misses=0,
+            # processes started
+            spawns=0,
+            # processes closed to stay within the limits
+            evictions=0,
+            # processes closed after being idle for too long
+            expirations=0,
+            # maximum number of simultaneously running processes
+            peak=0,
+        )
+
+    def __len__(self) -> int:
+        return len(self._running)
+
+    def stats(self) -> dict:
+        """Return a snapshot of the pool counters and its current size"""
+        with self._lock:
+            return dict(self.counters, running=len(self._running))
+
+    def hit(self, command: BatchedCommand) -> None:
+        """Record a request that is served by a running process"""
+        with self._lock:
+            self.counters['hits'] += 1
+            self._touch(command)
+
+    def spawn(self, command: BatchedCommand) -> None:
+        """Make room for, and record a process that is about to start"""
+        with self._lock:
+            self.counters['misses'] += 1
+            self.counters['spawns'] += 1
+            self._running.pop(id(command), None)
+            self.expire()
+            max_running = self._get_max_running()
+            self._evict(max(max_running - 1, 0))
+            self._touch(command)
+            self.counters['peak'] = max(
+                self.counters['peak'], len(self._running))
+
+    def release(self, command: BatchedCommand) -> None:
+        """Record that the process of a command is no longer running"""
+        with self._lock:
+            self._running.pop(id(command), None)
+            self._last_used.pop(id(command), None)
+
+    def expire(self, max_age: Optional[float] = None) -> None:
+        """Close all idle processes that are older than `max_age` seconds"""
+        if max_age is None:
+            max_age = cfg.obtain("datalad.runtime.max-inactive-age")
+        now = time.monotonic()
+        with self._lock:
+            for c in self._get_running():
+                if now - self._last_used[id(c)] <= max_age:
+                    # all remaining ones are younger
+                    break
+                if c._close_if_idle():
+                    self.counters['expirations'] += 1
+
+    def _get_running(self) -> list[BatchedCommand]:
+        running = []
+        for i, r in list(self._running.items()):
+            c = r()
+            if c is None:
+                self._running.pop(i, None)
+                self._last_used.pop(i, None)
+            else:
+                running.append(c)
+        return running
+
+    def _touch(self, command: BatchedCommand) -> None:
+        key = id(command)
+        if key in self._running:
+            self._running.move_to_end(key)
+        else:
+            self._running[key] = ref(command)
+        self._last_used[id(command)] = time.monotonic()
+
+    def _evict(self, max_running: int) -> None:
+        # close least recently used idle processes, until no more than
+        # `max_running` are left
+        for c in self._get_running():
+            if len(self._running) <= max_running:
+                return
+            if c._close_if_idle():
+                self.counters['evictions'] += 1
+        if len(self._running) > max_running:
+            lgr.debug(
+                "Too many batched processes remaining after cleanup, "
+                "%d are in use", len(self._running))
+
+    def _get_max_running(self) -> int:
+        max_running = cfg.obtain("datalad.runtime.max-batched")
+        max_fds = cfg.get("datalad.runtime.max-batched-fds", None)
+        max_fds = _get_default_max_fds() if max_fds is None else int(max_fds)
+        if max_fds is not None:
+            max_running = min(max_running, max_fds // self.fds_per_process)
+        return max_running
+
+
+def _get_default_max_fds() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        # not available on Windows
+        return None
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    return None if soft == resource.RLIM_INFINITY else soft // 2
+
+
+# The pool that all batched commands of this process report to
+batched_processes = BatchedProcessPool()
+
+
 @auto_repr
 class BatchedCommand(SafeDelCloseMixin):
     """
@@ -230,6 +385,9 @@ class BatchedCommand(SafeDelCloseMixin):
     # instances
     _active_instances: WeakValueDictionary[int, BatchedCommand] = WeakValueDictionary()
 
+    # Protocol that turns the output of the subprocess into responses
+    protocol_class: type[BatchedCommandProtocol] = BatchedCommandProtocol
+
     def __init__(self,
                  cmd: Union[str, Tuple, List],
                  path: Optional[str] = None,
@@ -254,8 +412,10 @@ class BatchedCommand(SafeDelCloseMixin):
         self.last_request: Optional[str] = None
 
         self._active = 0
+        # guards `_active`, such that the process is not closed by the pool
+        # while a request is about to be sent
+        self._active_lock = threading.Lock()
         self._active_last = _now()
-        self.clean_inactive()
         assert id(self) not in self._active_instances
         self._active_instances[id(self)] = self
 
@@ -265,48 +425,47 @@ class BatchedCommand(SafeDelCloseMixin):
 
     @classmethod
     def clean_inactive(cls):
-        from . import cfg
-        max_batched = cfg.obtain("datalad.runtime.max-batched")
-        max_inactive_age = cfg.obtain("datalad.runtime.max-inactive-age")
-        if len(cls._active_instances) > max_batched:
-            active_qty = 0
-            inactive = []
-            for c in cls._active_instances.values():
-                if c._active:
-                    active_qty += 1
-                else:
-                    inactive.append(c)
-            inactive.sort(key=attrgetter("_active_last"))
-            to_close = len(cls._active_instances) - max_batched
-            if to_close <= 0:
-                return
-            too_young = 0
-            now = _now()
-            for i, c in enumerate(inactive):
-                if (now - c._active_last).total_seconds() <= max_inactive_age:
-                    too_young = len(inactive) - i
-                    break
-                elif c._active:
-                    active_qty += 1
-                else:
-                    c.close()
-                    cls._active_instances.pop(id(c), None)
-                    to_close -= 1
-                    if to_close <= 0:
-                        break
-            if to_close > 0:
-                lgr.debug(
-                    "Too many BatchedCommands remaining after cleanup;"
-                    " %d active, %d went inactive recently",
-                    active_qty,
-                    too_young,
-                )
+        """Close processes that have been idle for too long
+
+        The limits on the number of running processes are enforced by
+        `batched_processes` whenever a new process is started.
+        """
+        batched_processes.expire()
+
+    def _enter(self) -> None:
+        with self._active_lock:
+            self._active += 1
+
+    def _leave(self) -> None:
+        with self._active_lock:
+            self._active -= 1
+
+    def _close_if_idle(self) -> bool:
+        """Close the process, unless a request is in progress
+
+        Returns
+        -------
+        bool
+          Whether the process was closed
+        """
+        # do not wait for a thread that is entering a request
+        if not self._active_lock.acquire(blocking=False):
+            return False
+        try:
+            if self._active:
+                return False
+            self.close()
+            return True
+        finally:
+            self._active_lock.release()
 
     def _initialize(self):
 
         lgr.debug("Starting new runner for %s", repr(self))
         lgr.log(5, "Command: %s", self.command)
 
+        batched_processes.spawn(self)
+
         self.stdin_queue = queue.Queue()
         self.stderr_output = b""
         self.wait_timed_out = None
@@ -319,7 +478,7 @@ class BatchedCommand(SafeDelCloseMixin):
         )
         self.generator = self.runner.run(
             cmd=self.command,
-            protocol=BatchedCommandProtocol,
+            protocol=self.protocol_class,
             stdin=self.stdin_queue,
             cwd=self.path,
             # This mimics the behavior of the old implementation w.r.t
@@ -342,6 +501,7 @@ class BatchedCommand(SafeDelCloseMixin):
                 return True
             self.return_code = result
             self.runner = None
+            batched_processes.release(self)
             if result != 0:
                 raise BatchedCommandError(
                     cmd=" ".join(self.command),
@@ -382,7 +542,7 @@ class BatchedCommand(SafeDelCloseMixin):
             If `self.output_proc` is not `None`, the result type of
             `self.output_proc` determines the type of the elements.
         """
-        self._active += 1
+        self._enter()
         requests = cmds
 
         input_multiple = isinstance(requests, list)
@@ -406,56 +566,146 @@ class BatchedCommand(SafeDelCloseMixin):
                         lgr.debug("%s: command exited", self)
                         self.return_code = self.generator.return_code
                         self.runner = None
+                        batched_processes.release(self)
 
         except CommandError as command_error:
-            # Convert CommandError into BatchedCommandError
-            self.runner = None
-            self.return_code = command_error.code
-            raise BatchedCommandError(
-                cmd=command_error.cmd,
-                last_processed_request=self.last_request,
-                msg=command_error.msg,
-                code=command_error.code,
-                stdout=command_error.stdout,
-                stderr=command_error.stderr,
-                cwd=command_error.cwd,
-                **command_error.kwargs
-            ) from command_error
+            self._raise_batched_error(command_error)
 
         finally:
-            self._active -= 1
+            self._leave()
         return responses if input_multiple else responses[0] if responses else None
 
+    def pipeline(self,
+                 requests: Iterable[Union[str, Tuple]],
+                 max_in_flight: int = 100) -> Iterator:
+        """
+        Send requests to the subprocess and yield the responses in order.
+
+        Unlike `__call__()`, which waits for the response to each request
+        before sending the next one, this keeps up to `max_in_flight` requests
+        in flight. The subprocess can then work on the next request while the
+        response to the previous one is processed, instead of paying a full
+        round trip per request.
+
+        If the subprocess exits before all responses were received, it is not
+        restarted, and `BatchedCommandError` is raised. Its
+        `last_processed_request` is the last request that received a
+        response, the remaining requests are left to the caller.
+
+        Parameters
+        ----------
+        requests : iterable of (str or tuple)
+            requests for the subprocess. The iterable is consumed lazily.
+        max_in_flight : int, optional
+            maximum number of requests sent ahead of their responses
+
+        Yields
+        ------
+        (return_type[self.output_proc] | str)
+            responses received from the process, one per request
+        """
+        self._enter()
+        requests = iter(requests)
+        in_flight: deque = deque()
+        exhausted = False
+        started = False
+        try:
+            while True:
+                if not in_flight and not self.process_running():
+                    # Only (re)start the process when no responses of the
+                    # current one are pending.
+                    self._initialize()
+                    started = True
+                while not exhausted and len(in_flight) < max(max_in_flight, 1):
+                    try:
+                        request = next(requests)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    if started:
+                        started = False
+                    else:
+                        batched_processes.hit(self)
+                    self._send_request(request)
+                    in_flight.append(request)
+                if not in_flight:
+                    return
+                try:
+                    response = self._get_response()
+                except StopIteration:
+                    # Do not restart the process and send the requests
+                    # again, one of them might be what made it exit.
+                    self.return_code = self.generator.return_code
+                    self.runner = None
+                    batched_processes.release(self)
+                    raise BatchedCommandError(
+                        cmd=" ".join(self.command),
+                        last_processed_request=self.last_request,
+                        msg=f"{type(self).__name__}: exited with "
+                            f"{self.return_code} and {len(in_flight)} "
+                            f"request(s) in flight after request: "
+                            f"{self.last_request}",
+                        code=self.return_code)
+                self.last_request = in_flight.popleft()
+                yield response
+
+        except CommandError as command_error:
+            self._raise_batched_error(command_error)
+
+        finally:
+            self._leave()
+
+    def _raise_batched_error(self, command_error: CommandError):
+        # Convert CommandError into BatchedCommandError
+        self.runner = None
+        batched_processes.release(self)
+        self.return_code = command_error.code
+        raise BatchedCommandError(
+            cmd=command_error.cmd,
+            last_processed_request=self.last_request,
+            msg=command_error.msg,
+            code=command_error.code,
+            stdout=command_error.stdout,
+            stderr=command_error.stderr,
+            cwd=command_error.cwd,
+            **command_error.kwargs
+        ) from command_error
+
     def process_request(self,
                         request: Union[Tuple, str]) -> Any | None:
 
-        self._active += 1
+        self._enter()
         try:
 
             if not self.process_running():
                 self._initialize()
-
-            # Remember request and send it to subprocess
-            if not isinstance(request, str):
-                request = ' '.join(request)
-            self.stdin_queue.put((request + "\n").encode())
-
-            # Get the response from the generator. We only consider
-            # data received on stdout as a response.
-            if self.output_proc:
-                # If we have an output procedure, let the output procedure
-                # read stdout and decide about the nature of the response
-                response = self.output_proc(ReadlineEmulator(self))
             else:
-                # If there is no output procedure we assume that a response
-                # is one line.
-                response = self.get_one_line()
-                if response is not None:
-                    response = response.rstrip()
-            return response
+                batched_processes.hit(self)
+            self._send_request(request)
+            return self._get_response()
 
         finally:
-            self._active -= 1
+            self._leave()
+
+    def _send_request(self, request: Union[Tuple, str]) -> None:
+        # Send a request to the running subprocess
+        if not isinstance(request, str):
+            request = ' '.join(request)
+        self.stdin_queue.put((request + "\n").encode())
+
+    def _get_response(self) -> Any | None:
+        # Get the response from the generator. We only consider
+        # data received on stdout as a response.
+        if self.output_proc:
+            # If we have an output procedure, let the output procedure
+            # read stdout and decide about the nature of the response
+            return self.output_proc(ReadlineEmulator(self))
+        # If there is no output procedure we assume that a response
+        # is one line.
+        response = self.get_one_line()
+        if response is not None:
+            response = response.rstrip()
+        return response
 
     def proc1(self,
               single_command: str):
@@ -463,12 +713,12 @@ class BatchedCommand(SafeDelCloseMixin):
         Simulate the old interface. This method is used only once in
         AnnexRepo.get_metadata()
         """
-        self._active += 1
+        self._enter()
         try:
             assert isinstance(single_command, str)
             return self(single_command)
         finally:
-            self._active -= 1
+            self._leave()
 
     def get_one_line(self) -> Optional[str]:
         """
@@ -578,6 +828,7 @@ class BatchedCommand(SafeDelCloseMixin):
         result = self.get_requested_error_output(return_stderr)
         self.runner = None
         self.stderr_output = b""
+        batched_processes.release(self)
         return result
 
     def get_requested_error_output(self, return_stderr: bool):
@@ -626,5 +877,88 @@ class BatchedCommand(SafeDelCloseMixin):
         return self._abandon_cache
 
 
+class BatchedCatFileProtocol(BatchedCommandProtocol):
+    """Protocol for `git cat-file --batch` and `git cat-file --batch-check`
+
+    Instead of lines, one result is sent per object report, which is a tuple
+    `(hexsha, type, size, content)`, or None if the requested object does not
+    exist. `content` is None for `--batch-check`. Object content is taken
+    from the receive buffer as-is, without any decoding.
+    """
+    def __init__(self,
+                 batched_command: "BatchedCatFile",
+                 done_future: Any = None,
+                 encoding: Optional[str] = None,
+                 output_proc: Optional[Callable] = None,
+                 ):
+        super().__init__(batched_command, done_future, encoding, output_proc)
+        self.with_content = not batched_command.check
+        self.buffer = bytearray()
+
+    def pipe_data_received(self, fd: int, data: bytes):
+        if fd != STDOUT_FILENO:
+            super().pipe_data_received(fd, data)
+            return
+        buffer = self.buffer
+        buffer += data
+        while True:
+            eol = buffer.find(b'\n')
+            if eol < 0:
+                return
+            header = bytes(buffer[:eol])
+            if header.endswith((b' missing', b' ambiguous')):
+                del buffer[:eol + 1]
+                self.send_result((fd, None))
+                continue
+            hexsha, objtype, size_str = header.decode('ascii').split(' ')
+            size = int(size_str)
+            if not self.with_content:
+                del buffer[:eol + 1]
+                self.send_result((fd, (hexsha, objtype, size, None)))
+                continue
+            # content is followed by a newline
+            end = eol + 1 + size
+            if len(buffer) <= end:
+                # wait for the rest of the content
+                return
+            content = bytes(buffer[eol + 1:end])
+            del buffer[:end + 1]
+            self.send_result((fd, (hexsha, objtype, size, content)))
+
+    def pipe_connection_lost(self, fd: int, exc: Optional[BaseException]):
+        if fd == STDOUT_FILENO and self.buffer:
+            lgr.debug("incomplete object report: %s", self.buffer[:100])
+
+
+def _read_object(stdout: ReadlineEmulator) -> Any:
+    # BatchedCatFileProtocol delivers complete object reports
+    return stdout.readline()
+
+
+class BatchedCatFile(BatchedCommand):
+    """Persistent `git cat-file` process for reading Git objects
+
+    Requests are object names (anything `git cat-file` understands, e.g.
+    a SHA, or `<rev>:<path>`), responses are tuples of
+    `(hexsha, type, size, content)`, or None if an object does not exist.
+    With `check=True` the process runs in `--batch-check` mode, and
+    `content` is always None.
+    """
+    protocol_class = BatchedCatFileProtocol
+
+    def __init__(self,
+                 path: Optional[str] = None,
+                 check: bool = False,
+                 git_cmd: Optional[List[str]] = None,
+                 ):
+        self.check = check
+        super().__init__(
+            (git_cmd or ['git'])
+            + ['cat-file', '--batch-check' if check else '--batch'],
+            path=path,
+            output_proc=_read_object,
+        )
+
+
 def _now():
     return datetime.now().astimezone()
@@ -15,6 +15,7 @@ import os
 import re
 import threading
 import warnings
+import weakref
 from collections import namedtuple
 from functools import (
     lru_cache,
@@ -32,6 +33,13 @@ from datalad.runner import (
     KillOutput,
     StdOutErrCapture,
 )
+from datalad.support.gitconfig import (
+    UnsupportedGitConfig,
+    get_env_config,
+    get_gitconfig_files,
+    parse_gitconfig,
+    read_gitconfig,
+)
 from datalad.utils import (
     getpwd,
     on_windows,
@@ -74,6 +82,57 @@ _scope_reload_doc = """
 _stat_result = namedtuple('_stat_result', 'st_ino st_size st_ctime st_mtime')
 
 
+# Configuration read from the system and global scopes is identical for all
+# ConfigManager instances of a process. It is read once, and shared until any
+# of the underlying files changes.
+_shared_stores = {}
+_shared_stores_lock = threading.Lock()
+
+
+def _get_file_stats(files):
+    stats = {}
+    for f in files:
+        try:
+            stat = f.stat()
+        except (FileNotFoundError, NotADirectoryError):
+            stats[f] = None
+            continue
+        stats[f] = _stat_result(
+            stat.st_ino,
+            stat.st_size,
+            stat.st_ctime,
+            stat.st_mtime)
+    return stats
+
+
+def _get_shared_store(paths):
+    """Return the (cached) store for the given system/global config files
+
+    Returns
+    -------
+    dict or None
+      None is returned if the configuration includes files conditionally.
+      The outcome of such conditions depends on the repository at hand,
+      hence such configuration cannot be shared.
+    """
+    key = tuple(paths)
+    with _shared_stores_lock:
+        store = _shared_stores.get(key)
+    if store is not None and _get_file_stats(store['files']) == store['stats']:
+        return store if store['cfg'] is not None else None
+    records, files = read_gitconfig(paths)
+    files = set(files)
+    store = dict(
+        cfg=None if any(k.startswith('includeif.') for k, _ in records)
+        else _gitcfg_records_to_dict(records),
+        files=files,
+        stats=_get_file_stats(files),
+    )
+    with _shared_stores_lock:
+        _shared_stores[key] = store
+    return store if store['cfg'] is not None else None
+
+
 # we cannot import external_versions here, as the cfg comes before anything
 # and we would have circular imports
 @lru_cache()
@@ -148,7 +207,7 @@ def parse_gitconfig_dump(dump, cwd=None, multi_value=True):
       a Git blob ID prefixed with 'blob:' is reported.
     """
     cwd = Path(getpwd() if cwd is None else cwd)
-    dct = {}
+    records = []
     fileset = set()
     for line in dump.split('\0'):
         # line is a null-delimited chunk
@@ -173,15 +232,8 @@ def parse_gitconfig_dump(dump, cwd=None, multi_value=True):
         if not k:
             # nothing else to log, all ignored dump was reported before
             continue
-        # multi-value reporting
-        present_v = dct.get(k, None)
-        if present_v is None or not multi_value:
-            dct[k] = v
-        else:
-            if isinstance(present_v, tuple):
-                dct[k] = present_v + (v,)
-            else:
-                dct[k] = (present_v, v)
+        records.append((k, v))
+    dct = _gitcfg_records_to_dict(records, multi_value=multi_value)
     # take blobs with verbatim markup
     origin_blobs = set(f for f in fileset if f.startswith('blob:'))
     # convert file specifications to Path objects with absolute paths
@@ -194,6 +246,27 @@ def parse_gitconfig_dump(dump, cwd=None, multi_value=True):
 _parse_gitconfig_dump = parse_gitconfig_dump
 
 
+def _gitcfg_records_to_dict(records, multi_value=True, base=None):
+    """Build a configuration dict from a sequence of key/value pairs
+
+    See `parse_gitconfig_dump()` for the meaning of `multi_value`. If a
+    `base` dict is given, the records are added to a copy of it, as if they
+    followed the records `base` was built from.
+    """
+    dct = dict(base) if base else {}
+    for k, v in records:
+        # multi-value reporting
+        present_v = dct.get(k, None)
+        if present_v is None or not multi_value:
+            dct[k] = v
+        else:
+            if isinstance(present_v, tuple):
+                dct[k] = present_v + (v,)
+            else:
+                dct[k] = (present_v, v)
+    return dct
+
+
 def _gitcfg_rec_to_keyvalue(rec):
     """Helper for parse_gitconfig_dump()
 
@@ -257,11 +330,14 @@ class ConfigManager(object):
     """Thin wrapper around `git-config` with support for a dataset configuration.
 
     The general idea is to have an object that is primarily used to read/query
-    configuration option.  Upon creation, current configuration is read via one
-    (or max two, in the case of the presence of dataset-specific configuration)
-    calls to `git config`.  If this class is initialized with a Dataset
-    instance, it supports reading and writing configuration from
-    ``.datalad/config`` inside a dataset too. This file is committed to Git and
+    configuration option.  Upon creation, current configuration is read from
+    the same files `git config` would read (plus a dataset-specific
+    configuration, if present). Files are parsed in-process, and parsed files
+    are shared by all instances until they are modified. `git config` is only
+    called for modifications, on a forced reload, or when a configuration
+    cannot be read in-process (e.g. syntax errors).  If this class is
+    initialized with a Dataset instance, it supports reading and writing
+    configuration from ``.datalad/config`` inside a dataset too. This file is committed to Git and
     hence useful to ship certain configuration items with a dataset.
 
     The API aims to provide the most significant read-access API of a
@@ -346,14 +422,18 @@ class ConfigManager(object):
 
         self._repo_dot_git = None
         self._repo_pathobj = None
+        # weak reference to the repository, to read committed config via
+        # its persistent `git cat-file` process without creating a
+        # reference cycle (the repo holds on to its ConfigManager)
+        self._repo_ref = None
         if dataset:
-            if hasattr(dataset, 'dot_git'):
-                # `dataset` is actually a Repo instance
-                self._repo_dot_git = dataset.dot_git
-                self._repo_pathobj = dataset.pathobj
-            elif dataset.repo:
-                self._repo_dot_git = dataset.repo.dot_git
-                self._repo_pathobj = dataset.repo.pathobj
+            repo = dataset if hasattr(dataset, 'dot_git') \
+                else dataset.repo
+            if repo:
+                # `dataset` is actually a Repo instance, or has one
+                self._repo_dot_git = repo.dot_git
+                self._repo_pathobj = repo.pathobj
+                self._repo_ref = weakref.ref(repo)
 
         self._config_cmd = ['git', 'config']
         # public dict to store variables that always override any setting
@@ -396,15 +476,19 @@ class ConfigManager(object):
         if self._runner is None:
             self._runner = GitRunner(**run_kwargs)
 
-        self.reload(force=True)
+        self.reload()
 
     def reload(self, force=False):
         """Reload all configuration items from the configured sources
 
         If `force` is False, all files configuration was previously read from
         are checked for differences in the modification times. If no difference
-        is found for any file no reload is performed. This mechanism will not
-        detect newly created global configuration files, use `force` in this case.
+        is found for any file no reload is performed. Otherwise, the
+        configuration files are parsed in-process, and only modified files are
+        actually read again.
+
+        If `force` is True, the configuration is reloaded via `git config`,
+        regardless of any modification.
         """
         run_args = ['-z', '-l', '--show-origin']
 
@@ -426,16 +510,10 @@ class ConfigManager(object):
             if self._repo_dot_git == self._repo_pathobj:
                 # this is a bare repo, we go with the default HEAD,
                 # if it has a config
-                try:
-                    # will blow if absent
-                    self._runner.run([
-                        'git', 'cat-file', '-e', 'HEAD:.datalad/config'],
-                        protocol=KillOutput)
+                if self._blob_exists('HEAD:.datalad/config') and (
+                        force or self._need_reload(self._stores['branch'])):
                     to_run['branch'] = run_args + [
                         '--blob', 'HEAD:.datalad/config']
-                except CommandError:
-                    # all good, just no branch config
-                    pass
             else:
                 # non-bare repo
                 # we could use the same strategy as for bare repos, and rely
@@ -457,7 +535,15 @@ class ConfigManager(object):
         # reload everything that was found todo
         while to_run:
             store_id, runargs = to_run.popitem()
-            self._stores[store_id] = self._reload(runargs)
+            store = None
+            if not force:
+                try:
+                    store = self._read_store(store_id)
+                except UnsupportedGitConfig as e:
+                    lgr.debug(
+                        "Cannot read %s configuration in-process, "
+                        "using git-config: %s", store_id, e)
+            self._stores[store_id] = store or self._reload(runargs)
 
         # always update the merged representation, even if we did not reload
         # anything from a file. ENV or overrides could change independently
@@ -483,6 +569,77 @@ class ConfigManager(object):
         curstats = self._get_stats(store)
         return any(curstats[f] != storestats[f] for f in store['files'])
 
+    def _read_store(self, store_id):
+        """Read a store from configuration files, without calling git
+
+        Raises
+        ------
+        UnsupportedGitConfig
+          If the configuration cannot be read faithfully without git.
+        """
+        git_dir = self._repo_dot_git
+        if git_dir is not None and not git_dir.is_dir():
+            # no (initialized) repository, git would look for one elsewhere
+            raise UnsupportedGitConfig(f'No Git directory at {git_dir}')
+        extra = None
+        # like `git config --file/--local/--blob`, include directives are
+        # only followed when reading all files git would read by default
+        includes = False
+        if store_id == 'branch':
+            if git_dir == self._repo_pathobj:
+                return self._read_blob_store('HEAD:.datalad/config')
+            paths = [self._repo_pathobj / DATASET_CONFIG_FILE]
+        elif git_dir is None and self._runner.cwd is not None:
+            # git would discover any repository at the working directory
+            raise UnsupportedGitConfig(
+                f'No repository known for {self._runner.cwd}')
+        elif self._src_mode == 'branch-local':
+            paths = [git_dir / 'config']
+        else:
+            shared = _get_shared_store(get_gitconfig_files())
+            if shared is not None:
+                # only the repository's own configuration is read here
+                paths = get_gitconfig_files(git_dir, local_only=True) \
+                    if git_dir is not None else []
+                records, files = read_gitconfig(
+                    paths, git_dir=git_dir, extra=get_env_config())
+                files = set(files)
+                stats = _get_file_stats(files)
+                stats.update(shared['stats'])
+                return dict(
+                    cfg=_gitcfg_records_to_dict(records, base=shared['cfg']),
+                    files=files.union(shared['files']),
+                    stats=stats,
+                )
+            paths = get_gitconfig_files(git_dir)
+            extra = get_env_config()
+            includes = True
+        records, files = read_gitconfig(
+            paths, git_dir=git_dir, extra=extra, includes=includes)
+        store = dict(
+            cfg=_gitcfg_records_to_dict(records),
+            files=set(files),
+        )
+        store['stats'] = self._get_stats(store)
+        return store
+
+    def _read_blob_store(self, obj):
+        repo = self._repo_ref() if self._repo_ref else None
+        blob = repo.get_object(obj) if repo is not None else None
+        if blob is None:
+            raise UnsupportedGitConfig(f'Cannot read {obj}')
+        try:
+            text = blob[3].decode('utf-8')
+        except UnicodeDecodeError as e:
+            raise UnsupportedGitConfig(f'Cannot decode {obj}: {e}') from e
+        # includes are not followed, like with `git config --blob`
+        records = parse_gitconfig(text, origin=obj)
+        return dict(
+            cfg=_gitcfg_records_to_dict(records),
+            files={f'blob:{obj}'},
+            stats={f'blob:{obj}': blob[0]},
+        )
+
     def _reload(self, run_args):
         # query git-config
         stdout, stderr = self._run(
@@ -501,27 +658,38 @@ class ConfigManager(object):
         return store
 
     def _get_stats(self, store):
-        stats = {}
+        stats = _get_file_stats(
+            [f for f in store['files'] if isinstance(f, Path)])
         for f in store['files']:
             if isinstance(f, Path):
-                if f.exists():
-                    stat = f.stat()
-                    stats[f] = _stat_result(
-                        stat.st_ino,
-                        stat.st_size,
-                        stat.st_ctime,
-                        stat.st_mtime)
-                else:
-                    stats[f] = None
+                continue
             elif f.startswith('blob:'):
                 # we record the specific shasum of the blob
-                stats[f] = self._runner.run(
-                    ['git', 'rev-parse', f[5:]],
-                    protocol=StdOutErrCapture)['stdout'].strip()
+                repo = self._repo_ref() if self._repo_ref else None
+                if repo is not None:
+                    info = repo.get_object(f[5:], check=True)
+                    stats[f] = info[0] if info else None
+                else:
+                    stats[f] = self._runner.run(
+                        ['git', 'rev-parse', f[5:]],
+                        protocol=StdOutErrCapture)['stdout'].strip()
             else:
                 stats[f] = None
         return stats
 
+    def _blob_exists(self, obj):
+        repo = self._repo_ref() if self._repo_ref else None
+        if repo is not None:
+            return repo.get_object(obj, check=True) is not None
+        try:
+            # will blow if absent
+            self._runner.run(['git', 'cat-file', '-e', obj],
+                             protocol=KillOutput)
+            return True
+        except CommandError:
+            # all good, just no such blob
+            return False
+
     @_scope_reload
     @_where_to_scope
     def obtain(self, var, default=None, dialog_type=None, valtype=None,
@@ -936,7 +1104,7 @@ class ConfigManager(object):
             val.append(value)
             self.overrides[var] = val[0] if len(val) == 1 else val
             if reload:
-                self.reload(force=True)
+                self.reload()
             return
 
         self._run(['--add', var, value], scope=scope, reload=reload,
@@ -965,7 +1133,7 @@ class ConfigManager(object):
         if scope == 'override':
             self.overrides[var] = value
             if reload:
-                self.reload(force=True)
+                self.reload()
             return
 
         from datalad.support.gitrepo import to_options
@@ -991,7 +1159,7 @@ class ConfigManager(object):
                 for k, v in self.overrides.items()
             }
             if reload:
-                self.reload(force=True)
+                self.reload()
             return
 
         self._run(['--rename-section', old, new], scope=scope, reload=reload)
@@ -1013,7 +1181,7 @@ class ConfigManager(object):
                 if not k.startswith(sec + '.')
             }
             if reload:
-                self.reload(force=True)
+                self.reload()
             return
 
         self._run(['--remove-section', sec], scope=scope, reload=reload)
@@ -1031,7 +1199,7 @@ class ConfigManager(object):
         if scope == 'override':
             self.overrides.pop(var, None)
             if reload:
-                self.reload(force=True)
+                self.reload()
             return
 
         # use unset all as it is simpler for now
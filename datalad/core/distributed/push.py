@@ -14,7 +14,12 @@ __docformat__ = 'restructuredtext'
 
 import logging
 import re
-from itertools import chain
+import threading
+from contextlib import nullcontext
+from itertools import (
+    chain,
+    islice,
+)
 
 from datalad.core.local.diff import diff_dataset
 from datalad.distribution.dataset import (
@@ -40,11 +45,13 @@ from datalad.log import log_progress
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.constraints import (
     EnsureChoice,
+    EnsureListOf,
     EnsureNone,
     EnsureStr,
 )
 from datalad.support.exceptions import CommandError
 from datalad.support.gitrepo import GitRepo
+from datalad.support.parallel import ProducerConsumer
 from datalad.support.param import Parameter
 from datalad.utils import (
     Path,
@@ -92,11 +99,15 @@ class Push(Interface):
         to=Parameter(
             args=("--to",),
             metavar='SIBLING',
+            action='append',
             doc="""name of the target sibling. If no name is given an attempt is
             made to identify the target based on the dataset's configuration
             (i.e. a configured tracking branch, or a single sibling that is
-            configured for push)""",
-            constraints=EnsureStr() | EnsureNone()),
+            configured for push). Changes to push are determined only once,
+            and are then pushed to all given targets concurrently.
+            [PY: Multiple targets can be given as a list of sibling names PY]
+            [CMD: This option can be given more than once CMD]""",
+            constraints=EnsureStr() | EnsureListOf(str) | EnsureNone()),
         since=Parameter(
             args=("--since",),
             constraints=EnsureStr() | EnsureNone(),
@@ -206,26 +217,32 @@ class Push(Interface):
 
         get_remote_kwargs = {'exclude_special_remotes': False} \
             if isinstance(ds_repo, AnnexRepo) else {}
-        if to and to not in ds_repo.get_remotes(**get_remote_kwargs):
+        # unique targets, in order. None (no target) for auto-detection
+        targets = list(dict.fromkeys(ensure_list(to))) or [None]
+        unknown = [t for t in targets if t is not None and
+                   t not in ds_repo.get_remotes(**get_remote_kwargs)]
+        if unknown:
             # get again for proper error:
             sr = ds_repo.get_remotes(**get_remote_kwargs)
             # yield an error result instead of raising a ValueError,
             # to enable the use case of pushing to a target that
             # a superdataset doesn't know, but some subdatasets to
             # (in combination with '--on-failure ignore')
-            yield dict(
-                res_kwargs,
-                status='error',
-                path=ds.path,
-                message="Unknown push target '{}'. {}".format(
-                    to,
-                    'Known targets: {}.'.format(', '.join(repr(s) for s in sr))
-                    if sr
-                    else 'No targets configured in dataset.'))
+            for t in unknown:
+                yield dict(
+                    res_kwargs,
+                    status='error',
+                    path=ds.path,
+                    message="Unknown push target '{}'. {}".format(
+                        t,
+                        'Known targets: {}.'.format(
+                            ', '.join(repr(s) for s in sorted(sr)))
+                        if sr
+                        else 'No targets configured in dataset.'))
             return
         if since == '^':
             # figure out state of remote branch and set `since`
-            since = _get_corresponding_remote_state(ds_repo, to)
+            since = _get_corresponding_remote_state(ds_repo, targets)
             if not since:
                 lgr.info(
                     "No tracked remote for active branch, "
@@ -234,7 +251,6 @@ class Push(Interface):
             # will blow with ValueError if unusable
             ds_repo.get_hexsha(since)
 
-
         # obtain a generator for information on the datasets to process
         # idea is to turn the `paths` argument into per-dataset
         # content listings that can be acted upon
@@ -246,21 +262,61 @@ class Push(Interface):
             recursive,
             recursion_limit)
 
-        # instead of a loop, this could all be done in parallel
-        matched_anything = False
-        for dspath, dsrecords in ds_spec:
-            matched_anything = True
+        matched_ds = []
+        # push unrelated datasets in parallel, if requested and there is
+        # more than one dataset to push. They share the jobs, hence each
+        # one transfers its content sequentially
+        parallel_ds = False
+        if recursive and ProducerConsumer.get_effective_jobs(jobs) > 1:
+            first_ds_spec = list(islice(ds_spec, 2))
+            parallel_ds = len(first_ds_spec) > 1
+            ds_spec = chain(first_ds_spec, ds_spec)
+        ds_jobs = 1 if parallel_ds else jobs
+
+        def push_ds(ds_spec_item):
+            dspath, dsrecords = ds_spec_item
+            matched_ds.append(dspath)
             lgr.debug('Pushing Dataset at %s', dspath)
             pbars = {}
-            yield from _push(
-                dspath, dsrecords, to, data, force, jobs, res_kwargs.copy(), pbars,
-                got_path_arg=True if path else False)
+            if len(targets) == 1:
+                yield from _push(
+                    dspath, dsrecords, targets[0], data, force, ds_jobs,
+                    res_kwargs.copy(), pbars,
+                    got_path_arg=True if path else False)
+            else:
+                # the changes are shared by all targets, and each target
+                # is pushed to by its own worker
+                content = _SharedContent(dsrecords)
+                locks = {}
+                yield from ProducerConsumer(
+                    targets,
+                    lambda target: _push(
+                        dspath, content, target, data, force, ds_jobs,
+                        res_kwargs.copy(), pbars,
+                        got_path_arg=True if path else False,
+                        target_locks=locks),
+                    jobs=len(targets),
+                )
             # take down progress bars for this dataset
             for i, ds in pbars.items():
                 log_progress(lgr.info, i, 'Finished push of %s', ds)
+
+        if parallel_ds:
+            # any superdataset is pushed only after all its subdatasets
+            yield from ProducerConsumer(
+                ds_spec,
+                push_ds,
+                order='bottom-up',
+                producer_future_key=lambda ds_spec_item: ds_spec_item[0],
+                jobs=jobs,
+            )
+        else:
+            for ds_spec_item in ds_spec:
+                yield from push_ds(ds_spec_item)
+        matched_anything = bool(matched_ds)
         if not matched_anything:
             potential_remote = False
-            if not to and len(paths) == 1:
+            if targets == [None] and len(paths) == 1:
                 # if we get a remote name without --to, provide a hint
                 sr = ds_repo.get_remotes(**get_remote_kwargs)
                 potential_remote = [
@@ -414,7 +470,7 @@ def _transfer_data(repo, ds, target, content, data, force, jobs, res_kwargs,
 
 
 def _push(dspath, content, target, data, force, jobs, res_kwargs, pbars,
-          got_path_arg=False):
+          got_path_arg=False, target_locks=None):
     force_git_push = force in ('all', 'gitpush')
 
     # nothing recursive in here, we only need a repo to work with
@@ -605,9 +661,22 @@ def _push(dspath, content, target, data, force, jobs, res_kwargs, pbars,
             res_kwargs.copy(),
             pbars,
             got_path_arg=got_path_arg,
+            target_locks=target_locks,
         )
 
-    # and lastly the primary push target
+    # and lastly the primary push target. Pushes to the same target (e.g. a
+    # common publication dependency of several targets) are done one after
+    # the other
+    with target_locks.setdefault(target, threading.Lock()) \
+            if target_locks is not None else nullcontext():
+        yield from _push_to_target(
+            ds, repo, target, content, data, force, force_git_push, jobs,
+            res_kwargs, pbar_id, refspecs2push, got_path_arg)
+
+
+def _push_to_target(ds, repo, target, content, data, force, force_git_push,
+                    jobs, res_kwargs, pbar_id, refspecs2push, got_path_arg):
+    is_annex_repo = isinstance(repo, AnnexRepo)
     target_is_git_remote = repo.config.get(
         'remote.{}.url'.format(target), None) is not None
 
@@ -764,6 +833,47 @@ def _push_refspecs(repo, target, refspecs, force_git_push, res_kwargs):
         )
 
 
+def _get_content_annexinfo(ds, content, got_path_arg):
+    ds_repo = ds.repo
+    # paths must be recoded to a dataset REPO root (in case of a symlinked
+    # location
+    annex_info_init = \
+        {ds_repo.pathobj / Path(c['path']).relative_to(ds.pathobj): c
+         for c in content} if ds.pathobj != ds_repo.pathobj else \
+        {Path(c['path']): c for c in content}
+    return list(ds_repo.get_content_annexinfo(
+        # paths are taken from `annex_info_init`
+        paths=None,
+        init=annex_info_init,
+        ref='HEAD',
+        # this is an expensive operation that is only needed
+        # to perform a warning below, and for more accurate
+        # progress reporting (exclude unavailable content).
+        # limit to cases with explicit paths provided
+        eval_availability=True if got_path_arg else False,
+    ).values())
+
+
+class _SharedContent(list):
+    """Changes of a dataset to push to several targets
+
+    The git-annex properties of the changed files do not depend on the
+    target. They are determined once, when first needed for a data
+    transfer, and are then used for all targets.
+    """
+    def __init__(self, records):
+        super().__init__(records)
+        self._lock = threading.Lock()
+        self._annexinfo = None
+
+    def get_annexinfo(self, ds, got_path_arg):
+        with self._lock:
+            if self._annexinfo is None:
+                self._annexinfo = _get_content_annexinfo(
+                    ds, self, got_path_arg)
+            return self._annexinfo
+
+
 def _push_data(ds, target, content, data, force, jobs, res_kwargs,
                got_path_arg=False):
     if ds.config.getbool('remote.{}'.format(target), 'annex-ignore', False):
@@ -801,28 +911,14 @@ def _push_data(ds, target, content, data, force, jobs, res_kwargs,
 
     # it really looks like we will transfer files, get info on what annex
     # has in store
-    # paths must be recoded to a dataset REPO root (in case of a symlinked
-    # location
-    annex_info_init = \
-        {ds_repo.pathobj / Path(c['path']).relative_to(ds.pathobj): c
-         for c in content} if ds.pathobj != ds_repo.pathobj else \
-        {Path(c['path']): c for c in content}
-    content = ds.repo.get_content_annexinfo(
-        # paths are taken from `annex_info_init`
-        paths=None,
-        init=annex_info_init,
-        ref='HEAD',
-        # this is an expensive operation that is only needed
-        # to perform a warning below, and for more accurate
-        # progress reporting (exclude unavailable content).
-        # limit to cases with explicit paths provided
-        eval_availability=True if got_path_arg else False,
-    )
+    content = content.get_annexinfo(ds, got_path_arg) \
+        if isinstance(content, _SharedContent) \
+        else _get_content_annexinfo(ds, content, got_path_arg)
     # figure out which of the reported content (after evaluating
     # `since` and `path` arguments needs transport
     to_transfer = [
         c
-        for c in content.values()
+        for c in content
         # by force
         if ((force in ('all', 'checkdatapresent') or
              # or by modification report
@@ -921,6 +1017,23 @@ def _get_corresponding_remote_state(repo, to):
     # instead we target the corresponding branch
     active_branch = repo.get_corresponding_branch() or repo.get_active_branch()
 
+    if isinstance(to, list) and len(to) > 1:
+        # several targets: changes since the last state that is known to
+        # all of them
+        states = [_get_corresponding_remote_state(repo, t) for t in to]
+        if not all(states):
+            return None
+        try:
+            return repo.call_git_oneline(
+                ['merge-base', '--octopus'] + states, read_only=True)
+        except CommandError as e:
+            # unrelated histories or unknown remote branch
+            lgr.debug('Cannot determine common state of %s: %s',
+                      states, e)
+            return None
+    elif isinstance(to, list):
+        to = to[0]
+
     if to:
         # XXX here we assume one to one mapping of names from local branches
         # to the remote
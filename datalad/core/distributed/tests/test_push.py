@@ -12,11 +12,16 @@
 
 import logging
 import os
+from unittest.mock import patch
 
 import pytest
 
 from datalad.core.distributed.clone import Clone
-from datalad.core.distributed.push import Push
+from datalad.core.distributed.push import (
+    Push,
+    _get_content_annexinfo,
+    _transfer_data,
+)
 from datalad.distribution.dataset import Dataset
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.exceptions import (
@@ -645,6 +650,67 @@ def test_gh1763(src=None, target1=None, target2=None, target3=None):
                   src.repo.whereis(['probe1'])[0])
 
 
+@with_tempfile(mkdir=True)
+@with_tempfile()
+def test_push_recursive_jobs_single_dataset(src=None, target=None):
+    src = Dataset(src).create(**ckwa)
+    mk_push_target(src, 'target', target, bare=False)
+    (src.pathobj / 'probe').write_text('probe')
+    src.save(to_git=False, **ckwa)
+    with patch('datalad.core.distributed.push._transfer_data',
+               wraps=_transfer_data) as transfer_data:
+        res = src.push(to='target', recursive=True, jobs=4, **ckwa)
+    assert_in_results(res, action='copy', status='ok',
+                      path=str(src.pathobj / 'probe'))
+    # with no other dataset to push in parallel, all jobs go to git-annex
+    eq_(transfer_data.call_count, 1)
+    eq_(transfer_data.call_args[0][6], 4)
+
+
+@with_tempfile(mkdir=True)
+@with_tempfile()
+@with_tempfile()
+@with_tempfile()
+def test_push_multiple_targets(src=None, target1=None, target2=None,
+                               target3=None):
+    src = Dataset(src).create(force=True, **ckwa)
+    targets = [
+        mk_push_target(src, f'target{i}', t, bare=False)
+        for i, t in enumerate([target1, target2, target3])
+    ]
+    # a dependency that is also a direct target
+    src.siblings('configure', name='target0', publish_depends='target2',
+                 **ckwa)
+    for probe in ('probe1', 'probe2'):
+        (src.pathobj / probe).write_text(probe)
+        src.save(probe, to_git=False, **ckwa)
+        with patch('datalad.core.distributed.push._get_content_annexinfo',
+                   wraps=_get_content_annexinfo) as annexinfo:
+            res = src.push(
+                to=['target0', 'target1', 'target2'], since='^',
+                data='anything', **ckwa)
+        # the changes are annotated once for all targets
+        eq_(annexinfo.call_count, 1)
+        for i, target in enumerate(targets):
+            assert_in_results(res, action='copy', status='ok',
+                              path=str(src.pathobj / probe),
+                              target=f'target{i}')
+            assert_in(target.config.get('annex.uuid'),
+                      src.repo.whereis([probe])[0])
+            eq_(target.get_hexsha(DEFAULT_BRANCH),
+                src.repo.get_hexsha(DEFAULT_BRANCH))
+        if probe == 'probe2':
+            # only the new file was considered
+            assert_not_in_results(res, path=str(src.pathobj / 'probe1'),
+                                  action='copy')
+
+    res = src.push(to=['target0', 'unknown', 'other'],
+                   on_failure='ignore', **ckwa)
+    assert_result_count(res, 2, status='error', action='publish')
+    assert_in_results(res, message="Unknown push target 'unknown'. "
+                      "Known targets: 'target0', 'target1', 'target2'.")
+
+
 @with_tempfile()
 @with_tempfile()
 def test_gh1811(srcpath=None, clonepath=None):
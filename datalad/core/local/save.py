@@ -42,11 +42,9 @@ from datalad.support.constraints import (
     EnsureNone,
     EnsureStr,
 )
+from datalad.support.contentinfo import ContentRecord
 from datalad.support.exceptions import CommandError
-from datalad.support.parallel import (
-    ProducerConsumerProgressLog,
-    no_subds_in_futures,
-)
+from datalad.support.parallel import ProducerConsumerProgressLog
 from datalad.support.param import Parameter
 from datalad.utils import ensure_list
 
@@ -245,11 +243,11 @@ class Save(Interface):
             # fish out status dict for this parent dataset
             ds_status = paths_by_ds.get(s['parentds'], {})
             # reassemble path status info as repo.status() would have made it
-            ds_status[ut.Path(s['path'])] = \
-                {k: v for k, v in s.items()
-                 if k not in (
-                     'path', 'parentds', 'refds', 'status', 'action',
-                     'logger')}
+            ds_status[ut.Path(s['path'])] = ContentRecord(
+                (k, v) for k, v in s.items()
+                if k not in (
+                    'path', 'parentds', 'refds', 'status', 'action',
+                    'logger'))
             paths_by_ds[s['parentds']] = ds_status
 
         lgr.debug('Determined %i datasets for saving from input arguments',
@@ -387,7 +385,7 @@ class Save(Interface):
         yield from ProducerConsumerProgressLog(
             sorted(paths_by_ds.items(), key=lambda v: v[0], reverse=True),
             partial(save_ds, version_tag=version_tag),
-            safe_to_consume=no_subds_in_futures,
+            order='bottom-up',
             producer_future_key=lambda ds_items: ds_items[0],
             jobs=jobs,
             log_filter=_log_filter_save_dataset,
@@ -14,11 +14,17 @@ __docformat__ = 'restructuredtext'
 import logging
 import os
 import os.path as op
+import threading
 import warnings
 from collections import OrderedDict
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
 
 import datalad.support.ansi_colors as ac
 import datalad.utils as ut
+from datalad.dataset.gitrepo import probe_repos
 from datalad.distribution.dataset import (
     Dataset,
     EnsureDataset,
@@ -34,6 +40,7 @@ from datalad.interface.base import (
     eval_results,
 )
 from datalad.interface.common_opts import (
+    jobs_opt,
     recursion_flag,
     recursion_limit,
 )
@@ -43,6 +50,7 @@ from datalad.support.constraints import (
     EnsureNone,
     EnsureStr,
 )
+from datalad.support.parallel import ProducerConsumer
 from datalad.support.param import Parameter
 from datalad.utils import (
     bytes2human,
@@ -102,9 +110,184 @@ STATE_COLOR_MAP = {
 }
 
 
+def _get_dataset_status(ds, paths, annexinfo, untracked,
+                        eval_submodule_state, cache):
+    """Query the status of a single dataset
+
+    See `yield_dataset_status()` for the meaning of the parameters.
+
+    Returns
+    -------
+    dict
+      Status records, keyed by paths in the dataset's repository.
+    """
+    repo = ds.repo
+    repo_path = repo.pathobj
+    lgr.debug('Querying %s.diffstatus() for paths: %s', repo, paths)
+    # recode paths with repo reference for low-level API
+    paths = [repo_path / p.relative_to(ds.pathobj) for p in paths] if paths else None
+    status = repo.diffstatus(
+        fr='HEAD' if repo.get_hexsha() else None,
+        to=None,
+        paths=paths,
+        untracked=untracked,
+        eval_submodule_state=eval_submodule_state,
+        _cache=cache)
+    if annexinfo and hasattr(repo, 'get_content_annexinfo'):
+        if paths:
+            # when an annex query has been requested for specific paths,
+            # exclude untracked files from the annex query (else gh-7032)
+            untracked = [k for k, v in status.items() if
+                         v['state'] == 'untracked']
+            lgr.debug(
+                'Skipping %s.get_content_annexinfo() for untracked paths: %s',
+                repo, paths)
+            [paths.remove(p) for p in untracked]
+        lgr.debug('Querying %s.get_content_annexinfo() for paths: %s', repo, paths)
+        # this will amend `status`
+        repo.get_content_annexinfo(
+            paths=paths,
+            init=status,
+            eval_availability=annexinfo in ('availability', 'all'),
+            ref=None)
+    return status
+
+
+class _StatusQueries:
+    """Run per-dataset status queries of a hierarchy concurrently
+
+    Queries for all installed subdatasets (within the recursion limit) are
+    submitted before a dataset's own status is determined. The modification
+    state of a subdataset is then derived from its own status report, rather
+    than evaluated once more (serially) by the superdataset query.
+
+    Results are picked up via `get()` in whatever order they are reported,
+    hence the reporting order is entirely unaffected by the order in which
+    queries complete.
+    """
+    def __init__(self, executor, annexinfo, untracked, eval_submodule_state,
+                 cache):
+        self._executor = executor
+        self._annexinfo = annexinfo
+        self._untracked = untracked
+        self._eval_submodule_state = eval_submodule_state
+        self._cache = cache
+        # full-dataset queries, by dataset path
+        self._futures = {}
+        # subdatasets whose queries were submitted by a dataset's query
+        self._submitted = {}
+        self._lock = threading.Lock()
+
+    def submit(self, ds, recursion_limit):
+        with self._lock:
+            if ds.pathobj not in self._futures:
+                self._futures[ds.pathobj] = self._executor.submit(
+                    self._query, ds, None, recursion_limit)
+
+    def get(self, ds, paths, recursion_limit):
+        if paths:
+            # a constrained query is not shared, and supersedes any full
+            # query that was submitted in anticipation of a recursion
+            self.discard(ds)
+            return self._query(ds, paths, recursion_limit)
+        self.submit(ds, recursion_limit)
+        status = self._result(ds, recursion_limit)
+        with self._lock:
+            self._futures.pop(ds.pathobj, None)
+            self._submitted.pop(ds.pathobj, None)
+        return status
+
+    def discard(self, ds):
+        """Drop the full query of a dataset whose status is not reported"""
+        self._discard(ds.pathobj)
+
+    def _discard(self, path):
+        with self._lock:
+            future = self._futures.pop(path, None)
+        if future is None or future.cancel():
+            return
+        # the query started already, the subdataset queries it submits
+        # are not going to be reported either
+        future.add_done_callback(
+            lambda f: self._discard_submitted(path))
+
+    def _discard_submitted(self, path):
+        with self._lock:
+            subpaths = self._submitted.pop(path, [])
+        for subpath in subpaths:
+            self._discard(subpath)
+
+    def _result(self, ds, recursion_limit):
+        with self._lock:
+            future = self._futures.get(ds.pathobj)
+        if future is None:
+            # the query was discarded, the status is still needed to
+            # evaluate the state of the subdataset, but nothing else
+            try:
+                return self._query(ds, None, recursion_limit)
+            finally:
+                self._discard_submitted(ds.pathobj)
+        if future.cancel():
+            # the query did not start yet, rather than waiting for a worker
+            # (that may never become available, if all of them are waiting
+            # too) run it right here
+            future = Future()
+            try:
+                future.set_result(self._query(ds, None, recursion_limit))
+            except Exception as e:
+                future.set_exception(e)
+            with self._lock:
+                self._futures[ds.pathobj] = future
+        return future.result()
+
+    def _query(self, ds, paths, recursion_limit):
+        eval_submodule_state = self._eval_submodule_state
+        if not recursion_limit:
+            return _get_dataset_status(
+                ds, paths, self._annexinfo, self._untracked,
+                eval_submodule_state, self._cache)
+        repo = ds.repo
+        subdatasets = {}
+        sm_paths = [
+            sm['path'] for sm in repo.get_submodules_(
+                paths=[repo.pathobj / p.relative_to(ds.pathobj)
+                       for p in paths] if paths else None)]
+        present = probe_repos(
+            sm_paths, cache=self._cache.setdefault('valid_repos', {}))
+        for sm_path in sm_paths:
+            if present[sm_path]:
+                subds = Dataset(
+                    str(ds.pathobj / sm_path.relative_to(repo.pathobj)))
+                subdatasets[sm_path] = subds
+                self.submit(subds, recursion_limit - 1)
+        if not paths:
+            with self._lock:
+                self._submitted[ds.pathobj] = [
+                    subds.pathobj for subds in subdatasets.values()]
+        status = _get_dataset_status(
+            ds, paths, self._annexinfo, self._untracked,
+            'commit' if eval_submodule_state == 'full'
+            else eval_submodule_state,
+            self._cache)
+        if eval_submodule_state != 'full':
+            return status
+        for path, props in status.items():
+            if props.get('type', None) != 'dataset' \
+                    or props.get('state', None) != 'clean' \
+                    or path not in subdatasets:
+                continue
+            # the recorded commit did not change, a subdataset is modified
+            # if anything in it is
+            substatus = self._result(subdatasets[path], recursion_limit - 1)
+            if any(p.get('state', None) not in ('clean', None)
+                   for p in substatus.values()):
+                props['state'] = 'modified'
+        return status
+
+
 def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
                          queried, eval_submodule_state, eval_filetype, cache,
-                         reporting_order):
+                         reporting_order, _queries=None):
     """Internal helper to obtain status information on a dataset
 
     Parameters
@@ -132,6 +315,9 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
       on the subdataset's submodule in a superdataset (depth-first).
       Alternatively, report all superdataset records first, before reporting
       any subdataset content records (breadth-first).
+    _queries : _StatusQueries, optional
+      If given, dataset status queries are performed via this instance,
+      potentially concurrently. Reporting order is not affected.
 
     Yields
     ------
@@ -149,40 +335,26 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
 
     if ds.pathobj in queried:
         # do not report on a single dataset twice
+        if _queries is not None:
+            # but do not leave a query behind that was submitted for it
+            _queries.discard(ds)
         return
     # take the dataset that went in first
     repo = ds.repo
     repo_path = repo.pathobj
-    lgr.debug('Querying %s.diffstatus() for paths: %s', repo, paths)
-    # recode paths with repo reference for low-level API
-    paths = [repo_path / p.relative_to(ds.pathobj) for p in paths] if paths else None
-    status = repo.diffstatus(
-        fr='HEAD' if repo.get_hexsha() else None,
-        to=None,
-        paths=paths,
-        untracked=untracked,
-        eval_submodule_state=eval_submodule_state,
-        _cache=cache)
-    if annexinfo and hasattr(repo, 'get_content_annexinfo'):
-        if paths:
-            # when an annex query has been requested for specific paths,
-            # exclude untracked files from the annex query (else gh-7032)
-            untracked = [k for k, v in status.items() if
-                         v['state'] == 'untracked']
-            lgr.debug(
-                'Skipping %s.get_content_annexinfo() for untracked paths: %s',
-                repo, paths)
-            [paths.remove(p) for p in untracked]
-        lgr.debug('Querying %s.get_content_annexinfo() for paths: %s', repo, paths)
-        # this will amend `status`
-        repo.get_content_annexinfo(
-            paths=paths,
-            init=status,
-            eval_availability=annexinfo in ('availability', 'all'),
-            ref=None)
+    if _queries is not None:
+        status = _queries.get(ds, paths, recursion_limit)
+    else:
+        status = _get_dataset_status(
+            ds, paths, annexinfo, untracked, eval_submodule_state, cache)
     # potentially collect subdataset status call specs for the end
     # (if order == 'breadth-first')
     subds_statuscalls = []
+    # determine the presence of all subdatasets at once
+    present = probe_repos(
+        [path for path, props in status.items()
+         if props.get('type', None) == 'dataset'],
+        cache=cache.setdefault('valid_repos', {})) if recursion_limit else {}
     for path, props in status.items():
         cpath = ds.pathobj / path.relative_to(repo_path)
         yield dict(
@@ -200,10 +372,9 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
                 # See https://github.com/datalad/datalad/pull/4526 for the usecase
                 lgr.debug("Got status for itself, which should not happen, skipping %s", path)
                 continue
-            subds = Dataset(str(cpath))
-            if subds.is_installed():
+            if present[path]:
                 call_args = (
-                    subds,
+                    Dataset(str(cpath)),
                     None,
                     annexinfo,
                     untracked,
@@ -215,6 +386,7 @@ def yield_dataset_status(ds, paths, annexinfo, untracked, recursion_limit,
                 )
                 call_kwargs = dict(
                     reporting_order='depth-first',
+                    _queries=_queries,
                 )
                 if reporting_order == 'depth-first':
                     yield from yield_dataset_status(*call_args, **call_kwargs)
@@ -359,6 +531,7 @@ class Status(Interface):
             with the [CMD: --annex CMD][PY: `annex` PY] option, in which
             case symlinks that represent annexed files will be reported
             as type='file'."""),
+        jobs=jobs_opt,
     )
 
     @staticmethod
@@ -373,7 +546,8 @@ class Status(Interface):
             recursive=False,
             recursion_limit=None,
             eval_subdataset_state='full',
-            report_filetype=None):
+            report_filetype=None,
+            jobs=None):
         if report_filetype is not None:
             warnings.warn(
                 "status(report_filetype=) no longer supported, and will be removed "
@@ -397,31 +571,46 @@ class Status(Interface):
         ds_path = ds.path
         queried = set()
         content_info_cache = {}
-        for res in _yield_paths_by_ds(ds, dataset, ensure_list(path)):
-            if 'status' in res:
-                # this is an error
-                yield res
-                continue
-            for r in yield_dataset_status(
-                    res['ds'],
-                    res['paths'],
-                    annex,
-                    untracked,
-                    recursion_limit
-                    if recursion_limit is not None else -1
-                    if recursive else 0,
-                    queried,
-                    eval_subdataset_state,
-                    None,
-                    content_info_cache,
-                    reporting_order='depth-first'):
-                if 'status' not in r:
-                    r['status'] = 'ok'
-                yield dict(
-                    r,
-                    refds=ds_path,
-                    action='status',
-                )
+        executor = queries = None
+        jobs = ProducerConsumer.get_effective_jobs(jobs)
+        if (recursive or recursion_limit) and jobs and jobs > 1:
+            # query subdatasets concurrently, results are still reported
+            # in the order of the hierarchy traversal
+            executor = ThreadPoolExecutor(
+                max_workers=jobs, thread_name_prefix='status')
+            queries = _StatusQueries(
+                executor, annex, untracked, eval_subdataset_state,
+                content_info_cache)
+        try:
+            for res in _yield_paths_by_ds(ds, dataset, ensure_list(path)):
+                if 'status' in res:
+                    # this is an error
+                    yield res
+                    continue
+                for r in yield_dataset_status(
+                        res['ds'],
+                        res['paths'],
+                        annex,
+                        untracked,
+                        recursion_limit
+                        if recursion_limit is not None else -1
+                        if recursive else 0,
+                        queried,
+                        eval_subdataset_state,
+                        None,
+                        content_info_cache,
+                        reporting_order='depth-first',
+                        _queries=queries):
+                    if 'status' not in r:
+                        r['status'] = 'ok'
+                    yield dict(
+                        r,
+                        refds=ds_path,
+                        action='status',
+                    )
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
 
     @staticmethod
     def custom_result_renderer(res, **kwargs):  # pragma: more cover
@@ -9,10 +9,15 @@
 """Test status command"""
 
 import os.path as op
+from concurrent.futures import ThreadPoolExecutor
 
 import datalad.utils as ut
 from datalad.api import status
-from datalad.core.local.status import get_paths_by_ds
+from datalad.core.local.status import (
+    _StatusQueries,
+    get_paths_by_ds,
+    yield_dataset_status,
+)
 from datalad.distribution.dataset import Dataset
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.exceptions import (
@@ -34,6 +39,7 @@ from datalad.tests.utils_pytest import (
     eq_,
     get_deeply_nested_structure,
     has_symlink_capability,
+    ok_,
     with_tempfile,
 )
 from datalad.utils import (
@@ -289,6 +295,90 @@ def test_subds_status(path=None):
         refds=subds.path)
 
 
+@with_tempfile(mkdir=True)
+def test_status_jobs(path=None):
+    ds = get_deeply_nested_structure(path)
+    # some modifications deep down
+    (ds.pathobj / 'subds_modified' / 'subds_lvl1_modified' / 'new').write_text(
+        'new')
+    (ds.pathobj / 'subds_modified' / 'subdir' / 'annexed_file.txt').unlink()
+    for kwargs in (dict(recursive=True),
+                   dict(recursive=True, annex='basic'),
+                   dict(recursion_limit=1),
+                   dict(path=['subds_modified', 'directory_untracked'],
+                        recursive=True)):
+        serial = ds.status(result_renderer='disabled', jobs=1, **kwargs)
+        # parallel queries report identically, in the same order
+        eq_(ds.status(result_renderer='disabled', jobs=3, **kwargs), serial)
+    # reporting order of the low-level helper is preserved too
+    for order in ('depth-first', 'breadth-first'):
+        args = (ds, None, None, 'normal', -1)
+        kwargs = dict(eval_submodule_state='full', eval_filetype=None,
+                      reporting_order=order)
+        serial = list(yield_dataset_status(
+            *args, queried=set(), cache={}, **kwargs))
+        cache = {}
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            queries = _StatusQueries(executor, None, 'normal', 'full', cache)
+            parallel = list(yield_dataset_status(
+                *args, queried=set(), cache=cache, _queries=queries,
+                **kwargs))
+        eq_(parallel, serial)
+        # all queries were consumed
+        eq_(queries._futures, {})
+    # a subdataset queried with path constraints first is not queried in
+    # full once more, and no query for it is left behind
+    subds = Dataset(ds.pathobj / 'subds_modified')
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        queries = _StatusQueries(executor, None, 'normal', 'full', {})
+        queried = set()
+        for d, paths in ((subds, [subds.pathobj / 'subdir']), (ds, None)):
+            list(yield_dataset_status(
+                d, paths, None, 'normal', -1, queried=queried, cache={},
+                _queries=queries, **kwargs))
+    eq_(queries._futures, {})
+
+
+@with_tempfile(mkdir=True)
+def test_status_worktree_monitor(path=None):
+    ds = get_deeply_nested_structure(path)
+    # all kinds of modifications
+    (ds.pathobj / 'subds_modified' / 'subds_lvl1_modified' / 'new').write_text(
+        'new')
+    (ds.pathobj / 'subds_modified' / 'subdir' / 'annexed_file.txt').unlink()
+    (ds.pathobj / 'directory_untracked' / 'more').mkdir()
+    (ds.pathobj / 'directory_untracked' / 'more' / 'f').write_text('f')
+    (ds.pathobj / 'subdir' / 'git_file.txt').write_text('changed')
+    (ds.pathobj / 'staged').write_text('staged')
+    ds.repo.call_git(['add', 'staged'])
+    ds.repo.call_git(['rm', '-q', '--cached', 'subdir/annexed_file.txt'])
+    repos = [ds.repo] + [
+        Dataset(r['path']).repo
+        for r in ds.subdatasets(recursive=True, result_renderer='disabled')]
+    queries = [
+        dict(recursive=True, untracked=u, eval_subdataset_state=e)
+        for u in ('no', 'normal', 'all')
+        for e in ('no', 'commit', 'full')] + [
+        dict(path=['subds_modified', 'subdir'], recursive=True)]
+    results = {}
+    for monitor in (False, True):
+        for repo in repos:
+            repo.config.set('datalad.runtime.worktree-monitor',
+                            str(monitor), scope='override')
+        results[monitor] = [
+            ds.status(result_renderer='disabled', **kwargs)
+            for kwargs in queries]
+    eq_(results[True], results[False])
+    # the untracked cache is not enabled behind the user's back
+    ok_(b'UNTR' not in (ds.repo.dot_git / 'index').read_bytes())
+    # but used when configured
+    ds.repo.config.set('core.untrackedCache', 'true', scope='local')
+    eq_(ds.status(result_renderer='disabled', **queries[3]),
+        results[True][3])
+    ok_(b'UNTR' in (ds.repo.dot_git / 'index').read_bytes())
+    ds.repo.config.unset('datalad.runtime.worktree-monitor', scope='override')
+
+
 @with_tempfile
 def test_status_symlinked_dir_within_repo(path=None):
     if not has_symlink_capability():
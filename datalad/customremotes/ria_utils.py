@@ -240,3 +240,107 @@ def create_ds_in_store(io, base_path, dsid, obj_version, store_version,
         except FileExistsError:
             lgr.warning("Alias %r already exists in the RIA store, not adding an "
                         "alias.", alias)
+
+
+def get_archive_index_path(archive_path):
+    """Return the path of the member index sidecar file of an archive"""
+    return archive_path.with_name(archive_path.name + '.index')
+
+
+def parse_7z_listing(out):
+    """Return the member paths from the output of `7z l -slt`
+
+    Parameters
+    ----------
+    out : str
+      Technical listing of an archive.
+
+    Returns
+    -------
+    list
+    """
+    # entries follow a separator line, before that is info on the archive
+    # itself
+    _, sep, entries = out.partition('\n----------\n')
+    return [
+        line[7:]
+        for line in entries.splitlines()
+        if line.startswith('Path = ')
+    ] if sep else []
+
+
+def format_archive_index(members, *signature):
+    """Format a member index of an archive
+
+    Parameters
+    ----------
+    members : iterable or dict
+      Member paths of the archive. For a seekable archive, a mapping of
+      member paths to the offset and size of their content.
+    *signature
+      Properties of the archive (e.g. its size), the index is only valid for.
+
+    Returns
+    -------
+    str
+    """
+    if isinstance(members, dict):
+        lines = ['{} {} {}'.format(offset, size, path)
+                 for path, (offset, size) in sorted(members.items())]
+    else:
+        lines = sorted(members)
+    return '\n'.join(
+        [' '.join(str(s) for s in signature)] + lines) + '\n'
+
+
+def parse_archive_index(content, *signature, offsets=False):
+    """Parse a member index of an archive
+
+    Parameters
+    ----------
+    content : str
+      As created by `format_archive_index()`.
+    *signature
+      Current properties of the archive, as given to `format_archive_index()`.
+    offsets : bool, optional
+      Whether this is the index of a seekable archive.
+
+    Returns
+    -------
+    set or dict or None
+      The member paths, or for a seekable archive a mapping of member paths
+      to the offset and size of their content. None if the index does not
+      match the archive.
+    """
+    header, _, members = content.partition('\n')
+    if header.split() != [str(s) for s in signature]:
+        return None
+    if not offsets:
+        return set(members.splitlines())
+    index = {}
+    for line in members.splitlines():
+        offset, size, path = line.split(' ', 2)
+        index[path] = (int(offset), int(size))
+    return index
+
+
+def index_tar_archive(archive_path):
+    """Return the offset and size of the content of files in a tar archive
+
+    Parameters
+    ----------
+    archive_path : Path
+      Uncompressed tar archive.
+
+    Returns
+    -------
+    dict
+      Mapping of member paths to (offset, size).
+    """
+    import tarfile
+    with tarfile.open(archive_path, 'r:') as tar:
+        return {
+            m.name: (m.offset_data, m.size)
+            for m in tar.getmembers()
+            if m.isfile()
+        }
@@ -7,6 +7,9 @@ from datalad.customremotes.ria_utils import (
     UnknownLayoutVersion,
     create_ds_in_store,
     create_store,
+    format_archive_index,
+    parse_7z_listing,
+    parse_archive_index,
     verify_ria_url,
 )
 from datalad.distributed.ora_remote import (
@@ -162,3 +165,40 @@ def test_verify_ria_url():
     for i, o in cases.items():
         # we are not testing the URL rewriting here
         assert o == verify_ria_url(i, {})[:2]
+
+
+def test_archive_index():
+    listing = """
+7-Zip [64] 16.02 : Copyright (c) 1999-2016 Igor Pavlov : 2016-05-21
+
+Listing archive: archive.7z
+
+--
+Path = archive.7z
+Type = 7z
+Physical Size = 1234
+
+----------
+Path = 1X
+Size = 0
+Attributes = D drwxr-xr-x
+
+Path = 1X/9m/MD5E-s4--ba1f2511fc30423bdbb183fe33f3dd0f/MD5E-s4--ba1f2511fc30423bdbb183fe33f3dd0f
+Size = 4
+Attributes = A -rw-r--r--
+
+"""
+    members = parse_7z_listing(listing)
+    assert_equal(
+        members,
+        ['1X',
+         '1X/9m/MD5E-s4--ba1f2511fc30423bdbb183fe33f3dd0f/'
+         'MD5E-s4--ba1f2511fc30423bdbb183fe33f3dd0f'])
+    assert_equal(parse_7z_listing('no listing'), [])
+
+    index = format_archive_index(members, 1234, 5)
+    assert_equal(parse_archive_index(index, 1234, 5), set(members))
+    # not matching the archive
+    assert_equal(parse_archive_index(index, 1234, 6), None)
+    assert_equal(parse_archive_index(index, 1234), None)
+    assert_equal(parse_archive_index(format_archive_index([], 1), 1), set())
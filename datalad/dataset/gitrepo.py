@@ -17,12 +17,14 @@ implementation and the old-standard from datalad.support.gitrepo for the
 lifetime of a singleton.
 """
 
-__all__ = ['GitRepo']
+__all__ = ['GitRepo', 'probe_repos']
 
 import logging
+import os
 import re
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from locale import getpreferredencoding
 from os import environ
@@ -34,6 +36,7 @@ from weakref import (
 )
 
 from datalad.cmd import (
+    BatchedCatFile,
     GitWitlessRunner,
     StdOutErrCapture,
 )
@@ -97,6 +100,16 @@ def _get_git_ignore_exception(exception):
     return None
 
 
+class _StdOutBytesErrCapture(StdOutErrCapture):
+    """Like StdOutErrCapture, but returns stdout as undecoded bytes"""
+    def _prepare_result(self):
+        stdout = self.fd_infos[self.stdout_fileno][1]
+        self.fd_infos[self.stdout_fileno] = ('stdout', None)
+        results = super()._prepare_result()
+        results['stdout'] = bytes(stdout)
+        return results
+
+
 @path_based_str_repr
 class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
     """Representation of a Git repository
@@ -160,6 +173,11 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
 
         self._line_splitter = None
 
+        # persistent `git cat-file` processes for get_object(), started on
+        # demand. Keyed by whether they only report object info
+        self._batched_cat_file = {}
+        self._cat_file_lock = threading.Lock()
+
         # Finally, register a finalizer (instead of having a __del__ method).
         # This will be called by garbage collection as well as "atexit". By
         # keeping the reference here, we can also call it explicitly.
@@ -416,6 +434,37 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
             "".join(output[STDOUT_FILENO]),
             "".join(output[STDERR_FILENO]))
 
+    def _call_git_bytes(self,
+                        args,
+                        files=None,
+                        expect_stderr=False,
+                        expect_fail=False):
+        """Call a read-only git command and return its undecoded stdout
+
+        This is meant for commands with large outputs that are best
+        processed in bulk, without having to decode and split them
+        incrementally. The parameters, and raised exceptions match those
+        documented for `call_git`.
+        """
+        if files is not None and not files:
+            # see _generator_call_git() on empty `files`
+            return b''
+        cmd = self._git_cmd_prefix + args
+        try:
+            if files:
+                res = self._git_runner.run_on_filelist_chunks(
+                    cmd, files, protocol=_StdOutBytesErrCapture)
+            else:
+                res = self._git_runner.run(
+                    cmd, protocol=_StdOutBytesErrCapture)
+        except CommandError as e:
+            lgr.log(5 if expect_fail else 11, str(e))
+            raise
+        stderr_log_level = {True: 5, False: 11}[expect_stderr]
+        for line in res['stderr'].splitlines():
+            lgr.log(stderr_log_level, "stderr| " + line)
+        return res['stdout']
+
     def call_git(self, args, files=None,
                  expect_stderr=False, expect_fail=False,
                  env=None,
@@ -585,6 +634,38 @@ class GitRepo(RepoInterface, metaclass=PathBasedFlyweight):
             return False
         return True
 
+    def get_object(self, obj, check=False):
+        """Read a Git object via a persistent `git cat-file` process
+
+        Compared to a `git cat-file` call per object, this avoids the cost of
+        starting a new process for each query, which dominates when a large
+        number of (small) objects is read.
+
+        Parameters
+        ----------
+        obj : str
+          Any object name that `git cat-file` understands, such as a SHA, or
+          `<rev>:<path>`.
+        check : bool, optional
+          If True, only query object info, but not the content.
+
+        Returns
+        -------
+        tuple or None
+          `(hexsha, type, size, content)`, where `content` are the raw
+          bytes of the object, or None if `check` is True. If the object
+          does not exist, None is returned.
+        """
+        with self._cat_file_lock:
+            proc = self._batched_cat_file.get(check)
+            if proc is None:
+                proc = self._batched_cat_file[check] = BatchedCatFile(
+                    path=str(self.pathobj),
+                    check=check,
+                    git_cmd=self._git_cmd_prefix,
+                )
+            return proc(obj)
+
     def init(self, sanity_checks=True, init_options=None):
         """Initializes the Git repository.
 
@@ -763,3 +844,79 @@ def _get_dot_git(pathobj, *, ok_missing=False, resolved=False):
             else:
                 raise InvalidGitRepositoryError("Invalid .git file")
     raise RuntimeError("Unaccounted condition")
+
+
+def _is_valid_repo_dir(path):
+    # same test as GitRepo.is_valid(), for a path known to be a directory,
+    # with a single stat call in the common case of a .git directory or
+    # file
+    try:
+        os.stat(os.path.join(path, '.git', 'HEAD'))
+        return True
+    except NotADirectoryError:
+        # .git is a file (or a symlink to one)
+        return True
+    except OSError:
+        # no .git, or an invalid one, could still be a bare repository
+        return os.path.exists(os.path.join(path, 'HEAD'))
+
+
+def probe_repos(paths, jobs=None, cache=None):
+    """Determine for any number of paths whether they are valid repositories
+
+    This is a bulk variant of `GitRepo.is_valid()`, meant for many paths
+    with a few common parent directories, such as all submodules of a
+    dataset. Each parent directory is scanned once to determine which
+    paths exist as directories, and only those are inspected further.
+    This avoids most of the individual stat calls that are particularly
+    expensive on network file systems.
+
+    Parameters
+    ----------
+    paths: iterable of Path
+    jobs: int, optional
+      Number of threads to inspect existing directories with. By default
+      the 'datalad.runtime.max-jobs' configuration is used.
+    cache: dict, optional
+      Mapping to look up and store results in. A cache must only be
+      reused for as long as no repository is created or removed at the
+      given paths, e.g. for the duration of a (read-only) command.
+
+    Returns
+    -------
+    dict
+      Mapping of each path to a bool, True if it is a valid repository.
+    """
+    paths = list(paths)
+    res = {}
+    by_parent = {}
+    for p in paths:
+        if cache is not None and p in cache:
+            res[p] = cache[p]
+        else:
+            by_parent.setdefault(p.parent, []).append(p)
+    candidates = []
+    for parent, children in by_parent.items():
+        try:
+            with os.scandir(parent) as entries:
+                dirs = set(e.name for e in entries if e.is_dir())
+        except OSError:
+            # parent does not exist (as a directory)
+            dirs = set()
+        for p in children:
+            if p.name in dirs:
+                candidates.append(p)
+            else:
+                res[p] = False
+    if jobs is None:
+        from datalad import cfg
+        jobs = cfg.obtain('datalad.runtime.max-jobs')
+    if jobs > 1 and len(candidates) > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            valid = list(executor.map(_is_valid_repo_dir, candidates))
+    else:
+        valid = [_is_valid_repo_dir(p) for p in candidates]
+    res.update(zip(candidates, valid))
+    if cache is not None:
+        cache.update(res)
+    return {p: res[p] for p in paths}
@@ -14,10 +14,12 @@ import logging
 import os
 import os.path as op
 import sys
+from unittest.mock import patch
 
 from datalad.dataset.gitrepo import (
     GitRepo,
     _get_dot_git,
+    probe_repos,
 )
 from datalad.support.exceptions import (
     CommandError,
@@ -376,3 +378,69 @@ def test_call_git_call_git_items_identity(temp_dir=None):
         r_no_item = repo.call_git(args, [hash_key])
         assert_equal(r_item, r_no_item)
         assert_equal(r_item, content)
+
+
+@with_tempfile(mkdir=True)
+def test_get_object(path=None):
+    repo = GitRepo(path).init()
+    big = os.urandom(1000000)
+    (repo.pathobj / 'big').write_bytes(big)
+    (repo.pathobj / 'with space').write_bytes(b'some\ncontent\n')
+    repo.call_git(['add', '.'])
+    repo.call_git(['commit', '-m', 'msg'])
+    sha = repo.call_git_oneline(['rev-parse', 'HEAD:big'])
+
+    assert_equal(repo.get_object('HEAD:big'), (sha, 'blob', len(big), big))
+    assert_equal(repo.get_object(sha, check=True),
+                 (sha, 'blob', len(big), None))
+    assert_equal(repo.get_object('HEAD:with space')[3], b'some\ncontent\n')
+    assert_equal(repo.get_object('HEAD')[1], 'commit')
+    # non-existing objects
+    assert_equal(repo.get_object('HEAD:missing'), None)
+    assert_equal(repo.get_object('HEAD:with space missing', check=True),
+                 None)
+    # the processes stay around, and see new commits
+    assert_equal(len(repo._batched_cat_file), 2)
+    (repo.pathobj / 'new').write_bytes(b'new')
+    repo.call_git(['add', 'new'])
+    repo.call_git(['commit', '-m', 'msg'])
+    assert_equal(repo.get_object('HEAD:new')[3], b'new')
+
+
+@with_tree(tree={
+    'file': '',
+    'empty': {},
+    'invalid': {'.git': {}},
+    'gitfile': {'.git': 'gitdir: ../repo/.git'},
+    'bare': {'HEAD': 'ref: refs/heads/main', 'config': ''},
+    'sub': {'nested': {}},
+})
+def test_probe_repos(path=None):
+    root = Path(path)
+    GitRepo(root / 'repo').init()
+    GitRepo(root / 'sub' / 'nested').init()
+    paths = [root / p for p in ('missing', 'file', 'empty', 'invalid',
+                                 'gitfile', 'bare', 'repo', 'sub/nested',
+                                 'sub/missing', 'missing/sub')]
+    expected = {p: GitRepo.is_valid(p) for p in paths}
+    assert_equal(
+        [p for p, valid in expected.items() if valid],
+        [root / 'gitfile', root / 'bare', root / 'repo', root / 'sub/nested'])
+    for jobs in (1, 3):
+        eq_(probe_repos(paths, jobs=jobs), expected)
+    # each parent directory is listed only once
+    with patch('datalad.dataset.gitrepo.os.scandir',
+               wraps=os.scandir) as scandir:
+        probe_repos(paths, jobs=1)
+    eq_(scandir.call_count, 3)
+    # results are memoized in a cache
+    cache = {}
+    probe_repos(paths[:3], cache=cache)
+    eq_(set(cache), set(paths[:3]))
+    cache[root / 'repo'] = False
+    with patch('datalad.dataset.gitrepo.os.scandir',
+               wraps=os.scandir) as scandir:
+        eq_(probe_repos(paths[:3] + [root / 'repo'], cache=cache),
+            {root / 'missing': False, root / 'file': False,
+             root / 'empty': False, root / 'repo': False})
+    eq_(scandir.call_count, 0)
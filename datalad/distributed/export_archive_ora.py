@@ -18,6 +18,12 @@ import shutil
 import subprocess
 from argparse import REMAINDER
 
+from datalad.customremotes.ria_utils import (
+    format_archive_index,
+    get_archive_index_path,
+    index_tar_archive,
+    parse_7z_listing,
+)
 from datalad.distribution.dataset import (
     EnsureDataset,
     datasetmethod,
@@ -61,6 +67,21 @@ class ExportArchiveORA(Interface):
 
     Enables the ORA special remote to locate and retrieve all keys contained
     in the archive.
+
+    An index of the archive members is written next to the archive (with an
+    additional '.index' extension). It lets the ORA special remote determine
+    the keys in the archive without listing the archive itself. When
+    placing the archive into a store, the index should be placed alongside.
+
+    Alternatively, an uncompressed TAR archive can be exported, to be placed
+    at::
+
+      <dataset location>/archives/archive.tar
+
+    Its index also records the position of each key in the archive, and the
+    ORA special remote reads keys from it by byte range (including over
+    HTTP), rather than extracting them. The index is required for using such
+    an archive.
     """
     _params_ = dict(
         dataset=Parameter(
@@ -72,8 +93,9 @@ class ExportArchiveORA(Interface):
         target=Parameter(
             args=("target",),
             metavar="TARGET",
-            doc="""if an existing directory, an 'archive.7z' is placed into
-            it, otherwise this is the path to the target archive""",
+            doc="""if an existing directory, an 'archive.7z' (or 'archive.tar')
+            is placed into it, otherwise this is the path to the target
+            archive""",
             constraints=EnsureStr() | EnsureNone()),
         remote=Parameter(
             args=("--for",),
@@ -100,6 +122,14 @@ class ExportArchiveORA(Interface):
             metavar="...",
             doc="""list of options for 7z to replace the default '-mx0' to
             generate an uncompressed archive"""),
+        archive_format=Parameter(
+            args=("--format",),
+            dest="archive_format",
+            doc="""type of archive to create. A 7z archive can be compressed.
+            A TAR archive is uncompressed, and seekable: keys can be read
+            from it by byte range. An existing archive is updated with
+            additional keys.""",
+            constraints=EnsureChoice("7z", "tar")),
         missing_content=Parameter(
             args=("--missing-content",),
             doc="""By default, any discovered file with missing content will
@@ -123,7 +153,8 @@ class ExportArchiveORA(Interface):
             remote=None,
             annex_wanted=None,
             froms=None,
-            missing_content='error',):
+            missing_content='error',
+            archive_format='7z'):
         # only non-bare repos have hashdirmixed, so require one
         ds = require_dataset(
             dataset, check_installed=True, purpose='export to ORA archive')
@@ -133,7 +164,7 @@ class ExportArchiveORA(Interface):
 
         archive = resolve_path(target, dataset)
         if archive.is_dir():
-            archive = archive / 'archive.7z'
+            archive = archive / f'archive.{archive_format}'
         else:
             archive.parent.mkdir(exist_ok=True, parents=True)
 
@@ -250,10 +281,34 @@ class ExportArchiveORA(Interface):
             'Finished RIA archive export from %s', ds
         )
         try:
-            subprocess.run(
-                ['7z', 'u', str(archive), '.'] + opts,
-                cwd=str(exportdir),
-            )
+            # index all members, an existing archive might have been updated
+            if archive_format == 'tar':
+                _update_tar(archive, exportdir)
+                members = index_tar_archive(archive)
+            else:
+                subprocess.run(
+                    ['7z', 'u', str(archive), '.'] + opts,
+                    cwd=str(exportdir),
+                )
+                listing = subprocess.run(
+                    ['7z', 'l', '-slt', str(archive)],
+                    stdout=subprocess.PIPE,
+                    universal_newlines=True,
+                )
+                members = parse_7z_listing(listing.stdout) \
+                    if listing.returncode == 0 else None
+            index_path = get_archive_index_path(archive)
+            if members is None:
+                # without an index, the archive itself is queried for
+                # members. Do not leave an index of a previous version
+                lgr.warning(
+                    'Failed to list the members of %s, not writing %s',
+                    archive, index_path)
+                if index_path.exists():
+                    index_path.unlink()
+            else:
+                index_path.write_text(format_archive_index(
+                    members, archive.stat().st_size))
             yield get_status_dict(
                 path=str(archive),
                 type='file',
@@ -265,9 +320,23 @@ class ExportArchiveORA(Interface):
                 path=str(archive),
                 type='file',
                 status='error',
-                message=('7z failed: %s', ce),
+                message=('%s failed: %s', archive_format, ce),
                 exception=ce,
                 **res_kwargs)
             return
         finally:
             rmtree(str(exportdir))
+
+
+def _update_tar(archive, exportdir):
+    """Add the files in `exportdir` to an uncompressed TAR archive
+
+    Files already in the archive are not added again.
+    """
+    import tarfile
+    with tarfile.open(archive, 'a') as tar:
+        existing = set(tar.getnames())
+        for path in sorted(exportdir.rglob('*')):
+            name = path.relative_to(exportdir).as_posix()
+            if path.is_file() and name not in existing:
+                tar.add(str(path), arcname=name, recursive=False)
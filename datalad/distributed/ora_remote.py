@@ -1,12 +1,16 @@
+import base64
 import functools
+import hashlib
 import logging
 import os
 import shutil
 import stat
 import subprocess
 import sys
+from collections import deque
 from contextlib import contextmanager
 from functools import wraps
+from itertools import count
 from pathlib import (
     Path,
     PurePosixPath,
@@ -25,7 +29,11 @@ from datalad.customremotes import (
 from datalad.customremotes.main import main as super_main
 from datalad.customremotes.ria_utils import (
     UnknownLayoutVersion,
+    format_archive_index,
+    get_archive_index_path,
     get_layout_locations,
+    parse_7z_listing,
+    parse_archive_index,
     verify_ria_url,
 )
 from datalad.support.annex_utils import _sanitize_key
@@ -146,6 +154,53 @@ class IOBase(object):
         """
         raise NotImplementedError
 
+    def get_archive_info(self, archive_path):
+        """Get properties of an archive, and its member index sidecar
+
+        Parameters
+        ----------
+        archive_path : Path or str
+          Must be an absolute path
+
+        Returns
+        -------
+        (int, int, str or None) or None
+          Size and modification time (in seconds) of the archive, and the
+          content of its member index sidecar, if there is any. None, if
+          there is no archive.
+        """
+        raise NotImplementedError
+
+    def list_archive(self, archive_path):
+        """List the member paths of an archive
+
+        Parameters
+        ----------
+        archive_path : Path or str
+          Must be an absolute path and point to an existing supported archive
+
+        Returns
+        -------
+        list
+        """
+        raise NotImplementedError
+
+    def read_range(self, path, offset, size, dst, progress_cb):
+        """Get a byte range of a file, e.g. a member of a seekable archive
+
+        Parameters
+        ----------
+        path : Path or str
+          Must be an absolute path
+        offset : int
+        size : int
+        dst : Path or str
+          Local file to write the content to.
+        progress_cb : callable
+          Called with the number of bytes received so far.
+        """
+        raise NotImplementedError
+
     def in_archive(self, archive_path, file_path):
         """Test whether a file is in an archive
 
@@ -272,6 +327,41 @@ class LocalIO(IOBase):
         )
         return loc in out['stdout']
 
+    def get_archive_info(self, archive_path):
+        try:
+            archive_stat = archive_path.stat()
+        except FileNotFoundError:
+            return None
+        index_path = get_archive_index_path(archive_path)
+        return archive_stat.st_size, int(archive_stat.st_mtime), \
+            index_path.read_text() if index_path.exists() else None
+
+    def list_archive(self, archive_path):
+        from datalad.cmd import (
+            StdOutErrCapture,
+            WitlessRunner,
+        )
+        out = WitlessRunner().run(
+            ['7z', 'l', '-slt', str(archive_path)],
+            protocol=StdOutErrCapture,
+        )
+        return parse_7z_listing(out['stdout'])
+
+    def read_range(self, path, offset, size, dst, progress_cb):
+        with open(path, 'rb') as src_file, open(dst, 'wb') as target_file:
+            src_file.seek(offset)
+            bytes_received = 0
+            while bytes_received < size:
+                chunk = src_file.read(
+                    min(DEFAULT_BUFFER_SIZE, size - bytes_received))
+                if not chunk:
+                    raise RIARemoteError(
+                        f"Unexpected end of {path} at "
+                        f"{offset + bytes_received}")
+                target_file.write(chunk)
+                bytes_received += len(chunk)
+                progress_cb(bytes_received)
+
     def read_file(self, file_path):
 
         with open(str(file_path), 'r') as f:
@@ -316,24 +406,195 @@ class LocalIO(IOBase):
             return False
 
 
+# shell functions defined in the remote shell, to perform multi-step
+# operations in a single command
+_REMOTE_HELPERS = r"""
+ora_w() {
+  # run a command with temporary write permission for directory $1
+  _ora_d="$1"; shift
+  if [ -w "$_ora_d" ] || [ ! -d "$_ora_d" ]; then "$@"; return; fi
+  chmod u+w "$_ora_d" || return
+  "$@"; _ora_rc=$?
+  chmod u-w "$_ora_d"
+  return $_ora_rc
+}
+ora_in_archive() {
+  # archive $1 exists and contains member $2
+  [ -e "$1" ] && 7z l "$1" "$2" 2>/dev/null | grep -qF -- "$2"
+}
+ora_archive_info() {
+  # size and mtime of archive $1, followed by its member index (if any)
+  stat -c '%s %Y' "$1" 2>/dev/null || stat -f '%z %m' "$1" || return
+  cat "$1.index" 2>/dev/null
+  return 0
+}
+ora_check() {
+  # file $2 has size $1, and MD5 checksum $3 (if given)
+  [ $(wc -c < "$2") -eq "$1" ] || return
+  [ -z "$3" ] && return
+  [ "$( (md5sum "$2" 2>/dev/null || md5 -q "$2") | cut -d' ' -f1)" = "$3" ]
+}
+"""
+
+
+class _RemoteShell(object):
+    """Pipelined command channel to a (remote) shell
+
+    Commands are sent to the shell without waiting for the completion of
+    previously sent commands. The output of each command is terminated by
+    a marker line with the ID of the command, and whether it succeeded.
+    As the shell executes commands in order, responses are read in the
+    order the commands were sent, and kept until they are requested.
+    """
+    # prefix of the marker line that ends the output of a command, followed
+    # by the command ID and 'ok' or 'fail'
+    END_MARKER = "ora-remote: end"
+
+    def __init__(self, cmd):
+        """
+        Parameters
+        ----------
+        cmd : list
+          Command to start the shell, e.g. an SSH call.
+        """
+        self.process = subprocess.Popen(cmd,
+                                        stderr=subprocess.DEVNULL,
+                                        stdout=subprocess.PIPE,
+                                        stdin=subprocess.PIPE)
+        self._ids = count()
+        # IDs of commands sent, but whose response was not read yet
+        self._inflight = deque()
+        # responses that were read, but not yet requested
+        self._responses = {}
+        # define the helpers, and swallow login message(s)
+        self.process.stdin.write(_REMOTE_HELPERS.encode())
+        self.process.stdin.write(b"echo RIA-REMOTE-LOGIN-END\n")
+        self.process.stdin.flush()
+        while True:
+            line = self.process.stdout.readline()
+            if line == b"RIA-REMOTE-LOGIN-END\n":
+                break
+            if not line:
+                raise RIARemoteError("Remote shell terminated during login")
+        # TODO: Same for stderr?
+
+    def submit(self, cmd):
+        """Send a command, without waiting for its completion
+
+        Returns
+        -------
+        int
+          ID of the command, to `receive()` its response.
+        """
+        cmd_id = next(self._ids)
+        self.process.stdin.write(
+            # the marker goes on a line of its own, even if the output
+            # lacks a trailing newline
+            "{cmd}\n[ $? -eq 0 ] && printf '\\n%s\\n' {ok} "
+            "|| printf '\\n%s\\n' {fail}\n".format(
+                cmd=cmd,
+                ok=sh_quote(f"{self.END_MARKER} {cmd_id} ok"),
+                fail=sh_quote(f"{self.END_MARKER} {cmd_id} fail"),
+            ).encode())
+        self._inflight.append(cmd_id)
+        return cmd_id
+
+    def receive(self, cmd_id):
+        """Wait for the response to a command
+
+        Returns
+        -------
+        (bool, str)
+          Whether the command succeeded, and its output.
+        """
+        if cmd_id in self._inflight:
+            self.process.stdin.flush()
+        while cmd_id not in self._responses:
+            if cmd_id not in self._inflight:
+                raise ValueError(f"Unknown command ID {cmd_id}")
+            self._read_response()
+        return self._responses.pop(cmd_id)
+
+    def run(self, cmd):
+        """Send a command, and wait for its response"""
+        return self.receive(self.submit(cmd))
+
+    def sync(self):
+        """Wait for all commands in flight"""
+        if self._inflight:
+            self.receive(self._inflight[-1])
+
+    def _read_response(self):
+        cmd_id = self._inflight.popleft()
+        marker = f"{self.END_MARKER} {cmd_id} "
+        lines = []
+        while True:
+            line = self.process.stdout.readline().decode()
+            if not line:
+                raise RIARemoteError(
+                    "Remote shell terminated unexpectedly: {}".format(
+                        "".join(lines)))
+            if line.startswith(self.END_MARKER):
+                if not line.startswith(marker):
+                    raise RIARemoteError(
+                        f"Out of sequence response {line!r}, "
+                        f"expected command {cmd_id}")
+                # strip the newline preceding the marker
+                self._responses[cmd_id] = (
+                    line[len(marker):].rstrip('\n') == 'ok',
+                    "".join(lines)[:-1])
+                return
+            lines.append(line)
+
+    def close(self):
+        # try exiting shell clean first
+        self.process.stdin.write(b"exit\n")
+        self.process.stdin.flush()
+        try:
+            self.process.wait(timeout=0.5)
+        except subprocess.TimeoutExpired:
+            # be more brutal if it doesn't work
+            # TODO: Theoretically terminate() can raise if not successful.
+            #       How to deal with that?
+            self.process.terminate()
+
+
 class SSHRemoteIO(IOBase):
     """IO operation if the object tree is SSH-accessible
 
     It doesn't even think about a windows server.
+
+    Commands are executed in a single remote shell session. Commands whose
+    outcome is not needed right away (e.g. `mkdir()`) are pipelined: they are
+    not waited for, and any failure is reported by the next command that is
+    waited for. Multi-step operations are performed by shell helpers (see
+    `_REMOTE_HELPERS`) in a single command, hence a round trip to the remote
+    end is only needed for operations that report something.
+
+    Small uploads are streamed through the same shell session, rather than
+    spawning an `scp` process per file.
     """
 
-    # output markers to detect possible command failure as well as end of output
-    # from a particular command:
-    REMOTE_CMD_FAIL = "ora-remote: end - fail"
-    REMOTE_CMD_OK = "ora-remote: end - ok"
+    # max. number of upload chunks in flight
+    UPLOAD_WINDOW = 16
+    # max. size of a streamed upload. Decoding base64 chunks in the remote
+    # shell is much slower than scp, which only pays off for small files,
+    # where starting a process per file dominates.
+    STREAM_MAX_SIZE = 4 * 1024 ** 2
 
-    def __init__(self, host, buffer_size=DEFAULT_BUFFER_SIZE):
+    def __init__(self, host, buffer_size=DEFAULT_BUFFER_SIZE,
+                 verify_uploads=False):
         """
         Parameters
         ----------
         host : str
           SSH-accessible host(name) to perform remote IO operations
           on.
+        buffer_size : int, optional
+          Size of the chunks to read and send.
+        verify_uploads : bool, optional
+          Whether to verify the MD5 checksum of uploaded files on the
+          remote end.
         """
 
         # the connection to the remote
@@ -344,25 +605,19 @@ class SSHRemoteIO(IOBase):
         )
         self.ssh.open()
         # open a remote shell
-        cmd = ['ssh'] + self.ssh._ssh_args + [self.ssh.sshri.as_str()]
-        self.shell = subprocess.Popen(cmd,
-                                      stderr=subprocess.DEVNULL,
-                                      stdout=subprocess.PIPE,
-                                      stdin=subprocess.PIPE)
-        # swallow login message(s):
-        self.shell.stdin.write(b"echo RIA-REMOTE-LOGIN-END\n")
-        self.shell.stdin.flush()
-        while True:
-            line = self.shell.stdout.readline()
-            if line == b"RIA-REMOTE-LOGIN-END\n":
-                break
-        # TODO: Same for stderr?
+        self._shell = _RemoteShell(
+            ['ssh'] + self.ssh._ssh_args + [self.ssh.sshri.as_str()])
+        # commands in flight whose failure must be reported
+        self._deferred = {}
 
         # make sure default is used when None was passed, too.
         self.buffer_size = buffer_size if buffer_size else DEFAULT_BUFFER_SIZE
+        self.verify_uploads = verify_uploads
 
         # lazy property to store the remote unix name
         self._remote_uname = None
+        # lazy property whether uploads can be streamed
+        self._can_stream = None
 
     @property
     def remote_uname(self):
@@ -377,23 +632,22 @@ class SSHRemoteIO(IOBase):
             ).rstrip()
         return self._remote_uname
 
-    def close(self):
-        # try exiting shell clean first
-        self.shell.stdin.write(b"exit\n")
-        self.shell.stdin.flush()
-        exitcode = self.shell.wait(timeout=0.5)
-        # be more brutal if it doesn't work
-        if exitcode is None:  # timed out
-            # TODO: Theoretically terminate() can raise if not successful.
-            #       How to deal with that?
-            self.shell.terminate()
+    @property
+    def can_stream(self):
+        """Whether the remote end can decode streamed uploads, lazy resolution
+        """
+        if self._can_stream is None:
+            self._can_stream = self._run(
+                "printf 'b3Jh' | base64 -d", no_output=False) == 'ora'
+        return self._can_stream
 
-    def _append_end_markers(self, cmd):
-        """Append end markers to remote command"""
+    @property
+    def shell(self):
+        """The process of the remote shell"""
+        return self._shell.process
 
-        return cmd + " && printf '%s\\n' {} || printf '%s\\n' {}\n".format(
-            sh_quote(self.REMOTE_CMD_OK),
-            sh_quote(self.REMOTE_CMD_FAIL))
+    def close(self):
+        self._shell.close()
 
     def _get_download_size_from_key(self, key):
         """Get the size of an annex object file from it's key
@@ -457,28 +711,50 @@ class SSHRemoteIO(IOBase):
         #       something to read in any case (it's blocking!).
         #       However, if we are sure stderr can only ever happen if we would
         #       raise RemoteError anyway, it might be okay.
-        call = self._append_end_markers(cmd)
-        self.shell.stdin.write(call.encode())
-        self.shell.stdin.flush()
+        cmd_id = self._shell.submit(cmd)
+        try:
+            # report on any pipelined command first
+            self._check_deferred(before=cmd_id)
+        finally:
+            ok, out = self._shell.receive(cmd_id)
+        return self._check(cmd, ok, out, no_output=no_output, check=check)
 
-        lines = []
-        while True:
-            line = self.shell.stdout.readline().decode()
-            lines.append(line)
-            if line == self.REMOTE_CMD_OK + '\n':
-                # end reading
+    def _run_deferred(self, cmd, no_output=True, check=False):
+        """Send a command, without waiting for its completion
+
+        A failure (according to `no_output` and `check`) is raised by the
+        next command that is waited for.
+
+        Returns
+        -------
+        int
+          ID of the command.
+        """
+        cmd_id = self._shell.submit(cmd)
+        self._deferred[cmd_id] = (cmd, no_output, check)
+        return cmd_id
+
+    def _check_deferred(self, before=None):
+        for cmd_id in sorted(self._deferred):
+            if before is not None and cmd_id > before:
                 break
-            elif line == self.REMOTE_CMD_FAIL + '\n':
-                if check:
-                    raise RemoteCommandFailedError(
-                        "{cmd} failed: {msg}".format(cmd=cmd,
-                                                     msg="".join(lines[:-1]))
-                    )
-                else:
-                    break
-        if no_output and len(lines) > 1:
-            raise RIARemoteError("{}: {}".format(call, "".join(lines)))
-        return "".join(lines[:-1])
+            cmd, no_output, check = self._deferred.pop(cmd_id)
+            self._check(cmd, *self._shell.receive(cmd_id),
+                        no_output=no_output, check=check)
+
+    def _sync(self):
+        """Wait for all commands in flight, before raw use of the shell"""
+        self._check_deferred()
+        self._shell.sync()
+
+    @staticmethod
+    def _check(cmd, ok, out, no_output, check):
+        if not ok and check:
+            raise RemoteCommandFailedError(
+                "{cmd} failed: {msg}".format(cmd=cmd, msg=out))
+        if no_output and out:
+            raise RIARemoteError("{}: {}".format(cmd, out))
+        return out
 
     @contextmanager
     def ensure_writeable(self, path):
@@ -529,19 +805,85 @@ class SSHRemoteIO(IOBase):
                                         # anymore
 
     def mkdir(self, path):
-        self._run('mkdir -p {}'.format(sh_quote(str(path))))
+        self._run_deferred('mkdir -p {}'.format(sh_quote(str(path))))
 
     def symlink(self, target, link_name):
-        self._run('ln -s {} {}'.format(sh_quote(str(target)), sh_quote(str(link_name))))
+        self._run_deferred('ln -s {} {}'.format(
+            sh_quote(str(target)), sh_quote(str(link_name))))
 
     def put(self, src, dst, progress_cb):
-        self.ssh.put(str(src), str(dst))
+        if os.path.getsize(src) > self.STREAM_MAX_SIZE \
+                or not self.can_stream:
+            # the target directory might be in the making
+            self._sync()
+            self.ssh.put(str(src), str(dst))
+            if self.verify_uploads:
+                self._verify_upload(src, dst)
+            return
+
+        # Content is sent in chunks, each base64-encoded in a here-document:
+        # the remote shell might read ahead on its stdin, hence anything not
+        # read by the shell itself could get lost.
+        # Size, and optionally the checksum, is verified at the end.
+        dst_path = sh_quote(str(dst))
+        md5 = hashlib.md5() if self.verify_uploads else None
+        bytes_sent = 0
+        upload_ids = []
+        try:
+            # not ':', failing redirection of a special built-in exits the shell
+            upload_ids.append(
+                self._run_deferred('true > {}'.format(dst_path), check=True))
+            with open(src, 'rb') as src_file:
+                while True:
+                    chunk = src_file.read(self.buffer_size)
+                    if not chunk:
+                        break
+                    if md5:
+                        md5.update(chunk)
+                    # limit the number of chunks in flight, to not block on
+                    # the remote end's output
+                    while len(self._deferred) >= self.UPLOAD_WINDOW:
+                        self._check_deferred(before=min(self._deferred))
+                    upload_ids.append(self._run_deferred(
+                        "base64 -d >> {} <<'ORA_EOF'\n{}ORA_EOF".format(
+                            dst_path, base64.encodebytes(chunk).decode()),
+                        check=True))
+                    bytes_sent += len(chunk)
+                    progress_cb(bytes_sent)
+            self._run('ora_check {} {} {}'.format(
+                bytes_sent, dst_path, md5.hexdigest() if md5 else "''"),
+                check=True)
+        except RemoteCommandFailedError as e:
+            # discard the outcome of the remaining chunks
+            for cmd_id in upload_ids:
+                if self._deferred.pop(cmd_id, None):
+                    self._shell.receive(cmd_id)
+            raise RIARemoteError(
+                f"Upload of {src} to {dst} failed") from e
+
+    def _verify_upload(self, src, dst):
+        md5 = hashlib.md5()
+        size = 0
+        with open(src, 'rb') as src_file:
+            while True:
+                chunk = src_file.read(self.buffer_size)
+                if not chunk:
+                    break
+                md5.update(chunk)
+                size += len(chunk)
+        try:
+            self._run('ora_check {} {} {}'.format(
+                size, sh_quote(str(dst)), md5.hexdigest()), check=True)
+        except RemoteCommandFailedError as e:
+            raise RIARemoteError(
+                f"Upload of {src} to {dst} failed") from e
 
     def get(self, src, dst, progress_cb):
 
         # Note, that as we are in blocking mode, we can't easily fail on the
         # actual get (that is 'cat').
-        # Therefore check beforehand.
+        # Therefore check beforehand. This also waits for all commands in
+        # flight, the shell is used directly below.
         if not self.exists(src):
             raise RIARemoteError("annex object {src} does not exist."
                                  "".format(src=src))
@@ -588,20 +930,24 @@ class SSHRemoteIO(IOBase):
                     progress_cb(bytes_received)
 
     def rename(self, src, dst):
-        with self.ensure_writeable(dst.parent):
-            self._run('mv {} {}'.format(sh_quote(str(src)), sh_quote(str(dst))))
+        self._run('ora_w {} mv {} {}'.format(
+            sh_quote(str(dst.parent)),
+            sh_quote(str(src)),
+            sh_quote(str(dst))))
 
     def remove(self, path):
         try:
-            with self.ensure_writeable(path.parent):
-                self._run('rm {}'.format(sh_quote(str(path))), check=True)
+            self._run('ora_w {} rm {}'.format(
+                sh_quote(str(path.parent)),
+                sh_quote(str(path))), check=True)
         except RemoteCommandFailedError as e:
             raise RIARemoteError(f"Unable to remove {path} "
                                  "or to obtain write permission in parent directory.") from e
 
     def remove_dir(self, path):
-        with self.ensure_writeable(path.parent):
-            self._run('rmdir {}'.format(sh_quote(str(path))))
+        self._run_deferred('ora_w {} rmdir {}'.format(
+            sh_quote(str(path.parent)),
+            sh_quote(str(path))))
 
     def exists(self, path):
         try:
@@ -611,28 +957,60 @@ class SSHRemoteIO(IOBase):
             return False
 
     def in_archive(self, archive_path, file_path):
-
-        if not self.exists(archive_path):
-            return False
-
-        loc = str(file_path)
         # query 7z for the specific object location, keeps the output
         # lean, even for big archives
-        cmd = '7z l {} {}'.format(
-            sh_quote(str(archive_path)),
-            sh_quote(loc))
+        try:
+            self._run('ora_in_archive {} {}'.format(
+                sh_quote(str(archive_path)),
+                sh_quote(str(file_path))), check=True)
+            return True
+        except RemoteCommandFailedError:
+            return False
 
-        # Note: Currently relies on file_path not showing up in case of failure
-        # including non-existent archive. If need be could be more sophisticated
-        # and called with check=True + catch RemoteCommandFailedError
-        out = self._run(cmd, no_output=False, check=False)
+    def get_archive_info(self, archive_path):
+        try:
+            out = self._run('ora_archive_info {}'.format(
+                sh_quote(str(archive_path))), no_output=False, check=True)
+        except RemoteCommandFailedError:
+            return None
+        header, _, index = out.partition('\n')
+        size, mtime = header.split()
+        return int(size), int(mtime), index or None
+
+    def list_archive(self, archive_path):
+        return parse_7z_listing(self._run(
+            '7z l -slt {}'.format(sh_quote(str(archive_path))),
+            no_output=False, check=True))
 
-        return loc in out
+    def read_range(self, path, offset, size, dst, progress_cb):
+        # Note, that as we are in blocking mode, we can't easily fail on the
+        # actual read. Therefore check beforehand. This also waits for all
+        # commands in flight, the shell is used directly below.
+        if not self.exists(path):
+            raise RIARemoteError(f"{path} does not exist.")
+
+        # tail seeks to the offset, rather than reading up to it
+        cmd = 'tail -c +{} {} | head -c {}\n'.format(
+            offset + 1, sh_quote(str(path)), size)
+        self.shell.stdin.write(cmd.encode())
+        self.shell.stdin.flush()
+
+        with open(dst, 'wb') as target_file:
+            bytes_received = 0
+            while bytes_received < size:
+                c = self.shell.stdout.read1(
+                    min(self.buffer_size, size - bytes_received))
+                if not c:
+                    raise RIARemoteError("Remote shell terminated unexpectedly")
+                bytes_received += len(c)
+                target_file.write(c)
+                progress_cb(bytes_received)
 
     def get_from_archive(self, archive, src, dst, progress_cb):
 
         # Note, that as we are in blocking mode, we can't easily fail on the
-        # actual get (that is 'cat'). Therefore check beforehand.
+        # actual get (that is 'cat'). Therefore check beforehand. This also
+        # waits for all commands in flight, the shell is used directly below.
         if not self.exists(archive):
             raise RIARemoteError("archive {arc} does not exist."
                                  "".format(arc=archive))
@@ -771,6 +1149,46 @@ class HTTPRemoteIO(object):
 
         return response.status_code == 200
 
+    def get_archive_info(self, archive_path):
+        # same signature as in SSH and Local IO, but the modification time
+        # is not determined
+        url = self.store_url + archive_path.as_posix()
+        try:
+            response = requests.head(url, allow_redirects=True)
+            if response.status_code != 200:
+                return None
+            index = requests.get(
+                self.store_url + get_archive_index_path(archive_path).as_posix())
+        except Exception as e:
+            raise RIARemoteError from e
+        return int(response.headers.get('Content-Length', -1)), None, \
+            index.text if index.status_code == 200 else None
+
+    def read_range(self, path, offset, size, dst, progress_cb):
+        url = self.store_url + path.as_posix()
+        with open(dst, 'wb') as target_file:
+            if not size:
+                return
+            try:
+                response = requests.get(
+                    url,
+                    headers={'Range': f'bytes={offset}-{offset + size - 1}'},
+                    stream=True)
+            except Exception as e:
+                raise RIARemoteError from e
+            if response.status_code != 206:
+                raise RIARemoteError(
+                    f"No byte range of {url} available: "
+                    f"{response.status_code} {response.reason}")
+            bytes_received = 0
+            for chunk in response.iter_content(self.buffer_size):
+                target_file.write(chunk)
+                bytes_received += len(chunk)
+                progress_cb(bytes_received)
+        if bytes_received != size:
+            raise RIARemoteError(
+                f"Got {bytes_received} instead of {size} bytes from {url}")
+
     def read_file(self, file_path):
 
         from datalad.support.network import download_url
@@ -926,6 +1344,7 @@ class ORARemote(SpecialRemote):
         self.read_only = False
         self.force_write = None
         self.ignore_remote_config = None
+        self.verify_uploads = None
         self.remote_log_enabled = None
         self.remote_dataset_tree_version = None
         self.remote_object_tree_version = None
@@ -941,6 +1360,8 @@ class ORARemote(SpecialRemote):
         # cache obj_locations:
         self._last_archive_path = None
         self._last_keypath = (None, None)
+        # cache member indices of archives
+        self._archive_members = {}
 
         # SSH "streaming" buffer
         self.buffer_size = DEFAULT_BUFFER_SIZE
@@ -1001,6 +1422,7 @@ class ORARemote(SpecialRemote):
         cfg_map = {"ora-force-write": "force_write",
                    "ora-ignore-ria-config": "ignore_remote_config",
                    "ora-buffer-size": "buffer_size",
+                   "ora-verify-uploads": "verify_uploads",
                    "ora-url": "ria_store_url",
                    "ora-push-url": "ria_store_pushurl"
                    }
@@ -1025,6 +1447,8 @@ class ORARemote(SpecialRemote):
                                  f"'remote.{gitcfg_name}."
                                  f"ora-buffer-size': {self.buffer_size}")
                     self.buffer_size = DEFAULT_BUFFER_SIZE
+            if self.verify_uploads:
+                self.verify_uploads = anything2bool(self.verify_uploads)
 
         if self.name:
             # Consider deprecated configs if there's no value yet
@@ -1412,7 +1836,8 @@ class ORARemote(SpecialRemote):
                     self.buffer_size
                 )
             elif self.storage_host:
-                self._io = SSHRemoteIO(self.storage_host, self.buffer_size)
+                self._io = SSHRemoteIO(self.storage_host, self.buffer_size,
+                                       self.verify_uploads)
                 from atexit import register
                 register(self._io.close)
             else:
@@ -1443,7 +1868,8 @@ class ORARemote(SpecialRemote):
                     self._push_io = LocalIO()
                 else:
                     self._push_io = SSHRemoteIO(self.storage_host_push,
-                                                self.buffer_size)
+                                                self.buffer_size,
+                                                self.verify_uploads)
 
                 # We have a new instance. Kill the existing one and replace.
                 from atexit import (
@@ -1516,13 +1942,6 @@ class ORARemote(SpecialRemote):
         dsobj_dir, archive_path, key_path = self._get_obj_location(key)
         key_path = dsobj_dir / key_path
 
-        if self.push_io.exists(key_path):
-            # if the key is here, we trust that the content is in sync
-            # with the key
-            return
-
-        self.push_io.mkdir(key_path.parent)
-
         # We need to copy to a temp location to let checkpresent fail while the
         # transfer is still in progress and furthermore not interfere with
         # administrative tasks in annex/objects.
@@ -1530,7 +1949,16 @@ class ORARemote(SpecialRemote):
         # different clones.
         transfer_dir = \
             self.remote_git_dir / "ora-remote-{}".format(self._repo.uuid) / "transfer"
+        # creating the directories upfront is harmless, and lets remote IO
+        # pipeline them with the check below
+        self.push_io.mkdir(key_path.parent)
         self.push_io.mkdir(transfer_dir)
+
+        if self.push_io.exists(key_path):
+            # if the key is here, we trust that the content is in sync
+            # with the key
+            return
+
         tmp_path = transfer_dir / key
 
         try:
@@ -1550,6 +1978,25 @@ class ORARemote(SpecialRemote):
 
         dsobj_dir, archive_path, key_path = self._get_obj_location(key)
         abs_key_path = dsobj_dir / key_path
+        member = key_path.as_posix()
+        for archive in self._get_archive_paths(archive_path):
+            members = self._get_archive_members(archive)
+            if not members or member not in members:
+                continue
+            # no futile attempt to get a loose object
+            try:
+                if isinstance(members, dict):
+                    self.io.read_range(archive, *members[member], filename,
+                                       self.annex.progress)
+                else:
+                    self.io.get_from_archive(archive, key_path, filename,
+                                             self.annex.progress)
+                return
+            except Exception as e:
+                # take the regular route below
+                ce = CapturedException(e)
+                lgr.debug("Failed to get %s from archive %s: %s",
+                          key, archive, ce)
         # sadly we have no idea what type of source gave checkpresent->true
         # we can either repeat the checks, or just make two opportunistic
         # attempts (at most)
@@ -1581,15 +2028,10 @@ class ORARemote(SpecialRemote):
         if self.io.exists(abs_key_path):
             # we have an actual file for this key
             return True
-        if isinstance(self.io, HTTPRemoteIO):
-            # no client-side archive access over HTTP
-            return False
-        # do not make a careful check whether an archive exists, because at
-        # present this requires an additional SSH call for remote operations
-        # which may be rather slow. Instead just try to run 7z on it and let
-        # it fail if no archive is around
         # TODO honor future 'archive-mode' flag
-        return self.io.in_archive(archive_path, key_path)
+        return any(
+            key_path.as_posix() in (self._get_archive_members(a) or ())
+            for a in self._get_archive_paths(archive_path))
 
     @handle_errors
     def remove(self, key):
@@ -1670,6 +2112,78 @@ class ORARemote(SpecialRemote):
         return self.remote_obj_dir, self._last_archive_path, \
             self._last_keypath[1]
 
+    def _get_archive_paths(self, archive_path):
+        """Get the paths of archives to consider, in order of preference
+
+        Besides the 7z archive, there might be a seekable (tar) archive,
+        whose members are read by byte range.
+        """
+        seekable_path = archive_path.with_suffix('.tar')
+        if isinstance(self.io, HTTPRemoteIO):
+            # no client-side 7z archive access over HTTP
+            return [seekable_path]
+        return [seekable_path, archive_path]
+
+    def _get_archive_members(self, archive_path):
+        """Get the member paths of an archive
+
+        The index is read from a sidecar file next to the archive (see
+        export-archive-ora), or from a local cache. Only if neither matches
+        the archive, the archive is listed (and the result cached). Any index
+        is read once per process.
+
+        A seekable archive requires a sidecar, which also records the offset
+        and size of each member.
+
+        Returns
+        -------
+        set or dict or None
+          For a seekable archive, a mapping of member paths to the offset and
+          size of their content. None, if there is no archive or it could not
+          be listed.
+        """
+        if archive_path in self._archive_members:
+            return self._archive_members[archive_path]
+        members = None
+        seekable = archive_path.suffix == '.tar'
+        info = self.io.get_archive_info(archive_path)
+        if info is not None:
+            size, mtime, index = info
+            if index:
+                members = parse_archive_index(index, size, offsets=seekable)
+            if members is None and seekable:
+                lgr.debug("No valid index for archive %s", archive_path)
+            elif members is None:
+                members = self._get_cached_archive_members(
+                    archive_path, size, mtime)
+        self._archive_members[archive_path] = members
+        return members
+
+    def _get_cached_archive_members(self, archive_path, size, mtime):
+        cache_file = Path(self.gitdir) / 'datalad' / 'cache' / \
+            'ora-archive-index' / hashlib.md5(
+                f'{self.storage_host}:{archive_path}'.encode()).hexdigest()
+        try:
+            members = parse_archive_index(cache_file.read_text(), size, mtime)
+            if members is not None:
+                return members
+        except OSError:
+            pass
+        try:
+            members = set(self.io.list_archive(archive_path))
+        except Exception as e:
+            ce = CapturedException(e)
+            lgr.debug("Failed to list archive %s: %s", archive_path, ce)
+            return None
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(format_archive_index(members, size, mtime))
+        except OSError as e:
+            ce = CapturedException(e)
+            lgr.debug("Failed to cache index of archive %s: %s",
+                      archive_path, ce)
+        return members
+
     # TODO: implement method 'error'
 
 
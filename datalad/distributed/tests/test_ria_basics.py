@@ -8,7 +8,11 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 
 import logging
+import os
+import shutil
 import stat
+import subprocess
+from unittest.mock import patch
 
 from datalad.api import (
     Dataset,
@@ -19,11 +23,18 @@ from datalad.cmd import NoCapture
 from datalad.customremotes.ria_utils import (
     create_ds_in_store,
     create_store,
+    format_archive_index,
+    get_archive_index_path,
     get_layout_locations,
+    parse_archive_index,
 )
 from datalad.distributed.ora_remote import (
+    HTTPRemoteIO,
     LocalIO,
+    ORARemote,
+    RIARemoteError,
     SSHRemoteIO,
+    _RemoteShell,
     _sanitize_key,
 )
 from datalad.distributed.tests.ria_utils import (
@@ -43,8 +54,10 @@ from datalad.tests.utils_pytest import (
     assert_not_in,
     assert_raises,
     assert_repo_status,
+    assert_result_count,
     assert_status,
     assert_true,
+    create_tree,
     has_symlink_capability,
     known_failure_windows,
     serve_path_via_http,
@@ -734,6 +747,83 @@ def test_sanitize_key():
         assert_equal(_sanitize_key(i), o)
 
 
+@with_tempfile(mkdir=True)
+def test_remote_shell(path=None):
+    path = Path(path)
+    (path / 'file').write_text('content')
+    shell = _RemoteShell(['sh'])
+    try:
+        # many commands in flight, responses are matched by ID
+        ids = [shell.submit(cmd) for cmd in (
+            'echo one', 'false', 'cat {}'.format(path / 'file'),
+            'mkdir {}'.format(path / 'sub'))]
+        assert_equal(shell.receive(ids[2]), (True, 'content'))
+        assert_equal(shell.receive(ids[0]), (True, 'one\n'))
+        assert_equal(shell.receive(ids[1]), (False, ''))
+        shell.sync()
+        assert_true((path / 'sub').is_dir())
+        assert_raises(ValueError, shell.receive, ids[3])
+        # helpers are available
+        (path / 'sub').chmod(0o555)
+        assert_true(shell.run('ora_w {0} touch {0}/new'.format(
+            path / 'sub'))[0])
+        assert_true((path / 'sub' / 'new').exists())
+        # write permission is not kept
+        assert_false((path / 'sub').stat().st_mode & stat.S_IWUSR)
+        (path / 'sub').chmod(0o755)
+        assert_false(shell.run('ora_in_archive {} x'.format(
+            path / 'archive.7z'))[0])
+        # an unexpected marker is an error
+        assert_raises(RIARemoteError, shell.run,
+                      "echo 'ora-remote: end 999 ok'")
+    finally:
+        shell.close()
+
+
+@with_tempfile(mkdir=True)
+def test_ssh_put_streamed(path=None):
+    path = Path(path)
+    src = path / 'src'
+    content = os.urandom(10000)
+    src.write_bytes(content)
+    # a local shell stands in for the remote one
+    with patch('datalad.distributed.ora_remote.ssh_manager') as ssh_manager, \
+            patch('datalad.distributed.ora_remote._RemoteShell',
+                  side_effect=lambda cmd: _RemoteShell(['sh'])):
+        io = SSHRemoteIO('somehost', buffer_size=1000, verify_uploads=True)
+    progress = []
+    try:
+        io.mkdir(path / 'sub')
+        io.put(src, path / 'sub' / 'dst', progress.append)
+        assert_equal((path / 'sub' / 'dst').read_bytes(), content)
+        assert_equal(progress, list(range(1000, 10001, 1000)))
+        # no file copy process
+        ssh_manager.get_connection.return_value.put.assert_not_called()
+        # content not matching the checksum
+        assert_false(io._shell.run('ora_check 10000 {} {}'.format(
+            path / 'sub' / 'dst', '0' * 32))[0])
+        assert_false(io._shell.run('ora_check 10 {} {}'.format(
+            path / 'sub' / 'dst', "''"))[0])
+        # a failure to write is reported
+        assert_raises(RIARemoteError, io.put, src, path / 'missing' / 'dst',
+                      lambda x: None)
+        # and does not break the session
+        assert_true(io.exists(path / 'sub' / 'dst'))
+        # large files are copied by scp
+        io.STREAM_MAX_SIZE = 5000
+        io.ssh.put.side_effect = shutil.copyfile
+        io.put(src, path / 'sub' / 'large', lambda x: None)
+        io.ssh.put.assert_called_once_with(
+            str(src), str(path / 'sub' / 'large'))
+        assert_equal((path / 'sub' / 'large').read_bytes(), content)
+        # and verified too
+        io.ssh.put.side_effect = lambda s, d: Path(d).write_bytes(b'bad')
+        assert_raises(RIARemoteError, io.put, src, path / 'sub' / 'bad',
+                      lambda x: None)
+    finally:
+        io.close()
+
+
 # Skipping on adjusted branch as a proxy for crippledFS. Write permissions of
 # the owner on a directory can't be revoked on VFAT. "adjusted branch" is a
 # bit broad but covers the CI cases. And everything RIA/ORA doesn't currently
@@ -815,3 +905,136 @@ def test_obtain_permission_ssh():
 @skip_if_root
 def test_obtain_permission_root():
     _test_permission(None)
+
+
+@with_tempfile(mkdir=True)
+def test_archive_index(path=None):
+    path = Path(path)
+    archive = path / 'archive.7z'
+    index = get_archive_index_path(archive)
+    assert_equal(index, path / 'archive.7z.index')
+    with patch('datalad.distributed.ora_remote.ssh_manager'), \
+            patch('datalad.distributed.ora_remote._RemoteShell',
+                  side_effect=lambda cmd: _RemoteShell(['sh'])):
+        ssh_io = SSHRemoteIO('somehost')
+    try:
+        for io in (LocalIO(), ssh_io):
+            assert_equal(io.get_archive_info(archive), None)
+            archive.write_bytes(b'123')
+            mtime = int(archive.stat().st_mtime)
+            assert_equal(io.get_archive_info(archive), (3, mtime, None))
+            index.write_text(format_archive_index(['XX/YY/K/K'], 3))
+            assert_equal(io.get_archive_info(archive),
+                         (3, mtime, '3\nXX/YY/K/K\n'))
+            archive.unlink()
+            index.unlink()
+    finally:
+        ssh_io.close()
+
+    def get_members(listing):
+        ora = ORARemote(None)
+        ora._io = LocalIO()
+        ora.gitdir = str(path / 'git')
+        with patch.object(LocalIO, 'list_archive',
+                          return_value=listing) as list_archive:
+            members = ora._get_archive_members(archive)
+            # read once
+            assert_equal(ora._get_archive_members(archive), members)
+        return members, list_archive.call_count
+
+    assert_equal(get_members(['A/B/C/C']), (None, 0))
+    archive.write_bytes(b'123')
+    index.write_text(format_archive_index(['XX/YY/K/K'], 3))
+    assert_equal(get_members(['A/B/C/C']), ({'XX/YY/K/K'}, 0))
+    # an outdated index is ignored, the archive is listed once
+    archive.write_bytes(b'1234')
+    assert_equal(get_members(['A/B/C/C']), ({'A/B/C/C'}, 1))
+    assert_equal(get_members(['A/B/C/C']), ({'A/B/C/C'}, 0))
+
+
+@with_tempfile(mkdir=True)
+def test_archive_index_listing_failure(path=None):
+    path = Path(path)
+    ds = Dataset(path / 'ds').create()
+    populate_dataset(ds)
+    ds.save()
+    archive = path / 'archive.7z'
+    index = get_archive_index_path(archive)
+    # an index of a previous version of the archive
+    index.write_text(format_archive_index(['XX/YY/K/K'], 3))
+    # 7z fails to list the members
+    with patch('datalad.distributed.export_archive_ora.subprocess.run',
+               side_effect=lambda cmd, **kwargs: subprocess.CompletedProcess(
+                   cmd, 2, stdout='')):
+        res = ds.export_archive_ora(archive, result_renderer='disabled')
+    # the archive is reported, but it is not indexed (wrongly)
+    assert_status('ok', res)
+    assert_false(index.exists())
+
+
+@with_tempfile(mkdir=True)
+@serve_path_via_http
+def test_seekable_archive(path=None, url=None):
+    path = Path(path)
+    ds = Dataset(path / 'ds').create()
+    populate_dataset(ds)
+    ds.save()
+    archive_dir = path / 'archives'
+    archive_dir.mkdir()
+    archive = archive_dir / 'archive.tar'
+    index_path = get_archive_index_path(archive)
+
+    def get_index():
+        return parse_archive_index(
+            index_path.read_text(), archive.stat().st_size, offsets=True)
+
+    res = ds.export_archive_ora(archive_dir, archive_format='tar')
+    assert_result_count(res, 1, status='ok', path=str(archive))
+    index = get_index()
+    assert_equal(len(index), 4)
+    # updates add the new keys only
+    create_tree(ds.path, {'five.txt': 'content5'})
+    ds.save()
+    ds.export_archive_ora(archive, archive_format='tar')
+    new_index = get_index()
+    assert_equal(len(new_index), 5)
+    assert_equal({k: new_index[k] for k in index}, index)
+
+    objs = ds.pathobj / '.git' / 'annex' / 'objects'
+    with patch('datalad.distributed.ora_remote.ssh_manager'), \
+            patch('datalad.distributed.ora_remote._RemoteShell',
+                  side_effect=lambda cmd: _RemoteShell(['sh'])):
+        ssh_io = SSHRemoteIO('somehost')
+    try:
+        for io, archive_path in (
+                (LocalIO(), archive),
+                (ssh_io, archive),
+                (HTTPRemoteIO(url), Path('/archives/archive.tar'))):
+            info = io.get_archive_info(archive_path)
+            assert_equal(info[0], archive.stat().st_size)
+            assert_equal(info[2], index_path.read_text())
+            for member, (offset, size) in new_index.items():
+                progress = []
+                io.read_range(archive_path, offset, size, path / 'out',
+                              progress.append)
+                # same content as the key in the annex
+                assert_equal((path / 'out').read_bytes(),
+                             (objs / member).read_bytes())
+                assert_equal(progress[-1], size)
+    finally:
+        ssh_io.close()
+
+    # ORA considers the seekable archive first, also over HTTP
+    ora = ORARemote(None)
+    ora._io = LocalIO()
+    archives = ora._get_archive_paths(archive_dir / 'archive.7z')
+    assert_equal(archives, [archive, archive_dir / 'archive.7z'])
+    assert_equal(ora._get_archive_members(archive), new_index)
+    ora._io = HTTPRemoteIO(url)
+    assert_equal(ora._get_archive_paths(Path('/archives/archive.7z')),
+                 [Path('/archives/archive.tar')])
+    # no valid index, no archive
+    index_path.write_text('0\n')
+    ora._archive_members = {}
+    assert_equal(ora._get_archive_members(Path('/archives/archive.tar')),
+                 None)
@@ -13,6 +13,16 @@
 import logging
 import os.path as op
 import re
+import threading
+from contextlib import nullcontext
+from functools import partial
+from itertools import count
+from multiprocessing import cpu_count
+from queue import (
+    Empty,
+    PriorityQueue,
+    Queue,
+)
 
 from datalad.config import ConfigManager
 from datalad.core.distributed.clone import clone_dataset
@@ -43,6 +53,7 @@ from datalad.interface.results import (
     success_status_map,
 )
 from datalad.local.subdatasets import Subdatasets
+from datalad.log import log_progress
 from datalad.support.annexrepo import AnnexRepo
 from datalad.support.collections import ReadOnlyDict
 from datalad.support.constraints import (
@@ -55,11 +66,9 @@ from datalad.support.exceptions import (
     CapturedException,
     CommandError,
     InsufficientArgumentsError,
+    RemoteNotAvailableError,
 )
-from datalad.support.gitrepo import (
-    GitRepo,
-    _fixup_submodule_dotgit_setup,
-)
+from datalad.support.gitrepo import _fixup_submodule_dotgit_setup
 from datalad.support.network import (
     RI,
     URL,
@@ -69,6 +78,7 @@ from datalad.support.parallel import ProducerConsumerProgressLog
 from datalad.support.param import Parameter
 from datalad.utils import (
     Path,
+    bytes2human,
     get_dataset_root,
     shortened_repr,
     unique,
@@ -422,7 +432,8 @@ def _install_necessary_subdatasets(
     # otherwise we start with the one deepest down
     cur_subds = subds_trail[-1]
 
-    while not GitRepo.is_valid_repo(cur_subds['path']):
+    # the state of each record was determined by subdatasets() just now
+    while cur_subds['state'] == 'absent':
         # install using helper that give some flexibility regarding where to
         # get the module from
         for res in _install_subds_from_flexible_source(
@@ -504,12 +515,14 @@ def _recursive_install_subds_underneath(ds, recursion_limit, reckless, start=Non
             yield from _install_subds_from_flexible_source(
                 Dataset(ds_path), sub, reckless=reckless, description=description)
 
-        if not subds.is_installed():
-            # an error result was emitted, and the external consumer can decide
-            # what to do with it, but there is no point in recursing into
-            # something that should be there, but isn't
-            lgr.debug('Subdataset %s could not be installed, skipped', subds)
-            return
+            # a present subdataset was already probed by subdatasets(), only
+            # check the outcome of an installation
+            if not subds.is_installed():
+                # an error result was emitted, and the external consumer can
+                # decide what to do with it, but there is no point in
+                # recursing into something that should be there, but isn't
+                lgr.debug('Subdataset %s could not be installed, skipped', subds)
+                return
 
         # recurse
         # we can skip the start expression, we know we are within
@@ -647,59 +660,343 @@ def _install_targetpath(
         yield res
 
 
-def _get_targetpaths(ds, content, refds_path, source, jobs):
-    # not ready for Path instances...
-    content = [str(c) for c in content]
-    # hand over to git-annex, get files content,
-    # report files in git as 'notneeded' to get
-    ds_repo = ds.repo
-    # needs to be an annex to get content
-    if not isinstance(ds_repo, AnnexRepo):
-        for r in results_from_paths(
-                content, status='notneeded',
+# process-wide semaphores limiting the number of concurrent transfers, by
+# limit ('datalad.get.max-transfers')
+_transfer_slots = {}
+_transfer_slots_lock = threading.Lock()
+
+
+def _get_transfer_slots():
+    from datalad import cfg
+    limit = cfg.obtain('datalad.get.max-transfers') \
+        if 'datalad.get.max-transfers' in cfg else None
+    if not limit:
+        return nullcontext()
+    with _transfer_slots_lock:
+        if limit not in _transfer_slots:
+            _transfer_slots[limit] = threading.BoundedSemaphore(limit)
+        return _transfer_slots[limit]
+
+
+class _TransferRequest:
+    """Content of a single dataset requested via `_TransferScheduler`"""
+    def __init__(self, ds, content):
+        self.ds = ds
+        # not ready for Path instances...
+        self.content = [str(c) for c in content]
+        # number of work units that are not yet processed
+        self.pending = 0
+        # size of the files to transfer (None if unknown)
+        self.sizes = {}
+        self.respath_by_status = {}
+
+
+class _TransferScheduler:
+    """Obtain annexed content across datasets with a common transfer budget
+
+    Content is requested per dataset, e.g. as soon as a dataset has been
+    installed, while the installation of other datasets continues. For each
+    request, a single `git annex whereis` call determines the annexed files
+    that need to be transferred, and their locations. Each file is assigned
+    to the cheapest remote it is available from (see
+    `AnnexRepo.get_remote_costs()`), and the files of each remote are split
+    into work units, such that even a few files keep all workers busy. The
+    work units of all datasets are processed by a
+    fixed number of worker threads, smallest files first. Files that could
+    not be obtained from their planned remote are retried with any remote.
+    Each unit is processed by a single `git annex get` call (without -J),
+    hence the number of concurrent transfers is limited by the number of
+    workers (and 'datalad.get.max-transfers'), regardless of the number of
+    datasets involved. 'datalad.get.max-bandwidth' is split across the
+    workers of a scheduler, it is not shared with other schedulers.
+
+    Results are reported via `results()`, and `close()` must be called
+    in any case to stop the worker threads.
+    """
+    # minimum number of files per work unit, to amortize the startup
+    # cost of git-annex, unless smaller units are needed to keep all
+    # workers busy
+    unit_size = 100
+
+    def __init__(self, refds_path, source, jobs):
+        from datalad import cfg
+        self._refds_path = refds_path
+        self._source = source
+        if jobs == 'auto':
+            # same as AnnexRepo._call_annex() would do it
+            jobs = min(cfg.obtain('datalad.runtime.max-annex-jobs'),
+                       max(3, cpu_count()))
+        self._jobs = jobs or 1
+        bandwidth = cfg.obtain('datalad.get.max-bandwidth') \
+            if 'datalad.get.max-bandwidth' in cfg else None
+        self._git_options = [
+            '-c', 'annex.bwlimit={}B/1s'.format(
+                max(1, bandwidth // self._jobs))] if bandwidth else []
+        self._slots = _get_transfer_slots()
+        self._tasks = PriorityQueue()
+        self._reports = Queue()
+        self._seq = count()
+        self._lock = threading.Lock()
+        self._threads = []
+        # number of requests that are not yet completely reported on
+        self._open = 0
+        self._aborted = False
+        self._progress_id = None
+        self._bytes = 0
+
+    def submit(self, ds, content):
+        """Request content in a dataset
+
+        Parameters
+        ----------
+        ds : Dataset
+        content : list(str)
+          Paths of files or directories in the dataset.
+        """
+        if not self._threads:
+            self._threads = [
+                threading.Thread(target=self._work, daemon=True)
+                for _ in range(self._jobs)]
+            for t in self._threads:
+                t.start()
+        self._open += 1
+        self._put((0,), self._plan, _TransferRequest(ds, content))
+
+    def results(self, wait=False):
+        """Yield results of processed requests
+
+        Parameters
+        ----------
+        wait : bool, optional
+          If set, wait until all submitted requests have been processed.
+          Otherwise only the results available right away are reported.
+        """
+        while self._open:
+            try:
+                kind, value = self._reports.get(block=wait)
+            except Empty:
+                return
+            if kind == 'error':
+                raise value
+            elif kind == 'planned':
+                self._log_progress(total=value)
+            elif kind == 'transferred':
+                nbytes, results = value
+                self._log_progress(update=nbytes)
+                yield from results
+            elif kind == 'done':
+                self._open -= 1
+                yield from value
+
+    def close(self):
+        # anything still queued is not needed anymore
+        self._aborted = bool(self._open)
+        for _ in self._threads:
+            self._put((2,), None)
+        for t in self._threads:
+            t.join()
+        self._threads = []
+        if self._progress_id:
+            log_progress(lgr.info, self._progress_id,
+                         'Finished transferring content')
+            self._progress_id = None
+
+    def _put(self, priority, task, *args):
+        self._tasks.put((
+            priority, next(self._seq),
+            partial(task, *args) if task else None))
+
+    def _work(self):
+        while True:
+            _, _, task = self._tasks.get()
+            if task is None:
+                return
+            if self._aborted:
+                continue
+            try:
+                task()
+            except Exception as e:
+                self._reports.put(('error', e))
+
+    def _log_progress(self, total=None, update=None):
+        if self._progress_id is None:
+            self._progress_id = 'get-transfers-{}'.format(id(self))
+            log_progress(lgr.info, self._progress_id,
+                         'Start transferring content',
+                         label='Transferring', unit=' Bytes', total=0,
+                         noninteractive_level=5)
+        if total:
+            self._bytes += total
+            log_progress(lgr.info, self._progress_id, '',
+                         total=self._bytes, update=0, increment=True,
+                         noninteractive_level=5)
+        if update:
+            log_progress(lgr.info, self._progress_id, '',
+                         update=update, increment=True,
+                         noninteractive_level=5)
+
+    def _plan(self, req):
+        repo = req.ds.repo
+        # needs to be an annex to get content
+        if not isinstance(repo, AnnexRepo):
+            self._reports.put(('done', list(results_from_paths(
+                req.content, status='notneeded',
                 message="no dataset annex, content already present",
                 action='get',
                 type='file',
                 logger=lgr,
-                refds=refds_path):
-            yield r
-        return
-    respath_by_status = {}
-    try:
-        results = ds_repo.get(
-            content,
-            options=['--from=%s' % source] if source else [],
-            jobs=jobs)
-    except CommandError as exc:
-        results = exc.kwargs.get("stdout_json")
-        if not results:
-            raise
-
-    for res in results:
-        res = annexjson2result(res, ds, type='file', logger=lgr,
-                               refds=refds_path)
-        success = success_status_map[res['status']]
-        # TODO: in case of some failed commands (e.g. get) there might
-        # be no path in the record.  yoh has only vague idea of logic
-        # here so just checks for having 'path', but according to
-        # results_from_annex_noinfo, then it would be assumed that
-        # `content` was acquired successfully, which is not the case
-        if 'path' in res:
-            respath_by_status[success] = \
-                respath_by_status.get(success, []) + [res['path']]
-        yield res
-
-    for r in results_from_annex_noinfo(
-            ds,
-            content,
-            respath_by_status,
+                refds=self._refds_path))))
+            return
+        if self._source:
+            if self._source not in repo.get_remotes():
+                raise RemoteNotAvailableError(
+                    remote=self._source,
+                    cmd="annex get",
+                    msg="Remote is not known. Known are: %s"
+                    % (repo.get_remotes(),)
+                )
+            repo._maybe_open_ssh_connection(self._source)
+        try:
+            # a single query for all locations of all needed keys
+            records = repo._call_annex_records(
+                ['whereis', '--not', '--in', '.'],
+                files=req.content)
+        except CommandError as exc:
+            # whereis fails for keys without a known copy, and for files
+            # that do not exist or are not annexed
+            records = exc.kwargs.get("stdout_json")
+            if not records:
+                raise
+        costs = {} if self._source else repo.get_remote_costs()
+        # files to transfer by source remote, one file per key. No remote
+        # (None) leaves the choice to git-annex, and has it report on
+        # files that cannot be obtained
+        files_by_remote = {}
+        keys = set()
+        for rec in records:
+            key = rec.get('key')
+            if not key:
+                if rec.get('file'):
+                    files_by_remote.setdefault(None, []).append(rec['file'])
+                    req.sizes[rec['file']] = 0
+                continue
+            if key in keys:
+                continue
+            keys.add(key)
+            if self._source:
+                remote = self._source
+            else:
+                # cheapest available remote, by name for identical costs
+                candidates = sorted(
+                    (costs[loc['uuid']]['cost'], costs[loc['uuid']]['name'])
+                    for loc in rec.get('whereis', [])
+                    if loc['uuid'] in costs)
+                remote = candidates[0][1] if candidates else None
+            files_by_remote.setdefault(remote, []).append(rec['file'])
+            try:
+                req.sizes[rec['file']] = AnnexRepo.get_size_from_key(key)
+            except ValueError:
+                req.sizes[rec['file']] = None
+        if not files_by_remote:
+            self._reports.put(('done', self._get_noinfo_results(req)))
+            return
+        nbytes = sum(filter(None, req.sizes.values()))
+        lgr.debug(
+            'Planned to get %i file(s) (%s) in %s from %s',
+            len(keys), bytes2human(nbytes), req.ds,
+            {r: len(f) for r, f in files_by_remote.items()})
+        self._reports.put(('planned', nbytes))
+        units = []
+        for remote, files in files_by_remote.items():
+            files = sorted(
+                files,
+                key=lambda f: (req.sizes[f] is None, req.sizes[f]))
+            # have enough units to keep all workers busy, even if that
+            # leads to units smaller than `unit_size` (down to a single
+            # file), but not more than twice the number of workers
+            unit_size = max(
+                min(self.unit_size, -(-len(files) // self._jobs)),
+                -(-len(files) // (2 * self._jobs)))
+            units.extend((remote, files[i:i + unit_size])
+                         for i in range(0, len(files), unit_size))
+        req.pending = len(units)
+        for remote, unit in units:
+            self._put_transfer(req, remote, unit)
+
+    def _put_transfer(self, req, remote, files):
+        largest = req.sizes[files[-1]]
+        self._put(
+            (1, float('inf') if largest is None else largest),
+            self._transfer, req, remote, files)
+
+    def _transfer(self, req, remote, files):
+        repo = req.ds.repo
+        options = ['--from=%s' % remote] if remote else []
+        if repo.config.get("annex.retry") is None:
+            options.extend(
+                ["-c",
+                 "annex.retry={}".format(
+                     repo.config.obtain("datalad.annex.retry"))])
+        with self._slots:
+            try:
+                records = repo._call_annex_records(
+                    ['get'] + options,
+                    files=files,
+                    git_options=self._git_options,
+                    progress=True)
+            except CommandError as exc:
+                records = exc.kwargs.get("stdout_json")
+                if not records:
+                    raise
+        # a failure to get from the planned remote is not final, git-annex
+        # gets to try all other remotes
+        retry = [] if self._source or remote is None else [
+            rec['file'] for rec in records
+            if not rec.get('success', True) and rec.get('file')]
+        results = []
+        nbytes = 0
+        with self._lock:
+            for rec in records:
+                if rec.get('file') in retry:
+                    continue
+                res = annexjson2result(rec, req.ds, type='file', logger=lgr,
+                                       refds=self._refds_path)
+                # TODO: in case of some failed commands (e.g. get) there
+                # might be no path in the record.  yoh has only vague idea
+                # of logic here so just checks for having 'path', but
+                # according to results_from_annex_noinfo, then it would be
+                # assumed that `content` was acquired successfully, which
+                # is not the case
+                if 'path' in res:
+                    req.respath_by_status.setdefault(
+                        success_status_map[res['status']], []).append(
+                            res['path'])
+                    if res['status'] == 'ok':
+                        nbytes += req.sizes.get(rec.get('file')) or 0
+                results.append(res)
+            if retry:
+                req.pending += 1
+            req.pending -= 1
+            done = not req.pending
+        self._reports.put(('transferred', (nbytes, results)))
+        if retry:
+            lgr.debug('Failed to get %i file(s) in %s from %s, trying all '
+                      'remotes', len(retry), req.ds, remote)
+            self._put_transfer(req, None, retry)
+        if done:
+            self._reports.put(('done', self._get_noinfo_results(req)))
+
+    def _get_noinfo_results(self, req):
+        return list(results_from_annex_noinfo(
+            req.ds,
+            req.content,
+            req.respath_by_status,
             dir_fail_msg='could not get some content in %s %s',
             noinfo_dir_msg='nothing to get from %s',
             noinfo_file_msg='already present',
             action='get',
             logger=lgr,
-            refds=refds_path):
-        yield r
+            refds=self._refds_path))
 
 
 def _check_error_reported_before(res: dict, error_dict: dict):
@@ -800,7 +1097,10 @@ class Get(Interface):
 
     .. note::
       Power-user info: This command uses :command:`git annex get` to fulfill
-      file handles.
+      file handles. The `jobs` setting limits the number of concurrent
+      :command:`git annex get` calls (each transferring one file at a time)
+      across all datasets, rather than being passed on as
+      :command:`git annex get -J` for each dataset.
     """
     _examples_ = [
         dict(text="Get a single file",
@@ -892,46 +1192,107 @@ class Get(Interface):
         # keep track of error results for paths that do not exist
         error_reported = {}
         content_by_ds = {}
-        # use subdatasets() to discover any relevant content that is not
-        # already present in the root dataset (refds)
-        for sdsres in Subdatasets.__call__(
-                contains=path,
-                # maintain path argument semantics and pass in dataset arg
-                # as is
-                dataset=dataset,
-                # always come from the top to get sensible generator behavior
-                bottomup=False,
-                # when paths are given, they will constrain the recursion
-                # automatically, and we need to enable recursion so we can
-                # location path in subdatasets several levels down
-                recursive=True if path else recursive,
-                recursion_limit=None if path else recursion_limit,
-                return_type='generator',
-                on_failure='ignore',
-                result_renderer='disabled'):
-            if sdsres.get('type', None) != 'dataset':
-                # if it is not about a 'dataset' it is likely content in
-                # the root dataset
-                if sdsres.get('status', None) == 'impossible' and \
-                        sdsres.get('message', None) == \
-                        'path not contained in any matching subdataset':
-                    target_path = Path(sdsres['path'])
-                    if refds.pathobj != target_path and \
-                            refds.pathobj not in target_path.parents:
-                        yield dict(
-                            action='get',
-                            path=str(target_path),
-                            status='error',
-                            message=('path not associated with dataset %s',
-                                     refds),
-                        )
-                        continue
-                    # check if we need to obtain anything underneath this path
-                    # the subdataset() call above will only look _until_ it
-                    # hits the targetpath
+        # content of installed datasets is obtained by a common scheduler,
+        # while the installation of other datasets continues
+        scheduler = _TransferScheduler(refds_path, source, jobs) \
+            if get_data else None
+
+        def _add_content(ds, paths):
+            dsrec = content_by_ds.setdefault(ds, set())
+            new = [p for p in paths if p not in dsrec]
+            dsrec.update(new)
+            if scheduler and new:
+                scheduler.submit(Dataset(ds), new)
+
+        def _transfer_results(wait=False):
+            if not scheduler:
+                return
+            for res in scheduler.results(wait=wait):
+                if 'path' not in res or res['path'] not in content_by_ds:
+                    # we had reports on datasets and subdatasets already
+                    # before the annex stage
+                    yield res
+
+        try:
+            # use subdatasets() to discover any relevant content that is not
+            # already present in the root dataset (refds)
+            for sdsres in Subdatasets.__call__(
+                    contains=path,
+                    # maintain path argument semantics and pass in dataset arg
+                    # as is
+                    dataset=dataset,
+                    # always come from the top to get sensible generator behavior
+                    bottomup=False,
+                    # when paths are given, they will constrain the recursion
+                    # automatically, and we need to enable recursion so we can
+                    # location path in subdatasets several levels down
+                    recursive=True if path else recursive,
+                    recursion_limit=None if path else recursion_limit,
+                    return_type='generator',
+                    on_failure='ignore',
+                    result_renderer='disabled'):
+                if sdsres.get('type', None) != 'dataset':
+                    # if it is not about a 'dataset' it is likely content in
+                    # the root dataset
+                    if sdsres.get('status', None) == 'impossible' and \
+                            sdsres.get('message', None) == \
+                            'path not contained in any matching subdataset':
+                        target_path = Path(sdsres['path'])
+                        if refds.pathobj != target_path and \
+                                refds.pathobj not in target_path.parents:
+                            yield dict(
+                                action='get',
+                                path=str(target_path),
+                                status='error',
+                                message=('path not associated with dataset %s',
+                                         refds),
+                            )
+                            continue
+                        # check if we need to obtain anything underneath this path
+                        # the subdataset() call above will only look _until_ it
+                        # hits the targetpath
+                        for res in _install_targetpath(
+                                refds,
+                                Path(sdsres['path']),
+                                recursive,
+                                recursion_limit,
+                                reckless,
+                                refds_path,
+                                description,
+                                jobs=jobs,
+                        ):
+                            # fish out the datasets that 'contains' a targetpath
+                            # and store them for later
+                            if res.get('status', None) in ('ok', 'notneeded') and \
+                                    'contains' in res:
+                                _add_content(res['path'], res['contains'])
+                            if res.get('status', None) != 'notneeded':
+                                # all those messages on not having installed anything
+                                # are a bit pointless
+                                # "notneeded" for annex get comes below
+                                # prevent double yielding of impossible result
+                                if _check_error_reported_before(res, error_reported):
+                                    continue
+                                yield res
+                    else:
+                        # dunno what this is, send upstairs
+                        yield sdsres
+                    # must continue for both conditional branches above
+                    # the rest is about stuff in real subdatasets
+                    continue
+                # instance of the closest existing dataset for this result
+                ds = Dataset(sdsres['parentds']
+                             if sdsres.get('state', None) == 'absent'
+                             else sdsres['path'])
+                assert 'contains' in sdsres
+                # explore the unknown
+                for target_path in sdsres.get('contains', []):
+                    # essentially the same as done above for paths in the root
+                    # dataset, but here we are starting from the closest
+                    # discovered subdataset
                     for res in _install_targetpath(
-                            refds,
-                            Path(sdsres['path']),
+                            ds,
+                            Path(target_path),
                             recursive,
                             recursion_limit,
                             reckless,
@@ -939,75 +1300,21 @@ class Get(Interface):
                             description,
                             jobs=jobs,
                     ):
-                        # fish out the datasets that 'contains' a targetpath
-                        # and store them for later
+                        known_ds = res['path'] in content_by_ds
                         if res.get('status', None) in ('ok', 'notneeded') and \
                                 'contains' in res:
-                            dsrec = content_by_ds.get(res['path'], set())
-                            dsrec.update(res['contains'])
-                            content_by_ds[res['path']] = dsrec
-                        if res.get('status', None) != 'notneeded':
-                            # all those messages on not having installed anything
-                            # are a bit pointless
-                            # "notneeded" for annex get comes below
+                            _add_content(res['path'], res['contains'])
+                        # prevent double-reporting of datasets that have been
+                        # installed by explorative installation to get to target
+                        # paths, prior in this loop
+                        if res.get('status', None) != 'notneeded' or not known_ds:
                             # prevent double yielding of impossible result
                             if _check_error_reported_before(res, error_reported):
                                 continue
                             yield res
-                else:
-                    # dunno what this is, send upstairs
-                    yield sdsres
-                # must continue for both conditional branches above
-                # the rest is about stuff in real subdatasets
-                continue
-            # instance of the closest existing dataset for this result
-            ds = Dataset(sdsres['parentds']
-                         if sdsres.get('state', None) == 'absent'
-                         else sdsres['path'])
-            assert 'contains' in sdsres
-            # explore the unknown
-            for target_path in sdsres.get('contains', []):
-                # essentially the same as done above for paths in the root
-                # dataset, but here we are starting from the closest
-                # discovered subdataset
-                for res in _install_targetpath(
-                        ds,
-                        Path(target_path),
-                        recursive,
-                        recursion_limit,
-                        reckless,
-                        refds_path,
-                        description,
-                        jobs=jobs,
-                ):
-                    known_ds = res['path'] in content_by_ds
-                    if res.get('status', None) in ('ok', 'notneeded') and \
-                            'contains' in res:
-                        dsrec = content_by_ds.get(res['path'], set())
-                        dsrec.update(res['contains'])
-                        content_by_ds[res['path']] = dsrec
-                    # prevent double-reporting of datasets that have been
-                    # installed by explorative installation to get to target
-                    # paths, prior in this loop
-                    if res.get('status', None) != 'notneeded' or not known_ds:
-                        # prevent double yielding of impossible result
-                        if _check_error_reported_before(res, error_reported):
-                            continue
-                        yield res
-
-        if not get_data:
-            # done already
-            return
-
-        # and now annex-get, this could all be done in parallel now
-        for ds, content in content_by_ds.items():
-            for res in _get_targetpaths(
-                    Dataset(ds),
-                    content,
-                    refds.path,
-                    source,
-                    jobs):
-                if 'path' not in res or res['path'] not in content_by_ds:
-                    # we had reports on datasets and subdatasets already
-                    # before the annex stage
-                    yield res
+                # report on content transfers completed meanwhile
+                yield from _transfer_results()
+            yield from _transfer_results(wait=True)
+        finally:
+            if scheduler:
+                scheduler.close()
@@ -9,6 +9,7 @@
 
 """
 
+import threading
 from os import curdir
 from os.path import basename
 from os.path import join as opj
@@ -48,6 +49,7 @@ from datalad.tests.utils_pytest import (
     known_failure_githubci_win,
     known_failure_windows,
     ok_,
+    patch_config,
     serve_path_via_http,
     skip_if_adjusted_branch,
     skip_if_on_windows,
@@ -740,12 +742,12 @@ def test_missing_path_handling(path=None):
     refds.path = "foo"
 
     with \
-            patch("datalad.distribution.get._get_targetpaths") as get_target_path, \
+            patch("datalad.distribution.get._TransferScheduler") as scheduler, \
             patch("datalad.distribution.get.require_dataset") as require_dataset, \
             patch("datalad.distribution.get._install_targetpath") as _install_targetpath, \
             patch("datalad.distribution.get.Subdatasets") as subdatasets:
 
-        get_target_path.return_value = [{
+        scheduler.return_value.results.return_value = [{
             "status": "error"
         }]
         require_dataset.return_value = refds
@@ -764,6 +766,129 @@ def test_missing_path_handling(path=None):
         ds.get("foo")
 
 
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+def test_get_transfer_scheduler(src=None, path=None):
+    origin = Dataset(src).create()
+    for sub in ('s1', 's2'):
+        sds = origin.create(sub)
+        # files of decreasing size in name order
+        create_tree(sds.path, {
+            'f{}'.format(i): 'x' * (100 - i * 10) for i in range(5)})
+        sds.save()
+    origin.save()
+    clone = install(
+        path, source=src, result_xfm='datasets', return_type='item-or-list')
+
+    transfers = []
+    running = []
+    orig_call = AnnexRepo._call_annex_records
+
+    def _call_annex_records(self, args, files=None, **kwargs):
+        if args[0] != 'get':
+            return orig_call(self, args, files=files, **kwargs)
+        running.append(files)
+        transfers.append((len(running), self.path, files))
+        try:
+            return orig_call(self, args, files=files, **kwargs)
+        finally:
+            running.remove(files)
+
+    # a single worker: smallest files first
+    with patch.object(AnnexRepo, '_call_annex_records', _call_annex_records), \
+            patch('datalad.distribution.get._TransferScheduler.unit_size', 1):
+        res = clone.get(['s1', 's2'], jobs=1)
+    assert_result_count(res, 10, action='get', type='file', status='ok')
+    assert_result_count(res, 2, action='install', type='dataset', status='ok')
+    for sub in ('s1', 's2'):
+        eq_([f for _, p, unit in transfers if p.endswith(sub) for f in unit],
+            ['f{}'.format(i) for i in reversed(range(5))])
+
+    # a global limit of transfers holds across all workers and datasets
+    for sub in ('s1', 's2'):
+        Dataset(clone.pathobj / sub).drop(what='filecontent', reckless='kill')
+    transfers.clear()
+    with patch.object(AnnexRepo, '_call_annex_records', _call_annex_records), \
+            patch('datalad.distribution.get._TransferScheduler.unit_size', 1), \
+            patch_config({'datalad.get.max-transfers': '1'}):
+        res = clone.get(['s1', 's2'], jobs=3)
+    assert_result_count(res, 10, action='get', type='file', status='ok')
+    eq_(len(transfers), 10)
+    eq_(max(n for n, _, _ in transfers), 1)
+
+
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+def test_get_concurrent_few_files(src=None, path=None):
+    origin = Dataset(src).create()
+    create_tree(origin.path, {'f{}'.format(i): str(i) for i in range(5)})
+    origin.save()
+    ds = clone(src, path)
+
+    transfers = []
+    # the first two transfers only pass, if they run at the same time
+    barrier = threading.Barrier(2, timeout=30)
+    orig_call = AnnexRepo._call_annex_records
+
+    def _call_annex_records(self, args, files=None, **kwargs):
+        if args[0] == 'get':
+            transfers.append((kwargs, files))
+            if len(transfers) <= 2:
+                barrier.wait()
+        return orig_call(self, args, files=files, **kwargs)
+
+    with patch.object(AnnexRepo, '_call_annex_records', _call_annex_records):
+        res = ds.get('.', jobs=4)
+    assert_result_count(res, 5, action='get', type='file', status='ok')
+    ok_(not barrier.broken)
+    # fewer files than the unit size are split across the workers
+    eq_(len(transfers), 3)
+    eq_(sorted(f for _, files in transfers for f in files),
+        ['f{}'.format(i) for i in range(5)])
+    # with progress reports
+    ok_(all(kwargs.get('progress') for kwargs, _ in transfers))
+
+
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+def test_get_cheapest_source(src=None, path=None, other_path=None):
+    origin = Dataset(src).create()
+    (origin.pathobj / 'f').write_text('content')
+    origin.save()
+    other = clone(src, other_path)
+    other.get('f')
+    ds = clone(src, path)
+    ds.siblings('add', name='other', url=other_path)
+    ds.repo.config.set('remote.other.annex-cost', '50', scope='local')
+    # make the location of the content in other known
+    ds.repo.fetch('other')
+
+    sources = []
+    orig_call = AnnexRepo._call_annex_records
+
+    def _call_annex_records(self, args, files=None, **kwargs):
+        if args[0] == 'get':
+            sources.append(
+                [a for a in args if a.startswith('--from=')] or None)
+        return orig_call(self, args, files=files, **kwargs)
+
+    with patch.object(AnnexRepo, '_call_annex_records', _call_annex_records):
+        res = ds.get('f')
+        assert_result_count(res, 1, action='get', status='ok')
+        eq_(sources, [['--from=other']])
+
+        # the cheapest remote lost the content without ds knowing about it,
+        # any other remote is tried next
+        ds.drop('f')
+        other.drop('f', reckless='kill')
+        sources.clear()
+        res = ds.get('f')
+        assert_result_count(res, 1, action='get', status='ok')
+        assert_result_count(res, 1, action='get')
+        eq_(sources, [['--from=other'], None])
+
+
 @slow  # started to >~30sec. https://github.com/datalad/datalad/issues/6412
 @known_failure_windows  # create-sibling-ria + ORA not fit for windows
 @with_tempfile
@@ -154,6 +154,12 @@ def test_update_simple(origin=None, src_path=None, dst_path=None):
     # full match
     res = dest.update(recursive=True, path=['subm 1', '2'])
     assert_result_count(res, 3, status='ok', type='dataset')
+    # same selection with datasets updated in parallel
+    for p, n in ((None, 3), ('whatever', 1), ('subm 1', 2),
+                 (['subm 1', '2'], 3)):
+        assert_result_count(
+            dest.update(recursive=True, path=p, jobs=2),
+            n, status='ok', type='dataset')
 
     # test that update doesn't crash if we specify only a single path (submod) to
     # operate on
@@ -13,17 +13,21 @@
 __docformat__ = 'restructuredtext'
 
 
-import itertools
 import logging
 from os.path import lexists
 
-from datalad.distribution.dataset import require_dataset
+from datalad.distribution.dataset import (
+    Dataset,
+    require_dataset,
+    resolve_path,
+)
 from datalad.interface.base import (
     Interface,
     build_doc,
     eval_results,
 )
 from datalad.interface.common_opts import (
+    jobs_opt,
     recursion_flag,
     recursion_limit,
 )
@@ -42,7 +46,12 @@ from datalad.support.exceptions import (
     CapturedException,
     CommandError,
 )
+from datalad.support.parallel import ProducerConsumer
 from datalad.support.param import Parameter
+from datalad.utils import (
+    Path,
+    ensure_list,
+)
 
 from .dataset import (
     EnsureDataset,
@@ -209,7 +218,9 @@ class Update(Interface):
             args=("--reobtain-data",),
             action="store_true",
             doc="""if enabled, file content that was present before an update
-            will be re-obtained in case a file was changed by the update."""), )
+            will be re-obtained in case a file was changed by the update."""),
+        jobs=jobs_opt,
+    )
 
     @staticmethod
     @datasetmethod(name='update')
@@ -226,7 +237,8 @@ class Update(Interface):
             recursive=False,
             recursion_limit=None,
             fetch_all=None,
-            reobtain_data=False):
+            reobtain_data=False,
+            jobs=None):
         if fetch_all is not None:
             lgr.warning('update(fetch_all=...) called. Option has no effect, and will be removed')
         if path and not recursive:
@@ -243,181 +255,27 @@ class Update(Interface):
         save_paths = []
         update_failures = set()
         saw_subds = False
-        for ds, revision in itertools.chain([(refds, None)], refds.subdatasets(
-                path=path,
-                state='present',
-                recursive=recursive,
-                recursion_limit=recursion_limit,
-                return_type='generator',
-                result_renderer='disabled',
-                result_xfm=YieldDatasetAndRevision()) if recursive else []):
-            if ds != refds:
+        update_kwargs = dict(
+            refds=refds,
+            sibling=sibling,
+            how=how,
+            how_subds=how_subds,
+            follow=follow,
+            reobtain_data=reobtain_data,
+            save_paths=save_paths,
+            update_failures=update_failures,
+        )
+        if recursive:
+            results = _update_recursive(
+                path, recursion_limit, jobs, update_kwargs)
+        else:
+            results = _update_ds(refds, None, **update_kwargs)
+        for res in results:
+            if res.get('path') != refds.path \
+                    and res.get('action') == 'update':
                 saw_subds = True
-            repo = ds.repo
-            is_annex = isinstance(repo, AnnexRepo)
-            # prepare return value
-            res = get_status_dict('update', ds=ds, logger=lgr, refds=refds.path)
-
-            follow_parent = revision and follow.startswith("parentds")
-            follow_parent_lazy = revision and follow == "parentds-lazy"
-            if follow_parent_lazy and \
-               repo.get_hexsha(repo.get_corresponding_branch()) == revision:
-                res["message"] = (
-                    "Dataset already at commit registered in parent: %s",
-                    repo.path)
-                res["status"] = "notneeded"
-                yield res
-                continue
-
-            how_curr = how_subds if revision else how
-            # get all remotes which have references (would exclude
-            # special remotes)
-            remotes = repo.get_remotes(
-                **({'exclude_special_remotes': True} if is_annex else {}))
-            if not remotes and not sibling:
-                res['message'] = ("No siblings known to dataset at %s\nSkipping",
-                                  repo.path)
-                res['status'] = 'notneeded'
-                yield res
-                continue
-            curr_branch = repo.get_active_branch()
-            tracking_remote = None
-            if not sibling and len(remotes) == 1:
-                # there is only one remote, must be this one
-                sibling_ = remotes[0]
-            elif not sibling:
-                # nothing given, look for tracking branch
-                tracking_remote = repo.get_tracking_branch(
-                    branch=curr_branch, remote_only=True)[0]
-                sibling_ = tracking_remote
-            else:
-                sibling_ = sibling
-            if sibling_ and sibling_ not in remotes:
-                res['message'] = ("'%s' not known to dataset %s\nSkipping",
-                                  sibling_, repo.path)
-                res['status'] = 'impossible'
-                yield res
-                continue
-            if not sibling_ and len(remotes) > 1 and how_curr:
-                lgr.debug("Found multiple siblings:\n%s", remotes)
-                res['status'] = 'impossible'
-                res['message'] = "Multiple siblings, please specify from which to update."
-                yield res
-                continue
-            lgr.info("Fetching updates for %s", ds)
-            # fetch remote
-            fetch_kwargs = dict(
-                # test against user-provided value!
-                remote=None if sibling is None else sibling_,
-                all_=sibling is None,
-                git_options=[
-                    # required to not trip over submodules that were removed in
-                    # the origin clone
-                    "--no-recurse-submodules",
-                    # prune to not accumulate a mess over time
-                    "--prune"]
-            )
-            if not (follow_parent_lazy and repo.commit_exists(revision)):
-                try:
-                    repo.fetch(**fetch_kwargs)
-                except CommandError as exc:
-                    ce = CapturedException(exc)
-                    yield get_status_dict(status="error",
-                                          message=("Fetch failed: %s", ce),
-                                          exception=ce,
-                                          **res,)
-                    continue
-
-            # NOTE reevaluate ds.repo again, as it might have be converted from
-            # a GitRepo to an AnnexRepo
-            repo = ds.repo
-
-            if follow_parent and not repo.commit_exists(revision):
-                if sibling_:
-                    try:
-                        lgr.debug("Fetching revision %s directly for %s",
-                                  revision, repo)
-                        repo.fetch(remote=sibling_, refspec=revision,
-                                   git_options=["--recurse-submodules=no"])
-                    except CommandError as exc:
-                        ce = CapturedException(exc)
-                        yield dict(
-                            res,
-                            status="impossible",
-                            message=(
-                                "Attempt to fetch %s from %s failed: %s",
-                                revision, sibling_, ce),
-                            exception=ce
-                        )
-                        continue
-                else:
-                    yield dict(res,
-                               status="impossible",
-                               message=("Need to fetch %s directly "
-                                        "but single sibling not resolved",
-                                        revision))
-                    continue
-
-            saw_update_failure = False
-            if how_curr:
-                if follow_parent:
-                    target = revision
-                else:
-                    target = _choose_update_target(
-                        repo, curr_branch,
-                        sibling_, tracking_remote)
-
-                adjusted = is_annex and repo.is_managed_branch(curr_branch)
-                if adjusted:
-                    if follow_parent:
-                        yield dict(
-                            res, status="impossible",
-                            message=("follow='parentds' is incompatible "
-                                     "with adjusted branches"))
-                        continue
-                    if how_curr != "merge":
-                        yield dict(
-                            res, status="impossible",
-                            message=("Updating via '%s' is incompatible "
-                                     "with adjusted branches",
-                                     how_curr))
-                        continue
-
-                update_fn = _choose_update_fn(
-                    repo,
-                    how_curr,
-                    is_annex=is_annex,
-                    adjusted=adjusted)
-
-                fn_opts = ["--ff-only"] if how_curr == "ff-only" else None
-                if update_fn is not _annex_sync:
-                    if target is None:
-                        yield dict(res,
-                                   status="impossible",
-                                   message="Could not determine update target")
-                        continue
-
-                if is_annex and reobtain_data:
-                    update_fn = _reobtain(ds, update_fn)
-
-                for ures in update_fn(repo, sibling_, target, opts=fn_opts):
-                    # NOTE: Ideally the "merge" action would also be prefixed
-                    # with "update.", but a plain "merge" is used for backward
-                    # compatibility.
-                    if ures["status"] != "ok" and (
-                            ures["action"] == "merge" or
-                            ures["action"].startswith("update.")):
-                        saw_update_failure = True
-                    yield dict(res, **ures)
-
-            if saw_update_failure:
-                update_failures.add(ds)
-                res['status'] = 'error'
-                res['message'] = ("Update of %s failed", target)
-            else:
-                res['status'] = 'ok'
-                save_paths.append(ds.path)
             yield res
+        how_curr = how_subds if saw_subds else how
         # we need to save updated states only if merge was requested -- otherwise
         # it was a pure fetch
         if how_curr and recursive:
@@ -425,6 +283,230 @@ class Update(Interface):
                 refds, save_paths, update_failures, path, saw_subds)
 
 
+def _update_ds(ds, revision, refds, sibling, how, how_subds, follow,
+               reobtain_data, save_paths, update_failures):
+    """Update a single dataset
+
+    `revision` is the commit registered in the parent dataset, or None for
+    the reference dataset. The dataset path is recorded in `save_paths` on
+    success, and the dataset in `update_failures` on a failed update.
+    """
+    repo = ds.repo
+    is_annex = isinstance(repo, AnnexRepo)
+    # prepare return value
+    res = get_status_dict('update', ds=ds, logger=lgr, refds=refds.path)
+
+    follow_parent = revision and follow.startswith("parentds")
+    follow_parent_lazy = revision and follow == "parentds-lazy"
+    if follow_parent_lazy and \
+       repo.get_hexsha(repo.get_corresponding_branch()) == revision:
+        res["message"] = (
+            "Dataset already at commit registered in parent: %s",
+            repo.path)
+        res["status"] = "notneeded"
+        yield res
+        return
+
+    how_curr = how_subds if revision else how
+    # get all remotes which have references (would exclude
+    # special remotes)
+    remotes = repo.get_remotes(
+        **({'exclude_special_remotes': True} if is_annex else {}))
+    if not remotes and not sibling:
+        res['message'] = ("No siblings known to dataset at %s\nSkipping",
+                          repo.path)
+        res['status'] = 'notneeded'
+        yield res
+        return
+    curr_branch = repo.get_active_branch()
+    tracking_remote = None
+    if not sibling and len(remotes) == 1:
+        # there is only one remote, must be this one
+        sibling_ = remotes[0]
+    elif not sibling:
+        # nothing given, look for tracking branch
+        tracking_remote = repo.get_tracking_branch(
+            branch=curr_branch, remote_only=True)[0]
+        sibling_ = tracking_remote
+    else:
+        sibling_ = sibling
+    if sibling_ and sibling_ not in remotes:
+        res['message'] = ("'%s' not known to dataset %s\nSkipping",
+                          sibling_, repo.path)
+        res['status'] = 'impossible'
+        yield res
+        return
+    if not sibling_ and len(remotes) > 1 and how_curr:
+        lgr.debug("Found multiple siblings:\n%s", remotes)
+        res['status'] = 'impossible'
+        res['message'] = "Multiple siblings, please specify from which to update."
+        yield res
+        return
+    lgr.info("Fetching updates for %s", ds)
+    # fetch remote
+    fetch_kwargs = dict(
+        # test against user-provided value!
+        remote=None if sibling is None else sibling_,
+        all_=sibling is None,
+        git_options=[
+            # required to not trip over submodules that were removed in
+            # the origin clone
+            "--no-recurse-submodules",
+            # prune to not accumulate a mess over time
+            "--prune"]
+    )
+    if not (follow_parent_lazy and repo.commit_exists(revision)):
+        try:
+            repo.fetch(**fetch_kwargs)
+        except CommandError as exc:
+            ce = CapturedException(exc)
+            yield get_status_dict(status="error",
+                                  message=("Fetch failed: %s", ce),
+                                  exception=ce,
+                                  **res,)
+            return
+
+    # NOTE reevaluate ds.repo again, as it might have be converted from
+    # a GitRepo to an AnnexRepo
+    repo = ds.repo
+
+    if follow_parent and not repo.commit_exists(revision):
+        if sibling_:
+            try:
+                lgr.debug("Fetching revision %s directly for %s",
+                          revision, repo)
+                repo.fetch(remote=sibling_, refspec=revision,
+                           git_options=["--recurse-submodules=no"])
+            except CommandError as exc:
+                ce = CapturedException(exc)
+                yield dict(
+                    res,
+                    status="impossible",
+                    message=(
+                        "Attempt to fetch %s from %s failed: %s",
+                        revision, sibling_, ce),
+                    exception=ce
+                )
+                return
+        else:
+            yield dict(res,
+                       status="impossible",
+                       message=("Need to fetch %s directly "
+                                "but single sibling not resolved",
+                                revision))
+            return
+
+    saw_update_failure = False
+    if how_curr:
+        if follow_parent:
+            target = revision
+        else:
+            target = _choose_update_target(
+                repo, curr_branch,
+                sibling_, tracking_remote)
+
+        adjusted = is_annex and repo.is_managed_branch(curr_branch)
+        if adjusted:
+            if follow_parent:
+                yield dict(
+                    res, status="impossible",
+                    message=("follow='parentds' is incompatible "
+                             "with adjusted branches"))
+                return
+            if how_curr != "merge":
+                yield dict(
+                    res, status="impossible",
+                    message=("Updating via '%s' is incompatible "
+                             "with adjusted branches",
+                             how_curr))
+                return
+
+        update_fn = _choose_update_fn(
+            repo,
+            how_curr,
+            is_annex=is_annex,
+            adjusted=adjusted)
+
+        fn_opts = ["--ff-only"] if how_curr == "ff-only" else None
+        if update_fn is not _annex_sync:
+            if target is None:
+                yield dict(res,
+                           status="impossible",
+                           message="Could not determine update target")
+                return
+
+        if is_annex and reobtain_data:
+            update_fn = _reobtain(ds, update_fn)
+
+        for ures in update_fn(repo, sibling_, target, opts=fn_opts):
+            # NOTE: Ideally the "merge" action would also be prefixed
+            # with "update.", but a plain "merge" is used for backward
+            # compatibility.
+            if ures["status"] != "ok" and (
+                    ures["action"] == "merge" or
+                    ures["action"].startswith("update.")):
+                saw_update_failure = True
+            yield dict(res, **ures)
+
+    if saw_update_failure:
+        update_failures.add(ds)
+        res['status'] = 'error'
+        res['message'] = ("Update of %s failed", target)
+    else:
+        res['status'] = 'ok'
+        save_paths.append(ds.path)
+    yield res
+
+
+def _update_recursive(path, recursion_limit, jobs, update_kwargs):
+    """Update a dataset hierarchy, with unrelated datasets in parallel
+
+    A subdataset is only updated after its superdataset, and the subdatasets
+    of a dataset are only discovered once it was updated, so that the
+    commits registered after the update are used with `follow='parentds'`.
+    With a single job, datasets are updated depth-first, in the order
+    reported by `subdatasets`.
+    """
+    refds = update_kwargs['refds']
+    paths = resolve_path(ensure_list(path), refds) if path else None
+    parallel = ProducerConsumer.get_effective_jobs(jobs) > 1
+
+    def update_and_expand(spec):
+        ds, revision, level, to_report = spec
+        if to_report:
+            yield from _update_ds(ds, revision, **update_kwargs)
+        if recursion_limit is not None and level >= recursion_limit:
+            return
+        for sm in ds.subdatasets(
+                state='present',
+                recursive=False,
+                return_type='generator',
+                result_renderer='disabled'):
+            sm_path = Path(sm['path'])
+            # same path constraints as with subdatasets(path=...)
+            report = paths is None \
+                or any(p == sm_path or p in sm_path.parents for p in paths)
+            if report or any(sm_path in p.parents for p in paths):
+                sm_spec = (Dataset(sm_path), sm.get('gitshasum'), level + 1,
+                           report)
+                if parallel:
+                    pc.add_to_producer_queue(sm_spec)
+                else:
+                    yield from update_and_expand(sm_spec)
+
+    root_spec = (refds, None, 0, True)
+    if not parallel:
+        yield from update_and_expand(root_spec)
+        return
+    pc = ProducerConsumer(
+        [root_spec],
+        update_and_expand,
+        producer_future_key=lambda spec: spec[0].path,
+        jobs=jobs,
+    )
+    yield from pc
+
+
 def _save_after_update(refds, tosave, update_failures, path_arg, saw_subds):
     if path_arg and not saw_subds:
         lgr.warning(
@@ -12,14 +12,17 @@
 
 __docformat__ = 'restructuredtext'
 
+import json
 import os
 import os.path as op
 import sys
+import threading
 import time
 from abc import (
     ABCMeta,
     abstractmethod,
 )
+from concurrent.futures import ThreadPoolExecutor
 from logging import getLogger
 from os.path import (
     exists,
@@ -56,6 +59,50 @@ from .credentials import CompositeCredential
 
 lgr = getLogger('datalad.downloaders')
 
+# do not split a download into segments smaller than that
+_MIN_SEGMENT_SIZE = 1024 ** 2
+
+
+def _merge_ranges(ranges):
+    """Merge overlapping or adjacent [start, end) ranges"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def _get_missing_ranges(done, size):
+    """Return the [start, end) ranges of [0, size) not covered by `done`"""
+    missing = []
+    pos = 0
+    for start, end in _merge_ranges(done):
+        if start > pos:
+            missing.append([pos, start])
+        pos = max(pos, end)
+    if pos < size:
+        missing.append([pos, size])
+    return missing
+
+
+def _split_ranges(ranges, n, min_size):
+    """Split the largest ranges until there are `n` of them
+
+    Ranges are not split into pieces smaller than `min_size`.
+    """
+    ranges = [list(r) for r in ranges]
+    while ranges and len(ranges) < n:
+        largest = max(ranges, key=lambda r: r[1] - r[0])
+        start, end = largest
+        if end - start < 2 * min_size:
+            break
+        middle = start + (end - start) // 2
+        largest[1] = middle
+        ranges.append([middle, end])
+    return sorted(ranges)
+
 
 # TODO: remove headers, HTTP specific
 @auto_repr
@@ -73,11 +120,39 @@ class DownloaderSession(object):
         self.headers = headers
         self.url = url
 
+    # whether download_range() can be used for the content
+    supports_ranges = False
+    # identifies the version of the content, so that pieces downloaded at
+    # different times could be verified to belong together
+    validator = None
+
     def download(self, f=None, pbar=None, size=None):
         raise NotImplementedError("must be implemented in subclases")
 
         # TODO: get_status ?
 
+    def download_range(self, f, start, end, progress=None):
+        """Download bytes [start, end) of the content into a file
+
+        Parameters
+        ----------
+        f: file
+          Opened file positioned at the point to write the range to
+        start, end: int
+        progress: callable, optional
+          Called with the number of bytes written after each chunk
+
+        Returns
+        -------
+        int
+          Number of bytes written
+        """
+        raise NotImplementedError("must be implemented in subclases")
+
+    def close(self):
+        """Release resources (e.g. an open response) held by the session"""
+        pass
+
 
 @auto_repr
 class BaseDownloader(object, metaclass=ABCMeta):
@@ -466,22 +541,50 @@ class BaseDownloader(object, metaclass=ABCMeta):
         # FETCH CONTENT
         # TODO: pbar = ui.get_progressbar(size=response.headers['size'])
         temp_filepath = self._get_temp_download_filename(filepath)
+        state_filepath = temp_filepath + '-state'
+        # a partial download can be continued only if the server provides
+        # byte ranges of a content we can reliably identify
+        resumable = size is None \
+            and downloader_session.supports_ranges \
+            and bool(downloader_session.validator)
+        keep_partial = False
         try:
-            if exists(temp_filepath):
-                # eventually we might want to continue the download
+            done = self._read_download_state(
+                temp_filepath, state_filepath, downloader_session) \
+                if resumable else None
+            if done:
+                lgr.info(
+                    "Resuming download of %s with %d out of %d bytes present",
+                    url, sum(e - s for s, e in done), target_size)
+            elif exists(temp_filepath):
                 lgr.warning(
                     "Temporary file %s from the previous download was found. "
                     "It will be overridden" % temp_filepath)
-                # TODO.  also logic below would clean it up atm
-
-            with open(temp_filepath, 'wb') as fp:
-                # TODO: url might be a bit too long for the beast.
-                # Consider to improve to make it animated as well, or shorten here
-                pbar = ui.get_progressbar(label=url, fill_text=filepath, total=target_size)
-                t0 = time.time()
-                downloader_session.download(fp, pbar, size=size)
-                downloaded_time = time.time() - t0
-                pbar.finish()
+            segments = max(cfg.obtain('datalad.download.segments'), 1) \
+                if resumable else 1
+
+            # TODO: url might be a bit too long for the beast.
+            # Consider to improve to make it animated as well, or shorten here
+            pbar = ui.get_progressbar(label=url, fill_text=filepath, total=target_size)
+            t0 = time.time()
+            keep_partial = resumable
+            if resumable and (done or segments > 1):
+                # the response to the initial request is not needed
+                downloader_session.close()
+                self._download_ranges(
+                    downloader_session, temp_filepath, state_filepath,
+                    done or [], segments, pbar)
+            else:
+                if resumable:
+                    # content is written sequentially, so whatever gets
+                    # into the file is a valid prefix to resume from
+                    self._write_download_state(
+                        state_filepath, downloader_session, None)
+                with open(temp_filepath, 'wb') as fp:
+                    downloader_session.download(fp, pbar, size=size)
+            downloaded_time = time.time() - t0
+            pbar.finish()
+            keep_partial = False
             downloaded_size = os.stat(temp_filepath).st_size
 
             # (headers.get('Content-type', "") and headers.get('Content-Type')).startswith('text/html')
@@ -508,13 +611,133 @@ class BaseDownloader(object, metaclass=ABCMeta):
             lgr.error("Failed to download %s into %s: %s", url, filepath, ce)
             raise DownloadError(ce) from e # for now
         finally:
-            if exists(temp_filepath):
-                # clean up
-                lgr.debug("Removing a temporary download %s", temp_filepath)
-                unlink(temp_filepath)
+            downloader_session.close()
+            if keep_partial and exists(temp_filepath):
+                lgr.debug("Keeping a partial download %s to resume from",
+                          temp_filepath)
+            else:
+                for p in (temp_filepath, state_filepath):
+                    if exists(p):
+                        # clean up
+                        lgr.debug("Removing a temporary download %s", p)
+                        unlink(p)
 
         return filepath
 
+    @staticmethod
+    def _write_download_state(state_filepath, downloader_session, done):
+        """Record what is needed to resume a download later on
+
+        `done` lists the [start, end) byte ranges present in the temporary
+        file, or is None if the file holds a contiguous prefix of the
+        content, which then is as long as the file.
+        """
+        with open(state_filepath, 'w') as f:
+            json.dump(dict(validator=downloader_session.validator,
+                           size=downloader_session.size,
+                           done=done), f)
+
+    @staticmethod
+    def _read_download_state(temp_filepath, state_filepath,
+                             downloader_session):
+        """Return the byte ranges of a previous download usable for resuming
+
+        Returns
+        -------
+        list or None
+          None if there is nothing to resume from
+        """
+        if not (exists(temp_filepath) and exists(state_filepath)):
+            return None
+        try:
+            with open(state_filepath) as f:
+                state = json.load(f)
+            if state['validator'] != downloader_session.validator \
+                    or state['size'] != downloader_session.size:
+                lgr.debug("Content changed since the partial download %s, "
+                          "not resuming", temp_filepath)
+                return None
+            done = state['done']
+            if done is None:
+                prefix = min(os.stat(temp_filepath).st_size,
+                             downloader_session.size)
+                return [[0, prefix]] if prefix else []
+            return [[int(s), int(e)] for s, e in done]
+        except Exception as e:
+            lgr.debug("Cannot use download state %s: %s",
+                      state_filepath, CapturedException(e))
+            return None
+
+    def _download_ranges(self, downloader_session, temp_filepath,
+                         state_filepath, done, segments, pbar):
+        """Download the ranges missing from `done` into a preallocated file
+
+        Up to `segments` ranges are downloaded in parallel.  Progress is
+        recorded in the state file, also if the download fails.
+        """
+        size = downloader_session.size
+        ranges = _split_ranges(
+            _get_missing_ranges(done, size), segments, _MIN_SEGMENT_SIZE)
+        # bytes fetched so far for each range
+        fetched = [0] * len(ranges)
+        total = sum(e - s for s, e in done)
+        lock = threading.Lock()
+        abort = threading.Event()
+
+        def _fetch_range(i):
+            start, end = ranges[i]
+
+            def _progress(n):
+                nonlocal total
+                if abort.is_set():
+                    raise DownloadError("Download was aborted")
+                with lock:
+                    fetched[i] += n
+                    total += n
+                    try:
+                        pbar.update(total)
+                    except Exception as e:
+                        lgr.warning("Failed to update progressbar: %s",
+                                    CapturedException(e))
+
+            with open(temp_filepath, 'r+b') as f:
+                f.seek(start)
+                downloader_session.download_range(
+                    f, start, end, progress=_progress)
+
+        self._write_download_state(state_filepath, downloader_session, done)
+        mode = 'r+b' if exists(temp_filepath) else 'wb'
+        with open(temp_filepath, mode) as f:
+            f.truncate(size)
+        lgr.debug("Downloading %d byte range(s) of %s",
+                  len(ranges), downloader_session.url)
+        try:
+            with ThreadPoolExecutor(
+                    max_workers=min(segments, len(ranges) or 1)) \
+                    as executor:
+                futures = [executor.submit(_fetch_range, i)
+                           for i in range(len(ranges))]
+                # let the other ranges complete if one fails, to keep as
+                # much as possible for resuming
+                errors = []
+                try:
+                    for future in futures:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            errors.append(e)
+                except BaseException:
+                    # e.g. interrupted by the user
+                    abort.set()
+                    raise
+            if errors:
+                raise errors[0]
+        finally:
+            self._write_download_state(
+                state_filepath, downloader_session,
+                _merge_ranges(done + [[s, s + n] for (s, e), n in
+                                      zip(ranges, fetched) if n]))
+
     def download(self, url, path=None, **kwargs):
         """Fetch content as pointed by the URL optionally into a file
 
@@ -27,6 +27,7 @@ from ..support.exceptions import (
     AccessFailedError,
     CapturedException,
     DownloadError,
+    IncompleteDownloadError,
     UnhandledRedirectError,
 )
 from ..support.network import (
@@ -468,12 +469,77 @@ class HTTPAnonBearerTokenAuthenticator(HTTPBearerTokenAuthenticator):
 @auto_repr
 class HTTPDownloaderSession(DownloaderSession):
     def __init__(self, size=None, filename=None,  url=None, headers=None,
-                 response=None, chunk_size=1024 ** 2):
+                 response=None, chunk_size=1024 ** 2, session=None):
         super(HTTPDownloaderSession, self).__init__(
             size=size, filename=filename, url=url, headers=headers,
         )
         self.chunk_size = chunk_size
         self.response = response
+        # requests session to issue further (range) requests with
+        self.session = session
+
+    @property
+    def supports_ranges(self):
+        headers = self.headers or {}
+        return bool(self.size) and self.session is not None \
+            and headers.get('Accept-Ranges', '').strip().lower() == 'bytes' \
+            and not headers.get('Content-Encoding')
+
+    @property
+    def validator(self):
+        headers = self.headers or {}
+        etag = headers.get('ETag')
+        # weak ETags cannot be used with If-Range
+        if etag and not etag.startswith('W/'):
+            return etag
+        return headers.get('Last-Modified')
+
+    def download_range(self, f, start, end, progress=None):
+        headers = {
+            'Accept-Encoding': '',
+            'Range': 'bytes=%d-%d' % (start, end - 1),
+        }
+        if self.validator:
+            # server responds with the full content if it has changed
+            # since, so we never combine pieces of different versions
+            headers['If-Range'] = self.validator
+        response = self.session.get(self.url, stream=True, headers=headers)
+        try:
+            if response.status_code not in (206, 416):
+                check_response_status(response, session=self.session)
+                raise DownloadError(
+                    "Failed to download bytes %d-%d of %s: the content has "
+                    "changed or ranges are not supported (status code %d)"
+                    % (start, end - 1, self.url, response.status_code))
+            content_range = response.headers.get('Content-Range', '')
+            if not re.match(r'bytes\s+%d-%d/' % (start, end - 1),
+                            content_range):
+                raise DownloadError(
+                    "Requested bytes %d-%d of %s, got %r"
+                    % (start, end - 1, self.url, content_range))
+            total = 0
+            for chunk in response.raw.stream(self.chunk_size,
+                                             decode_content=False):
+                if not chunk:
+                    continue
+                chunk = chunk[:end - start - total]
+                f.write(chunk)
+                total += len(chunk)
+                if progress:
+                    progress(len(chunk))
+                if total >= end - start:
+                    break
+        finally:
+            response.close()
+        if total < end - start:
+            raise IncompleteDownloadError(
+                "Downloaded %d out of %d bytes of the range %d-%d of %s"
+                % (total, end - start, start, end - 1, self.url))
+        return total
+
+    def close(self):
+        if self.response is not None:
+            self.response.close()
 
     def download(self, f=None, pbar=None, size=None):
         response = self.response
@@ -665,7 +731,8 @@ class HTTPDownloader(BaseDownloader):
             url=response.url,
             filename=url_filename,
             headers=headers,
-            response=response
+            response=response,
+            session=self._session,
         )
 
     @classmethod
@@ -39,6 +39,7 @@ from ..http import (
     HTTPBaseAuthenticator,
     HTTPBearerTokenAuthenticator,
     HTTPDownloader,
+    HTTPDownloaderSession,
     HTTPTokenAuthenticator,
     process_www_authenticate,
 )
@@ -72,6 +73,7 @@ from ...tests.utils_pytest import (
     assert_raises,
     known_failure_githubci_win,
     ok_file_has_content,
+    patch_config,
     serve_path_via_http,
     skip_if,
     skip_if_no_network,
@@ -201,6 +203,106 @@ def test_HTTPDownloader_basic(toppath=None, topurl=None):
     # TODO: access denied detection
 
 
+# 4 MiB, to be split into several segments
+_ranged_content = ''.join('%07d\n' % i for i in range(2 ** 19))
+
+
+def _download_interrupted(self, f=None, pbar=None, size=None):
+    f.write(self.response.raw.read(1000))
+    raise IOError("Connection lost")
+
+
+def _recording_download_range(ranges, fail_at=None):
+    orig = HTTPDownloaderSession.download_range
+
+    def download_range(self, f, start, end, progress=None):
+        ranges.append((start, end))
+        if start == fail_at:
+            raise IOError("Connection lost")
+        return orig(self, f, start, end, progress=progress)
+    return download_range
+
+
+@with_tree(tree=[('file.dat', _ranged_content)])
+@serve_path_via_http
+def test_HTTPDownloader_resume(toppath=None, topurl=None):
+    furl = topurl + "file.dat"
+    tfpath = opj(toppath, "file-downloaded.dat")
+    temp_filepath = BaseDownloader._get_temp_download_filename(tfpath)
+    state_filepath = temp_filepath + '-state'
+    downloader = HTTPDownloader()
+
+    def interrupt():
+        with patch.object(HTTPDownloaderSession, 'download',
+                          _download_interrupted), \
+                swallow_logs():
+            assert_raises(DownloadError, downloader.download, furl, tfpath,
+                          overwrite=True)
+        ok_file_has_content(temp_filepath, _ranged_content[:1000])
+        assert os.path.exists(state_filepath)
+
+    def download():
+        ranges = []
+        with patch.object(HTTPDownloaderSession, 'download_range',
+                          _recording_download_range(ranges)):
+            downloader.download(furl, tfpath, overwrite=True)
+        ok_file_has_content(tfpath, _ranged_content)
+        assert_false(os.path.exists(temp_filepath))
+        assert_false(os.path.exists(state_filepath))
+        return ranges
+
+    interrupt()
+    # only the remainder is fetched
+    assert_equal(download(), [(1000, len(_ranged_content))])
+
+    # content changed on the server, partial download is not used
+    interrupt()
+    served = opj(toppath, "file.dat")
+    mtime = os.stat(served).st_mtime - 100
+    os.utime(served, (mtime, mtime))
+    assert_equal(download(), [])
+
+    # neither it is with an unusable state
+    interrupt()
+    with open(state_filepath, 'w') as f:
+        f.write('garbage')
+    assert_equal(download(), [])
+
+
+@with_tree(tree=[('file.dat', _ranged_content)])
+@serve_path_via_http
+def test_HTTPDownloader_segments(toppath=None, topurl=None):
+    furl = topurl + "file.dat"
+    tfpath = opj(toppath, "file-downloaded.dat")
+    downloader = HTTPDownloader()
+    mib = 1024 ** 2
+    ranges = []
+    with patch_config({'datalad.download.segments': '4'}):
+        # one of the segments fails, the others are kept
+        with patch.object(HTTPDownloaderSession, 'download_range',
+                          _recording_download_range(ranges, fail_at=mib)), \
+                swallow_logs():
+            assert_raises(DownloadError, downloader.download, furl, tfpath)
+        assert_equal(sorted(ranges),
+                     [(i * mib, (i + 1) * mib) for i in range(4)])
+        assert_false(os.path.exists(tfpath))
+
+        ranges = []
+        with patch.object(HTTPDownloaderSession, 'download_range',
+                          _recording_download_range(ranges)):
+            downloader.download(furl, tfpath)
+        assert_equal(ranges, [(mib, 2 * mib)])
+        ok_file_has_content(tfpath, _ranged_content)
+
+        ranges = []
+        with patch.object(HTTPDownloaderSession, 'download_range',
+                          _recording_download_range(ranges)):
+            downloader.download(furl, tfpath, overwrite=True)
+        assert_equal(sorted(ranges),
+                     [(i * mib, (i + 1) * mib) for i in range(4)])
+        ok_file_has_content(tfpath, _ranged_content)
+
+
 @with_tree(tree=[('file.dat', 'abc')])
 @serve_path_via_http
 @with_memory_keyring
@@ -527,6 +527,44 @@ _definitions = {
         'type': EnsureInt(),
         'default': 3,
     },
+    'datalad.get.max-transfers': {
+        'ui': ('question', {
+            'title': 'Maximum number of concurrent content transfers',
+            'text': 'Process-wide limit for the number of annexed file '
+                    'transfers that `get` runs at the same time, across '
+                    'all datasets and concurrent `get` calls. If not set, '
+                    'each `get` call runs as many transfers as its "jobs" '
+                    'setting permits. For `get`, "jobs" is the number of '
+                    'concurrent transfers across all datasets of a call, '
+                    'not the number of `git annex get -J` jobs per '
+                    'dataset.'}),
+        'type': EnsureInt() | EnsureNone(),
+        'default': None,
+    },
+    'datalad.get.max-bandwidth': {
+        'ui': ('question', {
+            'title': 'Maximum bandwidth for content transfers (bytes/s)',
+            'text': 'Total bandwidth that the concurrent transfers of a '
+                    'single `get` call may use. It is split evenly across '
+                    'the "jobs" of the call, and enforced via annex.bwlimit, '
+                    'hence it only applies to remotes that support it. '
+                    'Unlike "datalad.get.max-transfers", this is a limit per '
+                    '`get` call, concurrent calls each use up to this '
+                    'bandwidth.'}),
+        'type': EnsureInt() | EnsureNone(),
+        'default': None,
+    },
+    'datalad.download.segments': {
+        'ui': ('question', {
+            'title': 'Number of parallel segments of a download',
+            'text': 'Number of byte ranges of a single file that are '
+                    'downloaded in parallel, if the server supports byte '
+                    'ranges and identifies the content with an ETag or '
+                    'Last-Modified header. Partial downloads from such '
+                    'servers are resumed regardless of this setting.'}),
+        'type': EnsureInt(),
+        'default': 1,
+    },
     'datalad.repo.backend': {
         'ui': ('question', {
                'title': 'git-annex backend',
@@ -547,6 +585,30 @@ _definitions = {
         'type': EnsureInt(),
         'default': 8,
     },
+    'datalad.runtime.content-info-cache': {
+        'ui': ('yesno', {
+            'title': 'Cache content information reported by Git',
+            'text': 'If enabled, information on tracked repository content '
+                    'is cached on disk (in .git/datalad/cache), and reused '
+                    'for as long as the Git index (or the queried tree) '
+                    'remains unchanged.'}),
+        'type': EnsureBool(),
+        'default': True,
+    },
+    'datalad.runtime.worktree-monitor': {
+        'ui': ('yesno', {
+            'title': 'Query worktree changes via a single `git status`',
+            'text': 'If enabled, modified and untracked content is '
+                    'determined with one `git status` call, instead of '
+                    'separate `git ls-files` calls that each walk the entire '
+                    'worktree. This lets Git use a configured filesystem '
+                    'monitor (core.fsmonitor) and untracked cache '
+                    '(core.untrackedCache) to only inspect changed paths, '
+                    'if they are configured. '
+                    'Only status reports on entire repositories are affected.'}),
+        'type': EnsureBool(),
+        'default': False,
+    },
     'datalad.runtime.max-annex-jobs': {
         'ui': ('question', {
                'title': 'Maximum number of git-annex jobs to request when "jobs" option set to "auto" (default)',
@@ -561,6 +623,13 @@ _definitions = {
         'type': EnsureInt(),
         'default': 20,
     },
+    'datalad.runtime.max-batched-fds': {
+        'ui': ('question', {
+            'title': 'Maximum number of file descriptors batched commands may hold',
+            'text': 'Automatic cleanup of batched commands will close the least recently used commands to keep the number of pipes to them below this limit. By default, half of the limit on open files for the process is used.'}),
+        'type': EnsureInt() | EnsureNone(),
+        'default': None,
+    },
     'datalad.runtime.max-inactive-age': {
         'ui': ('question', {
             'title': 'Maximum time (in seconds) a batched command can be'
@@ -606,6 +675,16 @@ _definitions = {
         'type': EnsureChoice('all', 'success', 'failure', 'ok', 'notneeded', 'impossible', 'error'),
         'default': None,
     },
+    'datalad.runtime.runner': {
+        'ui': ('question', {
+            'title': 'Subprocess runner implementation',
+            'text': "Selects how DataLad communicates with subprocesses. 'threaded' uses "
+                    "dedicated threads to read from, write to, and wait for each subprocess. "
+                    "'asyncio' services all subprocesses with a single event loop, which keeps "
+                    "the number of threads low when many commands run concurrently."}),
+        'type': EnsureChoice('threaded', 'asyncio'),
+        'default': 'threaded',
+    },
     'datalad.runtime.stalled-external': {
         'ui': ('question', {
             'title': 'Behavior for handing external processes',
@@ -13,11 +13,19 @@ import json
 import logging
 import os
 import re
+import sqlite3
 import string
 import sys
+import tempfile
+import weakref
 from collections import defaultdict
 from collections.abc import Mapping
+from contextlib import contextmanager
 from functools import partial
+from itertools import (
+    chain,
+    islice,
+)
 from urllib.parse import urlparse
 
 import datalad.support.path as op
@@ -46,6 +54,7 @@ from datalad.log import (
 from datalad.support.exceptions import (
     CapturedException,
     CommandError,
+    MissingExternalDependency,
 )
 from datalad.support.external_versions import external_versions
 from datalad.support.itertools import groupby_sorted
@@ -60,6 +69,8 @@ from datalad.utils import (
     Path,
     ensure_list,
     get_suggestions_msg,
+    get_tempfile_kwargs,
+    rmtree,
     unlink,
 )
 
@@ -307,9 +318,13 @@ class AnnexKeyParser(object):
         except KeyError as exc:
             lgr.warning("Row missing fields for --key: %s", exc)
             return {}
+        return self.parse_formatted(key)
 
+    def parse_formatted(self, key):
+        """Like `parse()`, but for a key that has already been formatted.
+        """
         if key == self.empty:
-            lgr.debug("All fields in --key's value are empty in row: %s", row)
+            lgr.debug("All fields in --key's value are empty: %s", key)
             # We got the same string that'd we get if all the fields were
             # empty, so this doesn't have a key.
             return {}
@@ -378,10 +393,22 @@ def fmt_to_name(format_string, num_to_name):
         return name
 
 
-INPUT_TYPES = ["ext", "csv", "tsv", "json"]
+INPUT_TYPES = ["ext", "csv", "tsv", "json", "jsonl", "parquet"]
 
+# Number of rows processed at once in streaming mode
+_STREAM_CHUNK_SIZE = 10000
 
-def _read(stream, input_type):
+# Number of rows with a key whose URLs are registered together
+_REGISTER_CHUNK_SIZE = 1000
+
+
+def _iter_read(stream, input_type):
+    """Like `_read()`, but return an iterator over the rows
+
+    CSV, TSV and JSON-lines input is read incrementally while iterating. A
+    JSON array can only be loaded as a whole. Parquet input is provided as
+    `_ColumnarRows`, which reads record batches while iterating.
+    """
     if input_type in ["csv", "tsv"]:
         import csv
         csvrows = csv.reader(stream,
@@ -394,17 +421,23 @@ def _read(stream, input_type):
         lgr.debug("Taking %s fields from first line as headers: %s",
                   len(headers), headers)
         idx_map = dict(enumerate(headers))
-        rows = [dict(zip(headers, r)) for r in csvrows]
+        rows = (dict(zip(headers, r)) for r in csvrows)
     elif input_type == "json":
         import json
         try:
-            rows = json.load(stream)
+            rows = iter(json.load(stream))
         except json.decoder.JSONDecodeError as e:
             raise ValueError(
                 f"Failed to read JSON from stream {stream}") from e
         # For json input, we do not support indexing by position,
         # only names.
         idx_map = {}
+    elif input_type == "jsonl":
+        rows = _iter_jsonl(stream)
+        idx_map = {}
+    elif input_type == "parquet":
+        rows = _ColumnarRows.from_parquet(stream)
+        idx_map = dict(enumerate(rows.names))
     else:
         raise ValueError(
             "input_type {} is invalid. Known values: {}"
@@ -412,28 +445,146 @@ def _read(stream, input_type):
     return rows, idx_map
 
 
-def _read_from_file(fname, input_type):
-    from_stdin = fname == "-"
-    if input_type == "ext":
-        if from_stdin:
-            input_type = "json"
+def _iter_jsonl(stream):
+    empty = True
+    for lineno, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.decoder.JSONDecodeError as e:
+            raise ValueError(
+                f"Failed to read JSON from line {lineno} of {stream}") from e
+        empty = False
+    if empty:
+        # like for CSV input without a header, there is nothing to go by
+        raise ValueError(f"Failed to read JSON lines from {stream}")
+
+
+class _ColumnarRows(object):
+    """Rows of columnar input, backed by a pyarrow table or Parquet file.
+
+    Iterating yields a dict per row, like for the other input types, whereas
+    `iter_batches()` gives access to (a subset of) the columns so that
+    `iter_extract()` can format a whole batch of rows at once.
+
+    Parameters
+    ----------
+    source : pyarrow.Table or pyarrow.parquet.ParquetFile
+    """
+
+    def __init__(self, source):
+        import pyarrow as pa
+        if isinstance(source, pa.Table):
+            self._table, self._file = source, None
+            self.schema = source.schema
+            self._num_rows = source.num_rows
         else:
-            extension = os.path.splitext(fname)[1]
-            if extension == ".json":
-                input_type = "json"
-            elif extension == ".tsv":
-                input_type = "tsv"
-            else:
-                input_type = "csv"
+            self._table, self._file = None, source
+            self.schema = source.schema_arrow
+            self._num_rows = source.metadata.num_rows
+
+    @classmethod
+    def from_parquet(cls, stream):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise MissingExternalDependency(
+                "pyarrow",
+                msg="It is required to read Parquet input, install "
+                    "datalad[addurls-parquet]")
+        if not stream.seekable():
+            # The Parquet metadata is at the end of the file.
+            stream = pa.BufferReader(stream.read())
+        try:
+            return cls(pq.ParquetFile(stream))
+        except pa.ArrowInvalid as e:
+            raise ValueError(
+                f"Failed to read Parquet data from {stream}") from e
+
+    @property
+    def names(self):
+        return self.schema.names
 
-    fd = sys.stdin if from_stdin else open(fname)
+    def load(self):
+        """Return rows with all data read into memory.
+        """
+        if self._table is not None:
+            return self
+        return _ColumnarRows(self._file.read())
+
+    def __len__(self):
+        return self._num_rows
+
+    def __getitem__(self, idx):
+        # Only supported for loaded rows, see `load()`.
+        return self._table.slice(idx, 1).to_pylist()[0]
+
+    def __iter__(self):
+        for batch in self.iter_batches():
+            yield from batch.to_pylist()
+
+    def iter_batches(self, columns=None, batch_size=None):
+        """Yield `pyarrow.RecordBatch` instances with the given `columns`.
+        """
+        batch_size = batch_size or 65536
+        if self._file is not None:
+            return self._file.iter_batches(batch_size=batch_size,
+                                           columns=columns)
+        table = self._table if columns is None else self._table.select(columns)
+        return iter(table.to_batches(max_chunksize=batch_size))
+
+
+def _read(stream, input_type):
+    rows, idx_map = _iter_read(stream, input_type)
+    if isinstance(rows, _ColumnarRows):
+        return rows.load(), idx_map
+    return list(rows), idx_map
+
+
+def _get_input_type(fname, input_type):
+    if input_type != "ext":
+        return input_type
+    if fname == "-":
+        return "json"
+    extension = os.path.splitext(fname)[1]
+    if extension == ".json":
+        return "json"
+    elif extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    elif extension == ".parquet":
+        return "parquet"
+    elif extension == ".tsv":
+        return "tsv"
+    return "csv"
+
+
+@contextmanager
+def _open_url_file(fname, input_type):
+    """Context manager providing the rows of a URL file, see `_iter_read()`
+    """
+    input_type = _get_input_type(fname, input_type)
+    binary = input_type == "parquet"
+    if fname == "-":
+        fd = sys.stdin.buffer if binary else sys.stdin
+    else:
+        fd = open(fname, "rb" if binary else "r")
     try:
-        records, colidx_to_name = _read(fd, input_type)
-        if not records:
-            lgr.warning("No rows found in %s", fd)
+        yield _iter_read(fd, input_type)
     finally:
-        if fd is not sys.stdin:
+        if fname != "-":
             fd.close()
+
+
+def _read_from_file(fname, input_type):
+    with _open_url_file(fname, input_type) as (records, colidx_to_name):
+        if isinstance(records, _ColumnarRows):
+            records = records.load()
+        else:
+            records = list(records)
+        if not records:
+            lgr.warning("No rows found in %s", fname)
     return records, colidx_to_name
 
 
@@ -457,6 +608,82 @@ def _is_known_special_key(key):
     return key in _FIXED_SPECIAL_KEYS or re.match(r"\A_url[0-9]+\Z", key)
 
 
+def _get_field_name(field, colidx_to_name):
+    """Map a placeholder field to the name of the column it refers to.
+    """
+    # Like string.Formatter, consider only the part before any attribute
+    # access or indexing.
+    name = re.split(r"[.\[]", field, maxsplit=1)[0]
+    try:
+        return colidx_to_name.get(int(name))
+    except ValueError:
+        return name
+
+
+def _format_column(format_string, batch, colidx_to_name, missing_value=None):
+    """Format `format_string` for all rows of a record batch at once.
+
+    This covers placeholders that refer to string or integer columns without
+    null values, optionally with a "!l" conversion, and gives the same result
+    as formatting each row with `Formatter`.
+
+    Parameters
+    ----------
+    format_string : str
+    batch : pyarrow.RecordBatch
+    colidx_to_name : dict
+    missing_value : str, optional
+
+    Returns
+    -------
+    A list with the formatted string for each row, or None if the format
+    string cannot be evaluated column-wise.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    try:
+        parsed = list(string.Formatter().parse(format_string))
+    except ValueError:
+        # Leave it to the row-wise formatting to report the error.
+        return None
+    parts = []
+    for literal, field, spec, conversion in parsed:
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if spec or conversion not in (None, "l") or re.search(r"[.\[]", field):
+            return None
+        name = _get_field_name(field, colidx_to_name)
+        idx = -1 if name is None else batch.schema.get_field_index(name)
+        if idx < 0:
+            return None
+        column = batch.column(idx)
+        if column.null_count:
+            return None
+        if pa.types.is_integer(column.type):
+            column = pc.cast(column, pa.string())
+        elif pa.types.is_string(column.type) or \
+                pa.types.is_large_string(column.type):
+            column = pc.cast(column, pa.string())
+            if missing_value is not None:
+                column = pc.if_else(pc.equal(column, ""), missing_value,
+                                    column)
+        else:
+            return None
+        if conversion == "l":
+            if not pc.all(pc.string_is_ascii(column)).as_py():
+                # Leave Unicode case mapping to str.lower().
+                return None
+            column = pc.ascii_lower(column)
+        parts.append(column)
+
+    if all(isinstance(p, str) for p in parts):
+        return ["".join(parts)] * batch.num_rows
+    return pc.binary_join_element_wise(*parts, "").to_pylist()
+
+
 def _get_placeholder_exception(exc, what, row):
     """Recast KeyError as a ValueError with close-match suggestions.
     """
@@ -550,8 +777,11 @@ def get_url_parts(url):
     return names
 
 
-def add_extra_filename_values(filename_format, rows, urls, dry_run):
+def add_extra_filename_values(filename_format, rows, urls, dry_run, start=0):
     """Extend `rows` with values for special formatting fields.
+
+    `start` is the position of the first of `rows` among all rows, and is
+    used to give each row a unique dummy file name in `dry_run` mode.
     """
     file_fields = list(get_fmt_names(filename_format))
     if any(i.startswith("_url") for i in file_fields):
@@ -561,7 +791,7 @@ def add_extra_filename_values(filename_format, rows, urls, dry_run):
     if any(i.startswith("_url_filename") for i in file_fields):
         if dry_run:  # Don't waste time making requests.
             dummy = get_file_parts("BASE.EXT", "_url_filename")
-            for idx, row in enumerate(rows):
+            for idx, row in enumerate(rows, start=start):
                 row.update(
                     {k: v + str(idx) for k, v in dummy.items()})
         else:
@@ -657,6 +887,14 @@ def _ignore_collisions(rows, collisions, last_wins=True):
             rows[idx]["ignore"] = True
 
 
+def _get_collision_msg(n_collisions):
+    return ("%s collided across rows; "
+            "troubleshoot by logging at debug level or "
+            "consider using {_repindex}",
+            single_or_plural("file name", "file names",
+                             n_collisions, include_count=True))
+
+
 def _handle_collisions(records, rows, on_collision):
     """Handle file name collisions in `rows`.
 
@@ -704,11 +942,7 @@ def _handle_collisions(records, rows, on_collision):
                         [records[i]
                          for i in remapped[next(iter(remapped))][:2]],
                         sort_keys=True, indent=2, default=str))
-            err_msg = ("%s collided across rows; "
-                       "troubleshoot by logging at debug level or "
-                       "consider using {_repindex}",
-                       single_or_plural("file name", "file names",
-                                        len(to_report), include_count=True))
+            err_msg = _get_collision_msg(len(to_report))
         else:
             _ignore_collisions(rows, collisions,
                                last_wins=on_collision == "take-last")
@@ -732,6 +966,220 @@ def sort_paths(paths):
     yield from sorted(paths, key=level_and_name)
 
 
+class _RowIndex(object):
+    """On-disk store of extracted row information for streaming mode.
+
+    Rows are kept in an SQLite database, so that file name collisions can be
+    found and rows can be grouped by (sub)dataset without holding all of them
+    in memory.
+
+    The database is placed in a temporary directory, which is removed when
+    the index is closed or garbage collected.
+    """
+
+    def __init__(self):
+        tmpdir = tempfile.mkdtemp(
+            **get_tempfile_kwargs(prefix="addurls_index"))
+        self._cleanup = weakref.finalize(self, rmtree, tmpdir)
+        self.path = op.join(tmpdir, "rows.sqlite")
+        self._con = sqlite3.connect(self.path, check_same_thread=False)
+        self._con.executescript("""
+            CREATE TABLE rows (
+                idx INTEGER PRIMARY KEY,
+                input_idx INTEGER,
+                filename TEXT,
+                subpath TEXT,
+                ident TEXT,
+                info TEXT,
+                ignore INTEGER DEFAULT 0);
+            CREATE TABLE repeats (
+                name TEXT PRIMARY KEY,
+                n INTEGER);
+        """)
+        self.repeats = _IndexedRepeats(self._con)
+        self._finalized = False
+
+    def add(self, infos):
+        """Store the extracted information of a chunk of rows
+        """
+        self._con.executemany(
+            "INSERT INTO rows (input_idx, filename, subpath, ident, info) "
+            "VALUES (?, ?, ?, ?, ?)",
+            ((i["input_idx"], i["filename"], i["subpath"] or "",
+              json.dumps([i["url"], i.get("meta_args")], sort_keys=True),
+              json.dumps(i))
+             for i in infos))
+        self._con.commit()
+
+    def __len__(self):
+        return self._con.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def _finalize(self):
+        if not self._finalized:
+            self._con.executescript("""
+                CREATE INDEX rows_filename ON rows (filename, idx);
+                CREATE INDEX rows_subpath ON rows (subpath, ignore, idx);
+            """)
+            self._finalized = True
+
+    def handle_collisions(self, on_collision):
+        """Like `_handle_collisions()`, for the stored rows.
+        """
+        self._finalize()
+        if on_collision == "error":
+            having = "COUNT(*) > 1"
+        elif on_collision == "error-if-different":
+            having = "COUNT(DISTINCT ident) > 1"
+        elif on_collision in ["take-first", "take-last"]:
+            self._con.execute(
+                "UPDATE rows SET ignore = 1 WHERE idx NOT IN "
+                "(SELECT {}(idx) FROM rows GROUP BY filename)".format(
+                    "MIN" if on_collision == "take-first" else "MAX"))
+            self._con.commit()
+            return
+        else:
+            raise ValueError(
+                f"Unsupported `on_collision` value: {on_collision}")
+        collided = "SELECT filename FROM rows GROUP BY filename " \
+                   "HAVING " + having
+        n_collisions = self._con.execute(
+            f"SELECT COUNT(*) FROM ({collided})").fetchone()[0]
+        if not n_collisions:
+            return
+        if lgr.isEnabledFor(logging.DEBUG):
+            for fname, in self._con.execute(f"{collided} LIMIT 10"):
+                lgr.debug(
+                    "Colliding name %r at positions %s", fname,
+                    [i for i, in self._con.execute(
+                        "SELECT input_idx FROM rows WHERE filename = ? "
+                        "ORDER BY idx", (fname,))])
+        return _get_collision_msg(n_collisions)
+
+    def __iter__(self):
+        """Yield all rows, marking ignored ones with ignore=True
+        """
+        for info, ignore in self._select(
+                "SELECT info, ignore FROM rows ORDER BY idx"):
+            info = json.loads(info)
+            if ignore:
+                info["ignore"] = True
+            yield info
+
+    def group_by_ds(self):
+        """Return the rows to process, grouped by the dataset
+
+        Returns
+        -------
+        A list with a (subpath, rows) tuple for each dataset, where rows is a
+        sized iterable that reads the rows from the database on iteration.
+        """
+        self._finalize()
+        return [
+            (subpath, _IndexedRows(self, subpath, n))
+            for subpath, n in self._con.execute(
+                "SELECT subpath, COUNT(*) FROM rows WHERE ignore = 0 "
+                "GROUP BY subpath ORDER BY subpath")]
+
+    def iter_rows(self, subpath):
+        for info, in self._select(
+                "SELECT info FROM rows WHERE subpath = ? AND ignore = 0 "
+                "ORDER BY idx",
+                (subpath,)):
+            yield json.loads(info)
+
+    def _select(self, query, params=()):
+        # a dedicated connection, because rows are consumed in other threads
+        con = sqlite3.connect(self.path)
+        try:
+            cursor = con.execute(query, params)
+            while True:
+                chunk = cursor.fetchmany(_STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield from chunk
+        finally:
+            con.close()
+
+    def close(self):
+        self._con.close()
+        self._cleanup()
+
+
+class _IndexedRows(object):
+    """Rows of a dataset in a `_RowIndex`, read anew on each iteration.
+    """
+
+    def __init__(self, index, subpath, n):
+        self._index = index
+        self._subpath = subpath
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return self._index.iter_rows(self._subpath)
+
+
+class _SizedIterable(object):
+    """Iterable with a known length, for progress reporting.
+    """
+
+    def __init__(self, iterable, n):
+        self._iterable = iterable
+        self._n = n
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return iter(self._iterable)
+
+
+class _IndexedRepeats(object):
+    """Mapping of `RepFormatter.repeats` kept in a `_RowIndex` database.
+    """
+
+    def __init__(self, con):
+        self._con = con
+
+    def __contains__(self, name):
+        return self._get(name) is not None
+
+    def __getitem__(self, name):
+        n = self._get(name)
+        if n is None:
+            raise KeyError(name)
+        return n
+
+    def __setitem__(self, name, n):
+        self._con.execute(
+            "INSERT OR REPLACE INTO repeats (name, n) VALUES (?, ?)",
+            (name, n))
+
+    def _get(self, name):
+        res = self._con.execute(
+            "SELECT n FROM repeats WHERE name = ?", (name,)).fetchone()
+        return res[0] if res else None
+
+
+def _extract_to_index(records, colidx_to_name, *args):
+    """Like `extract()`, but store the information in a `_RowIndex`.
+
+    Returns
+    -------
+    A tuple with the `_RowIndex` and the list of subdataset paths.
+    """
+    index = _RowIndex()
+    subpaths = set()
+    for infos, chunk_subpaths in iter_extract(
+            records, colidx_to_name, *args,
+            chunk_size=_STREAM_CHUNK_SIZE, repeats=index.repeats):
+        index.add(infos)
+        subpaths |= chunk_subpaths
+    return index, list(sort_paths(subpaths))
+
+
 def extract(rows, colidx_to_name=None,
             url_format="{0}", filename_format="{1}",
             exclude_autometa=None, meta=None, key=None,
@@ -752,28 +1200,66 @@ def extract(rows, colidx_to_name=None,
     for each row and the second item a list subdataset paths, sorted
     breadth-first.
     """
-    meta = ensure_list(meta)
+    infos = []
+    subpaths = set()
+    for chunk_infos, chunk_subpaths in iter_extract(
+            rows, colidx_to_name, url_format, filename_format,
+            exclude_autometa, meta, key, dry_run, missing_value):
+        infos.extend(chunk_infos)
+        subpaths |= chunk_subpaths
+    return infos, list(sort_paths(subpaths))
+
+
+def iter_extract(rows, colidx_to_name=None,
+                 url_format="{0}", filename_format="{1}",
+                 exclude_autometa=None, meta=None, key=None,
+                 dry_run=False, missing_value=None,
+                 chunk_size=None, repeats=None):
+    """Like `extract()`, but process `rows` in chunks.
+
+    Parameters
+    ----------
+    rows : iterable of dict
+        For columnar input (`_ColumnarRows`), the format strings are
+        evaluated for whole batches of rows where possible.
+    chunk_size : int, optional
+        Maximum number of rows to process at once. By default, all rows
+        are processed as a single chunk (columnar input is processed in
+        batches of at most 65536 rows).
+    repeats : mapping, optional
+        Storage for the file name repetition counts behind the
+        "_repindex" placeholder, a dict by default.
+
+    All other parameters match those of `extract()`.
+
+    Yields
+    ------
+    A tuple for each chunk, where the first item is a list with a dict of
+    extracted information for each row with a URL, and the second item a
+    set of subdataset paths.
+    """
     colidx_to_name = colidx_to_name or {}
+    if isinstance(rows, _ColumnarRows):
+        yield from _iter_extract_columnar(
+            rows, colidx_to_name, url_format, filename_format,
+            exclude_autometa, meta, key, dry_run, missing_value,
+            chunk_size, repeats)
+        return
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return
+    rows = chain([first], rows)
 
     # Formatter for everything but file names
     fmt = Formatter(colidx_to_name, missing_value)
     format_url = partial(fmt.format, url_format)
 
-    auto_meta_args = []
-    if exclude_autometa not in ["*", ""]:
-        urlcol = fmt_to_name(url_format, colidx_to_name)
-        # TODO: Try to normalize invalid fields, checking for any
-        # collisions.
-        metacols = (c for c in sorted(rows[0].keys()) if c != urlcol)
-        if exclude_autometa:
-            metacols = (c for c in metacols
-                        if not re.search(exclude_autometa, c))
-        metacols = filter_legal_metafield(metacols)
-        auto_meta_args = [c + "=" + "{" + c + "}" for c in metacols]
-
-    # Unlike `filename_format` and `url_format`, `meta` is a list
-    # because meta may be given multiple times on the command line.
-    formats_meta = [partial(fmt.format, m) for m in meta + auto_meta_args]
+    formats_meta = [
+        partial(fmt.format, m)
+        for m in _get_meta_formats(meta, exclude_autometa, url_format,
+                                   colidx_to_name, first.keys())]
 
     info_fns = []
     if formats_meta:
@@ -793,38 +1279,172 @@ def extract(rows, colidx_to_name=None,
             info["key"] = key_parser.parse(row)
         info_fns.append(set_key)
 
-    rows_with_url = []
-    infos = []
-    for idx, row in enumerate(rows):
-        try:
-            url = format_url(row)
-        except KeyError as exc:
-            raise _get_placeholder_exception(
-                exc, "URL", row)
-        if not url or url == missing_value:
-            continue  # pragma: no cover, peephole optimization
-        rows_with_url.append(row)
-        info = {"url": url, "input_idx": idx}
-        for fn in info_fns:
-            fn(info, row)
-        infos.append(info)
-
-    n_dropped = len(rows) - len(rows_with_url)
+    # For the file name, we allow the _repindex special key.
+    rep_formatter = RepFormatter(colidx_to_name, missing_value)
+    if repeats is not None:
+        rep_formatter.repeats = repeats
+    format_filename = partial(rep_formatter.format, filename_format)
+
+    idx = 0
+    n_with_url = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        rows_with_url = []
+        infos = []
+        for row in chunk:
+            try:
+                url = format_url(row)
+            except KeyError as exc:
+                raise _get_placeholder_exception(
+                    exc, "URL", row)
+            if url and url != missing_value:
+                rows_with_url.append(row)
+                info = {"url": url, "input_idx": idx}
+                for fn in info_fns:
+                    fn(info, row)
+                infos.append(info)
+            idx += 1
+
+        # Format the filename in a second pass so that we can provide
+        # information about the formatted URLs.
+        add_extra_filename_values(filename_format, rows_with_url,
+                                  [i["url"] for i in infos],
+                                  dry_run, start=n_with_url)
+        n_with_url += len(rows_with_url)
+        subpaths = _format_filenames(format_filename, rows_with_url, infos)
+        yield infos, subpaths
+        if chunk_size is None:
+            break
+
+    n_dropped = idx - n_with_url
     if n_dropped:
         lgr.warning("Dropped %d row(s) that had an empty URL", n_dropped)
 
-    # Format the filename in a second pass so that we can provide
-    # information about the formatted URLs.
-    add_extra_filename_values(filename_format, rows_with_url,
-                              [i["url"] for i in infos],
-                              dry_run)
 
-    # For the file name, we allow the _repindex special key.
-    format_filename = partial(
-        RepFormatter(colidx_to_name, missing_value).format,
-        filename_format)
-    subpaths = _format_filenames(format_filename, rows_with_url, infos)
-    return infos, list(sort_paths(subpaths))
+def _get_meta_formats(meta, exclude_autometa, url_format, colidx_to_name,
+                      names):
+    """Return the format strings for metadata, including automatic ones.
+
+    Parameters
+    ----------
+    names : iterable of str
+        Names of the input columns.
+    """
+    auto_meta_args = []
+    if exclude_autometa not in ["*", ""]:
+        urlcol = fmt_to_name(url_format, colidx_to_name)
+        # TODO: Try to normalize invalid fields, checking for any
+        # collisions.
+        metacols = (c for c in sorted(names) if c != urlcol)
+        if exclude_autometa:
+            metacols = (c for c in metacols
+                        if not re.search(exclude_autometa, c))
+        metacols = filter_legal_metafield(metacols)
+        auto_meta_args = [c + "=" + "{" + c + "}" for c in metacols]
+
+    # Unlike `filename_format` and `url_format`, `meta` is a list
+    # because meta may be given multiple times on the command line.
+    return ensure_list(meta) + auto_meta_args
+
+
+def _iter_extract_columnar(rows, colidx_to_name, url_format, filename_format,
+                           exclude_autometa, meta, key, dry_run, missing_value,
+                           chunk_size, repeats):
+    """Implementation of `iter_extract()` for `_ColumnarRows`.
+
+    Only the columns referenced by any of the format strings are read. Each
+    format string is evaluated for a whole record batch with
+    `_format_column()` where possible and for one row at a time otherwise.
+    """
+    names = rows.names
+    if any(_is_known_special_key(n) and n not in names
+           for n in get_fmt_names(filename_format)):
+        # Special keys depend on the formatted URLs and, in the case of
+        # "_repindex", on the file names formatted so far.
+        yield from iter_extract(
+            iter(rows), colidx_to_name, url_format, filename_format,
+            exclude_autometa, meta, key, dry_run, missing_value,
+            chunk_size, repeats)
+        return
+
+    formats_meta = _get_meta_formats(meta, exclude_autometa, url_format,
+                                     colidx_to_name, names)
+    formats = [url_format, filename_format] + formats_meta
+    if key:
+        formats.append(key)
+    needed = {_get_field_name(f, colidx_to_name)
+              for fmt_string in formats for f in get_fmt_names(fmt_string)}
+    columns = [n for n in names if n in needed] or None
+
+    fmt = Formatter(colidx_to_name, missing_value)
+    key_parser = AnnexKeyParser(fmt.format, key) if key else None
+
+    idx = 0
+    n_with_url = 0
+    for batch in rows.iter_batches(columns=columns, batch_size=chunk_size):
+        formatted = {f: _format_column(f, batch, colidx_to_name,
+                                       missing_value)
+                     for f in formats}
+        # Row-wise fallback for anything that couldn't be formatted at once
+        records = batch.to_pylist() \
+            if any(v is None for v in formatted.values()) else None
+
+        def format_row(format_string, i):
+            values = formatted[format_string]
+            if values is None:
+                return fmt.format(format_string, records[i])
+            return values[i]
+
+        infos = []
+        subpaths = set()
+        split_heads = {}
+        for i in range(batch.num_rows):
+            try:
+                url = format_row(url_format, i)
+            except KeyError as exc:
+                raise _get_placeholder_exception(exc, "URL", records[i])
+            if not url or url == missing_value:
+                continue
+            info = {"url": url, "input_idx": idx + i}
+            if formats_meta:
+                formatted_meta = []
+                for m in formats_meta:
+                    try:
+                        formatted_meta.append(format_row(m, i))
+                    except KeyError as exc:
+                        lgr.warning("Row is missing a key to add a metadata "
+                                    "field: %s", exc)
+                info["meta_args"] = clean_meta_args(formatted_meta)
+            if key_parser:
+                info["key"] = key_parser.parse(records[i]) \
+                    if formatted[key] is None \
+                    else key_parser.parse_formatted(formatted[key][i])
+            try:
+                filename = format_row(filename_format, i)
+            except KeyError as exc:
+                raise _get_placeholder_exception(exc, "file name", records[i])
+            head, sep, tail = filename.rpartition("//")
+            if sep:
+                # Many rows typically share the same subdataset prefix.
+                if head not in split_heads:
+                    split_heads[head] = get_subpaths(head + sep)
+                    subpaths.update(split_heads[head][1])
+                head, spaths = split_heads[head]
+                info["filename"] = head + tail
+                info["subpath"] = spaths[-1]
+            else:
+                info["filename"] = filename
+                info["subpath"] = None
+            infos.append(info)
+        idx += batch.num_rows
+        n_with_url += len(infos)
+        yield infos, subpaths
+
+    n_dropped = idx - n_with_url
+    if n_dropped:
+        lgr.warning("Dropped %d row(s) that had an empty URL", n_dropped)
 
 
 def _add_url(row, ds, repo, options=None, drop_after=False):
@@ -919,6 +1539,25 @@ class RegisterUrl(object):
                                status=status, message=message,
                                exception=exception)
 
+    def _fromkey_result(self, out_json):
+        res = annexjson2result(out_json, self.ds, type="file", logger=lgr)
+        if not res.get("message"):
+            res["message"] = "registered URL"
+        return res
+
+    def _examinekey_error(self, row):
+        return dict(self._err_res,
+                    path=row["filename_abs"],
+                    message=("Failed to get information for %s",
+                             row["key"]))
+
+    def _command_error(self, row, exc):
+        ce = CapturedException(exc)
+        return dict(self._err_res,
+                    path=row["filename_abs"],
+                    message=str(ce),
+                    exception=ce)
+
     def __call__(self, row):
         filename = row["ds_filename"]
         try:
@@ -930,10 +1569,7 @@ class RegisterUrl(object):
                 ek_info = self.examinekey(parsed_key, filename,
                                           migrate=migrate)
                 if not ek_info:
-                    yield dict(self._err_res,
-                               path=row["filename_abs"],
-                               message=("Failed to get information for %s",
-                                        parsed_key))
+                    yield self._examinekey_error(row)
                     return
                 key = ek_info["key"]
             else:
@@ -943,19 +1579,22 @@ class RegisterUrl(object):
             if avoid_fromkey:
                 res = self._write_pointer(row, ek_info)
             else:
-                res = annexjson2result(self.fromkey(key, filename),
-                                       self.ds, type="file", logger=lgr)
-                if not res.get("message"):
-                    res["message"] = "registered URL"
+                res = self._fromkey_result(self.fromkey(key, filename))
         except CommandError as exc:
-            ce = CapturedException(exc)
-            yield dict(self._err_res,
-                       path=row["filename_abs"],
-                       message=str(ce),
-                       exception=ce)
+            yield self._command_error(row, exc)
         else:
             yield res
 
+    def register_many(self, rows):
+        """Register the URLs of all `rows`.
+
+        Yields
+        ------
+        A tuple with each row and a list of its result records.
+        """
+        for row in rows:
+            yield row, list(self(row))
+
 
 # Note: If any other modules end up needing these batch operations, this should
 # find a new home.
@@ -965,18 +1604,18 @@ class BatchedRegisterUrl(RegisterUrl):
     """Like `RegisterUrl`, but use batched commands underneath.
     """
 
+    # Maximum number of requests sent to a batch process ahead of their
+    # responses
+    max_in_flight = 100
+
     def __init__(self, ds, repo=None):
         super().__init__(ds, repo)
         self._batch_commands = {}
 
-    def _batch(self,
-               command,
-               batch_input,
-               output_proc=None,
-               json=False,
-               batch_options=None):
-
-        bcmd = self._batch_commands.get(command)
+    def _get_batch_command(self, command, output_proc=None, json=False,
+                           batch_options=None):
+        cache_key = (command, tuple(batch_options or ()))
+        bcmd = self._batch_commands.get(cache_key)
         if not bcmd:
             repo = self.repo
             bcmd = repo._batched.get(
@@ -985,8 +1624,115 @@ class BatchedRegisterUrl(RegisterUrl):
                 json=json,
                 output_proc=output_proc,
                 annex_options=batch_options)
-            self._batch_commands[command] = bcmd
-        return bcmd(batch_input)
+            self._batch_commands[cache_key] = bcmd
+        return bcmd
+
+    def _batch(self,
+               command,
+               batch_input,
+               output_proc=None,
+               json=False,
+               batch_options=None):
+        return self._get_batch_command(
+            command, output_proc=output_proc, json=json,
+            batch_options=batch_options)(batch_input)
+
+    def _pipeline(self, command, batch_inputs, json=False,
+                  batch_options=None):
+        """Like `_batch()`, but keep several of `batch_inputs` in flight.
+
+        Returns
+        -------
+        A list with the response for each input. Once a request fails, the
+        remaining inputs are sent one at a time, and the response for an input
+        whose request failed is the `CommandError`.
+        """
+        bcmd = self._get_batch_command(command, json=json,
+                                       batch_options=batch_options)
+        responses = []
+        try:
+            responses.extend(
+                bcmd.pipeline(batch_inputs, max_in_flight=self.max_in_flight))
+        except CommandError as exc:
+            lgr.debug("Pipelined %s failed, continuing one request at a "
+                      "time: %s", command, CapturedException(exc))
+        for batch_input in batch_inputs[len(responses):]:
+            try:
+                responses.append(bcmd(batch_input))
+            except CommandError as exc:
+                responses.append(exc)
+        return responses
+
+    def register_many(self, rows):
+        """Register the URLs of all `rows`, pipelining the batch requests.
+
+        Instead of a round trip per row and command, the requests of each
+        command are sent for all rows at once, and a URL is registered only
+        once for each key.
+        """
+        rows = list(rows)
+        errors = {}
+        keys = {}
+        ek_infos = {}
+        by_target = defaultdict(list)
+        for i, row in enumerate(rows):
+            parsed_key = row["key"]
+            if self._avoid_fromkey or "target_backend" in parsed_key:
+                by_target[parsed_key.get("target_backend")].append(i)
+            else:
+                keys[i] = parsed_key["key"]
+
+        # The migration target is an option of the batch process.
+        for target, idxs in by_target.items():
+            responses = self._pipeline(
+                "examinekey",
+                [(rows[i]["key"]["key"], rows[i]["ds_filename"])
+                 for i in idxs],
+                json=True,
+                batch_options=["--migrate-to-backend=" + target]
+                if target else None)
+            for i, ek_info in zip(idxs, responses):
+                if isinstance(ek_info, CommandError):
+                    errors[i] = self._command_error(rows[i], ek_info)
+                elif not ek_info:
+                    errors[i] = self._examinekey_error(rows[i])
+                else:
+                    keys[i] = ek_info["key"]
+                    ek_infos[i] = ek_info
+
+        registered = {}
+        for i, key in sorted(keys.items()):
+            pair = (key, rows[i]["url"])
+            if pair not in registered:
+                try:
+                    self.registerurl(*pair)
+                    registered[pair] = None
+                except CommandError as exc:
+                    registered[pair] = exc
+            if registered[pair] is not None:
+                errors[i] = self._command_error(rows[i], registered[pair])
+
+        results = {}
+        todo = [i for i in sorted(keys) if i not in errors]
+        if self._avoid_fromkey:
+            for i in todo:
+                results[i] = self._write_pointer(rows[i], ek_infos[i])
+        else:
+            responses = self._pipeline(
+                "fromkey",
+                [(keys[i], rows[i]["ds_filename"]) for i in todo],
+                json=True,
+                # --force is needed because the key (usually) does not exist
+                # in the local repository.
+                batch_options=["--force"])
+            for i, out_json in zip(todo, responses):
+                if isinstance(out_json, CommandError):
+                    errors[i] = self._command_error(rows[i], out_json)
+                else:
+                    results[i] = self._fromkey_result(out_json)
+
+        for i, row in enumerate(rows):
+            yield row, [errors[i] if i in errors else results[i]]
 
     def examinekey(self, parsed_key, filename, migrate=False):
         if migrate:
@@ -1011,14 +1757,55 @@ class BatchedRegisterUrl(RegisterUrl):
                     output_proc=self._ignore, json=False)
 
 
+def _set_row_paths(rows, ds_path, subds_path):
+    """Add the file name information needed for adding URLs to `rows`.
+    """
+    for row in rows:
+        filename_abs = op.join(ds_path, row["filename"])
+        ds_filename = op.relpath(filename_abs, subds_path)
+        row.update({"filename_abs": filename_abs,
+                    "ds_filename": ds_filename})
+        yield row
+
+
+def _version_urls(rows, num_urls):
+    """Try to replace the URLs of `rows` with a versioned one.
+    """
+    log_progress(lgr.info, "addurls_versionurls",
+                 "Versioning %d URLs", num_urls,
+                 label="Versioning URLs",
+                 total=num_urls, unit=" URLs")
+    for row in rows:
+        url = row["url"]
+        try:
+            # TODO: make get_versioned_url more efficient while going
+            # through the same bucket(s)
+            row["url"] = get_versioned_url(url)
+        except (ValueError, NotImplementedError) as exc:
+            ce = CapturedException(exc)
+            # We don't expect this to happen because get_versioned_url
+            # should return the original URL if it isn't an S3 bucket.
+            # It only raises exceptions if it doesn't know how to
+            # handle the scheme for what looks like an S3 bucket.
+            lgr.warning("error getting version of %s: %s", row["url"], ce)
+        log_progress(lgr.info, "addurls_versionurls",
+                     "Versioned result for %s: %s", url, row["url"],
+                     update=1, increment=True)
+        yield row
+    log_progress(lgr.info, "addurls_versionurls", "Finished versioning URLs")
+
+
 def _log_filter_addurls(res):
     return res.get('type') == 'file' and res.get('action') in ["addurl", "addurls"]
 
 
 @with_result_progress("Adding URLs", log_filter=_log_filter_addurls)
 def _add_urls(rows, ds, repo, ifexists=None, options=None,
-              drop_after=False, by_key=False):
+              drop_after=False, by_key=False, meta_chunk_size=None):
     """Call `git annex addurl` using information in `rows`.
+
+    Metadata is set once all URLs are added, or, if `meta_chunk_size` is
+    given, whenever that many files with metadata have been added.
     """
     add_url = partial(_add_url, ds=ds, repo=repo,
                       drop_after=drop_after, options=options)
@@ -1030,10 +1817,36 @@ def _add_urls(rows, ds, repo, ifexists=None, options=None,
         else:
             register_url = BatchedRegisterUrl(ds, repo)
     else:
-        def register_url(*args, **kwargs):
-            raise RuntimeError("bug: this should be impossible")
+        register_url = None
 
     add_metadata = {}
+    # Rows with a key, which are registered together
+    pending = []
+
+    def finish(row, results):
+        all_ok = True
+        for res in results:
+            if res["status"] != "ok":
+                all_ok = False
+            yield res
+        if not all_ok:
+            return
+
+        if row.get("meta_args"):
+            add_metadata[row["ds_filename"]] = row["meta_args"]
+            if meta_chunk_size and len(add_metadata) >= meta_chunk_size:
+                yield from _set_metadata(add_metadata, ds, repo)
+                add_metadata.clear()
+
+    def register_pending():
+        if not pending:
+            return
+        if register_url is None:
+            raise RuntimeError("bug: this should be impossible")
+        for row, results in register_url.register_many(pending):
+            yield from finish(row, results)
+        pending.clear()
+
     for row in rows:
         filename_abs = row["filename_abs"]
         filename = row["ds_filename"]
@@ -1053,18 +1866,18 @@ def _add_urls(rows, ds, repo, ifexists=None, options=None,
             else:
                 lgr.debug("File %s already exists", filename_abs)
 
-        fn = register_url if row.get("key") else add_url
-        all_ok = True
-        for res in fn(row):
-            if res["status"] != "ok":
-                all_ok = False
-            yield res
-        if not all_ok:
-            continue
+        if row.get("key"):
+            pending.append(row)
+            if len(pending) >= _REGISTER_CHUNK_SIZE:
+                yield from register_pending()
+        else:
+            yield from finish(row, add_url(row))
+
+    yield from register_pending()
+    yield from _set_metadata(add_metadata, ds, repo)
 
-        if row.get("meta_args"):
-            add_metadata[filename] = row["meta_args"]
 
+def _set_metadata(add_metadata, ds, repo):
     if not add_metadata:
         return
 
@@ -1156,10 +1969,14 @@ class Addurls(Interface):
       $ datalad addurls avatars.csv '{link}' 'avatars//{who}.{ext}'
 
     If the information is represented as JSON lines instead of comma separated
-    values or a JSON array, you can use a utility like jq to transform the JSON
-    lines into an array that addurls accepts::
+    values or a JSON array, use the 'jsonl' input type::
 
-      $ ... | jq --slurp . | datalad addurls - '{link}' '{who}.{ext}'
+      $ ... | datalad addurls -t jsonl - '{link}' '{who}.{ext}'
+
+    For very large URL files, the 'stream' mode avoids loading all rows into
+    memory at once::
+
+      $ datalad addurls --stream urls.tsv '{link}' '{who}.{ext}'
 
     .. note::
 
@@ -1220,9 +2037,14 @@ class Addurls(Interface):
             args=("-t", "--input-type"),
             metavar="TYPE",
             doc="""Whether `URL-FILE` should be considered a CSV file, TSV
-            file, or JSON file. The default value, "ext", means to consider
-            `URL-FILE` as a JSON file if it ends with ".json" or a TSV file if
-            it ends with ".tsv". Otherwise, treat it as a CSV file.""",
+            file, JSON file, JSON lines file (one object per line), or Parquet
+            file. The default value, "ext", means to consider `URL-FILE` as a
+            JSON file if it ends with ".json", a JSON lines file if it ends
+            with ".jsonl" or ".ndjson", a Parquet file if it ends with
+            ".parquet", or a TSV file if it ends with ".tsv". Otherwise, treat
+            it as a CSV file. Reading Parquet files requires pyarrow
+            (installed with the "addurls-parquet" extra), which is also used
+            to format the rows of such files column by column.""",
             constraints=EnsureChoice(*INPUT_TYPES)),
         exclude_autometa=Parameter(
             args=("-x", "--exclude-autometa"),
@@ -1327,6 +2149,16 @@ class Addurls(Interface):
             the same URL and metadata. "take-first" or "take-last" indicate to
             instead take the first row or last row from each set of colliding
             rows."""),
+        stream=Parameter(
+            args=("--stream",),
+            action="store_true",
+            doc="""Process `URL-FILE` without holding all of its rows in
+            memory. Rows are read incrementally (except for a JSON array,
+            which is always loaded as a whole), and the extracted information
+            is kept in a temporary on-disk index to detect file name
+            collisions and to group rows by dataset. URLs are then added in
+            chunks. Rather than the individual files, the directories
+            containing added files are saved."""),
     )
 
     result_renderer = "tailored"
@@ -1341,7 +2173,7 @@ class Addurls(Interface):
                  message=None, dry_run=False, fast=False, ifexists=None,
                  missing_value=None, save=True, version_urls=False,
                  cfg_proc=None, jobs=None, drop_after=False,
-                 on_collision="error"):
+                 on_collision="error", stream=False):
         # This was to work around gh-2269. That's fixed, but changing the
         # positional argument names now would cause breakage for any callers
         # that used these arguments as keyword arguments.
@@ -1379,46 +2211,49 @@ class Addurls(Interface):
                     yield dict(st_dict, status="error", message=old_msg)
                     return
 
-        if isinstance(url_file, str):
-            if url_file != "-":
-                url_file = str(resolve_path(url_file, dataset))
-            try:
-                records, colidx_to_name = _read_from_file(
-                    url_file, input_type)
-            except ValueError as exc:
-                ce = CapturedException(exc)
-                yield get_status_dict(action="addurls",
-                                      ds=ds,
-                                      status="error",
-                                      message=str(ce),
-                                      exception=ce)
-                return
-            displayed_source = "'{}'".format(urlfile)
-        else:
-            displayed_source = "<records>"
-            records = ensure_list(url_file)
-            colidx_to_name = {}
-
-        rows = None
-        if records:
-            try:
+        extract_args = (url_format, filename_format, exclude_autometa, meta,
+                        key, dry_run, missing_value)
+        records = rows = None
+        try:
+            if isinstance(url_file, str):
+                if url_file != "-":
+                    url_file = str(resolve_path(url_file, dataset))
+                displayed_source = "'{}'".format(urlfile)
+                if stream:
+                    with _open_url_file(url_file, input_type) as \
+                            (records, colidx_to_name):
+                        rows, subpaths = _extract_to_index(
+                            records, colidx_to_name, *extract_args)
+                    records = None
+                else:
+                    records, colidx_to_name = _read_from_file(
+                        url_file, input_type)
+            else:
+                displayed_source = "<records>"
+                if stream:
+                    rows, subpaths = _extract_to_index(
+                        url_file, {}, *extract_args)
+                else:
+                    records = ensure_list(url_file)
+                colidx_to_name = {}
+            if records:
                 rows, subpaths = extract(records, colidx_to_name,
-                                         url_format, filename_format,
-                                         exclude_autometa, meta, key,
-                                         dry_run,
-                                         missing_value)
-            except (ValueError, RequestException) as exc:
-                ce = CapturedException(exc)
-                yield dict(st_dict, status="error", message=str(ce),
-                           exception=ce)
-                return
+                                         *extract_args)
+        except (ValueError, RequestException) as exc:
+            ce = CapturedException(exc)
+            yield dict(st_dict, status="error", message=str(ce),
+                       exception=ce)
+            return
 
         if not rows:
             yield dict(st_dict, status="notneeded",
                        message="No rows to process")
             return
 
-        collision_err = _handle_collisions(records, rows, on_collision)
+        if stream:
+            collision_err = rows.handle_collisions(on_collision)
+        else:
+            collision_err = _handle_collisions(records, rows, on_collision)
         if collision_err:
             yield dict(st_dict, status="error", message=collision_err)
             return
@@ -1429,7 +2264,8 @@ class Addurls(Interface):
             for row in rows:
                 if row.get("ignore"):
                     lgr.info("Would ignore row due to collision: %s",
-                             records[row["input_idx"]])
+                             records[row["input_idx"]] if records
+                             else "row {}".format(row["input_idx"]))
                 else:
                     lgr.info("Would %s %s to %s",
                              "register" if row.get("key") else "download",
@@ -1455,6 +2291,8 @@ class Addurls(Interface):
         # to be populated by addurls_to_ds
         files_to_add = set()
         created_subds = []
+        # number of added files in stream mode, by dataset
+        n_files_added = []
 
         def addurls_to_ds(args):
             """The "consumer" for ProducerConsumer parallel execution"""
@@ -1468,13 +2306,10 @@ class Addurls(Interface):
             else:
                 subds_path = ds_path
 
-            for row in rows:
-                # Add additional information that we'll need for various
-                # operations.
-                filename_abs = op.join(ds_path, row["filename"])
-                ds_filename = op.relpath(filename_abs, subds_path)
-                row.update({"filename_abs": filename_abs,
-                            "ds_filename": ds_filename})
+            # rows are processed in a single pass, they might not even be
+            # in memory (stream mode)
+            nrows = len(rows)
+            rows = _set_row_paths(rows, ds_path, subds_path)
 
             subds = Dataset(subds_path)
 
@@ -1494,38 +2329,27 @@ class Addurls(Interface):
             repo = subds.repo  # "expensive" so we get it once
 
             if version_urls:
-                num_urls = len(rows)
-                log_progress(lgr.info, "addurls_versionurls",
-                             "Versioning %d URLs", num_urls,
-                             label="Versioning URLs",
-                             total=num_urls, unit=" URLs")
-                for row in rows:
-                    url = row["url"]
-                    try:
-                        # TODO: make get_versioned_url more efficient while going
-                        # through the same bucket(s)
-                        row["url"] = get_versioned_url(url)
-                    except (ValueError, NotImplementedError) as exc:
-                        ce = CapturedException(exc)
-                        # We don't expect this to happen because get_versioned_url
-                        # should return the original URL if it isn't an S3 bucket.
-                        # It only raises exceptions if it doesn't know how to
-                        # handle the scheme for what looks like an S3 bucket.
-                        lgr.warning("error getting version of %s: %s", row["url"], ce)
-                    log_progress(lgr.info, "addurls_versionurls",
-                                 "Versioned result for %s: %s", url, row["url"],
-                                 update=1, increment=True)
-                log_progress(lgr.info, "addurls_versionurls", "Finished versioning URLs")
+                rows = _version_urls(rows, nrows)
 
             subds_files_to_add = set()
-            for r in _add_urls(rows, subds, repo,
+            n_added = 0
+            for r in _add_urls(_SizedIterable(rows, nrows), subds, repo,
                                ifexists=ifexists, options=annex_options,
-                               drop_after=drop_after, by_key=key):
+                               drop_after=drop_after, by_key=key,
+                               meta_chunk_size=_STREAM_CHUNK_SIZE
+                               if stream else None):
                 if r["status"] == "ok":
-                    subds_files_to_add.add(r["path"])
+                    if not stream:
+                        subds_files_to_add.add(r["path"])
+                    elif _log_filter_addurls(r):
+                        # only track the directories of the added files
+                        subds_files_to_add.add(
+                            op.join(op.dirname(r["path"]), ""))
+                        n_added += 1
                 yield r
 
             files_to_add.update(subds_files_to_add)
+            n_files_added.append(n_added)
             pass  # end of addurls_to_ds
 
 
@@ -1539,10 +2363,14 @@ class Addurls(Interface):
             # The top-level dataset has a subpath of None.
             return d.get("subpath") or ""
 
-        rows_nonignored = (r for r in rows if not r.get("ignore"))
-        # We need to serialize itertools.groupby .
-        rows_by_ds = [(k, tuple(v))
-                      for k, v in groupby_sorted(rows_nonignored, key=keyfn)]
+        if stream:
+            rows_by_ds = rows.group_by_ds()
+        else:
+            rows_nonignored = (r for r in rows if not r.get("ignore"))
+            # We need to serialize itertools.groupby .
+            rows_by_ds = [(k, tuple(v))
+                          for k, v in groupby_sorted(rows_nonignored,
+                                                     key=keyfn)]
 
         # There could be "intermediate" subdatasets which have no rows but would need
         # their datasets created and saved, so let's add them
@@ -1556,8 +2384,10 @@ class Addurls(Interface):
 
         # We want to provide progress overall files not just datasets
         # so our total will be just a len of rows
+        nrows = len(rows)
+
         def agg_files(*args, **kwargs):
-            return len(rows)
+            return nrows
 
         yield from ProducerConsumerProgressLog(
             rows_by_ds,
@@ -1587,7 +2417,7 @@ class Addurls(Interface):
             if extra_msgs:
                 extra_msgs.append('')
             message_addurls = message or f"""\
-[DATALAD] add {len(files_to_add)} files to {nrows_by_ds_orig} (sub)datasets from URLs
+[DATALAD] add {sum(n_files_added) if stream else len(files_to_add)} files to {nrows_by_ds_orig} (sub)datasets from URLs
 
 {os.linesep.join(extra_msgs)}
 url_file={displayed_source}
@@ -16,6 +16,7 @@ import os
 import re
 import warnings
 
+from datalad.dataset.gitrepo import probe_repos
 from datalad.distribution.dataset import (
     Dataset,
     EnsureDataset,
@@ -46,7 +47,6 @@ from datalad.support.exceptions import (
     CapturedException,
     CommandError,
 )
-from datalad.support.gitrepo import GitRepo
 from datalad.support.param import Parameter
 from datalad.utils import (
     Path,
@@ -314,25 +314,27 @@ def _get_submodules(ds, paths, fulfilled, recursive, recursion_limit,
     # is on its results
     #if not GitRepo.is_valid_repo(dspath):
     #    return
-    # put in giant for-loop to be able to yield results before completion
+    submodules = []
     for sm in _parse_git_submodules(ds, paths, lookup_cache):
-        repo = lookup_cache['repo']
-        sm_path = sm['path']
         contains_hits = None
         if contains:
-            contains_hits = [c[0] for c in contains if sm_path in c]
+            contains_hits = [c[0] for c in contains if sm['path'] in c]
             if not contains_hits:
                 # we are not looking for this subds, because it doesn't
                 # match the target path
                 continue
-        # the following used to be done by _parse_git_submodules()
-        # but is expensive and does not need to be done for submodules
-        # not matching `contains`
-        if not sm_path.exists() or not GitRepo.is_valid_repo(sm_path):
-            sm['state'] = 'absent'
-        else:
-            assert 'state' not in sm
-            sm['state'] = 'present'
+        submodules.append((sm, contains_hits))
+    # the following used to be done by _parse_git_submodules()
+    # but is expensive and does not need to be done for submodules
+    # not matching `contains`. All remaining submodules of this dataset
+    # are probed at once, rather than one by one.
+    present = probe_repos([sm['path'] for sm, _ in submodules])
+    # put in giant for-loop to be able to yield results before completion
+    for sm, contains_hits in submodules:
+        repo = lookup_cache['repo']
+        sm_path = sm['path']
+        assert 'state' not in sm
+        sm['state'] = 'present' if present[sm_path] else 'absent'
         # do we just need this to recurse into subdatasets, or is this a
         # real results?
         to_report = paths is None \
@@ -421,7 +423,7 @@ def _get_submodules(ds, paths, fulfilled, recursive, recursion_limit,
                 subdsres['contains'] = contains_hits
             if (not bottomup and \
                 (fulfilled is None or
-                 GitRepo.is_valid_repo(sm_path) == fulfilled)):
+                 present[sm_path] == fulfilled)):
                 yield subdsres
 
         # expand list with child submodules. keep all paths relative to parent
@@ -445,5 +447,5 @@ def _get_submodules(ds, paths, fulfilled, recursive, recursion_limit,
                 yield r
         if to_report and (bottomup and \
                 (fulfilled is None or
-                 GitRepo.is_valid_repo(sm_path) == fulfilled)):
+                 present[sm_path] == fulfilled)):
             yield subdsres
@@ -9,6 +9,7 @@
 # ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
 """Test addurls"""
 
+import hashlib
 import json
 import logging
 import os
@@ -16,7 +17,10 @@ import os.path as op
 import shutil
 import tempfile
 from copy import deepcopy
-from io import StringIO
+from io import (
+    BytesIO,
+    StringIO,
+)
 from unittest.mock import patch
 from urllib.parse import urlparse
 
@@ -56,12 +60,14 @@ from datalad.tests.utils_pytest import (
     ok_startswith,
     on_windows,
     skip_if,
+    skip_if_no_module,
     swallow_logs,
     swallow_outputs,
     with_tempfile,
     with_tree,
 )
 from datalad.utils import (
+    Path,
     get_tempfile_kwargs,
     rmtemp,
 )
@@ -348,6 +354,131 @@ def test_extract_csv_json_equal(input_type):
     eq_(json_output, csv_output)
 
 
+def test_extract_jsonl_json_equal():
+    jsonl = StringIO("".join(json.dumps(r) + "\n" for r in ST_DATA["rows"]))
+    kwds = dict(filename_format="{age_group}//{now_dead}//{name}.csv",
+                url_format="{name}_{debut_season}.com")
+    eq_(au.extract(*au._read(jsonl, "jsonl"), **kwds),
+        au.extract(*au._read(json_stream(ST_DATA["rows"]), "json"), **kwds))
+    assert_raises(ValueError, au._read, StringIO('{"a": 1}\n{"a"\n'),
+                  "jsonl")
+
+
+def parquet_stream(rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    stream = BytesIO()
+    pq.write_table(pa.Table.from_pylist(rows), stream)
+    stream.seek(0)
+    return stream
+
+
+@pytest.mark.parametrize("kwds", [
+    dict(filename_format="{age_group}//{now_dead}//{name!l}.csv",
+         url_format="{name}_{debut_season}.com"),
+    # positional placeholders, explicit metadata, and a missing value
+    dict(filename_format="{2}/{0}-{3}", url_format="{0}.com",
+         meta=["season={1}"], exclude_autometa="now_dead", missing_value="NA"),
+    # format specs and special keys are formatted row by row
+    dict(filename_format="{name}-{_repindex}", url_format="{age_group}"),
+    dict(filename_format="{debut_season:03d}/{name}",
+         url_format="https://{name}.com/{age_group}", exclude_autometa="*"),
+    dict(filename_format="{_url_hostname}/{name}",
+         url_format="https://{name}.com/{age_group}"),
+])
+def test_extract_parquet_equal(kwds):
+    skip_if_no_module("pyarrow")
+    # other tests leave special keys in ST_DATA's rows
+    rows = [{k: r[k] for k in ST_DATA["header"]} for r in ST_DATA["rows"]]
+    rows[1]["now_dead"] = ""
+    expected = au.extract(deepcopy(rows),
+                          dict(enumerate(ST_DATA["header"])), **kwds)
+    columnar, colidx_to_name = au._read(parquet_stream(rows), "parquet")
+    eq_(colidx_to_name, dict(enumerate(ST_DATA["header"])))
+    eq_(len(columnar), 4)
+    eq_(columnar[1], rows[1])
+    eq_(au.extract(columnar, colidx_to_name, **kwds), expected)
+    # the same when streaming the batches from the file
+    streamed, _ = au._iter_read(parquet_stream(rows), "parquet")
+    chunks = list(au.iter_extract(streamed, colidx_to_name, chunk_size=3,
+                                  **kwds))
+    eq_(len(chunks), 2)
+    eq_([i for c, _ in chunks for i in c], expected[0])
+    # unknown placeholders are reported as for other input
+    with assert_raises(ValueError) as cme:
+        au.extract(columnar, colidx_to_name, url_format="{nme}")
+    assert_in("Unknown placeholder 'nme' in URL", str(cme.value))
+    assert_raises(ValueError, au._read, BytesIO(b"no parquet"), "parquet")
+
+
+def test_format_column():
+    skip_if_no_module("pyarrow")
+    import pyarrow as pa
+    batch = pa.RecordBatch.from_pylist(
+        [{"s": "Ab", "i": 1, "f": 0.5, "u": "Ä", "n": "x"},
+         {"s": "", "i": 20, "f": 1.0, "u": "b", "n": None}])
+    idx_map = dict(enumerate(batch.schema.names))
+    for format_string, expected in [
+            ("{s}-{i}", ["Ab-1", "-20"]),
+            ("{0!l}/{1}{{}}", ["ab/1{}", "/20{}"]),
+            ("const", ["const", "const"]),
+            # unsupported types, conversions, and specs
+            ("{f}", None), ("{s!r}", None), ("{i:03d}", None),
+            # non-ASCII lower-casing, null values, and unknown columns
+            ("{u!l}", None), ("{n}", None), ("{s.real}", None),
+            ("{other}", None), ("{7}", None)]:
+        eq_(au._format_column(format_string, batch, idx_map), expected)
+    eq_(au._format_column("{s}", batch, idx_map, missing_value="NA"),
+        ["Ab", "NA"])
+
+
+def test_iter_extract_chunks():
+    rows = [dict(r, debut_season=str(r["debut_season"]))
+            for r in ST_DATA["rows"] * 3]
+    kwds = dict(url_format="{name}_{debut_season}.com",
+                filename_format="{age_group}//{name}-{_repindex}.csv",
+                meta=["group={age_group}"])
+    infos, subpaths = au.extract(deepcopy(rows), **kwds)
+    chunks = list(au.iter_extract(deepcopy(rows), chunk_size=5, **kwds))
+    eq_([len(c) for c, _ in chunks], [5, 5, 2])
+    eq_([i for c, _ in chunks for i in c], infos)
+    # the on-disk index reports the same
+    index, index_subpaths = au._extract_to_index(
+        deepcopy(rows), None, kwds["url_format"], kwds["filename_format"],
+        None, kwds["meta"])
+    eq_(list(index), infos)
+    eq_(index_subpaths, subpaths)
+    eq_(len(index), 12)
+    eq_([(subpath, len(r), [i["filename"] for i in r])
+         for subpath, r in index.group_by_ds()],
+        [(subpath, 6, [i["filename"] for i in infos
+                       if i["subpath"] == subpath])
+         for subpath in ("adult", "kid")])
+    index.close()
+    assert_false(op.exists(index.path))
+
+
+def test_row_index_collisions():
+    rows = [{"url": "a", "name": "x"}, {"url": "b", "name": "y"},
+            {"url": "c", "name": "x"}, {"url": "a", "name": "z"},
+            {"url": "a", "name": "z"}]
+
+    def get_index():
+        return au._extract_to_index(deepcopy(rows), None, "{url}",
+                                    "{name}")[0]
+
+    assert_in("2 file names", get_index().handle_collisions("error")[1])
+    assert_in("1 file name",
+              get_index().handle_collisions("error-if-different")[1])
+    for how, expected in (("take-first", ["a", "b", "a"]),
+                          ("take-last", ["b", "c", "a"])):
+        index = get_index()
+        eq_(index.handle_collisions(how), None)
+        eq_([i["url"] for i in index if not i.get("ignore")], expected)
+        eq_(sum(len(r) for _, r in index.group_by_ds()), 3)
+    assert_raises(ValueError, get_index().handle_collisions, "invalid")
+
+
 def test_extract_wrong_input_type():
     assert_raises(ValueError,
                   au._read, None, "invalid_input_type")
@@ -359,6 +490,45 @@ def test_registerurl_constructor(path=None):
     au.RegisterUrl(ds)
 
 
+@with_tempfile(mkdir=True)
+def test_batched_register_many(path=None):
+    ds = Dataset(path).create(force=True, annex=True)
+    if ds.repo.is_managed_branch():
+        raise SkipTest("Checks the fromkey code path")
+
+    def make_row(name, content, url):
+        md5sum = hashlib.md5(content.encode()).hexdigest()
+        return {"key": {"key": "MD5-s{}--{}".format(len(content), md5sum),
+                        "backend": "MD5", "keyname": md5sum},
+                "url": url,
+                "ds_filename": name,
+                "filename_abs": op.join(ds.path, name)}
+
+    rows = [make_row("a1", "a", "http://example.com/a"),
+            make_row("a2", "a", "http://example.com/a"),
+            make_row("a3", "a", "http://example.com/a-mirror"),
+            make_row(op.join("sub", "b"), "bb", "http://example.com/b")]
+    register_url = au.BatchedRegisterUrl(ds)
+    register_url.max_in_flight = 2
+    with patch.object(register_url, "registerurl",
+                      wraps=register_url.registerurl) as registerurl:
+        results = list(register_url.register_many(iter(rows)))
+    eq_([row for row, _ in results], rows)
+    for _, res in results:
+        eq_(len(res), 1)
+        eq_(res[0]["status"], "ok")
+    # identical key and URL pairs are registered only once
+    eq_(registerurl.call_count, 3)
+    ds.repo._batched.close()
+    annexinfo = ds.repo.get_content_annexinfo(
+        [r["filename_abs"] for r in rows], init=None)
+    eq_([annexinfo[Path(r["filename_abs"])]["key"] for r in rows],
+        [r["key"]["key"] for r in rows])
+    whereis = ds.repo.whereis("a1", output="full")
+    eq_(sorted(whereis[WEB_SPECIAL_REMOTE_UUID]["urls"]),
+        ["http://example.com/a", "http://example.com/a-mirror"])
+
+
 @with_tempfile(mkdir=True)
 def test_addurls_nonannex_repo(path=None):
     ds = Dataset(path).create(force=True, annex=False)
@@ -641,6 +811,39 @@ class TestAddurls(object):
                        result_renderer='disabled')
             assert_in("Not creating subdataset at existing path", cml.out)
 
+    @with_tempfile(mkdir=True)
+    def test_addurls_stream(self=None, path=None):
+        ds = Dataset(path).create(force=True)
+        jsonl_file = op.join(self.temp_dir, "stream.jsonl")
+        with open(jsonl_file, "w") as f:
+            for row in self.data:
+                f.write(json.dumps(row) + "\n")
+        with patch.object(au, "_STREAM_CHUNK_SIZE", 2):
+            assert_result_count(
+                ds.addurls(jsonl_file, "{url}", "{subdir}//{name}",
+                           exclude_autometa="(md5sum|size)", stream=True,
+                           result_renderer='disabled'),
+                3, action="addurl", status="ok")
+        for fname in ["foo/a", "foo/c", "bar/b"]:
+            ok_exists(op.join(ds.path, fname))
+        assert_repo_status(ds.path)
+        ok_startswith(ds.repo.format_commit('%s', DEFAULT_BRANCH),
+                      "[DATALAD] add 3 files to 2 (sub)datasets")
+        subds = Dataset(op.join(ds.path, "foo"))
+        eq_(dict(subds.repo.get_metadata(["a"]))["a"],
+            {"subdir": ["foo"], "name": ["a"]})
+
+        # collisions are detected as in the regular mode
+        with assert_raises(IncompleteResultsError) as raised:
+            ds.addurls(jsonl_file, "{url}", "{subdir}", stream=True,
+                       result_renderer='disabled')
+        assert_in("collided", str(raised.value))
+        ds.addurls(jsonl_file, "{url}", "{subdir}-{_repindex}", stream=True,
+                   result_renderer='disabled')
+        for fname in ["foo-0", "bar-0", "foo-1"]:
+            ok_exists(op.join(ds.path, fname))
+        assert_repo_status(ds.path)
+
     @with_tempfile(mkdir=True)
     def test_addurls_repindex(self=None, path=None):
         ds = Dataset(path).create(force=True)
@@ -829,6 +1032,8 @@ class TestAddurls(object):
         ds = Dataset(path).create(force=True)
         in_file = op.join(path, "in")
         for in_type in au.INPUT_TYPES:
+            if in_type == "parquet" and "pyarrow" not in external_versions:
+                continue
             with assert_raises(IncompleteResultsError) as exc:
                 ds.addurls(in_file, "{url}", "{name}", input_type=in_type,
                            result_renderer='disabled')
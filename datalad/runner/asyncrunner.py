@@ -0,0 +1,338 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""
+Event loop based subprocess execution with stdout and stderr passed to
+protocol objects
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import subprocess
+import threading
+import time
+from queue import Queue
+from typing import (
+    IO,
+    Callable,
+    Optional,
+    cast,
+)
+
+from .nonasyncrunner import (
+    STDERR_FILENO,
+    STDIN_FILENO,
+    STDOUT_FILENO,
+    ThreadedRunner,
+    _hint_on_too_long,
+    _ResultGenerator,
+)
+from .protocol import GeneratorMixIn
+from .runnerthreads import IOState
+
+__docformat__ = 'restructuredtext'
+
+lgr = logging.getLogger("datalad.runner.asyncrunner")
+
+
+class _EventLoopThread:
+    """Process-wide event loop, running in a daemon thread
+
+    The loop is (re)started on demand, e.g. in a child process after a fork.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None \
+                    or self._pid != os.getpid() \
+                    or self._thread is None \
+                    or not self._thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run,
+                    args=(self._loop,),
+                    name="datalad-runner-loop",
+                    daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+
+_event_loop = _EventLoopThread()
+
+
+class _QueueingSubprocessProtocol(asyncio.SubprocessProtocol):
+    """Forward subprocess events from the event loop to a runner's queue
+
+    The events are formatted like those of the threads of `ThreadedRunner`,
+    i.e. `(fileno, IOState, data)`, with `data=None` signaling EOF.
+    """
+    def __init__(self, output_queue: Queue) -> None:
+        self.output_queue = output_queue
+        self.exited = threading.Event()
+
+    def pipe_data_received(self, fd: int, data: bytes) -> None:
+        self.output_queue.put((fd, IOState.ok, data))
+
+    def pipe_connection_lost(self, fd: int, exc: Optional[Exception]) -> None:
+        if fd != STDIN_FILENO:
+            self.output_queue.put((fd, IOState.ok, None))
+
+    def process_exited(self) -> None:
+        self.exited.set()
+        self.output_queue.put((None, IOState.process_exit, None))
+
+
+class _LoopPipe:
+    """Thread-safe closing of a pipe transport"""
+    def __init__(self,
+                 call: Callable,
+                 transport: Optional[asyncio.BaseTransport]) -> None:
+        self._call = call
+        self._transport = transport
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._call(self._transport.close)
+
+
+class _LoopProcess:
+    """`Popen`-like handle for a process that is run by the event loop"""
+    def __init__(self,
+                 args: str | list,
+                 loop: asyncio.AbstractEventLoop,
+                 transport: asyncio.SubprocessTransport,
+                 protocol: _QueueingSubprocessProtocol,
+                 pipes: tuple[bool, bool, bool]) -> None:
+        self.args = args
+        self._loop = loop
+        self._transport = transport
+        self._protocol = protocol
+        self.pid = transport.get_pid()
+        self.stdin, self.stdout, self.stderr = (
+            _LoopPipe(self._call, transport.get_pipe_transport(i))
+            if piped else None
+            for i, piped in enumerate(pipes)
+        )
+
+    def _call(self, func: Callable, *args) -> None:
+        if not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(func, *args)
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._transport.get_returncode()
+
+    def poll(self) -> Optional[int]:
+        return self._transport.get_returncode()
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        if not self._protocol.exited.wait(timeout):
+            # can only time out with a timeout
+            assert timeout is not None
+            raise subprocess.TimeoutExpired(self.args, timeout)
+        returncode = self._transport.get_returncode()
+        # known once the process has exited
+        assert returncode is not None
+        return returncode
+
+    def send_signal(self, signal: int) -> None:
+        self._call(self._signal, self._transport.send_signal, signal)
+
+    def terminate(self) -> None:
+        self._call(self._signal, self._transport.terminate)
+
+    def kill(self) -> None:
+        self._call(self._signal, self._transport.kill)
+
+    @staticmethod
+    def _signal(func: Callable, *args) -> None:
+        try:
+            func(*args)
+        except ProcessLookupError:
+            # already gone
+            pass
+
+    def close(self) -> None:
+        self._call(self._transport.close)
+
+
+class AsyncioRunner(ThreadedRunner):
+    """Run a subprocess on a process-wide asyncio event loop
+
+    This is a drop-in replacement for `ThreadedRunner` (same parameters,
+    same protocol contract, same timeout semantics, same generator
+    interface). However, instead of starting up to three threads per
+    subprocess to read from stdout and stderr, write to stdin, and wait
+    for the process to exit, all subprocesses are serviced by a single
+    event loop that runs in a daemon thread. Events are handed to the
+    thread that called `run()`, hence protocol callbacks are executed in
+    this thread, just like with `ThreadedRunner`.
+
+    This keeps the number of threads independent of the number of
+    concurrently running subprocesses.
+
+    A `Queue` is not supported as `stdin`, because it cannot be
+    waited on by an event loop without a dedicated thread. Use
+    `ThreadedRunner` in this case.
+    """
+    def _locked_run(self) -> dict | _ResultGenerator:
+        with self.generator_condition:
+            if self.generator is not None:
+                if self.owning_thread == threading.get_ident():
+                    raise RuntimeError(
+                        "AsyncioRunner.run() was re-entered by already owning "
+                        f"thread {threading.get_ident()}. The execution is "
+                        f"still owned by thread {self.owning_thread}"
+                    )
+                self.generator_condition.wait()
+                assert self.generator is None
+
+        if isinstance(self.stdin, Queue):
+            raise ValueError(
+                "AsyncioRunner does not support a Queue as stdin, "
+                "use ThreadedRunner")
+        # input is written by the event loop, without an stdin queue
+        input_data = self.stdin if isinstance(self.stdin, bytes) else None
+        self.write_stdin = False
+
+        self.protocol = self.protocol_class(**self.protocol_kwargs)
+
+        if self.process is not None:
+            raise RuntimeError(f"Process already running {self.process.pid}")
+
+        self.return_code = None
+        self.output_queue = Queue()
+        loop = _event_loop.get_loop()
+        process = self._start(loop, input_data)
+        # a `Popen`-like handle, as far as protocols and the runner go
+        self.process = cast(subprocess.Popen, process)
+        self.process_running = True
+        self.active_file_numbers.add(None)
+
+        # There are no OS-level file numbers the runner could get hold of,
+        # the streams are identified by their standard file numbers
+        self.process_stdin_fileno = STDIN_FILENO \
+            if process.stdin else None
+        self.process_stdout_fileno = STDOUT_FILENO \
+            if self.catch_stdout else None
+        self.process_stderr_fileno = STDERR_FILENO \
+            if self.catch_stderr else None
+
+        self.protocol.connection_made(self.process)
+
+        self.fileno_mapping = {
+            fileno: fileno
+            for fileno in (self.process_stdout_fileno,
+                           self.process_stderr_fileno,
+                           self.process_stdin_fileno)
+            if fileno is not None
+        }
+        self.fileno_to_file = {
+            self.process_stdout_fileno: self.process.stdout,
+            self.process_stderr_fileno: self.process.stderr,
+            self.process_stdin_fileno: self.process.stdin,
+        }
+        self.fileno_to_file.pop(None, None)
+        self.file_to_fileno = {
+            f: fileno
+            for fileno, f in self.fileno_to_file.items()
+            if fileno is not None and f is not None
+        }
+
+        current_time = time.time()
+        if self.timeout:
+            self.last_touched[None] = current_time
+        for fileno in (self.process_stdout_fileno,
+                       self.process_stderr_fileno):
+            if fileno is not None:
+                self.active_file_numbers.add(fileno)
+                self.last_touched[fileno] = current_time
+
+        if isinstance(self.protocol, GeneratorMixIn):
+            self.generator = _ResultGenerator(
+                self,
+                self.protocol.result_queue
+            )
+            self.owning_thread = threading.get_ident()
+            return self.generator
+
+        return self.process_loop()
+
+    def _start(self,
+               loop: asyncio.AbstractEventLoop,
+               input_data: Optional[bytes]) -> _LoopProcess:
+        output_queue = self.output_queue
+        stdin: int | IO | None
+        if input_data is not None:
+            stdin = subprocess.PIPE
+        else:
+            # bytes and queues were handled by the caller
+            assert not isinstance(self.stdin, (bytes, Queue))
+            stdin = self.stdin
+        pipes = (
+            input_data is not None,
+            self.catch_stdout,
+            self.catch_stderr,
+        )
+        kwargs = {
+            **self.popen_kwargs,
+            **dict(
+                stdin=stdin,
+                stdout=subprocess.PIPE if self.catch_stdout else None,
+                stderr=subprocess.PIPE if self.catch_stderr else None,
+            )
+        }
+
+        async def start() -> _LoopProcess:
+            protocol = _QueueingSubprocessProtocol(output_queue)
+            # The following command is generated internally by datalad
+            # and trusted. Security check is therefore skipped.
+            if isinstance(self.cmd, str):
+                transport, _ = await loop.subprocess_shell(
+                    lambda: protocol, self.cmd, **kwargs)        # nosec
+            else:
+                transport, _ = await loop.subprocess_exec(
+                    lambda: protocol, *self.cmd, **kwargs)       # nosec
+            if input_data is not None:
+                stdin_transport = transport.get_pipe_transport(STDIN_FILENO)
+                assert isinstance(stdin_transport, asyncio.WriteTransport)
+                stdin_transport.write(input_data)
+                # closes after all data is written
+                stdin_transport.close()
+            return _LoopProcess(self.cmd, loop, transport, protocol, pipes)
+
+        try:
+            return asyncio.run_coroutine_threadsafe(start(), loop).result()
+        except OSError as e:
+            _hint_on_too_long(e)
+            raise
+
+    def is_stalled(self) -> bool:
+        # without the event loop, nothing can fill the queue anymore
+        return not _event_loop.is_alive() and self.output_queue.empty()
+
+    def _set_process_exited(self):
+        self.process.close()
+        super()._set_process_exited()
@@ -65,6 +65,18 @@ def _get_fileno(active: bool,
     return None
 
 
+def _hint_on_too_long(e: OSError) -> None:
+    if not on_windows and "argument list too long" in str(e).lower():
+        lgr.error(
+            "Caught exception suggesting too large stack size limits. "
+            "Hint: use 'ulimit -s' command to see current limit and "
+            "e.g. 'ulimit -s 8192' to reduce it to avoid this "
+            "exception. See "
+            "https://github.com/datalad/datalad/issues/6106 for more "
+            "information."
+        )
+
+
 class _ResultGenerator(Generator):
     """
     Generator returned by run_command if the protocol class
@@ -406,15 +418,7 @@ class ThreadedRunner:
             self.process = Popen(self.cmd, **kwargs)         # nosec
 
         except OSError as e:
-            if not on_windows and "argument list too long" in str(e).lower():
-                lgr.error(
-                    "Caught exception suggesting too large stack size limits. "
-                    "Hint: use 'ulimit -s' command to see current limit and "
-                    "e.g. 'ulimit -s 8192' to reduce it to avoid this "
-                    "exception. See "
-                    "https://github.com/datalad/datalad/issues/6106 for more "
-                    "information."
-                )
+            _hint_on_too_long(e)
             raise
 
         self.process_running = True
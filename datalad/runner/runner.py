@@ -32,6 +32,26 @@ from .protocol import (
 lgr = logging.getLogger('datalad.runner.runner')
 
 
+def _get_runner_class(stdin) -> type[ThreadedRunner]:
+    """Determine the runner implementation from `datalad.runtime.runner`
+
+    The asyncio-based runner cannot feed a subprocess from a `Queue`, the
+    threaded runner is used for those in any case.
+    """
+    if isinstance(stdin, Queue):
+        return ThreadedRunner
+    try:
+        from datalad import cfg
+    except ImportError:
+        # the configuration itself is being set up, which requires to run
+        # git-config
+        return ThreadedRunner
+    if cfg.get('datalad.runtime.runner', None) == 'asyncio':
+        from .asyncrunner import AsyncioRunner
+        return AsyncioRunner
+    return ThreadedRunner
+
+
 class WitlessRunner(object):
     """Minimal Runner with support for online command output processing
 
@@ -212,7 +232,7 @@ class WitlessRunner(object):
             applied_cwd
         )
 
-        threaded_runner = ThreadedRunner(
+        threaded_runner = _get_runner_class(stdin)(
             cmd=cmd,
             protocol_class=protocol,
             stdin=stdin,
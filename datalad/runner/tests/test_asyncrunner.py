@@ -0,0 +1,143 @@
+# emacs: -*- mode: python-mode; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil; coding: utf-8 -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test the event loop based runner
+"""
+from __future__ import annotations
+
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+
+import pytest
+
+from datalad.tests.utils_pytest import (
+    assert_raises,
+    assert_true,
+    eq_,
+    patch_config,
+    skip_if_on_windows,
+)
+
+from .. import (
+    CommandError,
+    Runner,
+    StdOutCapture,
+    StdOutErrCapture,
+)
+from ..asyncrunner import AsyncioRunner
+from ..nonasyncrunner import ThreadedRunner
+from ..runner import _get_runner_class
+from .test_nonasyncrunner import (
+    GenNothing,
+    GenStdoutLines,
+    GenStdoutStderr,
+)
+from .utils import py2cmd
+
+
+def test_capture() -> None:
+    rt = AsyncioRunner(
+        cmd=py2cmd(
+            "import sys; print('out'); print('err', file=sys.stderr)"),
+        protocol_class=StdOutErrCapture,
+        stdin=None)
+    res = rt.run()
+    assert isinstance(res, dict)
+    eq_(res['stdout'].strip(), 'out')
+    eq_(res['stderr'].strip(), 'err')
+    eq_(res['code'], 0)
+    eq_(rt.return_code, 0)
+
+
+def test_stdin_bytes() -> None:
+    data = b'x' * 200000 + b'\n'
+    res = AsyncioRunner(
+        cmd=py2cmd("import sys; print(len(sys.stdin.read()))"),
+        protocol_class=StdOutCapture,
+        stdin=data).run()
+    assert isinstance(res, dict)
+    eq_(int(res['stdout']), len(data))
+    # a queue cannot be served by the event loop
+    assert_raises(
+        ValueError,
+        AsyncioRunner(cmd=['true'], protocol_class=StdOutCapture,
+                      stdin=Queue()).run)
+
+
+def test_generator() -> None:
+    rt = AsyncioRunner(
+        cmd=py2cmd("for i in range(3): print(i)"),
+        protocol_class=GenStdoutLines,
+        stdin=None)
+    gen = rt.run()
+    assert isinstance(gen, Generator)
+    eq_(list(gen), ['0', '1', '2'])
+    eq_(gen.return_code, 0)
+
+
+@skip_if_on_windows
+def test_error() -> None:
+    res = AsyncioRunner(cmd=py2cmd("import sys; sys.exit(3)"),
+                        protocol_class=StdOutErrCapture,
+                        stdin=None).run()
+    assert isinstance(res, dict)
+    eq_(res['code'], 3)
+    gen = AsyncioRunner(cmd=py2cmd("import sys; sys.exit(3)"),
+                        protocol_class=GenStdoutStderr,
+                        stdin=None).run()
+    with pytest.raises(CommandError) as cme:
+        list(gen)
+    eq_(cme.value.code, 3)
+    assert_raises(
+        FileNotFoundError,
+        AsyncioRunner(cmd=['datalad-no-such-command'],
+                      protocol_class=StdOutCapture,
+                      stdin=None).run)
+
+
+@skip_if_on_windows
+def test_timeout_process() -> None:
+    # protocols returning True from timeout() terminate the process
+    for protocol in (GenStdoutStderr, GenNothing):
+        rt = AsyncioRunner(cmd=["sleep", "4"],
+                           stdin=None,
+                           protocol_class=protocol,
+                           timeout=.5,
+                           exception_on_error=False)
+        tuple(rt.run())
+        assert_true(rt.return_code is not None)
+
+
+def test_concurrent() -> None:
+    def run(i: int) -> str:
+        res = AsyncioRunner(
+            cmd=py2cmd(f"print({i})"),
+            protocol_class=StdOutCapture,
+            stdin=None).run()
+        assert isinstance(res, dict)
+        return res['stdout'].strip()
+
+    nthreads = threading.active_count()
+    with ThreadPoolExecutor(8) as executor:
+        eq_(list(executor.map(run, range(32))), [str(i) for i in range(32)])
+    # the event loop runs in a single thread for all subprocesses
+    assert_true(threading.active_count() <= nthreads + 1)
+
+
+def test_runner_selection() -> None:
+    eq_(_get_runner_class(None), ThreadedRunner)
+    with patch_config({'datalad.runtime.runner': 'asyncio'}):
+        eq_(_get_runner_class(None), AsyncioRunner)
+        eq_(_get_runner_class(b''), AsyncioRunner)
+        eq_(_get_runner_class(Queue()), ThreadedRunner)
+        res = Runner().run(py2cmd("print('selected')"),
+                           protocol=StdOutCapture)
+        assert isinstance(res, dict)
+        eq_(res['stdout'].strip(), 'selected')
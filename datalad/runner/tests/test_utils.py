@@ -14,6 +14,7 @@ from datalad.tests.utils_pytest import (
 
 from ..utils import (
     AssemblingDecoderMixIn,
+    ByteLineSplitter,
     LineSplitter,
 )
 
@@ -114,6 +115,30 @@ def test_line_splitter_corner_cases() -> None:
     assert_equal(lines, ["  a   ", " "])
 
 
+def test_byte_line_splitter() -> None:
+    data = "first line\nsecond ä line\r\nthird\n\nfourth ".encode("utf-8")
+    expected = [b"first line", "second ä line".encode("utf-8"), b"third", b""]
+    # feed all at once, and byte by byte, splitting encoded characters
+    for chunks in ([data], [data[i:i + 1] for i in range(len(data))]):
+        line_splitter = ByteLineSplitter()
+        lines = []
+        for chunk in chunks:
+            lines.extend(line_splitter.process(chunk))
+        assert_equal(lines, expected)
+        assert_equal(line_splitter.finish_processing(), b"fourth ")
+        assert_is_none(line_splitter.finish_processing())
+
+    line_splitter = ByteLineSplitter()
+    assert_equal(line_splitter.process(memoryview(b"a\rb\n")), [b"a\rb"])
+    assert_equal(line_splitter.process(b""), [])
+    assert_is_none(line_splitter.finish_processing())
+
+    line_splitter = ByteLineSplitter(separator=b"\x00", keep_ends=True)
+    assert_equal(line_splitter.process(b"a\r\n\x00b"), [b"a\r\n\x00"])
+    assert_equal(line_splitter.process(b"c\x00\x00"), [b"bc\x00", b"\x00"])
+    assert_is_none(line_splitter.finish_processing())
+
+
 def test_assembling_decoder_mix_in_basic() -> None:
 
     encoding = "utf-8"
@@ -113,6 +113,69 @@ class LineSplitter:
         return self.remaining_data
 
 
+class ByteLineSplitter:
+    """
+    A line splitter for streamed bytes
+
+    Unlike `LineSplitter`, no decoding is performed. Complete records are
+    returned as `bytes`, and can be decoded (or handed to a parser that
+    accepts `bytes`) once per record. Each chunk is split in a single pass,
+    and only the unterminated tail of a chunk is retained, in a `bytearray`
+    that is extended in place. Therefore, records that are delivered in
+    many parts are assembled in linear time.
+    """
+    def __init__(self,
+                 separator: Optional[bytes] = None,
+                 keep_ends: bool = False
+                 ) -> None:
+        """
+        Parameters
+        ----------
+        separator: Optional[bytes]
+            If not None, the provided separator will be used to split lines.
+            If None, lines are split on b"\\n", and a preceding b"\\r" is
+            considered part of the line ending. Unlike `str.splitlines()`,
+            other characters, e.g. a single b"\\r", do not end a line.
+        keep_ends: bool
+            If True, the separator will be contained in the returned lines.
+        """
+        self.separator = separator
+        self.keep_ends = keep_ends
+        self.remaining_data = bytearray()
+
+    def process(self,
+                data: bytes | bytearray | memoryview
+                ) -> list[bytes]:
+        separator = self.separator or b"\n"
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        if separator not in data:
+            self.remaining_data += data
+            return []
+
+        lines = data.split(separator)
+        # the last element is the unterminated rest, possibly b""
+        tail = lines.pop()
+        if self.remaining_data:
+            self.remaining_data += lines[0]
+            lines[0] = bytes(self.remaining_data)
+        self.remaining_data = bytearray(tail)
+
+        if self.keep_ends:
+            return [line + separator for line in lines]
+        if self.separator is None:
+            return [
+                line[:-1] if line.endswith(b"\r") else line
+                for line in lines
+            ]
+        return lines
+
+    def finish_processing(self) -> Optional[bytes]:
+        remaining_data = bytes(self.remaining_data) or None
+        self.remaining_data = bytearray()
+        return remaining_data
+
+
 class AssemblingDecoderMixIn:
     """ Mix in to safely decode data that is delivered in parts
 
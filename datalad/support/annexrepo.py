@@ -53,9 +53,11 @@ from datalad.dochelpers import (
     borrowkwargs,
 )
 from datalad.log import log_progress
+from datalad.runner.nonasyncrunner import STDOUT_FILENO
 from datalad.runner.protocol import GeneratorMixIn
 from datalad.runner.utils import (
     AssemblingDecoderMixIn,
+    ByteLineSplitter,
     LineSplitter,
 )
 from datalad.support.annex_utils import (
@@ -63,7 +65,9 @@ from datalad.support.annex_utils import (
     _get_non_existing_from_annex_output,
     _sanitize_key,
 )
+from datalad.support.contentinfo import ContentRecord
 from datalad.support.exceptions import CapturedException
+from datalad.support.json_py import loads_record
 from datalad.ui import ui
 from datalad.utils import (
     Path,
@@ -875,6 +879,43 @@ class AnnexRepo(GitRepo, RepoInterface):
                 CapturedException(e)
         return srs
 
+    def get_remote_costs(self) -> Dict[str, dict]:
+        """Get the cost of retrieving content from each available remote
+
+        Costs are reported by git-annex, hence they reflect any configured
+        `remote.<name>.annex-cost[-command]`, and otherwise the default
+        cost of a remote's type, or the cost reported by an external
+        special remote (e.g. the ORA remote's GETCOST).
+
+        Returns
+        -------
+        dict
+          Keys are remote UUIDs. Each value is a dictionary with the
+          remote's 'name' and 'cost' (float). Remotes that are not
+          available, have no annex, or are configured with
+          `remote.<name>.annex-ignore`, are not reported.
+        """
+        # the web remote is built-in and has no git config. Remotes that
+        # git-annex is told to ignore are not considered
+        remotes = [r for r in self.get_remotes()
+                   if not self.is_remote_annex_ignored(r)] + ['web']
+        try:
+            records = self._call_annex_records(
+                ['info', '--fast'] + remotes,
+                merge_annex_branches=False)
+        except CommandError as e:
+            records = e.kwargs.get('stdout_json') or []
+        costs = {}
+        for rec in records:
+            if not rec.get('uuid') or rec.get('available') == 'false':
+                continue
+            try:
+                cost = float(rec['cost'])
+            except (KeyError, ValueError):
+                continue
+            costs[rec['uuid']] = dict(name=rec['remote'], cost=cost)
+        return costs
+
     def _call_annex(self, args, files=None, jobs=None, protocol=StdOutErrCapture,
                     git_options=None, stdin=None, merge_annex_branches=True,
                     **kwargs):
@@ -3466,12 +3507,12 @@ class AnnexRepo(GitRepo, RepoInterface):
                     # Annex reports error on that file. Create an error entry,
                     # as we can't currently yield a prepared error result from
                     # within here.
-                    rec = {'status': 'error', 'state': 'unknown'}
+                    rec = ContentRecord(status='error', state='unknown')
                 elif init is not None:
                     # init constraint knows nothing about this path -> skip
                     continue
                 else:
-                    rec = {}
+                    rec = ContentRecord()
             rec.update({'{}{}'.format(key_prefix, k): j[k]
                        for k in j if k != 'file' and k != 'error-messages'})
             # change annex' `error-messages` into singular to match result
@@ -3727,7 +3768,7 @@ class AnnexJsonProtocol(WitlessProtocol):
         self.json_out = []
         self._global_pbar_id = 'annexprogress-{}'.format(id(self))
         self.total_nbytes = total_nbytes
-        self._unprocessed = None
+        self._line_splitter = ByteLineSplitter()
 
     def add_to_output(self, json_object):
         self.json_out.append(json_object)
@@ -3752,38 +3793,46 @@ class AnnexJsonProtocol(WitlessProtocol):
             self._pbars.add(self._global_pbar_id)
 
     def pipe_data_received(self, fd, data):
-        if fd != 1:
+        if fd != STDOUT_FILENO:
             # let the base class decide what to do with it
             super().pipe_data_received(fd, data)
             return
-        if self._unprocessed:
-            data = self._unprocessed + data
-            self._unprocessed = None
         # this is where the JSON records come in
-        lines = data.splitlines()
-        data_ends_with_eol = data.endswith(os.linesep.encode())
-        del data
-        for iline, line in enumerate(lines):
+        for line in self._line_splitter.process(data):
+            self._proc_json_line(line)
+        tail = self._line_splitter.remaining_data
+        if tail.endswith(b'}'):
+            # the unterminated rest might be a complete record already,
+            # e.g. with an interactive process that does not end records
+            # with a newline
             try:
-                j = json.loads(line)
-            except Exception as exc:
-                if line.strip():
-                    # do not complain on empty lines
-                    if iline == len(lines) - 1 and not data_ends_with_eol:
-                        lgr.debug("Caught %s while trying to parse JSON line %s which might "
-                                  "be not yet a full line", exc, line)
-                        # it is the last line and fails to parse -- it can/likely
-                        # to happen that it was not a complete line and that buffer
-                        # got filled up/provided before the end of line.
-                        # Store it so that it can be prepended to data in the next call.
-                        self._unprocessed = line
-                        break
-                    # TODO turn this into an error result, or put the exception
-                    # onto the result future -- needs more thought
-                    lgr.error('Received undecodable JSON output: %s', line)
-                continue
+                j = loads_record(bytes(tail))
+            except ValueError:
+                # most likely not yet a full record
+                return
+            self._line_splitter.finish_processing()
             self._proc_json_record(j)
 
+    def pipe_connection_lost(self, fd, exc):
+        if fd == STDOUT_FILENO:
+            # a final record might not be terminated by a newline
+            remaining = self._line_splitter.finish_processing()
+            if remaining is not None:
+                self._proc_json_line(remaining)
+        super().pipe_connection_lost(fd, exc)
+
+    def _proc_json_line(self, line):
+        try:
+            j = loads_record(line)
+        except Exception:
+            if line.strip():
+                # do not complain on empty lines
+                # TODO turn this into an error result, or put the exception
+                # onto the result future -- needs more thought
+                lgr.error('Received undecodable JSON output: %s', line)
+            return
+        self._proc_json_record(j)
+
     def _get_pbar_id(self, record):
         # NOTE: Look at the "action" field for byte-progress records and the
         # top-level `record` for the final record. The action record as a whole
@@ -3918,11 +3967,6 @@ class AnnexJsonProtocol(WitlessProtocol):
                 'Finished',
                 noninteractive_level=5,
             )
-        if self._unprocessed:
-            lgr.error(
-                "%d bytes of received undecodable JSON output remain: %s",
-                len(self._unprocessed), self._unprocessed
-            )
         super().process_exited()
 
 
@@ -3969,7 +4013,7 @@ class AnnexInitOutput(WitlessProtocol, AssemblingDecoderMixIn):
 
     def pipe_data_received(self, fd, byts):
         line = self.decode(fd, byts, self.encoding)
-        if fd == 1:
+        if fd == STDOUT_FILENO:
             res = re.search("(scanning for .* files)", line, flags=re.IGNORECASE)
             if res:
                 lgr.info("%s (this may take some time)", res.groups()[0])
@@ -4077,7 +4121,7 @@ def readlines_until_ok_or_failed(stdout, maxlines=100):
 def readline_json(stdout):
     toload = stdout.readline().strip()
     try:
-        return json.loads(toload) if toload else {}
+        return loads_record(toload) if toload else {}
     except json.JSONDecodeError:
         lgr.error('Received undecodable JSON output: %s', toload)
         return {}
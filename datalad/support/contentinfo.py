@@ -0,0 +1,711 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Helpers for `GitRepo.get_content_info()`
+
+This module provides a column-oriented representation of the information
+Git reports on repository content via `git ls-files --stage` and
+`git ls-tree`, bulk parsers for the output of these commands, a lazy
+dict-like view on such reports, and a persistent cache for them (keyed
+by the stat signature of the index file, or the SHA of a tree object).
+It also provides `ContentRecord`, a compact mapping type for the
+properties of individual content records.
+"""
+
+from __future__ import annotations
+
+__docformat__ = 'restructuredtext'
+
+import logging
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from collections.abc import (
+    Iterable,
+    Iterator,
+    MutableMapping,
+)
+from pathlib import (
+    Path,
+    PurePath,
+)
+from typing import (
+    Any,
+    Optional,
+)
+
+from datalad.support.cache import DictCache
+
+lgr = logging.getLogger('datalad.support.contentinfo')
+
+# map of file mode reported by Git to the type label used by datalad
+MODE_TYPE_MAP = {
+    '100644': 'file',
+    '100755': 'file',
+    '120000': 'symlink',
+    '160000': 'dataset',
+}
+
+# characters that give a path special meaning as a Git pathspec
+_PATHSPEC_MAGIC = frozenset('*?[\\:')
+
+# Git reports paths as raw bytes, decode them like the OS would
+_FS_ENCODING = sys.getfilesystemencoding()
+_FS_ERRORS = sys.getfilesystemencodeerrors()
+
+_MAGIC = b'DLCI'
+_FORMAT_VERSION = 2
+# header after the magic: format version, length of the signature string
+_HEADER = struct.Struct('>BH')
+# payload header: number of records, length of path block, length of the
+# block of distinct modes, SHA size in bytes.
+# Sizes are stored as little-endian signed 64bit integers (-1 for unknown)
+_PAYLOAD_HEADER = struct.Struct('>IQIB')
+
+# properties of content records that are stored in dedicated slots. This
+# covers everything reported by get_content_info(), diffstatus(), and
+# `git annex find --json` (via get_content_annexinfo())
+RECORD_FIELDS = (
+    'type', 'state', 'gitshasum', 'prev_gitshasum', 'bytesize',
+    'key', 'backend', 'keyname', 'humansize', 'mtime',
+    'hashdirlower', 'hashdirmixed', 'has_content', 'objloc',
+)
+_RECORD_SLOTS = frozenset(RECORD_FIELDS)
+_UNSET = object()
+
+
+class ContentRecord(MutableMapping):
+    """Properties of a single content record
+
+    A drop-in replacement for the property dicts that are reported for
+    each path by `get_content_info()`, `diffstatus()`, and
+    `get_content_annexinfo()`. Common properties (see `RECORD_FIELDS`)
+    are kept in slots instead of a per-record hash table, which cuts the
+    memory footprint of a report on a large repository to a fraction.
+    Any other property is stored in a regular dict that is only created
+    when needed.
+
+    Iteration order is the order of `RECORD_FIELDS`, followed by any
+    other property in the order of assignment.
+    """
+
+    __slots__ = RECORD_FIELDS + ('_extra',)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._extra: Optional[dict[str, Any]] = None
+        for props in args + (kwargs,):
+            for k, v in (props.items() if hasattr(props, 'items')
+                         else props):
+                self[k] = v
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _RECORD_SLOTS:
+            value = getattr(self, key, _UNSET)
+            if value is _UNSET:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _RECORD_SLOTS:
+            return getattr(self, key, default)
+        if self._extra is None:
+            return default
+        return self._extra.get(key, default)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _RECORD_SLOTS:
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _RECORD_SLOTS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is None:
+            raise KeyError(key)
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: Any) -> bool:
+        if key in _RECORD_SLOTS:
+            return getattr(self, key, _UNSET) is not _UNSET
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for k in RECORD_FIELDS:
+            if getattr(self, k, _UNSET) is not _UNSET:
+                yield k
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        n = sum(getattr(self, k, _UNSET) is not _UNSET
+                for k in RECORD_FIELDS)
+        return n + len(self._extra) if self._extra else n
+
+    def __bool__(self) -> bool:
+        # stop at the first property, instead of counting them all
+        for k in RECORD_FIELDS:
+            if getattr(self, k, _UNSET) is not _UNSET:
+                return True
+        return bool(self._extra)
+
+    def copy(self) -> ContentRecord:
+        return self.__class__(self.items())
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (dict(self.items()),)
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(self.__class__.__name__, dict(self.items()))
+
+
+class ContentInfoTable:
+    """Column-oriented report on repository content
+
+    All columns are parallel sequences with one item per content record:
+
+    `paths`
+      POSIX paths relative to the repository root
+    `modes`
+      File mode as reported by Git, or None for untracked content
+    `shas`
+      SHA of the Git object, or None for untracked content
+    `sizes`
+      Size of the object in bytes, or -1 if not known
+    """
+    __slots__ = ('paths', 'modes', 'shas', 'sizes')
+
+    def __init__(self,
+                 paths: Optional[list[str]] = None,
+                 modes: Optional[list[Optional[str]]] = None,
+                 shas: Optional[list[Optional[str]]] = None,
+                 sizes: Optional[array] = None) -> None:
+        self.paths = paths if paths is not None else []
+        n = len(self.paths)
+        self.modes = modes if modes is not None else [None] * n
+        self.shas = shas if shas is not None else [None] * n
+        self.sizes = sizes if sizes is not None else array('q', [-1]) * n
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ContentInfoTable):
+            return NotImplemented
+        return all(getattr(self, c) == getattr(other, c)
+                   for c in self.__slots__)
+
+    def take(self, rows: Iterable[int]) -> ContentInfoTable:
+        """Return a new table with the given rows only"""
+        rows = list(rows)
+        return ContentInfoTable(
+            [self.paths[i] for i in rows],
+            [self.modes[i] for i in rows],
+            [self.shas[i] for i in rows],
+            array('q', [self.sizes[i] for i in rows]),
+        )
+
+    def tracked(self) -> ContentInfoTable:
+        """Return a table with records of tracked content only"""
+        if None not in self.modes:
+            return self
+        return self.take(i for i, m in enumerate(self.modes) if m is not None)
+
+    def filter(self, paths: Iterable[str]) -> ContentInfoTable:
+        """Return a table with records matching any of the given paths
+
+        Matching follows Git's pathspec semantics for literal POSIX paths:
+        a record matches, if its path is identical to a query path, or if
+        it is located underneath it.
+        """
+        paths = list(paths)
+        if any(p in ('', '.') for p in paths):
+            return self
+        exact = set(paths)
+        prefixes = tuple(p.rstrip('/') + '/' for p in paths)
+        return self.take(
+            i for i, p in enumerate(self.paths)
+            if p in exact or p.startswith(prefixes))
+
+    @classmethod
+    def concat(cls, *tables: ContentInfoTable) -> ContentInfoTable:
+        """Return a new table with the records of all given tables"""
+        res = cls()
+        for t in tables:
+            res.paths.extend(t.paths)
+            res.modes.extend(t.modes)
+            res.shas.extend(t.shas)
+            res.sizes.extend(t.sizes)
+        return res
+
+
+def _split_records(out: bytes) -> list[bytes]:
+    records = out.split(b'\0')
+    if records and not records[-1]:
+        # output is NUL terminated
+        records.pop()
+    return records
+
+
+def _decode_paths(paths: list[bytes]) -> list[str]:
+    # decoding a single joined buffer is much faster than decoding
+    # each path individually
+    if not paths:
+        return []
+    return b'\0'.join(paths).decode(_FS_ENCODING, _FS_ERRORS).split('\0')
+
+
+def _untracked_path(path: bytes) -> bytes:
+    # untracked directories are reported with a trailing slash
+    return path[:-1] if path.endswith(b'/') else path
+
+
+def parse_ls_files_untracked(out: bytes) -> ContentInfoTable:
+    """Parse the output of `git ls-files -z -o`"""
+    return ContentInfoTable(
+        _decode_paths([_untracked_path(r) for r in _split_records(out)]))
+
+
+def parse_status_porcelain(out: bytes) -> tuple[list[str], ContentInfoTable]:
+    """Parse the output of `git status --porcelain=v2 -z --no-renames`
+
+    Returns
+    -------
+    tuple
+      A list of paths of tracked content that is modified or deleted in
+      the worktree (compared to the index), like `git ls-files -m -d` would
+      report it, and a table with the untracked content, like
+      `parse_ls_files_untracked()` would report it.
+    """
+    modified = []
+    untracked = []
+    for r in _split_records(out):
+        kind = r[:1]
+        if kind == b'?':
+            untracked.append(_untracked_path(r[2:]))
+        elif kind == b'1':
+            # `1 XY <sub> <mH> <mI> <mW> <hH> <hI> <path>`, where Y is the
+            # worktree status
+            if r[3:4] != b'.':
+                modified.append(r.split(b' ', 8)[8])
+        elif kind == b'u':
+            # unmerged: `u XY <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>`
+            modified.append(r.split(b' ', 10)[10])
+    return _decode_paths(modified), ContentInfoTable(_decode_paths(untracked))
+
+
+def parse_ls_files(out: bytes) -> ContentInfoTable:
+    """Parse the output of `git ls-files --stage -z [-o]`
+
+    Each record of tracked content is formatted as
+    `<mode> SP <sha> SP <stage> TAB <path>`, untracked content is reported
+    by path only (and before any tracked content). The fixed width of the
+    properties allows for splitting all records at the same offsets,
+    instead of matching them one by one.
+    """
+    records = _split_records(out)
+    if not records:
+        return ContentInfoTable()
+    # determine the length of the SHAs in this repository from the last
+    # record, which is tracked content, unless there is none
+    last = records[-1]
+    shalen = last.find(b' ', 7) - 7
+    # offset of the path in a record of tracked content
+    poff = 7 + shalen + 3
+    if shalen not in (40, 64) or last[poff - 1:poff] != b'\t':
+        return parse_ls_files_untracked(out)
+    # untracked content is reported first, find where tracked content starts
+    nuntracked = 0
+    for r in records:
+        if r[6:7] == b' ' and r[poff - 3:poff - 2] == b' ' \
+                and r[poff - 1:poff] == b'\t':
+            break
+        nuntracked += 1
+    untracked = records[:nuntracked]
+    records = records[nuntracked:]
+    rawmodes = [r[:6] for r in records]
+    # intern the handful of distinct modes
+    modemap = {m: m.decode('ascii') for m in set(rawmodes)}
+    modes: list[Optional[str]] = [None] * nuntracked
+    modes.extend(map(modemap.__getitem__, rawmodes))
+    shas: list[Optional[str]] = [None] * nuntracked
+    shas.extend([r[7:7 + shalen].decode('ascii') for r in records])
+    paths = _decode_paths(
+        [_untracked_path(r) for r in untracked]
+        + [r[poff:] for r in records])
+    return ContentInfoTable(paths, modes, shas)
+
+
+def parse_ls_tree(out: bytes) -> ContentInfoTable:
+    """Parse the output of `git ls-tree -z -r -l`
+
+    Each record is formatted as
+    `<mode> SP <type> SP <sha> SP <size> TAB <path>`, where the size is
+    padded to a minimum width, or '-' if the object is not a blob.
+    """
+    records = [r.split(b'\t', 1) for r in _split_records(out)]
+    props = [r[0].split() for r in records]
+    modemap: dict[bytes, str] = {}
+    return ContentInfoTable(
+        _decode_paths([r[1] for r in records]),
+        [modemap.get(p[0]) or modemap.setdefault(p[0], p[0].decode('ascii'))
+         for p in props],
+        [p[2].decode('ascii') for p in props],
+        array('q', [-1 if p[3] == b'-' else int(p[3]) for p in props]),
+    )
+
+
+class ContentInfo(MutableMapping):
+    """Lazy mapping of content paths to their properties
+
+    This is the return value of `GitRepo.get_content_info()`. It behaves
+    like a dict with absolute `Path` keys, and `ContentRecord` values with
+    the properties 'type', 'gitshasum', and (if known, for files)
+    'bytesize'. However, a record is only created when it is accessed, and
+    the type of untracked content is only determined then.
+
+    Any record, once accessed, is retained, such that modifications
+    are preserved, just like with a regular dict.
+    """
+
+    def __init__(self, root: Path, table: Optional[ContentInfoTable] = None
+                 ) -> None:
+        self._root = root
+        self._rootprefix = '' if str(root) == os.curdir \
+            else str(root).rstrip(os.sep) + os.sep
+        self._table = table if table is not None else ContentInfoTable()
+        # map of relative path to the row reporting on it, built on demand
+        self._rows: Optional[dict[str, int]] = None
+        # rows that have been superseded (duplicate paths) or removed
+        self._hidden: set[int] = set()
+        # property dicts for rows that have been accessed
+        self._props: dict[int, MutableMapping[str, Any]] = {}
+        # items for paths not reported in the table
+        self._extra: dict[Any, MutableMapping[str, Any]] = {}
+
+    @property
+    def table(self) -> ContentInfoTable:
+        """Underlying column-oriented report (ignores any modifications)"""
+        return self._table
+
+    def _get_rows(self) -> dict[str, int]:
+        if self._rows is None:
+            rows = {p: i for i, p in enumerate(self._table.paths)}
+            if len(rows) < len(self._table):
+                # Git reports a path multiple times for the stages of a
+                # merge conflict, the last report wins
+                self._hidden.update(
+                    i for i, p in enumerate(self._table.paths)
+                    if rows[p] != i)
+            self._rows = rows
+        return self._rows
+
+    def _get_row(self, key: Any) -> Optional[int]:
+        if not isinstance(key, PurePath):
+            return None
+        key = str(key)
+        if not key.startswith(self._rootprefix):
+            return None
+        key = key[len(self._rootprefix):]
+        if os.sep != '/':
+            key = key.replace(os.sep, '/')
+        row = self._get_rows().get(key)
+        return None if row is None or row in self._hidden else row
+
+    def _get_props(self, row: int) -> MutableMapping[str, Any]:
+        props = self._props.get(row)
+        if props is not None:
+            return props
+        t = self._table
+        mode = t.modes[row]
+        props = ContentRecord()
+        if mode is None:
+            path = self._root.joinpath(t.paths[row])
+            # be nice and assign types for untracked content
+            props.type = 'symlink' if path.is_symlink() \
+                else 'directory' if path.is_dir() else 'file'
+            props.gitshasum = None
+        else:
+            props.type = MODE_TYPE_MAP.get(mode, mode)
+            props.gitshasum = t.shas[row]
+            if props.type == 'file' and t.sizes[row] >= 0:
+                props.bytesize = t.sizes[row]
+        self._props[row] = props
+        return props
+
+    def __getitem__(self, key: Any) -> MutableMapping[str, Any]:
+        row = self._get_row(key)
+        if row is None:
+            return self._extra[key]
+        return self._get_props(row)
+
+    def __setitem__(self, key: Any, value: MutableMapping[str, Any]) -> None:
+        row = self._get_row(key)
+        if row is None:
+            self._extra[key] = value
+        else:
+            self._props[row] = value
+
+    def __delitem__(self, key: Any) -> None:
+        row = self._get_row(key)
+        if row is None:
+            del self._extra[key]
+        else:
+            self._hidden.add(row)
+            self._props.pop(row, None)
+
+    def __contains__(self, key: Any) -> bool:
+        return self._get_row(key) is not None or key in self._extra
+
+    def _iter_rows(self) -> Iterator[int]:
+        self._get_rows()
+        hidden = self._hidden
+        return (i for i in range(len(self._table)) if i not in hidden)
+
+    def __iter__(self) -> Iterator[Any]:
+        joinpath = self._root.joinpath
+        paths = self._table.paths
+        for i in self._iter_rows():
+            yield joinpath(paths[i])
+        yield from self._extra
+
+    def __len__(self) -> int:
+        self._get_rows()
+        return len(self._table) - len(self._hidden) + len(self._extra)
+
+    def items(self) -> Iterator[tuple[Any, MutableMapping[str, Any]]]:  # type: ignore[override]
+        joinpath = self._root.joinpath
+        paths = self._table.paths
+        for i in self._iter_rows():
+            yield joinpath(paths[i]), self._get_props(i)
+        yield from self._extra.items()
+
+    def relitems(self) -> Iterator[tuple[Optional[str], Any, MutableMapping[str, Any]]]:
+        """Like `items()`, but also report the path relative to the root
+
+        The relative path (in POSIX notation, as reported by Git) allows
+        for cheap lookups via `getrel()`. It is None for items that are not
+        reported by the underlying table.
+        """
+        joinpath = self._root.joinpath
+        paths = self._table.paths
+        for i in self._iter_rows():
+            yield paths[i], joinpath(paths[i]), self._get_props(i)
+        for k, v in self._extra.items():
+            yield None, k, v
+
+    def getrel(self, relpath: str) -> Optional[MutableMapping[str, Any]]:
+        """Like `get()`, but for a path relative to the root (see `relitems()`)
+        """
+        row = self._get_rows().get(relpath)
+        if row is not None and row not in self._hidden:
+            return self._get_props(row)
+        return self._extra.get(self._root.joinpath(relpath)) \
+            if self._extra else None
+
+    def missing_from(self, other: ContentInfo) -> Iterator[tuple[Any, MutableMapping[str, Any]]]:
+        """Yield the items whose path is not reported by `other`
+        """
+        paths = self._table.paths
+        for i in self._iter_rows():
+            if other.getrel(paths[i]) is None:
+                yield self._root.joinpath(paths[i]), self._get_props(i)
+        for k, v in self._extra.items():
+            if k not in other:
+                yield k, v
+
+    def values(self) -> Iterator[MutableMapping[str, Any]]:  # type: ignore[override]
+        for i in self._iter_rows():
+            yield self._get_props(i)
+        yield from self._extra.values()
+
+    def copy(self) -> dict[Any, MutableMapping[str, Any]]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(self.__class__.__name__, self.copy())
+
+
+def get_index_signature(index: Path) -> Optional[str]:
+    """Return a stat signature of a Git index file
+
+    Any write to the index (Git replaces the file via a lock file) changes
+    at least one of inode, size, or modification/change time.
+
+    Returns
+    -------
+    str or None
+      None is returned, if the index file does not exist.
+    """
+    try:
+        st = index.stat()
+    except OSError:
+        return None
+    return '{}:{}:{}:{}'.format(
+        st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+def is_literal_path(path: str) -> bool:
+    """Whether a Git pathspec is guaranteed to match only by path prefix"""
+    return not _PATHSPEC_MAGIC.intersection(path)
+
+
+def _dump(signature: str, table: ContentInfoTable) -> bytes:
+    modes = sorted(set(table.modes))
+    modemap = {m: i for i, m in enumerate(modes)}
+    shasize = len(table.shas[0]) // 2 if len(table) else 20
+    pathblock = '\0'.join(table.paths).encode('utf-8', 'surrogatepass')
+    modeblock = '\0'.join(modes).encode('ascii')
+    sizes = array('q', table.sizes)
+    if sys.byteorder != 'little':
+        sizes.byteswap()
+    payload = b''.join((
+        _PAYLOAD_HEADER.pack(
+            len(table), len(pathblock), len(modeblock), shasize),
+        modeblock,
+        pathblock,
+        bytes(modemap[m] for m in table.modes),
+        bytes.fromhex(''.join(table.shas)),
+        sizes.tobytes(),
+    ))
+    sig = signature.encode('utf-8')
+    return b''.join((
+        _MAGIC,
+        _HEADER.pack(_FORMAT_VERSION, len(sig)),
+        sig,
+        zlib.compress(payload, 1),
+    ))
+
+
+def _load(data: bytes, signature: str) -> Optional[ContentInfoTable]:
+    if data[:len(_MAGIC)] != _MAGIC:
+        return None
+    offset = len(_MAGIC)
+    version, siglen = _HEADER.unpack_from(data, offset)
+    offset += _HEADER.size
+    if version != _FORMAT_VERSION \
+            or data[offset:offset + siglen] != signature.encode('utf-8'):
+        return None
+    payload = memoryview(zlib.decompress(data[offset + siglen:]))
+    count, pathlen, modelen, shasize = _PAYLOAD_HEADER.unpack_from(payload, 0)
+    if not count:
+        return ContentInfoTable()
+    offset = _PAYLOAD_HEADER.size
+    modes = bytes(payload[offset:offset + modelen]).decode('ascii').split('\0')
+    offset += modelen
+    paths = bytes(payload[offset:offset + pathlen]).decode(
+        'utf-8', 'surrogatepass').split('\0')
+    offset += pathlen
+    modecodes = payload[offset:offset + count]
+    offset += count
+    hexshas = payload[offset:offset + count * shasize].hex()
+    offset += count * shasize
+    sizes = array('q')
+    sizes.frombytes(payload[offset:offset + count * 8])
+    if sys.byteorder != 'little':
+        sizes.byteswap()
+    hexlen = 2 * shasize
+    return ContentInfoTable(
+        paths,
+        [modes[m] for m in modecodes],
+        [hexshas[i:i + hexlen] for i in range(0, count * hexlen, hexlen)],
+        sizes,
+    )
+
+
+class ContentInfoCache:
+    """Persistent cache of tracked content reported by Git
+
+    Reports are stored under a label (e.g. 'index', or 'tree-<SHA>'),
+    together with a signature that must match for a cache hit. The last
+    loaded reports are also kept in memory to avoid repeated reads within
+    a process.
+
+    Any error while reading or writing the cache is logged and otherwise
+    ignored, a cache failure must never break a query.
+    """
+
+    def __init__(self, path: Path, max_trees: int = 10) -> None:
+        """
+        Parameters
+        ----------
+        path : Path
+          Directory to store cache files in. Will be created on demand.
+        max_trees : int
+          Maximum number of tree reports to keep on disk. Least recently
+          used ones are removed first.
+        """
+        self.path = path
+        self.max_trees = max_trees
+        self._memory: dict[str, tuple[str, ContentInfoTable]] = \
+            DictCache(size_limit=max_trees + 1)
+
+    def get(self, label: str, signature: Optional[str]) \
+            -> Optional[ContentInfoTable]:
+        """Return the report for `label`, if the stored signature matches"""
+        if signature is None:
+            return None
+        mem = self._memory.get(label)
+        if mem and mem[0] == signature:
+            return mem[1]
+        cachefile = self.path / label
+        try:
+            table = _load(cachefile.read_bytes(), signature)
+            if table is not None and label.startswith('tree-'):
+                # mark as recently used
+                os.utime(cachefile)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            lgr.debug('Ignoring unusable content info cache %s: %s',
+                      cachefile, e)
+            return None
+        if table is not None:
+            self._memory[label] = (signature, table)
+        return table
+
+    def set(self, label: str, signature: Optional[str],
+            table: ContentInfoTable) -> None:
+        """Store a report of tracked content for `label` under a signature"""
+        if signature is None:
+            return
+        self._memory[label] = (signature, table)
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix='.tmp', dir=str(self.path))
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(_dump(signature, table))
+                os.replace(tmp, str(self.path / label))
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            if label.startswith('tree-'):
+                self._prune_trees()
+        except Exception as e:
+            lgr.debug('Failed to write content info cache to %s: %s',
+                      self.path, e)
+
+    def _prune_trees(self) -> None:
+        trees = sorted(self.path.glob('tree-*'),
+                       key=lambda p: p.stat().st_mtime)
+        for p in trees[:max(0, len(trees) - self.max_trees)]:
+            self._memory.pop(p.name, None)
+            p.unlink()
@@ -0,0 +1,628 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""In-process reader for git-config files
+
+Configuration files are parsed with the syntax rules of git-config(1),
+including ``include.path`` and ``includeIf.<condition>.path`` directives,
+without running ``git config``. Parsed files are cached process-wide by
+their stat signature (inode, size, mtime), hence unmodified files are never
+parsed twice.
+
+Whenever a configuration cannot be reproduced faithfully (syntax errors,
+unsupported include conditions, unusual environment settings),
+`UnsupportedGitConfig` is raised, and callers are expected to fall back on
+``git config``, which is the reference implementation.
+"""
+
+__docformat__ = 'restructuredtext'
+
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+lgr = logging.getLogger('datalad.support.gitconfig')
+
+# like git, refuse to follow more nested includes
+MAX_INCLUDE_DEPTH = 10
+
+# environment variables that change which files git reads its
+# configuration from, in ways that are not reproduced here
+_UNSUPPORTED_ENV = ('GIT_CONFIG', 'GIT_DIR', 'GIT_COMMON_DIR')
+
+_ASCII_ALPHA = frozenset(
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')
+_KEY_CHARS = _ASCII_ALPHA.union('0123456789-')
+_SPACE = frozenset(' \t\n\v\f\r')
+_VALUE_ESCAPES = {'t': '\t', 'b': '\b', 'n': '\n', '\\': '\\', '"': '"'}
+_SPACES = re.compile(r'[ \t\n\v\f\r]+')
+_BLANKS = re.compile(r'[ \t]*')
+_KEY_NAME = re.compile(r'[A-Za-z0-9-]*')
+# a section header with an optional subsection without escapes
+_SIMPLE_SECTION = re.compile(
+    r'\[([A-Za-z0-9.-]+)(?:[ \t\v\f\r]+"([^"\\\n]*)")?\]')
+# a value without quotes, escapes, comments, or whitespace other than
+# spaces, up to the end of the line
+_SIMPLE_VALUE = re.compile(r'([^"\\#;\t\n\v\f\r]*)(?:\n|\Z)')
+
+
+class UnsupportedGitConfig(Exception):
+    """Configuration cannot be read without git
+
+    Raised for syntax errors (for which git provides the authoritative error
+    message), and for features that are not implemented here, such as
+    ``includeIf.hasconfig:...`` conditions.
+    """
+
+
+def parse_gitconfig(text, origin=None):
+    """Parse the content of a git-config file
+
+    Parameters
+    ----------
+    text : str
+      Content of a configuration file.
+    origin : str, optional
+      Identifier of the source, only used in error messages.
+
+    Returns
+    -------
+    list
+      (key, value) tuples, in the order of their definition. Section and
+      variable names are lower-cased, subsection names are kept verbatim.
+      A value is None, if a variable is given without '=', which git
+      considers boolean true.
+
+    Raises
+    ------
+    UnsupportedGitConfig
+      On invalid syntax.
+    """
+    # git treats CRLF line endings like LF
+    text = text.replace('\r\n', '\n')
+    if text.startswith('\ufeff'):
+        text = text[1:]
+    records = []
+    n = len(text)
+    pos = 0
+    section = None
+
+    def fail(msg):
+        line = text.count('\n', 0, pos) + 1
+        raise UnsupportedGitConfig(
+            f'{msg} in line {line} of {origin or "configuration"}')
+
+    while pos < n:
+        c = text[pos]
+        if c in _SPACE:
+            pos = _SPACES.match(text, pos).end()
+        elif c in '#;':
+            # comment to the end of the line
+            pos = text.find('\n', pos)
+            pos = n if pos < 0 else pos
+        elif c == '[':
+            simple = _SIMPLE_SECTION.match(text, pos)
+            if simple:
+                # fast path for headers without escapes
+                name, sub = simple.groups()
+                section = name.lower() if sub is None \
+                    else '{}.{}'.format(name.lower(), sub)
+                pos = simple.end()
+                continue
+            pos += 1
+            start = pos
+            while pos < n and (text[pos] in _KEY_CHARS or text[pos] == '.'):
+                pos += 1
+            section = text[start:pos].lower()
+            if not section or pos >= n:
+                fail('bad section header')
+            if text[pos] in _SPACE:
+                # [section "subsection"]
+                while pos < n and text[pos] in _SPACE and text[pos] != '\n':
+                    pos += 1
+                if pos >= n or text[pos] != '"':
+                    fail('bad section header')
+                pos += 1
+                sub = []
+                while pos < n and text[pos] not in '"\n':
+                    if text[pos] == '\\':
+                        pos += 1
+                        if pos >= n or text[pos] == '\n':
+                            break
+                    sub.append(text[pos])
+                    pos += 1
+                if pos >= n or text[pos] != '"':
+                    fail('bad section header')
+                pos += 1
+                section = '{}.{}'.format(section, ''.join(sub))
+            if pos >= n or text[pos] != ']':
+                fail('bad section header')
+            pos += 1
+        elif c in _ASCII_ALPHA:
+            if section is None:
+                fail('variable outside of a section')
+            start = pos
+            pos = _KEY_NAME.match(text, pos).end()
+            key = '{}.{}'.format(section, text[start:pos].lower())
+            pos = _BLANKS.match(text, pos).end()
+            if pos >= n or text[pos] == '\n':
+                records.append((key, None))
+            elif text[pos] == '=':
+                value, pos = _parse_value(text, pos + 1, fail)
+                records.append((key, value))
+            else:
+                fail('bad config line')
+        else:
+            fail('bad config line')
+    return records
+
+
+def _parse_value(text, pos, fail):
+    """Parse a value starting at `pos`, return it with the position after it
+    """
+    simple = _SIMPLE_VALUE.match(text, pos)
+    if simple:
+        # fast path for the vast majority of values
+        return simple.group(1).strip(' '), simple.end()
+    n = len(text)
+    value = []
+    quote = False
+    space = 0
+    while pos < n:
+        c = text[pos]
+        pos += 1
+        if c == '\n':
+            if quote:
+                fail('unterminated quote')
+            return ''.join(value), pos
+        if c in _SPACE and not quote:
+            if value:
+                space += 1
+            continue
+        if c in '#;' and not quote:
+            # rest of the line is a comment
+            end = text.find('\n', pos)
+            pos = n if end < 0 else end
+            continue
+        if space:
+            value.append(' ' * space)
+            space = 0
+        if c == '\\':
+            if pos >= n:
+                fail('bad escape sequence')
+            c = text[pos]
+            pos += 1
+            if c == '\n':
+                # line continuation
+                continue
+            if c not in _VALUE_ESCAPES:
+                fail('bad escape sequence')
+            value.append(_VALUE_ESCAPES[c])
+        elif c == '"':
+            quote = not quote
+        else:
+            value.append(c)
+    if quote:
+        fail('unterminated quote')
+    return ''.join(value), pos
+
+
+#
+# Cache of parsed files
+#
+_parsed_files = {}
+_parsed_files_lock = threading.Lock()
+
+
+def _stat_signature(stat):
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def read_gitconfig_file(path):
+    """Return the parsed records of a configuration file
+
+    Results are cached by the path and the stat signature of the file.
+
+    Returns
+    -------
+    list or None
+      Records as returned by `parse_gitconfig()`, or None, if the file
+      does not exist or is not readable.
+    """
+    path = str(path)
+    try:
+        with open(path, 'rb') as f:
+            sig = _stat_signature(os.fstat(f.fileno()))
+            with _parsed_files_lock:
+                cached = _parsed_files.get(path)
+            if cached is not None and cached[0] == sig:
+                return cached[1]
+            content = f.read()
+    except (FileNotFoundError, NotADirectoryError, PermissionError,
+            IsADirectoryError):
+        return None
+    try:
+        text = content.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise UnsupportedGitConfig(f'Cannot decode {path}: {e}') from e
+    records = parse_gitconfig(text, origin=path)
+    with _parsed_files_lock:
+        _parsed_files[path] = (sig, records)
+    return records
+
+
+#
+# Include directives
+#
+def _wildmatch_regex(pattern, icase=False):
+    """Translate a git wildmatch pattern (with WM_PATHNAME) into a regex"""
+    out = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            j = i + 1
+            while j < n and pattern[j] == '*':
+                j += 1
+            if j - i >= 2 and (i == 0 or pattern[i - 1] == '/') \
+                    and (j == n or pattern[j] == '/'):
+                if j == n:
+                    # trailing '**' matches everything
+                    out.append('.*')
+                else:
+                    # '**/' matches zero or more directories
+                    out.append('(?:.*/)?')
+                    j += 1
+            else:
+                out.append('[^/]*')
+            i = j
+            continue
+        if c == '?':
+            out.append('[^/]')
+        elif c == '[':
+            j = i + 1
+            if j < n and pattern[j] in '!^':
+                j += 1
+            if j < n and pattern[j] == ']':
+                j += 1
+            while j < n and pattern[j] != ']':
+                j += 1
+            if j >= n or '[:' in pattern[i + 1:j]:
+                # unterminated brackets, or character classes
+                raise UnsupportedGitConfig(
+                    f'Unsupported pattern {pattern!r}')
+            body = pattern[i + 1:j]
+            negate = body[:1] in ('!', '^')
+            if negate:
+                body = body[1:]
+            body = body.replace('\\', '\\\\').replace('[', '\\[') \
+                .replace(']', '\\]').replace('^', '\\^')
+            out.append('[{}{}]'.format('^/' if negate else '', body))
+            i = j
+        elif c == '\\' and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile(''.join(out) + r'\Z', re.IGNORECASE if icase else 0)
+
+
+def _expand_home(path):
+    if path.startswith('~'):
+        expanded = os.path.expanduser(path)
+        if expanded == path:
+            raise UnsupportedGitConfig(f'Cannot expand {path!r}')
+        return expanded
+    return path
+
+
+def _include_gitdir(pattern, git_dir, including_file, icase):
+    if git_dir is None:
+        return False
+    prefix = ''
+    if pattern.startswith('~/'):
+        pattern = _expand_home(pattern)
+    if pattern.startswith('./'):
+        if including_file is None:
+            raise UnsupportedGitConfig(
+                'relative config include conditionals must come from files')
+        prefix = os.path.dirname(os.path.realpath(including_file)) + '/'
+        pattern = pattern[2:]
+    elif not os.path.isabs(pattern):
+        pattern = '**/' + pattern
+    if pattern.endswith('/'):
+        pattern += '**'
+    regex = _wildmatch_regex(pattern, icase)
+    # like git, try the resolved path first, and the plain absolute path
+    # second, to also match patterns with symlinked directories
+    for text in (os.path.realpath(git_dir), os.path.abspath(git_dir)):
+        if prefix:
+            if not (text.lower().startswith(prefix.lower()) if icase
+                    else text.startswith(prefix)):
+                continue
+            text = text[len(prefix):]
+        if regex.match(text):
+            return True
+    return False
+
+
+def _include_onbranch(pattern, git_dir):
+    if git_dir is None:
+        return False
+    try:
+        head = (Path(git_dir) / 'HEAD').read_text().strip()
+    except (OSError, UnicodeDecodeError):
+        return False
+    if not head.startswith('ref: refs/heads/'):
+        return False
+    if pattern.endswith('/'):
+        pattern += '**'
+    return bool(_wildmatch_regex(pattern).match(head[16:]))
+
+
+def _include_condition(condition, git_dir, including_file):
+    for prefix, icase in (('gitdir:', False), ('gitdir/i:', True)):
+        if condition.startswith(prefix):
+            return _include_gitdir(
+                condition[len(prefix):], git_dir, including_file, icase)
+    if condition.startswith('onbranch:'):
+        return _include_onbranch(condition[9:], git_dir)
+    if condition.startswith('hasconfig:'):
+        raise UnsupportedGitConfig(
+            f'Unsupported include condition {condition!r}')
+    # like git, consider unknown conditions false
+    return False
+
+
+def _expand_includes(records, including_file, git_dir, files, depth=0):
+    """Yield records, with those of included files inserted after each
+    include directive"""
+    for key, value in records:
+        yield key, value
+        if key == 'include.path':
+            pass
+        elif key.startswith('includeif.') and key.endswith('.path'):
+            if not _include_condition(
+                    key[10:-5], git_dir, including_file):
+                continue
+        else:
+            continue
+        if value is None:
+            raise UnsupportedGitConfig(f'Missing value for {key!r}')
+        if including_file is None and not os.path.isabs(value) \
+                and not value.startswith('~'):
+            raise UnsupportedGitConfig(
+                'relative config includes must come from files')
+        path = _expand_home(value)
+        if not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(including_file), path)
+        if depth >= MAX_INCLUDE_DEPTH:
+            raise UnsupportedGitConfig(
+                f'Exceeded maximum include depth with {path}')
+        files.append(Path(path))
+        included = read_gitconfig_file(path)
+        if included is not None:
+            yield from _expand_includes(
+                included, path, git_dir, files, depth + 1)
+
+
+def read_gitconfig(paths, git_dir=None, extra=None, includes=True):
+    """Read the configuration from a sequence of files
+
+    Parameters
+    ----------
+    paths : iterable of path-like
+      Configuration files, in the order of precedence used by git (lowest
+      first). Non-existing files are ignored.
+    git_dir : path-like, optional
+      Git directory of a repository, used to evaluate ``gitdir:`` and
+      ``onbranch:`` include conditions. Such conditions are never met
+      without a repository.
+    extra : list, optional
+      (key, value) tuples, appended after all file-based records, like
+      the ones given to git via the environment.
+    includes : bool, optional
+      Whether to follow ``include.path`` and ``includeIf.*.path``
+      directives. git only does that when reading all configuration files,
+      not for a specific one (``--file``, ``--local``, ``--blob``).
+
+    Returns
+    -------
+    list, list
+      The (key, value) records in the order git would report them, and the
+      paths of all files that were considered (including non-existing
+      files and included files).
+    """
+    git_dir = None if git_dir is None else str(git_dir)
+    records = []
+    files = []
+    for path in paths:
+        path = Path(path)
+        files.append(path)
+        content = read_gitconfig_file(path)
+        if content is not None:
+            records.extend(
+                _expand_includes(content, str(path), git_dir, files)
+                if includes else content)
+    if extra:
+        records.extend(
+            _expand_includes(extra, None, git_dir, files)
+            if includes else extra)
+    return records, files
+
+
+#
+# Sources of the configuration git would read
+#
+def _canonical_key(key):
+    section, dot, rest = key.partition('.')
+    sub, _, name = rest.rpartition('.')
+    if not dot or not section or not name:
+        raise UnsupportedGitConfig(f'Invalid configuration key {key!r}')
+    return '.'.join(
+        [section.lower()] + ([sub] if sub else []) + [name.lower()])
+
+
+def _dequote(env, pos):
+    """Return a single-quoted string from position `pos` (a quote) on"""
+    out = []
+    pos += 1
+    while True:
+        end = env.find("'", pos)
+        if end < 0:
+            raise UnsupportedGitConfig('Cannot parse GIT_CONFIG_PARAMETERS')
+        out.append(env[pos:end])
+        pos = end + 1
+        # shell quoting of a quote or exclamation mark: '\''
+        if env[pos:pos + 1] == '\\' and env[pos + 1:pos + 2] in ("'", '!') \
+                and env[pos + 2:pos + 3] == "'":
+            out.append(env[pos + 1])
+            pos += 3
+            continue
+        return ''.join(out), pos
+
+
+def get_env_config(environ=None):
+    """Return configuration that git receives via environment variables
+
+    Covers ``GIT_CONFIG_COUNT``/``GIT_CONFIG_KEY_<n>``/``GIT_CONFIG_VALUE_<n>``
+    and ``GIT_CONFIG_PARAMETERS`` (as set by ``git -c``), in the order git
+    processes them.
+
+    Returns
+    -------
+    list
+      (key, value) tuples
+    """
+    environ = os.environ if environ is None else environ
+    records = []
+    count = environ.get('GIT_CONFIG_COUNT')
+    if count:
+        try:
+            count = int(count)
+        except ValueError as e:
+            raise UnsupportedGitConfig(
+                f'Invalid GIT_CONFIG_COUNT {count!r}') from e
+        for i in range(count):
+            try:
+                records.append((
+                    _canonical_key(environ[f'GIT_CONFIG_KEY_{i}']),
+                    environ[f'GIT_CONFIG_VALUE_{i}']))
+            except KeyError as e:
+                raise UnsupportedGitConfig(f'Missing {e}') from e
+    env = environ.get('GIT_CONFIG_PARAMETERS')
+    if not env:
+        return records
+    pos = 0
+    n = len(env)
+    while True:
+        while pos < n and env[pos] in _SPACE:
+            pos += 1
+        if pos >= n:
+            break
+        if env[pos] != "'":
+            raise UnsupportedGitConfig('Cannot parse GIT_CONFIG_PARAMETERS')
+        key, pos = _dequote(env, pos)
+        if env[pos:pos + 1] == '=':
+            # new style: 'key'='value'
+            pos += 1
+            if env[pos:pos + 1] == "'":
+                value, pos = _dequote(env, pos)
+            else:
+                value = None
+        else:
+            # old style: 'key=value'
+            key, eq, value = key.partition('=')
+            if not eq:
+                value = None
+        records.append((_canonical_key(key), value))
+    return records
+
+
+@lru_cache()
+def _get_system_config_file(git_path):
+    # The location of the system configuration is compiled into git, and
+    # git only reports it when asked to edit it. Let it hand the path to an
+    # "editor" that merely prints it.
+    from datalad.runner import (
+        GitRunner,
+        StdOutErrCapture,
+    )
+    try:
+        out = GitRunner(env=dict(os.environ, GIT_EDITOR='echo')).run(
+            ['git', 'config', '--system', '--edit'],
+            protocol=StdOutErrCapture)
+    except Exception as e:
+        lgr.debug('Could not determine location of system git config: %s',
+                  e)
+        return None
+    return out['stdout'].strip() or None
+
+
+def get_gitconfig_files(git_dir=None, local_only=False, environ=None):
+    """Return the configuration files git reads, lowest precedence first
+
+    Parameters
+    ----------
+    git_dir : path-like, optional
+      Git directory of a repository, whose local configuration is included.
+    local_only : bool, optional
+      If True, only the local (and worktree) configuration of the
+      repository is reported, like ``git config --local`` would read.
+    environ : dict, optional
+      Environment to consider, defaults to `os.environ`.
+
+    Raises
+    ------
+    UnsupportedGitConfig
+      If the environment changes the set of files in an unsupported way.
+    """
+    environ = os.environ if environ is None else environ
+    if any(environ.get(v) for v in _UNSUPPORTED_ENV):
+        raise UnsupportedGitConfig(
+            'Configuration location is modified by the environment')
+    files = []
+    if not local_only:
+        if environ.get('GIT_CONFIG_NOSYSTEM', '').lower() \
+                not in ('1', 'true', 'yes', 'on'):
+            system = environ.get('GIT_CONFIG_SYSTEM') \
+                or _get_system_config_file(environ.get('PATH'))
+            if system is None:
+                raise UnsupportedGitConfig(
+                    'Unknown location of system configuration')
+            files.append(Path(system))
+        if 'GIT_CONFIG_GLOBAL' in environ:
+            files.append(Path(environ['GIT_CONFIG_GLOBAL']))
+        else:
+            home = environ.get('HOME')
+            xdg = environ.get('XDG_CONFIG_HOME')
+            if xdg:
+                files.append(Path(xdg, 'git', 'config'))
+            elif home:
+                files.append(Path(home, '.config', 'git', 'config'))
+            if home:
+                files.append(Path(home, '.gitconfig'))
+    if git_dir is not None:
+        git_dir = Path(git_dir)
+        if (git_dir / 'commondir').exists():
+            # the configuration of a linked worktree is shared with the
+            # main worktree
+            raise UnsupportedGitConfig('Linked worktrees are not supported')
+        files.append(git_dir / 'config')
+        local = read_gitconfig_file(git_dir / 'config') or []
+        worktreecfg = [v for k, v in local
+                       if k == 'extensions.worktreeconfig']
+        if worktreecfg and (worktreecfg[-1] is None or worktreecfg[-1].lower()
+                            in ('1', 'true', 'yes', 'on')):
+            files.append(git_dir / 'config.worktree')
+    return files
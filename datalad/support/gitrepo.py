@@ -12,13 +12,16 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import os.path as op
 import posixpath
 import re
 import subprocess
+import threading
 import warnings
+from collections import OrderedDict
 from collections.abc import (
     Callable,
     Iterable,
@@ -45,7 +48,6 @@ from os.path import (
     relpath,
     sep,
 )
-from re import Pattern
 from typing import (
     TYPE_CHECKING,
     Any,
@@ -79,6 +81,7 @@ from datalad.dataset.gitrepo import GitRepo as CoreGitRepo
 from datalad.dataset.gitrepo import (
     _get_dot_git,
     path_based_str_repr,
+    probe_repos,
 )
 from datalad.log import log_progress
 from datalad.support.due import (
@@ -109,6 +112,18 @@ from datalad.utils import (
     posix_relpath,
 )
 
+from .contentinfo import (
+    ContentInfo,
+    ContentInfoCache,
+    ContentInfoTable,
+    ContentRecord,
+    get_index_signature,
+    is_literal_path,
+    parse_ls_files,
+    parse_ls_files_untracked,
+    parse_ls_tree,
+    parse_status_porcelain,
+)
 from .exceptions import (
     CapturedException,
     CommandError,
@@ -119,6 +134,11 @@ from .exceptions import (
 )
 # imports from same module:
 from .external_versions import external_versions
+from .gitconfig import (
+    UnsupportedGitConfig,
+    _stat_signature,
+    parse_gitconfig,
+)
 from .network import (
     RI,
     PathRI,
@@ -808,6 +828,46 @@ class GitAddOutput(TypedDict):
     success: bool
 
 
+# parsed .gitmodules files, by blob SHA of their content (a few most
+# recently used ones), and the stat signature and blob SHA of each
+# .gitmodules file that was parsed, by path
+_GITMODULES_CACHE_SIZE = 32
+_gitmodules_parsed: OrderedDict[str, dict[PurePosixPath, dict[str, str]]] = \
+    OrderedDict()
+_gitmodules_blobs: dict[str, tuple[tuple[int, int, int], str]] = {}
+_gitmodules_lock = threading.Lock()
+
+
+def _get_modinfo(db: Mapping[str, Any]) -> dict[PurePosixPath, dict[str, str]]:
+    """Helper for GitRepo._parse_gitmodules() to report by submodule path
+    """
+    mods: dict[str, dict[str, str]] = {}
+    for k, v in db.items():
+        if not k.startswith('submodule.'):
+            # we don't know what this is
+            lgr.warning("Skip unrecognized .gitmodule specification: %s=%s", k, v)
+            continue
+        # module name is everything after 'submodule.' that is not the variable
+        # name, variable name is the last 'dot-free' segment in the key
+        mod_name, _, var = k[10:].rpartition('.')
+        mods.setdefault(mod_name, {})[var] = v
+
+    out = {}
+    # bring into traditional shape
+    for name, props in mods.items():
+        if 'path' not in props:
+            lgr.warning("Failed to get '%s', skipping this submodule", name)
+            continue
+        modprops = {'gitmodule_{}'.format(k): v
+                    for k, v in props.items()
+                    if not k.startswith('__')}
+        # Keep as PurePosixPath for possible normalization of / in the path etc
+        modpath = PurePosixPath(props['path'])
+        modprops['gitmodule_name'] = name
+        out[modpath] = modprops
+    return out
+
+
 @path_based_str_repr
 class GitRepo(CoreGitRepo):
     """Representation of a git repository
@@ -929,6 +989,9 @@ class GitRepo(CoreGitRepo):
             git_opts.update(kwargs)
 
         self._cfg = None
+        self._cinfo_cache: Optional[ContentInfoCache] = None
+        # mapping of commit SHAs to the SHAs of their trees
+        self._tree_shas: dict[str, str] = {}
 
         if do_create:  # we figured it out earlier
             from_cmdline = git_opts.pop('_from_cmdline_', [])
@@ -2362,47 +2425,61 @@ class GitRepo(CoreGitRepo):
         self.call_git(cmd_options)
 
     def _parse_gitmodules(self) -> dict[PurePosixPath, dict[str, str]]:
-        # TODO read .gitconfig from Git blob?
-        gitmodules = self.pathobj / '.gitmodules'
-        if not gitmodules.exists():
+        """Report the submodule properties recorded in .gitmodules
+
+        The file is parsed in-process, and the result is cached by the
+        stat signature of the file and the blob SHA of its content. The
+        returned mapping is shared, and must not be modified.
+        """
+        gitmodules = str(self.pathobj / '.gitmodules')
+        try:
+            with open(gitmodules, 'rb') as f:
+                sig = _stat_signature(os.fstat(f.fileno()))
+                with _gitmodules_lock:
+                    known_sig, blob = _gitmodules_blobs.get(
+                        gitmodules, (None, None))
+                    modinfo = _gitmodules_parsed.get(blob) \
+                        if known_sig == sig and blob is not None else None
+                if modinfo is not None:
+                    return modinfo
+                content = f.read()
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
             return {}
+        # same ID as for the blob that Git would record (in SHA-1 repos)
+        blob = hashlib.sha1(
+            b'blob %d\0' % len(content) + content).hexdigest()
+        with _gitmodules_lock:
+            modinfo = _gitmodules_parsed.get(blob)
+        if modinfo is None:
+            try:
+                # like `git config --file`, ignore include directives
+                records = parse_gitconfig(
+                    content.decode('utf-8'), origin=gitmodules)
+            except (UnicodeDecodeError, UnsupportedGitConfig) as e:
+                lgr.debug('Cannot parse %s in-process, using git-config: %s',
+                          gitmodules, CapturedException(e))
+                return self._parse_gitmodules_via_git()
+            # disable multi-value report (last value wins), because we
+            # could not deal with them anyways, and they should not appear
+            # in a normal .gitmodules file but could easily appear when
+            # duplicates are included. In this case, we better not crash
+            modinfo = _get_modinfo(dict(records))
+        with _gitmodules_lock:
+            _gitmodules_blobs[gitmodules] = (sig, blob)
+            _gitmodules_parsed[blob] = modinfo
+            _gitmodules_parsed.move_to_end(blob)
+            while len(_gitmodules_parsed) > _GITMODULES_CACHE_SIZE:
+                _gitmodules_parsed.popitem(last=False)
+        return modinfo
+
+    def _parse_gitmodules_via_git(self) -> dict[PurePosixPath, dict[str, str]]:
         # pull out file content
         out = self.call_git(
             ['config', '-z', '-l', '--file', '.gitmodules'],
             read_only=True)
         # abuse our config parser
-        # disable multi-value report, because we could not deal with them
-        # anyways, and they should not appear in a normal .gitmodules file
-        # but could easily appear when duplicates are included. In this case,
-        # we better not crash
         db, _ = parse_gitconfig_dump(out, cwd=self.path, multi_value=False)
-        mods: dict[str, dict[str, str]] = {}
-        for k, v in db.items():
-            if not k.startswith('submodule.'):
-                # we don't know what this is
-                lgr.warning("Skip unrecognized .gitmodule specification: %s=%s", k, v)
-                continue
-            k_l = k.split('.')
-            # module name is everything after 'submodule.' that is not the variable
-            # name
-            mod_name = '.'.join(k_l[1:-1])
-            # variable name is the last 'dot-free' segment in the key
-            mods.setdefault(mod_name, {})[k_l[-1]] = v
-
-        out = {}
-        # bring into traditional shape
-        for name, props in mods.items():
-            if 'path' not in props:
-                lgr.warning("Failed to get '%s', skipping this submodule", name)
-                continue
-            modprops = {'gitmodule_{}'.format(k): v
-                        for k, v in props.items()
-                        if not k.startswith('__')}
-            # Keep as PurePosixPath for possible normalization of / in the path etc
-            modpath = PurePosixPath(props['path'])
-            modprops['gitmodule_name'] = name
-            out[modpath] = modprops
-        return out
+        return _get_modinfo(db)
 
     def get_submodules_(self, paths: Optional[list[str | PathLike[str]]] = None) -> Iterator[dict]:
         """Yield submodules in this repository.
@@ -2789,7 +2866,7 @@ class GitRepo(CoreGitRepo):
                         attrline += ' {}={}'.format(a, val)
                 f.write('{}\n'.format(attrline))
 
-    def get_content_info(self, paths: Optional[Sequence[str | PathLike[str]]] = None, ref: Optional[str] = None, untracked: str = 'all') -> dict[Path, dict[str, str | int | None]]:
+    def get_content_info(self, paths: Optional[Sequence[str | PathLike[str]]] = None, ref: Optional[str] = None, untracked: str = 'all') -> ContentInfo:
         """Get identifier and type information from repository content.
 
         This is simplified front-end for `git ls-files/tree`.
@@ -2820,7 +2897,11 @@ class GitRepo(CoreGitRepo):
 
         Returns
         -------
-        dict
+        ContentInfo
+          A dict-like mapping (properties are only assembled on access, and
+          the column-oriented report is available via its `table` attribute).
+          It is a `collections.abc.MutableMapping`, but not a `dict`
+          subclass; use `dict(...)` where an actual dict is required.
           Each content item has an entry under a pathlib `Path` object instance
           pointing to its absolute path inside the repository (this path is
           guaranteed to be underneath `Repo.path`).
@@ -2842,8 +2923,6 @@ class GitRepo(CoreGitRepo):
         """
         lgr.debug('%s.get_content_info(...)', self)
         # TODO limit by file type to replace code in subdatasets command
-        info: dict[Path, dict[str, str | int | None]] = dict()
-
         if paths:  # is not None separate after
             # path matching will happen against what Git reports
             # and Git always reports POSIX paths
@@ -2852,10 +2931,14 @@ class GitRepo(CoreGitRepo):
             # note: will be list-ified below
             posix_paths = [ut.PurePath(p).as_posix() for p in paths]
         elif paths is not None:
-            return info
+            return ContentInfo(self.pathobj)
         else:
             posix_paths = None
 
+        # whether query paths are known to point to content tracked by this
+        # repository (and not into a submodule), such that a report on them
+        # can be obtained by filtering a full report
+        paths_in_repo = posix_paths is None
         if posix_paths and (not ref or external_versions["cmd:git"] >= "2.29.0"):
             # If a path points within a submodule, we need to map it to the
             # containing submodule before feeding it to ls-files or ls-tree.
@@ -2867,6 +2950,7 @@ class GitRepo(CoreGitRepo):
                           for s in self.get_submodules_()]
             # `paths` get normalized into PurePosixPath above, submodules are POSIX as well
             posix_paths = get_parent_paths(posix_paths, submodules)
+            paths_in_repo = all(is_literal_path(p) for p in posix_paths)
 
         # this will not work in direct mode, but everything else should be
         # just fine
@@ -2889,74 +2973,90 @@ class GitRepo(CoreGitRepo):
             else:
                 raise ValueError(
                     'unknown value for `untracked`: {}'.format(untracked))
-            props_re = re.compile(
-                r'(?P<type>[0-9]+) (?P<sha>.*) (.*)\t(?P<fname>.*)$')
+            parse = parse_ls_files
         else:
             cmd = ['ls-tree', ref, '-z', '-r', '--full-tree', '-l']
-            props_re = re.compile(
-                r'(?P<type>[0-9]+) ([a-z]*) (?P<sha>[^ ]*) [\s]*(?P<size>[0-9-]+)\t(?P<fname>.*)$')
+            parse = parse_ls_tree
+
+        cache = self._content_info_cache if paths_in_repo else None
+        cache_label, cache_sig = self._get_content_info_cache_key(ref) \
+            if cache is not None else (None, None)
+        table = cache.get(cache_label, cache_sig) \
+            if cache is not None and cache_label else None
+        if table is not None:
+            lgr.debug('Use cached content info for %s', cache_label)
+            if posix_paths is not None:
+                table = table.filter(posix_paths)
+            if not ref and untracked != 'no':
+                # the index only describes tracked content, untracked content
+                # must still be discovered. ls-files reports it first.
+                table = ContentInfoTable.concat(
+                    parse_ls_files_untracked(self._call_git_bytes(
+                        [a for a in cmd if a != '--stage'],
+                        files=posix_paths)),
+                    table)
+            lgr.debug('Done %s.get_content_info(...)', self)
+            return ContentInfo(self.pathobj, table)
 
         lgr.debug('Query repo: %s', cmd)
         try:
-            stdout = self.call_git(
+            stdout = self._call_git_bytes(
                 cmd,
                 files=posix_paths,
-                expect_fail=True,
-                read_only=True)
+                expect_fail=True)
         except CommandError as exc:
             if "fatal: Not a valid object name" in exc.stderr:
                 raise InvalidGitReferenceError(ref)
             raise
         lgr.debug('Done query repo: %s', cmd)
 
-        self._get_content_info_line_helper(
-            ref,
-            info,
-            stdout.split('\0'),
-            props_re)
+        table = parse(stdout)
+        if cache is not None and cache_label and posix_paths is None \
+                and (ref or cache_sig == self._get_content_info_cache_key(
+                    ref)[1]):
+            # only a full report can be cached, and only if the index did
+            # not change while it was produced
+            cache.set(cache_label, cache_sig, table.tracked())
 
         lgr.debug('Done %s.get_content_info(...)', self)
-        return info
-
-    def _get_content_info_line_helper(self, ref: Optional[str], info: dict[Path, dict[str, str | int | None]], lines: list[str], props_re: Pattern[str]) -> None:
-        """Internal helper of get_content_info() to parse Git output"""
-        mode_type_map = {
-            '100644': 'file',
-            '100755': 'file',
-            '120000': 'symlink',
-            '160000': 'dataset',
-        }
-        for line in lines:
-            if not line:
-                continue
-            inf: dict[str, str | int | None] = {}
-            props = props_re.match(line)
-            if not props:
-                # not known to Git, but Git always reports POSIX
-                path = ut.PurePosixPath(line)
-                inf['gitshasum'] = None
-            else:
-                # again Git reports always in POSIX
-                path = ut.PurePosixPath(props.group('fname'))
-
-            # revisit the file props after this path has not been rejected
-            if props:
-                inf['gitshasum'] = props.group('sha')
-                inf['type'] = mode_type_map.get(
-                    props.group('type'), props.group('type'))
-
-                if ref and inf['type'] == 'file':
-                    inf['bytesize'] = int(props.group('size'))
-
-            # join item path with repo path to get a universally useful
-            # path representation with auto-conversion and tons of other
-            # stuff
-            joinedpath = self.pathobj.joinpath(path)
-            if 'type' not in inf:
-                # be nice and assign types for untracked content
-                inf['type'] = 'symlink' if joinedpath.is_symlink() \
-                    else 'directory' if joinedpath.is_dir() else 'file'
-            info[joinedpath] = inf
+        return ContentInfo(self.pathobj, table)
+
+    @property
+    def _content_info_cache(self) -> Optional[ContentInfoCache]:
+        """Persistent cache for get_content_info(), None if disabled"""
+        if self._cinfo_cache is None:
+            if not self.config.obtain('datalad.runtime.content-info-cache'):
+                return None
+            self._cinfo_cache = ContentInfoCache(
+                self.dot_git / 'datalad' / 'cache' / 'contentinfo')
+        return self._cinfo_cache
+
+    def _get_content_info_cache_key(self, ref: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+        """Determine label and signature of a content info cache record
+
+        For the worktree, the signature is the stat signature of the index
+        file. For a `ref`, both are derived from the SHA of its tree.
+        (None, None) is returned, if no record can be determined.
+        """
+        if not ref:
+            if 'GIT_INDEX_FILE' in os.environ:
+                # we cannot know what index git is going to use
+                return None, None
+            return 'index', get_index_signature(self.dot_git / 'index')
+        tree = self._tree_shas.get(ref)
+        if tree is None:
+            try:
+                tree = self.call_git(
+                    ['rev-parse', '-q', '--verify', ref + '^{tree}'],
+                    expect_fail=True,
+                    read_only=True).strip()
+            except CommandError:
+                # leave it to the actual query to report invalid references
+                return None, None
+            if re.fullmatch('[0-9a-f]{40}|[0-9a-f]{64}', ref):
+                # the tree of a commit never changes
+                self._tree_shas[ref] = tree
+        return 'tree-{}'.format(tree), tree
 
     def status(self, paths: Optional[Sequence[str | PathLike[str]]] = None, untracked: str= 'all', eval_submodule_state: Literal["commit", "full", "no"] = 'full') -> dict[Path, dict[str, str]]:
         """Simplified `git status` equivalent.
@@ -3089,6 +3189,16 @@ class GitRepo(CoreGitRepo):
         # TODO report more info from get_content_info() calls in return
         # value, those are cheap and possibly useful to a consumer
         # we need (at most) three calls to git
+        if to is None and ppaths is None \
+                and self.config.obtain('datalad.runtime.worktree-monitor'):
+            # a single `git status` call reports modified and untracked
+            # content, and can use the filesystem monitor and untracked
+            # cache of Git
+            ci_key = _get_cache_key('ci', None, None, untracked)
+            mod_key = _get_cache_key('mod', None, None)
+            if ci_key not in _cache or mod_key not in _cache:
+                _cache[ci_key], _cache[mod_key] = \
+                    self._get_worktree_status(untracked)
         if to is None:
             # everything we know about the worktree, including os.stat
             # for each file
@@ -3141,11 +3251,18 @@ class GitRepo(CoreGitRepo):
                 from_state = {}
             _cache[key] = from_state
 
+        # match records by relative path, if possible, which is much
+        # cheaper than matching absolute `Path`s
+        by_relpath = isinstance(to_state, ContentInfo) \
+            and isinstance(from_state, ContentInfo)
         status = dict()
-        for f, to_state_r in to_state.items():
+        for rpath, f, to_state_r in (
+                to_state.relitems() if by_relpath
+                else ((None, f, r) for f, r in to_state.items())):
             props = self._diffstatus_get_state_props(
                 f,
-                from_state.get(f, None),
+                from_state.getrel(rpath) if rpath is not None
+                else from_state.get(f, None),
                 to_state_r,
                 # are we comparing against a recorded commit or the worktree
                 to is not None,
@@ -3160,20 +3277,22 @@ class GitRepo(CoreGitRepo):
                 return 'modified'
             status[f] = props
 
-        for f, from_state_r in from_state.items():
-            if f not in to_state:
-                # we new this, but now it is gone and Git is not complaining
-                # about it being missing -> properly deleted and deletion
-                # stages
-                status[f] = dict(
-                    state='deleted',
-                    type=from_state_r['type'],
-                    # report the shasum to distinguish from a plainly vanished
-                    # file
-                    gitshasum=from_state_r['gitshasum'],
-                )
-                if eval_submodule_state == 'global':
-                    return 'modified'
+        for f, from_state_r in (
+                from_state.missing_from(to_state) if by_relpath
+                else ((f, r) for f, r in from_state.items()
+                      if f not in to_state)):
+            # we new this, but now it is gone and Git is not complaining
+            # about it being missing -> properly deleted and deletion
+            # stages
+            status[f] = ContentRecord(
+                state='deleted',
+                type=from_state_r['type'],
+                # report the shasum to distinguish from a plainly vanished
+                # file
+                gitshasum=from_state_r['gitshasum'],
+            )
+            if eval_submodule_state == 'global':
+                return 'modified'
 
         if to is not None or eval_submodule_state == 'no':
             # if we have `to` we are specifically comparing against
@@ -3188,13 +3307,17 @@ class GitRepo(CoreGitRepo):
             else:
                 return status
 
+        # probe all subdatasets for presence at once
+        present = probe_repos(
+            [f for f, st in status.items()
+             if 'state' not in st and st['type'] == 'dataset'],
+            cache=_cache.setdefault('valid_repos', {}))
         # loop over all subdatasets and look for additional modifications
         for f, st in status.items():
-            f = str(f)
             if 'state' in st or not st['type'] == 'dataset':
                 # no business here
                 continue
-            if not GitRepo.is_valid_repo(f):
+            if not present[f]:
                 # submodule is not present, no chance for a conflict
                 st['state'] = 'clean'
                 continue
@@ -3235,12 +3358,51 @@ class GitRepo(CoreGitRepo):
         else:
             return status
 
+    def _get_worktree_status(self, untracked: str) -> tuple[ContentInfo, set[Path]]:
+        """Report on all worktree content with a single `git status` call
+
+        Unlike separate `git ls-files -o` and `git ls-files -m -d` calls,
+        `git status` can consult a filesystem monitor (core.fsmonitor), and
+        the untracked cache (core.untrackedCache), in order to only inspect
+        changed paths. Both are used as configured for the repository.
+
+        Returns
+        -------
+        tuple
+          The content info, as reported by `get_content_info(untracked=...)`,
+          and the set of paths that are modified or deleted in the worktree.
+        """
+        untracked_opt = {'no': 'no', 'normal': 'normal', 'all': 'all'}.get(
+            untracked)
+        if untracked_opt is None:
+            raise ValueError(
+                'unknown value for `untracked`: {}'.format(untracked))
+        # flush pending changes, like get_content_info() would
+        self.precommit()
+        modified, untracked_table = parse_status_porcelain(
+            self._call_git_bytes(
+                ['status', '--porcelain=v2', '-z', '--no-renames',
+                 # like `ls-files -m`, only consider the commit of a
+                 # submodule
+                 '--ignore-submodules=dirty',
+                 '--untracked-files={}'.format(untracked_opt)]))
+        # query tracked content only after `git status` had a chance to
+        # update the index, such that a cached report stays valid
+        tracked = self.get_content_info(paths=None, ref=None, untracked='no')
+        return (
+            ContentInfo(self.pathobj,
+                        ContentInfoTable.concat(untracked_table,
+                                                tracked.table)),
+            set(self.pathobj.joinpath(ut.PurePosixPath(p))
+                for p in modified),
+        )
+
     def _diffstatus_get_state_props(self, f: Path,
                                     from_state: Optional[dict[str, str]],
                                     to_state: dict[str, str],
                                     against_commit: bool,
                                     modified_in_worktree: bool,
-                                    eval_submodule_state: str) -> dict[str, str]:
+                                    eval_submodule_state: str) -> ContentRecord:
         """Helper to determine diff properties for a single path
 
         Parameters
@@ -3260,7 +3422,7 @@ class GitRepo(CoreGitRepo):
             # comparing against a commit
             modified_in_worktree = False
 
-        props = {}
+        props = ContentRecord()
         if 'type' in to_state:
             props['type'] = to_state['type']
 
@@ -24,6 +24,16 @@ from os.path import (
 
 from datalad.support.exceptions import CapturedException
 
+# optional, faster parsers for individual records. Both accept bytes, hence
+# records do not need to be decoded beforehand
+try:
+    from orjson import loads as _fast_loads
+except ImportError:
+    try:
+        from ujson import loads as _fast_loads
+    except ImportError:
+        _fast_loads = None
+
 # produce relatively compact, but also diff-friendly format
 json_dump_kwargs = dict(
     indent=0,
@@ -152,6 +162,22 @@ def loads(s, *args, **kwargs):
         raise
 
 
+def loads_record(s):
+    """Parse a single JSON record from `bytes` or `str`
+
+    orjson or ujson are used, if available. Records that these parsers
+    reject are handed to the standard library parser, which is more
+    permissive (e.g. NaN, integers beyond 64 bit), and raises the
+    usual `json.JSONDecodeError` for invalid input.
+    """
+    if _fast_loads is not None:
+        try:
+            return _fast_loads(s)
+        except ValueError:
+            pass
+    return json.loads(s)
+
+
 def load(fname, fixup=True, compressed=None, **kw):
     """Load JSON from a file, possibly fixing it up if initial load attempt fails
 
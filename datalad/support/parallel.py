@@ -15,15 +15,21 @@ __docformat__ = 'restructuredtext'
 import concurrent.futures
 import inspect
 import logging
-import sys
 import time
 import uuid
-from collections import defaultdict
+from collections import (
+    defaultdict,
+    deque,
+)
+from pathlib import PurePath
 from queue import (
     Empty,
     Queue,
 )
-from threading import Thread
+from threading import (
+    Lock,
+    Thread,
+)
 
 from datalad.support.exceptions import CapturedException
 
@@ -71,6 +77,141 @@ def no_subds_in_futures(futures, path, skip=tuple()):
     return all(not path_is_subpath(p, path) or p in skip for p in futures)
 
 
+#
+# Schedulers deciding which produced items can be consumed
+#
+
+class _FifoScheduler:
+    """Release items in the order they were produced
+
+    If `safe_to_consume` is given, it is consulted for the next item in line
+    whenever the set of futures changed, and no item is released before
+    this one.
+    """
+    def __init__(self, safe_to_consume=None, futures=None):
+        self.safe_to_consume = safe_to_consume
+        self.futures = futures
+        self._pending = deque()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, key, item):
+        self._pending.append((key, item))
+
+    def pop_ready(self):
+        pending = self._pending
+        while pending and (
+                self.safe_to_consume is None
+                or self.safe_to_consume(self.futures, pending[0][0])):
+            yield pending.popleft()
+
+    def finish(self, key):
+        pass
+
+    def clear(self):
+        self._pending.clear()
+
+
+class _HierarchyScheduler:
+    """Release items keyed by (dataset) paths in hierarchy order
+
+    With `bottom-up` order, an item is only released when no item for a
+    path underneath it is pending or running. With `top-down` order, an item
+    is only released when no item for a path above it is pending or running.
+    Items without such a relation are released immediately, regardless of
+    the order in which they were produced.
+
+    Unlike `no_subds_in_futures()` and `no_parentds_in_futures()`, the
+    constraints are indexed when an item is added, hence finding the items
+    that become ready when an item is finished only costs O(depth) per
+    affected item, and does not require comparing all paths with each other.
+    """
+    def __init__(self, order):
+        if order not in ('bottom-up', 'top-down'):
+            raise ValueError(f"Unknown order {order!r}")
+        self.bottomup = order == 'bottom-up'
+        # path -> (key, item) of items that were not released yet
+        self._pending = {}
+        # paths of items that are pending or running
+        self._unfinished = set()
+        # path -> unfinished paths underneath it (a dict, to keep the
+        # order in which they were added)
+        self._below = defaultdict(dict)
+        # candidates for release, in the order they became ready
+        self._ready = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, key, item):
+        path = PurePath(key)
+        if path in self._unfinished:
+            raise ValueError(f"Duplicate item for {key!r}")
+        self._unfinished.add(path)
+        for parent in path.parents:
+            self._below[parent][path] = None
+        self._pending[path] = (key, item)
+        if self._is_ready(path):
+            self._ready[path] = None
+
+    def _is_ready(self, path):
+        if self.bottomup:
+            return not self._below.get(path)
+        return not any(p in self._unfinished for p in path.parents)
+
+    def pop_ready(self):
+        while self._ready:
+            path = next(iter(self._ready))
+            del self._ready[path]
+            # items added meanwhile might have invalidated a candidate,
+            # it becomes a candidate again once they are finished
+            if self._is_ready(path):
+                yield self._pending.pop(path)
+
+    def finish(self, key):
+        path = PurePath(key)
+        self._unfinished.discard(path)
+        for parent in path.parents:
+            below = self._below.get(parent)
+            if below is None:
+                continue
+            below.pop(path, None)
+            if not below:
+                del self._below[parent]
+                if self.bottomup and parent in self._pending:
+                    self._ready[parent] = None
+        if not self.bottomup:
+            self._ready.update(
+                (p, None) for p in self._below.get(path, ())
+                if p in self._pending and self._is_ready(p))
+
+    def clear(self):
+        self._pending.clear()
+        self._ready.clear()
+
+
+# The path-based `safe_to_consume` helpers above are served by the
+# hierarchy scheduler, which does not need to re-check them for all
+# pending items whenever a future completes
+_HIERARCHY_ORDERS = {
+    no_subds_in_futures: 'bottom-up',
+    no_parentds_in_futures: 'top-down',
+}
+
+
+class _FutureDone:
+    """Notification about a completed future, sent by the future itself"""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+
+# Notification that new items were produced, or production has finished
+_PRODUCED = object()
+
+
 class ProducerConsumer:
     """Producer/Consumer implementation to (possibly) parallelize execution.
 
@@ -127,6 +268,7 @@ class ProducerConsumer:
                  producer_future_key=None,
                  reraise_immediately=False,
                  agg=None,
+                 order=None,
                  ):
         """
 
@@ -160,6 +302,14 @@ class ProducerConsumer:
           Should be a callable with two arguments: (item, prior total) and return a new total
           which will get assigned to .total of this object.  If not specified, .total is
           just a number of items produced by the producer.
+        order: {'bottom-up', 'top-down'}, optional
+          Requires the keys of the produced items (see `producer_future_key`) to be
+          paths. With 'bottom-up' an item is only consumed after all items for paths
+          underneath it, with 'top-down' only after all items for paths above it
+          were consumed. Unrelated items are consumed in parallel, in the order in
+          which they become ready. This replaces `safe_to_consume`, and is also used
+          when `no_subds_in_futures` ('bottom-up') or `no_parentds_in_futures`
+          ('top-down') are given as `safe_to_consume`.
         """
         self.producer = producer
         self.consumer = consumer
@@ -168,6 +318,7 @@ class ProducerConsumer:
         self.producer_future_key = producer_future_key
         self.reraise_immediately = reraise_immediately
         self.agg = agg
+        self.order = order
 
         self.total = None if self.agg else 0
         self._jobs = None  # actual "parallel" jobs used
@@ -176,6 +327,8 @@ class ProducerConsumer:
         self._producer_queue = None
         self._producer_exception = None
         self._producer_interrupt = None
+        self._consumer_queue = None
+        self._scheduler = None
         # so we could interrupt more or less gracefully
         self._producer_thread = None
         self._executor = None
@@ -304,7 +457,13 @@ class ProducerConsumer:
 
         # To allow feeding producer queue with more entries, possibly from consumer!
         self._producer_queue = producer_queue = Queue()
-        consumer_queue = Queue()
+        # Results of consumers, and notifications about produced items and
+        # completed futures. The main loop below blocks on it, and is only
+        # woken up when there is something to do
+        self._consumer_queue = consumer_queue = Queue()
+        self._futures = futures = {}
+        self._scheduler = scheduler = self._get_scheduler(futures)
+        self._reset_stats(jobs)
 
         def producer_worker():
             """That is the one which interrogates producer and updates .total"""
@@ -319,48 +478,81 @@ class ProducerConsumer:
                 self._producer_exception = e
             finally:
                 self._producer_finished = True
+                consumer_queue.put(_PRODUCED)
 
         def consumer_worker(callable, *args, **kwargs):
             """Since jobs could return a generator and we cannot really "inspect" for that
             """
-            res = callable(*args, **kwargs)
-            if inspect.isgenerator(res):
-                lgr.debug("Got consumer worker which returned a generator %s", res)
-                didgood = False
-                for r in res:
-                    didgood = True
-                    lgr.debug("Adding %s to queue", r)
-                    consumer_queue.put(r)
-                if not didgood:
-                    lgr.error("Nothing was obtained from %s :-(", res)
-            else:
-                lgr.debug("Got straight result %s, not a generator", res)
-                consumer_queue.put(res)
+            t0 = time.time()
+            try:
+                res = callable(*args, **kwargs)
+                if inspect.isgenerator(res):
+                    lgr.debug("Got consumer worker which returned a generator %s", res)
+                    didgood = False
+                    for r in res:
+                        didgood = True
+                        lgr.debug("Adding %s to queue", r)
+                        consumer_queue.put(r)
+                    if not didgood:
+                        lgr.error("Nothing was obtained from %s :-(", res)
+                else:
+                    lgr.debug("Got straight result %s, not a generator", res)
+                    consumer_queue.put(res)
+            finally:
+                with self._stats_lock:
+                    self._busy_time += time.time() - t0
+
+        def submit(job_key, job_args):
+            lgr.debug("Submitting worker future for %s", job_args)
+            future = executor.submit(consumer_worker, self.consumer, job_args)
+            futures[job_key] = future
+            # the notification is queued after all results of the consumer
+            future.add_done_callback(
+                lambda f: consumer_queue.put(_FutureDone(job_key)))
 
         self._producer_thread = Thread(target=producer_worker)
         self._producer_thread.start()
-        self._futures = futures = {}
 
         lgr.debug("Initiating ThreadPoolExecutor with %d jobs", jobs)
-        # we will increase sleep_time when doing nothing useful
-        sleeper = Sleeper()
         interrupted_by_exception = None
         with concurrent.futures.ThreadPoolExecutor(jobs) as executor:
             self._executor = executor
             # yield from the producer_queue (.total and .finished could be accessed meanwhile)
             while True:
                 try:
-                    done_useful = False
                     if self.reraise_immediately and self._producer_exception and not interrupted_by_exception:
                         # so we have a chance to exit gracefully
                         # No point to reraise if there is already an exception which was raised
                         # which might have even been this one
                         lgr.debug("Reraising an exception from producer as soon as we found it")
                         raise self._producer_exception
+
+                    # important!  We are using threads, so worker threads will be sharing CPU time
+                    # with this master thread. For it to become efficient, we should consume as much
+                    # as possible from producer asap and push it to executor.  So drain the queue
+                    while not (producer_queue.empty() or interrupted_by_exception):
+                        job_args = producer_queue.get()
+                        job_key = self.producer_future_key(job_args) if self.producer_future_key else job_args
+                        # Current implementation, to provide depchecking, relies on unique
+                        # args for the job
+                        assert job_key not in futures
+                        scheduler.add(job_key, job_args)
+                    if not interrupted_by_exception:
+                        for job_key, job_args in scheduler.pop_ready():
+                            submit(job_key, job_args)
+                        self._max_pending = max(self._max_pending, len(scheduler))
+
                     if (self._producer_finished and
                             not futures and
                             consumer_queue.empty() and
                             producer_queue.empty()):
+                        if len(scheduler) and not interrupted_by_exception:
+                            # nothing is running that could ever make
+                            # pending items ready
+                            raise RuntimeError(
+                                "Cannot consume {} remaining items, their "
+                                "dependencies are not satisfied".format(
+                                    len(scheduler)))
                         # This will let us not "escape" the while loop and reraise any possible exception
                         # within the loop if we have any.
                         # Otherwise we might see "RuntimeError: generator ignored GeneratorExit"
@@ -368,58 +560,28 @@ class ProducerConsumer:
                         # no other subsequent exception was raised and we left the loop
                         raise _FinalShutdown()
 
-                    # important!  We are using threads, so worker threads will be sharing CPU time
-                    # with this master thread. For it to become efficient, we should consume as much
-                    # as possible from producer asap and push it to executor.  So drain the queue
-                    while not (producer_queue.empty() or interrupted_by_exception):
-                        done_useful = True
-                        try:
-                            job_args = producer_queue.get() # timeout=0.001)
-                            job_key = self.producer_future_key(job_args) if self.producer_future_key else job_args
-                            if self.safe_to_consume:
-                                # Sleep a little if we are not yet ready
-                                # TODO: add some .debug level reporting based on elapsed time
-                                # IIRC I did smth like growing exponentially delays somewhere (dandi?)
-                                while not self.safe_to_consume(futures, job_key):
-                                    self._pop_done_futures(lgr) or sleeper()
-                            # Current implementation, to provide depchecking, relies on unique
-                            # args for the job
-                            assert job_key not in futures
-                            lgr.debug("Submitting worker future for %s", job_args)
-                            futures[job_key] = executor.submit(consumer_worker, self.consumer, job_args)
-                        except Empty:
-                            pass
-
-                    # check active futures
-                    if not consumer_queue.empty():
-                        done_useful = True
-                        # ATM we do not bother of some "in order" reporting
-                        # Just report as soon as any new record arrives
-                        res = consumer_queue.get()
-                        lgr.debug("Got %s from consumer_queue", res)
-                        yield res
-
-                    done_useful |= self._pop_done_futures(lgr)
-
-                    if not done_useful:  # you need some rest
-                        # TODO: same here -- progressive logging
-                        lgr.log(5,
-                                "Did nothing useful, sleeping. Have "
-                                "producer_finished=%s producer_queue.empty=%s futures=%s consumer_queue.empty=%s",
-                                self._producer_finished,
-                                producer_queue.empty(),
-                                futures,
-                                consumer_queue.empty(),
-                                )
-                        sleeper()
-                    else:
-                        sleeper.reset()
+                    try:
+                        # A timeout only to stay responsive to signals on
+                        # all platforms, the queue is not polled
+                        res = consumer_queue.get(timeout=1)
+                    except Empty:
+                        continue
+                    if res is _PRODUCED:
+                        continue
+                    if isinstance(res, _FutureDone):
+                        self._future_done(res.key)
+                        continue
+                    # ATM we do not bother of some "in order" reporting
+                    # Just report as soon as any new record arrives
+                    lgr.debug("Got %s from consumer_queue", res)
+                    yield res
                 except (_FinalShutdown, GeneratorExit):
                     self.shutdown(force=True, exception=self._producer_exception or interrupted_by_exception)
                     break  # if there were no exception to raise
                 except BaseException as exc:
                     ce = CapturedException(exc)
                     self._interrupted = True
+                    scheduler.clear()
                     if interrupted_by_exception:
                         # so we are here again but now it depends why we are here
                         if isinstance(exc, KeyboardInterrupt):
@@ -439,46 +601,77 @@ class ProducerConsumer:
                             "running. You can force earlier forceful exit "
                             "by Ctrl-C.", ce)
                         self.shutdown(force=False, exception=exc)
+        lgr.debug("Finished %s: %s", self, self.stats())
 
-    def add_to_producer_queue(self, value):
-        self._producer_queue.put(value)
-        self._update_total(value)
+    def _get_scheduler(self, futures):
+        order = self.order
+        if order is None:
+            order = _HIERARCHY_ORDERS.get(self.safe_to_consume)
+        if order is not None:
+            return _HierarchyScheduler(order)
+        return _FifoScheduler(self.safe_to_consume, futures)
 
-    def _pop_done_futures(self, lgr):
-        """Removes .done from provided futures.
+    def _future_done(self, key):
+        """Process the completion of the future for `key`
+
+        Any exception of the consumer is re-raised.
+        """
+        future = self._futures.get(key)
+        if future is None or not future.done():
+            # canceled and removed during shutdown
+            return
+        del self._futures[key]
+        self._nfinished += 1
+        self._scheduler.finish(key)
+        if future.cancelled():
+            return
+        exception = future.exception()
+        if exception:
+            lgr.debug("Future for %r raised %s.  Re-raising to trigger graceful shutdown etc", key, exception)
+            raise exception
+        lgr.debug("Future for %r is done", key)
+
+    def _reset_stats(self, jobs):
+        self._stats_lock = Lock()
+        self._jobs = jobs
+        self._start_time = time.time()
+        self._busy_time = 0.0
+        self._nfinished = 0
+        self._max_pending = 0
+
+    def stats(self):
+        """Report metrics on the threaded execution
 
         Returns
         -------
-        bool
-          True if any future was removed
+        dict
+          With the number of produced items not yet seen by the scheduler
+          ('queued'), items waiting for their dependencies ('pending'),
+          submitted items that are not yet finished ('running'), finished
+          items ('finished'), the largest number of pending items
+          ('max_pending'), and the fraction of the available worker time
+          spent in consumers since execution started ('utilization').
+          Empty, if no threaded execution was started.
         """
-        done_useful = False
-        # remove futures which are done
-        for args, future in list(self._futures.items()):
-            if future.done():
-                done_useful = True
-                future_ = self._futures.pop(args)
-                exception = future_.exception()
-                if exception:
-                    lgr.debug("Future for %r raised %s.  Re-raising to trigger graceful shutdown etc", args, exception)
-                    raise exception
-                lgr.debug("Future for %r is done", args)
-        return done_useful
-
-
-class Sleeper():
-    def __init__(self):
-        self.min_sleep_time = 0.001
-        # but no more than to this max
-        self.max_sleep_time = 0.1
-        self.sleep_time = self.min_sleep_time
-
-    def __call__(self):
-        time.sleep(self.sleep_time)
-        self.sleep_time = min(self.max_sleep_time, self.sleep_time * 2)
-
-    def reset(self):
-        self.sleep_time = self.min_sleep_time
+        if self._futures is None or self._scheduler is None:
+            return {}
+        elapsed = time.time() - self._start_time
+        return dict(
+            queued=self._producer_queue.qsize(),
+            pending=len(self._scheduler),
+            running=len(self._futures),
+            finished=self._nfinished,
+            max_pending=self._max_pending,
+            utilization=self._busy_time / (elapsed * self._jobs)
+            if elapsed and self._jobs else 0.0,
+        )
+
+    def add_to_producer_queue(self, value):
+        self._producer_queue.put(value)
+        self._update_total(value)
+        if self._consumer_queue is not None:
+            # wake up the main loop
+            self._consumer_queue.put(_PRODUCED)
 
 
 class ProducerConsumerProgressLog(ProducerConsumer):
@@ -22,7 +22,10 @@ lgr = logging.getLogger('datalad.repodates')
 
 
 def _cat_blob(repo, obj, bad_ok=False):
-    """Call `git cat-file blob OBJ`.
+    """Read the content of blob OBJ, like `git cat-file blob OBJ`.
+
+    A persistent `git cat-file --batch` process is used (see
+    `GitRepo.get_object()`).
 
     Parameters
     ----------
@@ -36,20 +39,16 @@ def _cat_blob(repo, obj, bad_ok=False):
     -------
     Blob's content (str) or None if `obj` is not and `bad_ok` is true.
     """
-    if bad_ok:
-        kwds = {"expect_fail": True, "expect_stderr": True}
-    else:
-        kwds = {}
-
-    try:
-        out_cat = repo.call_git(["cat-file", "blob", obj], read_only=True,
-                                **kwds)
-    except CommandError as exc:
-        if bad_ok and "bad file" in exc.stderr:
-            out_cat = None
-        else:
-            raise
-    return out_cat
+    info = repo.get_object(obj)
+    if info is None or info[1] != 'blob':
+        if bad_ok:
+            return None
+        raise CommandError(
+            cmd=['git', 'cat-file', 'blob', obj],
+            msg='bad file',
+            stderr='fatal: git cat-file {}: bad file'.format(obj),
+        )
+    return info[3].decode('utf-8', errors='replace')
 
 
 def branch_blobs(repo, branch):
@@ -79,8 +78,6 @@ def branch_blobs(repo, branch):
     log_progress(lgr.info, "repodates_branch_blobs",
                  "Checking %d objects", num_objects,
                  label="Checking objects", total=num_objects, unit=" objects")
-    # This is inefficient.  It makes a git call for each object, some of which
-    # aren't even blobs.  We could instead use 'git cat-file --batch'.
     for obj, fname in blob_trees:
         log_progress(lgr.info, "repodates_branch_blobs",
                      "Checking %s", obj,
@@ -2644,6 +2644,26 @@ def test_whereis_zero_copies(path=None):
             assert_equal(res, [[]])
 
 
+@with_tempfile(mkdir=True)
+@with_tempfile(mkdir=True)
+def test_get_remote_costs(src=None, path=None):
+    origin = AnnexRepo(src, create=True)
+    repo = AnnexRepo.clone(src, path)
+    repo.add_remote('unavailable', '/nonexistent')
+    costs = repo.get_remote_costs()
+    assert_equal(
+        costs,
+        {origin.uuid: {'name': DEFAULT_REMOTE, 'cost': 100.0},
+         WEB_SPECIAL_REMOTE_UUID: {'name': 'web', 'cost': 200.0}})
+    repo.config.set(f'remote.{DEFAULT_REMOTE}.annex-cost', '300',
+                    scope='local')
+    assert_equal(repo.get_remote_costs()[origin.uuid]['cost'], 300.0)
+    # a remote that git-annex ignores is no source of content
+    repo.config.set(f'remote.{DEFAULT_REMOTE}.annex-ignore', 'true',
+                    scope='local')
+    assert_not_in(origin.uuid, repo.get_remote_costs())
+
+
 @with_tempfile(mkdir=True)
 def test_whereis_batch_eqv(path=None):
     path = Path(path)
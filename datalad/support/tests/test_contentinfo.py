@@ -0,0 +1,213 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test helpers for content info reports"""
+
+import pickle
+from array import array
+
+from datalad.support.contentinfo import (
+    ContentInfo,
+    ContentInfoCache,
+    ContentInfoTable,
+    ContentRecord,
+    parse_ls_files,
+    parse_ls_files_untracked,
+    parse_ls_tree,
+    parse_status_porcelain,
+)
+from datalad.tests.utils_pytest import (
+    assert_equal,
+    assert_in,
+    assert_not_in,
+    assert_raises,
+    with_tempfile,
+    with_tree,
+)
+from datalad.utils import Path
+
+sha1 = 'e69de29bb2d1d6434b8b29ae775ad8c2e48c5391'
+sha2 = '8bb0bdd3fb15ddd4990e69060fa8d158c83ff888'
+
+
+def test_contentrecord():
+    rec = ContentRecord(type='file', gitshasum=sha1)
+    assert_equal(rec, {'type': 'file', 'gitshasum': sha1})
+    assert_equal(len(rec), 2)
+    assert_in('type', rec)
+    assert_not_in('state', rec)
+    assert_equal(rec.get('state'), None)
+    assert_raises(KeyError, rec.__getitem__, 'state')
+    assert_raises(KeyError, rec.__delitem__, 'state')
+    # arbitrary properties are supported too
+    rec.update(state='clean', status='ok')
+    assert_equal(rec['status'], 'ok')
+    assert_equal(list(rec), ['type', 'state', 'gitshasum', 'status'])
+    del rec['type']
+    assert_equal(rec.pop('status'), 'ok')
+    assert_equal(dict(rec, path='p'),
+                 {'state': 'clean', 'gitshasum': sha1, 'path': 'p'})
+    # copies are independent
+    cp = rec.copy()
+    cp['state'] = 'modified'
+    assert_equal(rec['state'], 'clean')
+    assert_equal(pickle.loads(pickle.dumps(rec)), rec)
+    assert rec
+    assert not ContentRecord()
+    assert ContentRecord(status='ok')
+    assert_equal(ContentRecord([('key', 'K')], bytesize=1),
+                 {'key': 'K', 'bytesize': 1})
+
+
+def test_parse_ls_files():
+    assert_equal(parse_ls_files(b''), ContentInfoTable())
+    out = (
+        b'untracked\0udir/\0'
+        b'100644 ' + sha1.encode() + b' 0\tfile with space\0'
+        b'120000 ' + sha2.encode() + b' 0\tdir/link\0'
+        b'160000 ' + sha2.encode() + b' 0\tsub\0'
+    )
+    t = parse_ls_files(out)
+    assert_equal(t.paths, ['untracked', 'udir', 'file with space',
+                           'dir/link', 'sub'])
+    assert_equal(t.modes, [None, None, '100644', '120000', '160000'])
+    assert_equal(t.shas, [None, None, sha1, sha2, sha2])
+    assert_equal(list(t.sizes), [-1] * 5)
+    assert_equal(t.tracked().paths, ['file with space', 'dir/link', 'sub'])
+
+    # only untracked content
+    assert_equal(parse_ls_files(b'untracked\0udir/\0').paths,
+                 ['untracked', 'udir'])
+    assert_equal(parse_ls_files_untracked(b'untracked\0udir/\0'),
+                 parse_ls_files(b'untracked\0udir/\0'))
+
+    # SHA256 repositories
+    sha256 = 64 * 'a'
+    t = parse_ls_files(b'100755 ' + sha256.encode() + b' 0\tx\xc3\xa4\0')
+    assert_equal(t.paths, ['x\xe4'])
+    assert_equal(t.shas, [sha256])
+
+
+def test_parse_ls_tree():
+    out = (
+        b'100644 blob ' + sha1.encode() + b'       5\tfile\0'
+        b'160000 commit ' + sha2.encode() + b'       -\tsub\0'
+    )
+    t = parse_ls_tree(out)
+    assert_equal(t.paths, ['file', 'sub'])
+    assert_equal(t.modes, ['100644', '160000'])
+    assert_equal(t.shas, [sha1, sha2])
+    assert_equal(list(t.sizes), [5, -1])
+
+
+def test_parse_status_porcelain():
+    assert_equal(parse_status_porcelain(b''), ([], ContentInfoTable()))
+    h = sha1.encode()
+    out = (
+        b'? untracked\0? udir/\0'
+        # staged only, unmodified in the worktree
+        b'1 M. N... 100644 100644 100644 ' + h + b' ' + h + b' staged\0'
+        b'1 .M N... 100644 100644 100644 ' + h + b' ' + h
+        + b' file with space\0'
+        b'1 .D N... 100644 100644 000000 ' + h + b' ' + h + b' gone\0'
+        b'1 .M SC.. 160000 160000 160000 ' + h + b' ' + h + b' sub\0'
+        b'u UU N... 100644 100644 100644 100644 ' + h + b' ' + h + b' ' + h
+        + b' conflict\0'
+    )
+    modified, untracked = parse_status_porcelain(out)
+    assert_equal(modified, ['file with space', 'gone', 'sub', 'conflict'])
+    assert_equal(untracked, parse_ls_files_untracked(b'untracked\0udir/\0'))
+
+
+def test_table_filter():
+    t = ContentInfoTable(['a', 'ab', 'a/b', 'c/d/e'])
+    assert_equal(t.filter(['a']).paths, ['a', 'a/b'])
+    assert_equal(t.filter(['c/d', 'ab']).paths, ['ab', 'c/d/e'])
+    assert_equal(t.filter(['.']).paths, t.paths)
+    assert_equal(t.filter(['c/d/e/f']).paths, [])
+    assert_equal(
+        ContentInfoTable.concat(t.filter(['ab']), t.filter(['a'])).paths,
+        ['ab', 'a', 'a/b'])
+
+
+@with_tree(tree={'udir': {'f': ''}, 'ufile': ''})
+def test_contentinfo_view(path=None):
+    root = Path(path)
+    t = ContentInfoTable(
+        ['udir', 'ufile', 'file', 'conflict', 'conflict'],
+        [None, None, '100644', '100644', '100755'],
+        [None, None, sha1, sha1, sha2],
+        array('q', [-1, -1, 5, -1, -1]),
+    )
+    info = ContentInfo(root, t)
+    assert_equal(len(info), 4)
+    assert isinstance(info[root / 'file'], ContentRecord)
+    assert_equal(list(info), [root / 'udir', root / 'ufile', root / 'file',
+                              root / 'conflict'])
+    assert_equal(
+        info,
+        {
+            root / 'udir': {'type': 'directory', 'gitshasum': None},
+            root / 'ufile': {'type': 'file', 'gitshasum': None},
+            root / 'file': {'type': 'file', 'gitshasum': sha1,
+                            'bytesize': 5},
+            # last report on a path wins
+            root / 'conflict': {'type': 'file', 'gitshasum': sha2},
+        })
+    assert_not_in(root / 'other', info)
+    assert_not_in('file', info)
+    assert_raises(KeyError, info.__getitem__, root / 'other')
+
+    # modifications are retained
+    info[root / 'file']['state'] = 'clean'
+    assert_equal(info[root / 'file']['state'], 'clean')
+    info[root / 'other'] = {'type': 'file'}
+    assert_in(root / 'other', info)
+    del info[root / 'ufile']
+    assert_not_in(root / 'ufile', info)
+    assert_equal(list(info), [root / 'udir', root / 'file',
+                              root / 'conflict', root / 'other'])
+    assert_equal(info.pop(root / 'udir')['type'], 'directory')
+    assert_equal(info.getrel('file')['state'], 'clean')
+    assert_equal(info.getrel('other'), {'type': 'file'})
+    assert_equal(info.getrel('ufile'), None)
+    assert_equal(
+        [(r, p) for r, p, _ in info.relitems()],
+        [('file', root / 'file'), ('conflict', root / 'conflict'),
+         (None, root / 'other')])
+    assert_equal(
+        [p for p, _ in info.missing_from(ContentInfo(root, t))],
+        [root / 'other'])
+    assert_equal(
+        [p for p, _ in ContentInfo(root, t).missing_from(info)],
+        [root / 'udir', root / 'ufile'])
+    assert_equal(len(info), 3)
+    assert_equal(type(info.copy()), dict)
+
+
+@with_tempfile(mkdir=True)
+def test_contentinfo_cache(path=None):
+    t = parse_ls_tree(
+        b'100644 blob ' + sha1.encode() + b'       5\tfile\0'
+        b'160000 commit ' + sha2.encode() + b'       -\tsub\0'
+        b'120000 blob ' + sha2.encode() + b'      12\tl\xc3\xa4nk\0'
+    )
+    cache = ContentInfoCache(Path(path) / 'cache', max_trees=2)
+    assert_equal(cache.get('index', 'sig'), None)
+    cache.set('index', 'sig', t)
+    cache.set('index-empty', 'sig', ContentInfoTable())
+    # fresh instance has to load from disk
+    cache = ContentInfoCache(Path(path) / 'cache', max_trees=2)
+    assert_equal(cache.get('index', 'othersig'), None)
+    assert_equal(cache.get('index', 'sig'), t)
+    assert_equal(cache.get('index-empty', 'sig'), ContentInfoTable())
+    # trees are pruned
+    for i in range(3):
+        cache.set('tree-{}'.format(i), str(i), t)
+    assert_equal(sorted(p.name for p in (Path(path) / 'cache').glob('tree-*')),
+                 ['tree-1', 'tree-2'])
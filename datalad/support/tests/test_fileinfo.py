@@ -10,6 +10,7 @@
 
 import os.path as op
 from pathlib import Path
+from unittest.mock import patch
 
 import datalad.utils as ut
 from datalad.distribution.dataset import Dataset
@@ -166,7 +167,7 @@ def test_compare_content_info(path=None):
     # not a stat call per file for the worktree, and is not done ATM
     wt = ds.repo.get_content_info(ref=None)
     assert_dict_equal(
-        wt,
+        {f: dict(p) for f, p in wt.items()},
         {f: {k: v for k, v in p.items() if k != 'bytesize'}
          for f, p in ds.repo.get_content_info(ref='HEAD').items()}
     )
@@ -390,3 +391,57 @@ def test_get_file_annexinfo(path=None):
         ds.pathobj / 'dir1' / 'dropped', eval_availability=True)
     assert_equal(props['has_content'], False)
     assert_not_in('objloc', props)
+
+
+@with_tree(tree={
+    'file': 'content',
+    'dir': {'sub': 'sub', 'other': 'other'},
+})
+def test_get_content_info_cache(path=None):
+    repo = GitRepo(path, create=True)
+    repo.add(['file', 'dir'])
+    repo.commit(msg='init')
+    (repo.pathobj / 'untracked').write_text('untracked')
+    (repo.pathobj / 'dir' / 'untracked').write_text('untracked')
+
+    queries = [
+        dict(),
+        dict(untracked='no'),
+        dict(untracked='normal'),
+        dict(ref='HEAD'),
+        dict(paths=['dir']),
+        dict(paths=['dir/sub', 'file'], untracked='no'),
+        dict(paths=['dir'], ref='HEAD'),
+    ]
+    repo.config.set(
+        'datalad.runtime.content-info-cache', 'false', scope='override')
+    repo._cinfo_cache = None
+    assert_equal(repo._content_info_cache, None)
+    expected = [repo.get_content_info(**q) for q in queries]
+
+    repo.config.set(
+        'datalad.runtime.content-info-cache', 'true', scope='override')
+    # first round fills the cache, second round is served from it
+    for i in range(2):
+        for q, e in zip(queries, expected):
+            res = repo.get_content_info(**q)
+            assert_equal(list(res.items()), list(e.items()))
+    cachedir = repo.dot_git / 'datalad' / 'cache' / 'contentinfo'
+    assert (cachedir / 'index').exists()
+
+    # no git call needed for tracked content of an unchanged index
+    with patch.object(repo, 'call_git', side_effect=AssertionError):
+        assert_equal(repo.get_content_info(untracked='no'), expected[1])
+        assert_equal(
+            repo.get_content_info(paths=['dir/sub', 'file'], untracked='no'),
+            expected[5])
+
+    # a modified index invalidates the cache
+    repo.add(['untracked'])
+    assert_in('gitshasum',
+              repo.get_content_info(untracked='no')[repo.pathobj / 'untracked'])
+    # and so does a corrupted cache file
+    repo._cinfo_cache = None
+    (cachedir / 'index').write_bytes(b'garbage')
+    res = repo.get_content_info(untracked='no')
+    assert_in(repo.pathobj / 'untracked', res)
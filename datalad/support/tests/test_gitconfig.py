@@ -0,0 +1,196 @@
+# emacs: -*- mode: python; py-indent-offset: 4; tab-width: 4; indent-tabs-mode: nil -*-
+# ex: set sts=4 ts=4 sw=4 et:
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+#
+#   See COPYING file distributed along with the datalad package for the
+#   copyright and license terms.
+#
+# ## ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ### ##
+"""Test the in-process git-config reader"""
+
+from unittest.mock import patch
+
+import pytest
+
+from datalad.config import parse_gitconfig_dump
+from datalad.runner import (
+    GitRunner,
+    StdOutErrCapture,
+)
+from datalad.support.gitconfig import (
+    UnsupportedGitConfig,
+    _parsed_files,
+    _wildmatch_regex,
+    get_env_config,
+    parse_gitconfig,
+    read_gitconfig,
+    read_gitconfig_file,
+)
+from datalad.tests.utils_pytest import (
+    assert_equal,
+    assert_false,
+    assert_in,
+    assert_not_in,
+    assert_raises,
+    assert_true,
+)
+
+_crazy_cfg = """\
+# comment
+; another comment
+[Core]
+\tBare = false
+[section "Sub Section"]
+  key = plain value # with comment
+  quoted = " leading and trailing  " ; comment
+  escapes = tab\\there \\"quoted\\" back\\\\slash new\\nline
+  continued = first \\
+second
+  inner   =   several    spaces
+  flag
+  empty =
+  Mixed-Case9 = 1
+[legacy.SubSection]
+  key = legacy
+[section "quote\\"d"] key = same line
+[multi]
+  v = 1
+  v = 2
+[multi]
+  v = 3
+"""
+
+
+def _git_records(path):
+    out = GitRunner().run(
+        ['git', 'config', '-z', '-l', '--file', str(path)],
+        protocol=StdOutErrCapture)
+    return parse_gitconfig_dump(out['stdout'], multi_value=True)[0]
+
+
+def _fold_records(records):
+    # multiple values of a key as a tuple, like parse_gitconfig_dump()
+    dct = {}
+    for k, v in records:
+        present = dct.get(k)
+        dct[k] = v if present is None else (
+            present + (v,) if isinstance(present, tuple) else (present, v))
+    return dct
+
+
+def test_parse_gitconfig(tmp_path):
+    cfgfile = tmp_path / 'config'
+    cfgfile.write_text(_crazy_cfg)
+    records = parse_gitconfig(_crazy_cfg)
+    assert_in(('section.Sub Section.key', 'plain value'), records)
+    assert_in(('section.Sub Section.quoted', ' leading and trailing  '),
+              records)
+    assert_in(('section.Sub Section.flag', None), records)
+    assert_in(('legacy.subsection.key', 'legacy'), records)
+    # identical to what git reports
+    assert_equal(_fold_records(records), _git_records(cfgfile))
+
+    for invalid in ('key = outside', '[sec\nkey = v', '[sec]\n1key = v',
+                    '[sec]\nkey = "unterminated', '[sec]\nkey = \\x',
+                    '[sec "sub]\n', '[sec]\nkey # comment'):
+        assert_raises(UnsupportedGitConfig, parse_gitconfig, invalid)
+
+
+def test_wildmatch():
+    for pattern, matching, notmatching in (
+            ('**/work/**', ('/home/me/work/proj/.git', '/work/x'),
+             ('/home/me/workshop/.git',)),
+            ('/a/*/c', ('/a/b/c',), ('/a/b/x/c',)),
+            ('/a/**/c', ('/a/c', '/a/b/x/c'), ('/a/bc',)),
+            ('/a/b?', ('/a/bc',), ('/a/b/',)),
+            ('/a/[bc]d', ('/a/bd', '/a/cd'), ('/a/ed',)),
+            ('/a/[!b]d', ('/a/cd',), ('/a/bd', '/a//d')),
+    ):
+        regex = _wildmatch_regex(pattern)
+        for m in matching:
+            assert_true(regex.match(m), (pattern, m))
+        for m in notmatching:
+            assert_false(regex.match(m), (pattern, m))
+    assert_true(_wildmatch_regex('/A/b', icase=True).match('/a/B'))
+
+
+def test_includes(tmp_path):
+    repo = tmp_path / 'repo'
+    git_dir = repo / '.git'
+    git_dir.mkdir(parents=True)
+    (git_dir / 'HEAD').write_text('ref: refs/heads/feature/one\n')
+    (tmp_path / 'inc').mkdir()
+    (tmp_path / 'inc' / 'a.cfg').write_text(
+        '[a]\n  v = a\n[include]\n  path = b.cfg\n')
+    (tmp_path / 'inc' / 'b.cfg').write_text('[b]\n  v = b\n')
+    (tmp_path / 'inc' / 'c.cfg').write_text('[c]\n  v = c\n')
+    main = tmp_path / 'main.cfg'
+    main.write_text(
+        '[pre]\n  v = 1\n'
+        '[include]\n  path = inc/a.cfg\n  path = inc/missing.cfg\n'
+        '[includeIf "gitdir:repo/"]\n  path = inc/c.cfg\n'
+        '[includeIf "gitdir:other/"]\n  path = inc/never.cfg\n'
+        '[includeIf "onbranch:feature/"]\n  path = inc/c.cfg\n'
+        '[includeIf "unknown:condition"]\n  path = inc/never.cfg\n'
+        '[post]\n  v = 2\n')
+    records, files = read_gitconfig([main], git_dir=git_dir)
+    assert_equal(
+        [k for k, v in records if not k.startswith('include')],
+        ['pre.v', 'a.v', 'b.v', 'c.v', 'c.v', 'post.v'])
+    assert_in(tmp_path / 'inc' / 'b.cfg', files)
+    # missing includes are tracked to detect their creation
+    assert_in(tmp_path / 'inc' / 'missing.cfg', files)
+    assert_not_in(tmp_path / 'inc' / 'never.cfg', files)
+    # no repository, no conditional include
+    records, _ = read_gitconfig([main])
+    assert_equal(
+        [k for k, v in records if not k.startswith('include')],
+        ['pre.v', 'a.v', 'b.v', 'post.v'])
+    # like `git config --file`, includes can be ignored
+    records, files = read_gitconfig([main], git_dir=git_dir, includes=False)
+    assert_equal(files, [main])
+    assert_equal(_fold_records(records), _git_records(main))
+
+    (tmp_path / 'inc' / 'b.cfg').write_text(
+        '[includeIf "hasconfig:remote.*.url:https://**"]\n  path = c.cfg\n')
+    assert_raises(UnsupportedGitConfig, read_gitconfig, [main])
+    # endless recursion
+    (tmp_path / 'inc' / 'b.cfg').write_text('[include]\n  path = a.cfg\n')
+    assert_raises(UnsupportedGitConfig, read_gitconfig, [main])
+
+
+def test_read_gitconfig_file_cache(tmp_path):
+    cfgfile = tmp_path / 'config'
+    assert read_gitconfig_file(cfgfile) is None
+    cfgfile.write_text('[a]\n  v = 1\n')
+    with patch('datalad.support.gitconfig.parse_gitconfig',
+               wraps=parse_gitconfig) as parser:
+        assert_equal(read_gitconfig_file(cfgfile), [('a.v', '1')])
+        assert_equal(read_gitconfig_file(cfgfile), [('a.v', '1')])
+        assert_equal(parser.call_count, 1)
+        # any modification is detected
+        cfgfile.write_text('[a]\n  v = 22\n')
+        assert_equal(read_gitconfig_file(cfgfile), [('a.v', '22')])
+        assert_equal(parser.call_count, 2)
+    assert_in(str(cfgfile), _parsed_files)
+
+
+@pytest.mark.parametrize("env,expected", [
+    ({}, []),
+    ({'GIT_CONFIG_PARAMETERS': "'Init.defaultBranch=main' 'Sec.Sub.Key'"},
+     [('init.defaultbranch', 'main'), ('sec.Sub.key', None)]),
+    ({'GIT_CONFIG_PARAMETERS': "'a.b'='it'\\''s' 'c.d'='x=y'"},
+     [('a.b', "it's"), ('c.d', 'x=y')]),
+    ({'GIT_CONFIG_COUNT': '1', 'GIT_CONFIG_KEY_0': 'a.b',
+      'GIT_CONFIG_VALUE_0': 'v', 'GIT_CONFIG_PARAMETERS': "'c.d=e'"},
+     [('a.b', 'v'), ('c.d', 'e')]),
+])
+def test_get_env_config(env, expected):
+    assert_equal(get_env_config(env), expected)
+
+
+def test_get_env_config_invalid():
+    for env in ({'GIT_CONFIG_PARAMETERS': "unquoted"},
+                {'GIT_CONFIG_PARAMETERS': "'nodot=1'"},
+                {'GIT_CONFIG_COUNT': '1'}):
+        assert_raises(UnsupportedGitConfig, get_env_config, env)
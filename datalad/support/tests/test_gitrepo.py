@@ -14,6 +14,7 @@ import logging
 import os
 import os.path as op
 import sys
+from unittest.mock import patch
 
 import pytest
 
@@ -70,6 +71,7 @@ from datalad.tests.utils_pytest import (
 )
 from datalad.utils import (
     Path,
+    PurePosixPath,
     chpwd,
     getpwd,
     on_windows,
@@ -991,6 +993,63 @@ def test_get_submodules_parent_on_unborn_branch(path=None):
         ["sub"])
 
 
+@with_tempfile(mkdir=True)
+def test_parse_gitmodules(path=None):
+    repo = GitRepo(op.join(path, 'repo'), create=True)
+    gitmodules = repo.pathobj / '.gitmodules'
+    eq_(repo._parse_gitmodules(), {})
+    gitmodules.write_text(
+        '[submodule "sub"]\n'
+        '\tpath = sub\n\turl = ./sub\n'
+        '\tdatalad-id = 1234 ; comment\n'
+        '[submodule "with.dot and space"]\n'
+        '\tpath = "dir/with space"\n'
+        '\tdatalad-recursiveinstall = skip\n'
+        '\tflag\n'
+        '[submodule "nopath"]\n'
+        '\turl = ./nopath\n'
+        '[Submodule "sub"]\n'
+        '\turl = ./sub2\n')
+    modinfo = repo._parse_gitmodules()
+    eq_(modinfo, {
+        PurePosixPath('sub'): {
+            'gitmodule_path': 'sub',
+            'gitmodule_url': './sub2',
+            'gitmodule_datalad-id': '1234',
+            'gitmodule_name': 'sub'},
+        PurePosixPath('dir/with space'): {
+            'gitmodule_path': 'dir/with space',
+            'gitmodule_datalad-recursiveinstall': 'skip',
+            'gitmodule_flag': None,
+            'gitmodule_name': 'with.dot and space'},
+    })
+    # identical to what git-config reports
+    eq_(repo._parse_gitmodules_via_git(), modinfo)
+    # no subprocess for unmodified files, and files with identical
+    # content in other repositories
+    other = GitRepo(op.join(path, 'other'), create=True)
+    (other.pathobj / '.gitmodules').write_bytes(gitmodules.read_bytes())
+    with patch.object(GitRepo, 'call_git') as call_git, \
+            patch('datalad.support.gitrepo.parse_gitconfig') as parser:
+        ok_(repo._parse_gitmodules() is modinfo)
+        ok_(other._parse_gitmodules() is modinfo)
+    call_git.assert_not_called()
+    parser.assert_not_called()
+    # modifications are detected
+    gitmodules.write_text('[submodule "new"]\n\tpath = new\n')
+    eq_(list(repo._parse_gitmodules()), [PurePosixPath('new')])
+    # include directives are not followed, just like git-config does it
+    gitmodules.write_text(
+        '[submodule "new"]\n\tpath = new\n[include]\n\tpath = ../inc\n')
+    (Path(path) / 'inc').write_text(
+        '[submodule "inc"]\n\tpath = inc\n')
+    eq_(repo._parse_gitmodules(), repo._parse_gitmodules_via_git())
+    eq_(list(repo._parse_gitmodules()), [PurePosixPath('new')])
+    # git reports on what cannot be parsed
+    gitmodules.write_text('[submodule "new"\n\tpath = new\n')
+    assert_raises(CommandError, repo._parse_gitmodules)
+
+
 def test_to_options():
 
     class Some(object):
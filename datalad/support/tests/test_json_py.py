@@ -17,6 +17,7 @@ from datalad.support.json_py import (
     load,
     load_stream,
     loads,
+    loads_record,
 )
 from datalad.tests.utils_pytest import (
     assert_in,
@@ -55,6 +56,15 @@ def test_loads():
     assert_in('Failed to load content from', cml.out)
 
 
+def test_loads_record():
+    for rec in (b'{"k": "\xc3\xa4", "n": [1, 2.5, null]}',
+                '{"k": "\u00e4", "n": [1, 2.5, null]}'):
+        eq_(loads_record(rec), {'k': '\xe4', 'n': [1, 2.5, None]})
+    # values the fast parsers might reject
+    eq_(loads_record(b'[%d]' % 2 ** 70), [2 ** 70])
+    assert_raises(JSONDecodeError, loads_record, b'{"I": "am wrong,}')
+
+
 @with_tempfile(mkdir=True)
 def test_compression(path=None):
     fname = op.join(path, 'test.json.xz')
@@ -9,8 +9,10 @@
 
 import logging
 from functools import partial
+from pathlib import PurePosixPath
 from time import (
     sleep,
+    thread_time,
     time,
 )
 
@@ -25,7 +27,9 @@ from datalad.support.exceptions import IncompleteResultsError
 from datalad.support.parallel import (
     ProducerConsumer,
     ProducerConsumerProgressLog,
+    _HierarchyScheduler,
     no_parentds_in_futures,
+    no_subds_in_futures,
 )
 from datalad.tests.utils_pytest import (
     assert_equal,
@@ -104,6 +108,92 @@ def test_producer_future_key(jobs):
     assert_equal(list(pc), [0, 1, 2])
 
 
+def test_hierarchy_scheduler():
+    def released(sched):
+        return [k for k, _ in sched.pop_ready()]
+
+    sched = _HierarchyScheduler('bottom-up')
+    for p in ('/a', '/a/b', '/a/b/c', '/d'):
+        sched.add(p, p)
+    assert_raises(ValueError, sched.add, '/d', '/d')
+    assert_equal(released(sched), ['/a/b/c', '/d'])
+    assert_equal(len(sched), 2)
+    sched.finish('/d')
+    assert_equal(released(sched), [])
+    sched.finish('/a/b/c')
+    assert_equal(released(sched), ['/a/b'])
+    # a new item underneath blocks the parent again
+    sched.add('/a/e', '/a/e')
+    sched.finish('/a/b')
+    assert_equal(released(sched), ['/a/e'])
+    sched.finish('/a/e')
+    assert_equal(released(sched), ['/a'])
+    assert_equal(len(sched), 0)
+
+    sched = _HierarchyScheduler('top-down')
+    for p in ('/a/b', '/a', '/a/b/c', '/a/d', '/e'):
+        sched.add(p, p)
+    # /a/b was ready when added, but no longer when released
+    assert_equal(released(sched), ['/a', '/e'])
+    sched.finish('/a')
+    assert_equal(released(sched), ['/a/b', '/a/d'])
+    sched.finish('/a/b')
+    assert_equal(released(sched), ['/a/b/c'])
+    assert_raises(ValueError, _HierarchyScheduler, 'sideways')
+
+
+@pytest.mark.parametrize("order", ['bottom-up', 'top-down'])
+def test_ProducerConsumer_order(order):
+    paths = ['/a', '/a/b', '/a/b/c', '/a/d', '/e', '/e/f']
+    finished = []
+
+    def consumer(path):
+        # dependencies were all done, while the item was running
+        if order == 'bottom-up':
+            assert not [p for p in paths
+                        if path in PurePosixPath(p).parents and p not in finished]
+        else:
+            assert not [p for p in paths
+                        if PurePosixPath(p) in PurePosixPath(path).parents
+                        and p not in finished]
+        sleep(0.01)
+        finished.append(path)
+        yield path
+
+    # producing items in the "wrong" order must not matter
+    pc = ProducerConsumer(
+        paths if order == 'bottom-up' else paths[::-1],
+        consumer, order=order, jobs=4)
+    assert_equal(sorted(pc), sorted(paths))
+    assert_equal(sorted(finished), sorted(paths))
+    stats = pc.stats()
+    assert_equal(stats['finished'], len(paths))
+    assert_equal(stats['running'], 0)
+    assert_equal(stats['pending'], 0)
+    assert_greater(stats['utilization'], 0)
+    # the helpers for safe_to_consume select the same ordering
+    assert_equal(
+        sorted(ProducerConsumer(
+            paths, consumer, jobs=4,
+            safe_to_consume=no_subds_in_futures
+            if order == 'bottom-up' else no_parentds_in_futures)),
+        sorted(paths))
+
+
+def test_ProducerConsumer_no_busy_wait():
+    # the main thread must not poll while consumers run
+    def consumer(i):
+        sleep(0.5)
+        return i
+
+    pc = ProducerConsumer(range(4), consumer, jobs=4)
+    t0 = time()
+    cpu0 = thread_time()
+    assert_equal(sorted(pc), list(range(4)))
+    assert_greater(1.5, time() - t0)
+    assert_greater(0.1, thread_time() - cpu0)
+
+
 @slow  # 12sec on Yarik's laptop
 @with_tempfile(mkdir=True)
 def test_creatsubdatasets(topds_path=None, n=2):
@@ -17,15 +17,18 @@ import pytest
 from datalad.cmd import (
     BatchedCommand,
     BatchedCommandError,
+    BatchedProcessPool,
     readline_rstripped,
 )
 from datalad.runner.tests.utils import py2cmd
 from datalad.tests.utils_pytest import (
     assert_equal,
+    assert_false,
     assert_is_none,
     assert_is_not_none,
     assert_not_equal,
     assert_true,
+    patch_config,
 )
 
 
@@ -165,6 +168,65 @@ def test_batched_restart():
     bc.close(return_stderr=False)
 
 
+def test_batched_pipeline():
+    bc = BatchedCommand(
+        cmd=py2cmd(
+            "import sys\n"
+            "for line in sys.stdin:\n"
+            "    print(line.strip().upper(), flush=True)\n"))
+    sent = []
+
+    def requests(n):
+        for i in range(n):
+            sent.append(i)
+            yield f"line-{i}"
+
+    responses = bc.pipeline(requests(50), max_in_flight=5)
+    assert_equal(next(responses), "LINE-0")
+    # requests are sent ahead, but not more than allowed
+    assert_equal(len(sent), 5)
+    assert_equal(list(responses), [f"LINE-{i}" for i in range(1, 50)])
+    assert_equal(bc.last_request, "line-49")
+    # it works the same way as __call__ afterwards
+    assert_equal(bc(("one", "more")), "ONE MORE")
+    bc.close(return_stderr=False)
+
+
+def test_batched_pipeline_exit():
+    # Requests that were in flight when the process exited are not sent
+    # again, but left to the caller.
+    bc = BatchedCommand(
+        cmd=py2cmd(
+            "import os\n"
+            "import sys\n"
+            "for i in range(3):\n"
+            "    print(os.getpid(), sys.stdin.readline().strip(), "
+            "flush=True)\n"))
+    lines = [f"line-{i}" for i in range(10)]
+    responses = []
+    with pytest.raises(BatchedCommandError) as exception_info:
+        for r in bc.pipeline(lines, max_in_flight=5):
+            responses.append(r.split())
+    assert_equal([r[1] for r in responses], lines[:3])
+    assert_equal(exception_info.value.last_processed_request, "line-2")
+    assert_equal(exception_info.value.code, 0)
+    # the process is started again for the next request
+    pid = bc("line-3").split()[0]
+    assert_not_equal(pid, responses[0][0])
+    bc.close(return_stderr=False)
+
+    bc = BatchedCommand(
+        cmd=py2cmd(
+            """
+print("something")
+exit(3)
+            """))
+    with pytest.raises(BatchedCommandError) as exception_info:
+        list(bc.pipeline(["one", "two", "three"]))
+    assert exception_info.value.code == 3
+    bc.close(return_stderr=False)
+
+
 def test_command_fail_1():
     # Expect that a failing command raises a CommandError in which the return
     # code and the last successful request is caught, and that the command is
@@ -212,3 +274,51 @@ print(a*b)
     assert bc.return_code == 1
     assert bc.last_request is None
     bc.close(return_stderr=False)
+
+
+def test_batched_process_pool():
+    pool = BatchedProcessPool()
+    with unittest.mock.patch("datalad.cmd.batched_processes", pool), \
+            patch_config({"datalad.runtime.max-batched": "2",
+                          "datalad.runtime.max-batched-fds": None,
+                          "datalad.runtime.max-inactive-age": "600"}):
+        bcs = [BatchedCommand(cmd=[sys.executable, "-i", "-u", "-q", "-"])
+               for i in range(3)]
+        for i, bc in enumerate(bcs):
+            assert_equal(bc("print({})".format(i)), str(i))
+        # the least recently used process was closed to make room
+        assert_equal(len(pool), 2)
+        assert_false(bcs[0].process_running())
+        assert_true(bcs[2].process_running())
+        # and is transparently restarted
+        assert_equal(bcs[0]("print('again')"), "again")
+        assert_false(bcs[1].process_running())
+        assert_equal(bcs[2]("print('hit')"), "hit")
+        assert_equal(
+            pool.stats(),
+            dict(hits=1, misses=4, spawns=4, evictions=2, expirations=0,
+                 peak=2, running=2))
+        # idle processes expire
+        pool.expire(max_age=0)
+        assert_equal(len(pool), 0)
+        assert_equal(pool.stats()['expirations'], 2)
+        # the fd limit also caps the number of processes
+        with patch_config({"datalad.runtime.max-batched-fds": "3"}):
+            for bc in bcs:
+                bc("print(1)")
+                assert_equal(len(pool), 1)
+        # processes with a request in progress, or about to start one,
+        # are not closed
+        bcs[0]("print(1)")
+        bcs[0]._enter()
+        pool.expire(max_age=0)
+        assert_true(bcs[0].process_running())
+        bcs[0]._leave()
+        with bcs[0]._active_lock:
+            pool.expire(max_age=0)
+        assert_true(bcs[0].process_running())
+        pool.expire(max_age=0)
+        assert_false(bcs[0].process_running())
+        for bc in bcs:
+            bc.close()
+        assert_equal(len(pool), 0)
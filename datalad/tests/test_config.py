@@ -30,6 +30,7 @@ from datalad.config import (
 )
 from datalad.distribution.dataset import Dataset
 from datalad.support.annexrepo import AnnexRepo
+from datalad.support.gitconfig import read_gitconfig
 from datalad.support.gitrepo import GitRepo
 from datalad.tests.utils_pytest import (
     DEFAULT_BRANCH,
@@ -832,3 +833,93 @@ def test_cross_cfgman_update(tmp_path):
     ds.config.set(myuniqcfg, myuniqcfg_value2, scope='global')
     # and again expect the global instance to catch up with it
     assert dl_cfg.get(myuniqcfg) == myuniqcfg_value2
+
+
+def test_reload_without_git(tmp_path):
+    repo = GitRepo(tmp_path / 'repo', create=True)
+    # a ConfigManager does not need git to read the configuration
+    with patch.object(ConfigManager, '_reload',
+                      side_effect=ConfigManager._reload,
+                      autospec=True) as git_reload:
+        cfg = ConfigManager(repo)
+        assert_in('user.name', cfg)
+        for i in range(3):
+            cfg.set(f'sec.sub.key{i}', str(i), scope='local')
+            cfg.add('sec.sub.multi', str(i), scope='local')
+        cfg.set('sec.sub.key0', 'new', scope='local')
+        cfg.unset('sec.sub.key1', scope='local')
+        # modifications are visible without a forced reload
+        assert_equal(cfg.get('sec.sub.key0'), 'new')
+        assert_not_in('sec.sub.key1', cfg)
+        assert_equal(cfg.get('sec.sub.key2'), '2')
+        assert_equal(cfg.get('sec.sub.multi', get_all=True),
+                     ('0', '1', '2'))
+        assert_equal(git_reload.call_count, 0)
+        # but git is still the reference on a forced reload
+        in_process = cfg._stores['git']['cfg']
+        cfg.reload(force=True)
+        assert_equal(git_reload.call_count, 1)
+    assert_equal(in_process, cfg._stores['git']['cfg'])
+
+
+def test_shared_global_config(tmp_path):
+    globalcfg = tmp_path / 'gitconfig'
+    globalcfg.write_text('[user]\n  name = Shared\n  email = s@example.com\n')
+    repos = [GitRepo(tmp_path / f'repo{i}', create=True) for i in range(2)]
+    with patch.dict(os.environ, {'GIT_CONFIG_GLOBAL': str(globalcfg)}), \
+            patch('datalad.config.read_gitconfig',
+                  wraps=read_gitconfig) as reader:
+        cfgs = [ConfigManager(r) for r in repos]
+        # global/system files are read once, and only the local
+        # configuration is read for each repository
+        read_paths = [c.args[0] for c in reader.call_args_list]
+        assert_equal(sum(globalcfg in p for p in read_paths), 1)
+        for r, cfg in zip(repos, cfgs):
+            assert_in(r.dot_git / 'config', cfg._stores['git']['files'])
+            assert_in(globalcfg, cfg._stores['git']['files'])
+            assert_equal(cfg.get('user.name'), 'Shared')
+        # a modification is seen by all managers
+        cfgs[0].set('user.name', 'Modified', scope='global')
+        for cfg in cfgs:
+            cfg.reload()
+            assert_equal(cfg.get('user.name'), 'Modified')
+        # local configuration stays local
+        cfgs[1].set('user.name', 'Local', scope='local')
+        assert_equal(cfgs[0].get('user.name'), 'Modified')
+        assert_equal(cfgs[1].get('user.name'), 'Local')
+        # conditional includes depend on the repository, and prevent sharing
+        (tmp_path / 'repo0.cfg').write_text('[user]\n  name = Repo0\n')
+        with globalcfg.open('a') as f:
+            f.write(f'[includeIf "gitdir:{tmp_path}/repo0/"]\n'
+                    f'  path = {tmp_path}/repo0.cfg\n')
+        for cfg in cfgs:
+            cfg.reload()
+        assert_equal(cfgs[0].get('user.name'), 'Repo0')
+        assert_equal(cfgs[1].get('user.name'), 'Local')
+        assert_equal(
+            [c.get('user.name') for c in (ConfigManager(r) for r in repos)],
+            ['Repo0', 'Local'])
+
+
+def test_no_includes_in_dataset_config(tmp_path):
+    included = tmp_path / 'included.cfg'
+    included.write_text('[foo]\n\tbar = included\n')
+    ds = Dataset(tmp_path / 'ds').create()
+    # like `git config --file`, includes in the dataset config are ignored
+    ds.config.add('include.path', str(included), scope='branch')
+    cfg = ConfigManager(ds)
+    in_process = {s: cfg._stores[s]['cfg'] for s in ('git', 'branch')}
+    assert_not_in('foo.bar', cfg)
+    cfg.reload(force=True)
+    assert_equal(in_process,
+                 {s: cfg._stores[s]['cfg'] for s in ('git', 'branch')})
+    # includes in the repository config are followed when reading all
+    # configuration files, but not with `git config --local`
+    ds.config.add('include.path', str(included), scope='local')
+    cfg = ConfigManager(ds)
+    assert_equal(cfg.get('foo.bar'), 'included')
+    cfg = ConfigManager(ds, source='branch-local')
+    in_process = cfg._stores['git']['cfg']
+    assert_not_in('foo.bar', cfg)
+    cfg.reload(force=True)
+    assert_equal(in_process, cfg._stores['git']['cfg'])
@@ -12,6 +12,7 @@ import base64
 import lzma
 import multiprocessing
 import multiprocessing.queues
+import re
 import ssl
 import textwrap
 from difflib import unified_diff
@@ -20,6 +21,7 @@ from http.server import (
     HTTPServer,
     SimpleHTTPRequestHandler,
 )
+from io import BytesIO
 from json import dumps
 from unittest import SkipTest
 from unittest.mock import patch
@@ -648,6 +650,48 @@ class SilentHTTPHandler(SimpleHTTPRequestHandler):
             return
         lgr.debug("HTTP: " + format, *args)
 
+    def send_header(self, keyword, value):
+        SimpleHTTPRequestHandler.send_header(self, keyword, value)
+        if keyword == 'Last-Modified':
+            # only sent for files, for which send_head() serves byte ranges
+            SimpleHTTPRequestHandler.send_header(
+                self, 'Accept-Ranges', 'bytes')
+
+    def send_head(self):
+        """Serve a single byte range of a file, if requested"""
+        byte_range = re.fullmatch(
+            r'bytes=(\d*)-(\d*)', self.headers.get('Range', '').strip())
+        path = self.translate_path(self.path)
+        if not byte_range or not any(byte_range.groups()) \
+                or not os.path.isfile(path):
+            return SimpleHTTPRequestHandler.send_head(self)
+        last_modified = self.date_time_string(int(os.path.getmtime(path)))
+        if self.headers.get('If-Range', last_modified) != last_modified:
+            # file has changed, full content must be served
+            return SimpleHTTPRequestHandler.send_head(self)
+        size = os.path.getsize(path)
+        start, end = byte_range.groups()
+        if not start:
+            # suffix range
+            start, end = max(size - int(end), 0), size - 1
+        else:
+            start, end = int(start), min(int(end or size - 1), size - 1)
+        if start >= size or start > end:
+            # unsatisfiable range (e.g. a client resuming a complete
+            # download), ignore it as servers may do
+            return SimpleHTTPRequestHandler.send_head(self)
+        with open(path, 'rb') as f:
+            f.seek(start)
+            content = f.read(end - start + 1)
+        self.send_response(206)
+        self.send_header('Content-type', self.guess_type(path))
+        self.send_header('Content-Range',
+                         'bytes {}-{}/{}'.format(start, end, size))
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('Last-Modified', last_modified)
+        self.end_headers()
+        return BytesIO(content)
+
 
 def _multiproc_serve_path_via_http(
         hostname, path_to_serve_from, queue, use_ssl=False, auth=None): # pragma: no cover
@@ -49,11 +49,15 @@ requires = {
     'downloaders-extra': [
         'requests_ftp',
     ],
+    'addurls-parquet': [
+        'pyarrow',           # Parquet input for addurls
+    ],
     'publish': [
         'python-gitlab',     # required for create-sibling-gitlab
     ],
     'misc': [
         'argcomplete>=1.12.3',  # optional CLI completion
+        'orjson',            # faster parsing of JSON records from git-annex
         'pyperclip',         # clipboard manipulations
         'python-dateutil',   # add support for more date formats to check_dates
     ],